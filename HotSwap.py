@@ -1,40 +1,30 @@
+import time
+STARTUP_T0 = time.perf_counter()  # Before the heavy imports, for the startup benchmark
+import sys
+if __name__ == "__main__" and "--headless" in sys.argv:
+    # No window, no Tk: the engine alone, driven by the same config.json
+    from hotswap_engine import main
+    sys.exit(main(sys.argv[1:]))
 import customtkinter as ctk
-import obsws_python as obs
-import win32gui
 from tkinter import messagebox, filedialog
-import win32process
 import win32api
 import win32con
-import win32event  
-import winerror    
-import psutil
 import threading
-import time
-import json
 import os
-import socket
-import sys
-import keyboard
-import shutil
-import winsound
-import wave
-import audioop
-import io
 import ctypes
-from PIL import Image
-
+from hotswap_listview import VirtualList
+from hotswap_overlay import ALERT_DIGEST, AlertQueue, OverlayPool, merge_alert, new_alert
+from hotswap_engine import (
+    HotSwapEngine, EngineView, acquire_single_instance, resource_path, app_data_dir, CONFIG_FILE, LOG_FILE, CRASH_FILE,
+    APP_NAME, APP_VERSION, TONE_NORMAL, TONE_PRIMARY, TONE_SUCCESS, TONE_WARNING, TONE_DANGER, TONE_MUTED,
+    ALERT_GAME_DETECTED, ALERT_FRAME_DROP, ALERT_CAPTURE_FAILED, ALERT_ASPECT_RATIO,
+)
+from hotswap_startup import StartupTimer, BENCHMARK_FLAG
+from hotswap_log import log, LogStream, INFO, ERROR
 
-#Resource Path Helper 
-def resource_path(relative_path):
-    """Get absolute path to resource, works for dev and PyInstaller exe."""
-    if getattr(sys, 'frozen', False):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base_path, relative_path)
-
-APP_NAME = "HotSwap"
-APP_VERSION = "1.1.0" 
+# keyboard, PIL and winsound are imported where they are used, off the startup path
+STARTUP = StartupTimer(STARTUP_T0)
+STARTUP.mark("imports")
 
 
 ctk.set_appearance_mode("Dark")
@@ -63,13 +53,14 @@ FONT_BODY = ("Segoe UI", 16, "bold")
 FONT_SMALL = ("Segoe UI", 16, "bold")
 FONT_CAPTION = ("Segoe UI", 16, "bold")
 
-app_data_dir = os.path.join(os.environ['APPDATA'], "HotSwap")
-if not os.path.exists(app_data_dir):
-    try:
-        os.makedirs(app_data_dir)
-    except Exception:
-        pass
-CONFIG_FILE = os.path.join(app_data_dir, "config.json")
+TONE_COLORS = {
+    TONE_NORMAL: "#FFFFFF",
+    TONE_PRIMARY: COLOR_PRIMARY,
+    TONE_SUCCESS: COLOR_SUCCESS,
+    TONE_WARNING: COLOR_WARNING,
+    TONE_DANGER: COLOR_DANGER,
+    TONE_MUTED: COLOR_MUTED,
+}
 
 # ... [Keep Flash Window Helpers] ...
 FLASHW_STOP = 0
@@ -110,23 +101,120 @@ GetWindowLong = ctypes.windll.user32.GetWindowLongW
 SetWindowLong = ctypes.windll.user32.SetWindowLongW
 SetWindowDisplayAffinity = ctypes.windll.user32.SetWindowDisplayAffinity
 
+class _OverlayWindow:
+    """One pre-built popup for an overlay type, cloaked from capture on first show. Showing it only swaps text and position."""
+
+    def __init__(self, parent, overlay_type, logo_image):
+        self.overlay_type = overlay_type
+        self.window = ctk.CTkToplevel(parent)
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.window.configure(fg_color="#000001")
+        self.window.attributes("-transparentcolor", "#000001")
+        self.window.attributes("-topmost", True)
+        self.window.attributes("-alpha", 0.95)
+
+        # --- SETUP COLORS ---
+        if overlay_type == OverlayPopup.TYPE_FRAME_DROP or overlay_type == OverlayPopup.TYPE_CAPTURE_FAILED:
+            title_color = COLOR_DANGER
+        elif overlay_type == OverlayPopup.TYPE_ASPECT_RATIO:
+            title_color = COLOR_WARNING
+        else:
+            title_color = COLOR_ACCENT
+
+        # --- DRAW UI (once) ---
+        frame = ctk.CTkFrame(self.window, fg_color="#1a1a1a", corner_radius=20)
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        if logo_image:
+            ctk.CTkLabel(frame, image=logo_image, text="").pack(pady=(20, 5), anchor="center")
+
+        ctk.CTkLabel(frame, text="HotSwap", font=("Segoe UI", 16, "bold"), text_color=COLOR_MUTED).pack(anchor="center")
+        self.lbl_title = ctk.CTkLabel(frame, text="", font=("Segoe UI", 28, "bold"), text_color=title_color)
+        self.lbl_title.pack(pady=(0, 10), anchor="center")
+        message_size = 20 if overlay_type == OverlayPopup.TYPE_DIGEST else 36  # Digests hold one line per alert
+        self.lbl_message = ctk.CTkLabel(frame, text="", font=("Segoe UI", message_size, "bold"), text_color="#FFFFFF", wraplength=600, justify="center")
+        self.lbl_message.pack(pady=(0, 15), padx=40, anchor="center")
+
+        self.lbl_add = self.lbl_ignore = None
+        if overlay_type == OverlayPopup.TYPE_GAME_DETECTED:
+            self.lbl_add = ctk.CTkLabel(frame, text="", font=("Segoe UI", 16, "bold"), text_color=COLOR_SUCCESS)
+            self.lbl_add.pack(pady=(0, 2), anchor="center")
+            self.lbl_ignore = ctk.CTkLabel(frame, text="", font=("Segoe UI", 16, "bold"), text_color="#9E0000")
+            self.lbl_ignore.pack(pady=(0, 5), anchor="center")
+        elif overlay_type == OverlayPopup.TYPE_FRAME_DROP:
+            self.lbl_ignore = ctk.CTkLabel(frame, text="", font=("Segoe UI", 16, "bold"), text_color="#9E0000")
+            self.lbl_ignore.pack(pady=(0, 5), anchor="center")
+        elif overlay_type == OverlayPopup.TYPE_CAPTURE_FAILED:
+            ctk.CTkLabel(frame, text="Run as Administrator to fix", font=("Segoe UI", 16, "bold"), text_color=COLOR_MUTED).pack(pady=(0, 5), anchor="center")
+        elif overlay_type == OverlayPopup.TYPE_ASPECT_RATIO:
+            ctk.CTkLabel(frame, text="Black bars detected on stream", font=("Segoe UI", 16, "bold"), text_color=COLOR_MUTED).pack(pady=(0, 5), anchor="center")
+
+        self.lbl_dismiss = ctk.CTkLabel(frame, text="", font=("Segoe UI", 16, "bold"), text_color="#CDCF44")
+        self.lbl_dismiss.pack(pady=(0, 20), anchor="center")
+
+        self.window.update_idletasks()
+        self.flags_applied = False
+
+    def reveal(self):
+        self.window.deiconify()
+        if not self.flags_applied:
+            # Tk creates the outer (top-level) HWND on first map; the flags only work on that one
+            self.window.update()
+            self.flags_applied = self._apply_win32_flags()
+        self.window.lift()
+
+    def fill(self, title, message, hotkey, duration, ignore_key):
+        self.lbl_title.configure(text=title)
+        self.lbl_message.configure(text=message)
+        if self.lbl_add is not None:
+            self.lbl_add.configure(text=f"{hotkey.upper()} Add to whitelist")
+        if self.lbl_ignore is not None:
+            action = "Dismiss" if self.overlay_type == OverlayPopup.TYPE_GAME_DETECTED else "Disable alerts"
+            self.lbl_ignore.configure(text=f"{ignore_key} {action}")
+        self.lbl_dismiss.configure(text=f"Auto-dismiss in {duration // 1000}s")
+
+    def _apply_win32_flags(self):
+        """Returns True once the flags are set on the outer window."""
+        try:
+            hwnd = ctypes.windll.user32.GetParent(self.window.winfo_id())
+            if not hwnd: return False  # Not mapped yet
+
+            # 1. Existing Style Flags (Transparent, Click-through, No Taskbar)
+            style = GetWindowLong(hwnd, GWL_EXSTYLE)
+            new_style = style | WS_EX_LAYERED | WS_EX_TRANSPARENT | WS_EX_NOACTIVATE | WS_EX_TOOLWINDOW
+            SetWindowLong(hwnd, GWL_EXSTYLE, new_style)
+
+            # 2. Apply the Invisibility Cloak to the Popup
+            SetWindowDisplayAffinity(hwnd, WDA_EXCLUDEFROMCAPTURE)
+            return True
+        except Exception:
+            return False
+
+
 class OverlayPopup:
-    TYPE_GAME_DETECTED = "game_detected"
-    TYPE_FRAME_DROP = "frame_drop"
-    TYPE_CAPTURE_FAILED = "capture_failed"
-    TYPE_ASPECT_RATIO = "aspect_mismatch"
+    TYPE_GAME_DETECTED = ALERT_GAME_DETECTED
+    TYPE_FRAME_DROP = ALERT_FRAME_DROP
+    TYPE_CAPTURE_FAILED = ALERT_CAPTURE_FAILED
+    TYPE_ASPECT_RATIO = ALERT_ASPECT_RATIO
+    TYPE_DIGEST = ALERT_DIGEST
+    ALL_TYPES = (TYPE_GAME_DETECTED, TYPE_FRAME_DROP, TYPE_CAPTURE_FAILED, TYPE_ASPECT_RATIO, TYPE_DIGEST)
 
     def __init__(self, parent):
         self.parent = parent
-        self.popup = None
+        self.popup = None          # Toplevel currently on screen
         self.auto_dismiss_id = None
         self.overlay_type = None
         self.logo_image = None
-        self.popup_queue = []
-        self._load_logo()
+        self._logo_loaded = False
+        self.queue = AlertQueue()  # Waiting alerts, one per type with repeats merged in
+        self.current_alert = None
+        self._pump_id = None
+        self.windows = OverlayPool(self._build_window, parent.after)  # overlay type -> _OverlayWindow
         self.current_message = "" 
 
     def _load_logo(self):
+        self._logo_loaded = True
         try:
             if getattr(sys, 'frozen', False):
                 icon_path = os.path.join(sys._MEIPASS, "HotSwap.ico")
@@ -134,83 +222,82 @@ class OverlayPopup:
                 icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "HotSwap.ico")
 
             if os.path.exists(icon_path):
+                from PIL import Image
                 img = Image.open(icon_path)
-                img = img.resize((48, 48), Image.Resampling.LANCZOS)
+                # The .ico already has a 48x48 frame; pick it instead of resampling a bigger one
+                if (48, 48) in img.info.get("sizes", ()):
+                    img.size = (48, 48)
+                img.load()
                 self.logo_image = ctk.CTkImage(light_image=img, dark_image=img, size=(48, 48))
         except Exception as e:
-            print(f"Could not load logo: {e}")
+            log.warning("UI", "Could not load logo: %s", e)
             self.logo_image = None
 
+    def prebuild(self, types=None):
+        """Build the pooled windows one per event-loop turn, so startup isn't blocked."""
+        self.windows.prebuild(types or self.ALL_TYPES)
+
+    def _build_window(self, overlay_type):
+        if not self._logo_loaded: self._load_logo()
+        return _OverlayWindow(self.parent, overlay_type, self.logo_image)
+
     def clear_queue(self):
         """Clears all pending popups. Use when user has taken action."""
-        self.popup_queue.clear()
+        self.queue.clear()
 
-    def show(self, title, message, hotkey="F9", duration=10000, overlay_type=None, monitor_handle=None):
+    def show(self, title, message, hotkey="F9", duration=10000, overlay_type=None, monitor_handle=None,
+             value=None, template=None, requested_at=None):
+        """
+        Queue an alert. `value`/`template` let repeats merge into one message,
+        e.g. value=45 then 310 with template "Dropped {} frames!" shows
+        "Dropped 45 → 310 frames!".
+        """
+        if requested_at is None: requested_at = time.perf_counter()
         # THREAD SAFETY FIX:
         # If this is called from a background thread, force it to the main thread.
         if threading.current_thread() is not threading.main_thread():
-            self.parent.after(0, lambda: self.show(title, message, hotkey, duration, overlay_type, monitor_handle))
+            self.parent.after(0, lambda: self.show(title, message, hotkey, duration, overlay_type, monitor_handle,
+                                                   value, template, requested_at))
             return
 
-        # --- EXISTING LOGIC STARTS HERE ---
-        # Deduplication logic
-        if self.popup is not None and self.current_message == message:
+        alert = new_alert(title, message, overlay_type, hotkey, duration, monitor_handle, value, template, requested_at)
+
+        # Same type already on screen: update it in place
+        if self.popup is not None and self.overlay_type == overlay_type and self.current_alert:
+            if self.current_alert['message'] == message: return
+            merge_alert(self.current_alert, alert)
+            self._display(self.current_alert, refresh=True)
             return
 
-        for item in self.popup_queue:
-            if item['message'] == message:
-                return
+        # Same type already waiting: fold into it
+        if self.queue.add(alert): self._pump()
 
-        # Queue if busy
-        if self.popup is not None:
-            self.popup_queue.append({
-                'title': title, 'message': message, 'hotkey': hotkey,
-                'duration': duration, 'overlay_type': overlay_type,
-                'monitor_handle': monitor_handle
-            })
+    def _pump(self):
+        """Show the next eligible alert, or a digest when several are waiting."""
+        if self._pump_id:
+            try: self.parent.after_cancel(self._pump_id)
+            except Exception: pass
+            self._pump_id = None
+        if self.popup is not None or not self.queue: return
+        alert, wait = self.queue.take()
+        if alert is None:
+            if wait is not None:
+                self._pump_id = self.parent.after(max(50, int(wait * 1000)), self._pump)
             return
+        self._display(alert)
 
+    def _display(self, alert, refresh=False):
+        overlay_type = alert['overlay_type']
         self.overlay_type = overlay_type
-        self.current_message = message 
+        self.current_alert = alert
+        self.current_message = alert['message']
+        self.queue.shown(alert)
 
-        self.popup = ctk.CTkToplevel(self.parent)
-        self.popup.withdraw()
-        self.popup.overrideredirect(True)
-        self.popup.configure(fg_color="#000001")
-        self.popup.attributes("-transparentcolor", "#000001")
-
-        # --- SETUP COLORS ---
-        if overlay_type == self.TYPE_FRAME_DROP or overlay_type == self.TYPE_CAPTURE_FAILED:
-            title_color = COLOR_DANGER
-        elif overlay_type == self.TYPE_ASPECT_RATIO:
-            title_color = COLOR_WARNING
-        else:
-            title_color = COLOR_ACCENT
-
-        # --- DRAW UI ---
-        frame = ctk.CTkFrame(self.popup, fg_color="#1a1a1a", corner_radius=20)
-        frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        if self.logo_image:
-            ctk.CTkLabel(frame, image=self.logo_image, text="").pack(pady=(20, 5), anchor="center")
-
-        ctk.CTkLabel(frame, text="HotSwap", font=("Segoe UI", 16, "bold"), text_color=COLOR_MUTED).pack(anchor="center")
-        ctk.CTkLabel(frame, text=title, font=("Segoe UI", 28, "bold"), text_color=title_color).pack(pady=(0, 10), anchor="center")
-        ctk.CTkLabel(frame, text=message, font=("Segoe UI", 36, "bold"), text_color="#FFFFFF", wraplength=600, justify="center").pack(pady=(0, 15), padx=40, anchor="center")
-
-        ignore_key = getattr(self.parent, 'ignore_alerts_hotkey', 'i').upper()
-
-        if overlay_type == self.TYPE_GAME_DETECTED:
-            ctk.CTkLabel(frame, text=f"{hotkey.upper()} Add to whitelist", font=("Segoe UI", 16, "bold"), text_color=COLOR_SUCCESS).pack(pady=(0, 2), anchor="center")
-            ctk.CTkLabel(frame, text=f"{ignore_key} Dismiss", font=("Segoe UI", 16, "bold"), text_color="#9E0000").pack(pady=(0, 5), anchor="center")
-        elif overlay_type == self.TYPE_FRAME_DROP:
-            ctk.CTkLabel(frame, text=f"{ignore_key} Disable alerts", font=("Segoe UI", 16, "bold"), text_color="#9E0000").pack(pady=(0, 5), anchor="center")
-        elif overlay_type == self.TYPE_CAPTURE_FAILED:
-            ctk.CTkLabel(frame, text="Run as Administrator to fix", font=("Segoe UI", 16, "bold"), text_color=COLOR_MUTED).pack(pady=(0, 5), anchor="center")
-        elif overlay_type == self.TYPE_ASPECT_RATIO:
-            ctk.CTkLabel(frame, text="Black bars detected on stream", font=("Segoe UI", 16, "bold"), text_color=COLOR_MUTED).pack(pady=(0, 5), anchor="center")
-
-        ctk.CTkLabel(frame, text=f"Auto-dismiss in {duration // 1000}s", font=("Segoe UI", 16, "bold"), text_color="#CDCF44").pack(pady=(0, 20), anchor="center")
+        title = alert['title'] if alert['count'] == 1 or alert.get('template') else f"{alert['title']} (x{alert['count']})"
+        ignore_key = self.parent.engine.ignore_alerts_hotkey.upper()
+        window = self.windows.get(overlay_type)
+        window.fill(title, alert['message'], alert['hotkey'], alert['duration'], ignore_key)
+        self.popup = window.window
 
         # --- CALCULATE POSITION ---
         self.popup.update_idletasks()
@@ -219,6 +306,7 @@ class OverlayPopup:
 
         x, y = 0, 0
         positioned = False
+        monitor_handle = alert['monitor_handle']
 
         if monitor_handle:
             try:
@@ -231,7 +319,7 @@ class OverlayPopup:
                 y = work_area[3] - popup_height - 30
                 positioned = True
             except Exception as e:
-                print(f"Monitor positioning failed: {e}")
+                log.warning("UI", "Monitor positioning failed: %s", e)
         
         if not positioned:
             # Fallback to Primary Monitor
@@ -241,17 +329,28 @@ class OverlayPopup:
             y = screen_height - popup_height - 80
 
         self.popup.geometry(f"+{x}+{y}")
-        self.popup.attributes("-topmost", True)
-        self.popup.attributes("-alpha", 0.95)
-        self.popup.deiconify()
-        self.popup.update()
-
-        self._apply_win32_flags()
-
+        if not refresh:
+            window.reveal()
+            requested_at = alert['requested_at']
+            self.popup.after_idle(lambda: self._record_visible(overlay_type, requested_at))
+
+        # (Re)start the auto-dismiss countdown
+        if self.auto_dismiss_id:
+            try: self.popup.after_cancel(self.auto_dismiss_id)
+            except Exception: pass
         if overlay_type == self.TYPE_GAME_DETECTED:
-            self.auto_dismiss_id = self.popup.after(duration, self.parent.hide_suggestion)
+            self.auto_dismiss_id = self.popup.after(alert['duration'], self.parent.engine.hide_suggestion)
         else:
-            self.auto_dismiss_id = self.popup.after(duration, self.hide)
+            self.auto_dismiss_id = self.popup.after(alert['duration'], self.hide)
+
+    def _record_visible(self, overlay_type, requested_at):
+        ms = (time.perf_counter() - requested_at) * 1000
+        self.windows.record_visible(overlay_type, ms)
+        log.debug("Overlay", "%s visible in %.1f ms", overlay_type or 'popup', ms)
+
+    def show_stats(self):
+        """Time-to-visible per overlay type: {type: (last_ms, worst_ms)}."""
+        return self.windows.show_stats()
 
     def is_frame_drop_alert(self):
         return self.overlay_type == self.TYPE_FRAME_DROP and self.popup is not None
@@ -259,23 +358,6 @@ class OverlayPopup:
     def is_game_detected_alert(self):
         return self.overlay_type == self.TYPE_GAME_DETECTED and self.popup is not None
 
-    def _apply_win32_flags(self):
-        try:
-            hwnd = ctypes.windll.user32.GetParent(self.popup.winfo_id())
-            if not hwnd: hwnd = self.popup.winfo_id()
-            
-            # 1. Existing Style Flags (Transparent, Click-through, No Taskbar)
-            style = GetWindowLong(hwnd, GWL_EXSTYLE)
-            new_style = style | WS_EX_LAYERED | WS_EX_TRANSPARENT | WS_EX_NOACTIVATE | WS_EX_TOOLWINDOW
-            SetWindowLong(hwnd, GWL_EXSTYLE, new_style)
-
-            # 2. NEW: Apply the Invisibility Cloak to the Popup
-            # WDA_EXCLUDEFROMCAPTURE = 0x00000011
-            SetWindowDisplayAffinity(hwnd, 0x00000011)
-            
-        except Exception:
-            pass
-
     def hide(self):
         if self.auto_dismiss_id and self.popup:
             try:
@@ -286,25 +368,15 @@ class OverlayPopup:
 
         if self.popup:
             try:
-                self.popup.destroy()
+                self.popup.withdraw()  # Kept for the next popup of this type
             except Exception:
                 pass
             self.popup = None
+            self.current_alert = None
             self.current_message = "" 
 
-        if self.popup_queue:
-            next_popup = self.popup_queue.pop(0)
-            self.parent.after(100, lambda: self._show_queued(next_popup))
-
-    def _show_queued(self, popup_data):
-        self.show(
-            title=popup_data['title'],
-            message=popup_data['message'],
-            hotkey=popup_data['hotkey'],
-            duration=popup_data['duration'],
-            overlay_type=popup_data['overlay_type'],
-            monitor_handle=popup_data.get('monitor_handle') # Pass this
-        )
+        if self.queue:
+            self._pump_id = self.parent.after(100, self._pump)
 
 
 class ConfirmDialog(ctk.CTkToplevel):
@@ -389,8 +461,10 @@ class Tooltip:
             self.tooltip_window = None
 
 
-class HotSwap(ctk.CTk):
-    def __init__(self):
+class HotSwap(ctk.CTk, EngineView):
+    """The HotSwap window: a view attached to a HotSwapEngine, which does the actual work."""
+
+    def __init__(self, startup_benchmark=False):
         super().__init__()
         self.title(f"{APP_NAME} v{APP_VERSION}")
         self.geometry("550x750")
@@ -404,69 +478,87 @@ class HotSwap(ctk.CTk):
         if os.path.exists(self.icon_path):
             self.iconbitmap(self.icon_path)
 
-        self.obs_client = None
-        self.is_tracking = False
-        self.last_injected_exe = ""
-        self.current_monitor_handle = None
-        self.session_alerts = {}
-        self.last_obs_target = ""
+        self.engine = HotSwapEngine(view=self)
         self.monitors = []
         self.monitor_var = ctk.StringVar(value="")
-        self.suggested_app = None
-        self.suggested_title = None
-        self.suggested_class = None
-        self.recording_folder = os.path.normpath(os.path.join(os.path.expanduser("~"), "Videos"))
-        self.current_bitrate = 6000
-        self.temp_ignore_list = []
-        self.locked_app = None
         self.overlay = OverlayPopup(self)
-        self.self_exe = "HotSwap.exe" if getattr(sys, 'frozen', False) else "python.exe"
-        self.last_render_skipped = 0
-
-        self.demo_mode = False # Demo mode flag for testing
-
-        self.detection_keys = ['w', 'a', 's', 'd']
-        self.whitelist = []
-        self.blacklist = ["explorer.exe", "python.exe", "SearchHost.exe", "Taskmgr.exe", "ApplicationFrameHost.exe", "chrome.exe", "discord.exe"]
-        self.anticheat_games = ["valorant.exe", "vgc.exe", "faceitclient.exe", "faceit.exe", "easyanticheat.exe", "battleye.exe", "beclient.exe", "r5apex.exe", "fortnite.exe", "fortniteclient-win64-shipping.exe"]
-        self.anticheat_suggested = False
-        self.detection_hotkey = "f9"
-        self.toggle_tracking_hotkey = "f10"
-        self.ignore_alerts_hotkey = "i"
-        self.detection_threshold = 2.0
-        self.frame_drop_threshold = 30
-        self.game_detection_enabled = True
-        self.total_swaps = 0
-        self.frame_drop_alerts_enabled = True
-        self.disclaimer_accepted = False
-        self.current_scene_collection = None
-        self.scene_collection_sources = {}
-        self.audio_feedback_enabled = True
-        self.popup_notifications_enabled = True
-        self.audio_volume = 0.5
-        self.sound_detected_path = ""
-        self.sound_switched_path = ""
-        self.default_sound_detected = resource_path("sounds/detected.wav")
-        self.default_sound_switched = resource_path("sounds/switched.wav")
+
+        self.startup_benchmark = startup_benchmark
+        self.ui_ready = threading.Event()  # Set once the widgets the engine reports to exist
+        self._built_tabs = {"Dashboard"}   # Rules/Settings are built the first time they are shown
+        self._first_frame_done = False
+        self._create_setting_vars()
+
+        # Only the config is read before connecting; the OBS handshake runs while the window is built
+        config = self.engine.read_config()
+        self.engine.load_settings(config)
+        if self.engine.password:
+            self.engine.connect()
 
         self.setup_ui()
-        self.load_settings()
-        
-        threading.Thread(target=self.install_obs_script, kwargs={'silent': True}, daemon=True).start()
+        self._apply_window_settings(config)
+        self._sync_setting_vars()
+        self.ui_ready.set()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.bind("<Map>", self._on_map, add="+")
         self.after(500, self._hide_from_capture)
-        
-        if self.game_detection_enabled:
-            threading.Thread(target=self.heuristic_loop, daemon=True).start()
+        self.after(1500, self.overlay.prebuild)  # Popups are built once, after the main window is up
 
-        self._register_hotkeys()
-        
-        if self.entry_pass.get():
-            threading.Thread(target=self.auto_connect_logic, daemon=True).start()
-        else:
-            self.tabs.set("Settings")
+        if not self.engine.password:
+            self._show_tab("Settings")
             self.after(1000, self.show_onboarding)
 
+    def _on_map(self, event):
+        if event.widget is not self or self._first_frame_done: return
+        self._first_frame_done = True
+        self.after_idle(self._after_first_frame)
+
+    def _after_first_frame(self):
+        """Start everything the first frame doesn't need."""
+        STARTUP.mark("first_frame")
+        self.engine.start()
+        if self.startup_benchmark and not self.engine.password:
+            self._finish_startup_benchmark()
+
+    def _finish_startup_benchmark(self):
+        STARTUP.report()
+        self.engine.tasks.shutdown()
+        self.destroy()
+
+    def _ui(self, fn, *args):
+        """Run fn on the Tk thread once the widgets exist; engine callbacks arrive on any thread."""
+        if threading.current_thread() is threading.main_thread():
+            if self.ui_ready.is_set(): fn(*args)
+            else: self.after(0, fn, *args)  # Runs once mainloop starts, after __init__ built the widgets
+        else:
+            self.ui_ready.wait()
+            self.after(0, fn, *args)
+
+    def _create_setting_vars(self):
+        """Widgets bind to Tk variables; _sync_setting_vars copies the engine's settings into them."""
+        self.video_source_var = ctk.StringVar()
+        self.audio_source_var = ctk.StringVar()
+        self.auto_rec_var = ctk.BooleanVar()
+        self.auto_fit_var = ctk.BooleanVar()
+        self.game_detection_var = ctk.BooleanVar()
+        self.frame_drop_var = ctk.BooleanVar()
+        self.audio_feedback_var = ctk.BooleanVar()
+        self.popup_var = ctk.BooleanVar()
+        self.audio_volume_var = ctk.DoubleVar()
+
+    def _sync_setting_vars(self):
+        engine = self.engine
+        self.video_source_var.set(engine.video_source)
+        self.audio_source_var.set(engine.audio_source)
+        self.auto_rec_var.set(engine.auto_record)
+        self.auto_fit_var.set(engine.auto_fit)
+        self.game_detection_var.set(engine.game_detection_enabled)
+        self.frame_drop_var.set(engine.frame_drop_alerts_enabled)
+        self.audio_feedback_var.set(engine.audio_feedback_enabled)
+        self.popup_var.set(engine.popup_notifications_enabled)
+        self.audio_volume_var.set(engine.audio_volume)
+        self.btn_add_quick.configure(text=f"Add ({engine.detection_hotkey.upper()})")
+
     def show_onboarding(self):
         guide = ctk.CTkToplevel(self)
         guide.title("Welcome to HotSwap")
@@ -503,60 +595,6 @@ class HotSwap(ctk.CTk):
         y = (window.winfo_screenheight() // 2) - (height // 2)
         window.geometry(f"+{x}+{y}")
 
-    def _register_hotkeys(self):
-        try:
-            keyboard.add_hotkey(self.detection_hotkey, self.quick_add_suggestion)
-        except Exception: pass
-        try:
-            keyboard.add_hotkey(self.toggle_tracking_hotkey, self.toggle_tracking_hotkey_pressed)
-        except Exception: pass
-        try:
-            keyboard.add_hotkey(self.ignore_alerts_hotkey, self._ignore_frame_drop_alerts)
-        except Exception: pass
-        try:
-            keyboard.add_hotkey("shift+l+d", self.toggle_demo_mode) #demo mode toggle
-        except Exception: pass
-        
-    def toggle_demo_mode(self):
-        """Secret toggle for recording demo videos."""
-        self.demo_mode = not self.demo_mode
-        
-        if self.demo_mode:
-            self.title(f"{APP_NAME} v{APP_VERSION} [DEMO MODE]")
-            self._show_for_capture()
-            winsound.MessageBeep(winsound.MB_ICONASTERISK)
-            print("!!! DEMO MODE ENABLED - OBS UPDATES DISABLED, VISIBLE TO CAPTURE !!!")
-        else:
-            self.title(f"{APP_NAME} v{APP_VERSION}")
-            self._hide_from_capture()
-            winsound.MessageBeep(winsound.MB_OK)
-            print("!!! DEMO MODE DISABLED - LIVE !!!")
-
-    def _unregister_hotkeys(self):
-        try: keyboard.remove_hotkey(self.quick_add_suggestion)
-        except Exception: pass
-        try: keyboard.remove_hotkey(self.toggle_tracking_hotkey_pressed)
-        except Exception: pass
-        try: keyboard.remove_hotkey(self._ignore_frame_drop_alerts)
-        except Exception: pass
-
-    def _ignore_frame_drop_alerts(self):
-        if self.overlay.is_frame_drop_alert():
-            self.frame_drop_alerts_enabled = False
-            self.frame_drop_var.set(False)
-            self.overlay.hide()
-            self.save_settings()
-        elif self.overlay.is_game_detected_alert():
-            self.ignore_suggestion_once()
-
-    def toggle_tracking_hotkey_pressed(self):
-        if self.switch_track.get() == 1:
-            self.switch_track.deselect()
-        else:
-            self.switch_track.select()
-        self.toggle_tracking()
-
-
     def setup_ui(self):
         # [Paste content of setup_ui]
         self.status_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -564,6 +602,7 @@ class HotSwap(ctk.CTk):
         header_row = ctk.CTkFrame(self.status_frame, fg_color="transparent")
         header_row.pack(fill="x")
         try:
+            from PIL import Image
             logo_path = resource_path("hotswaplogoapp.png")
             logo_img = Image.open(logo_path)
             self.header_logo = ctk.CTkImage(light_image=logo_img, dark_image=logo_img, size=(143, 38))
@@ -580,16 +619,30 @@ class HotSwap(ctk.CTk):
         self.pin_tooltip = Tooltip(self.btn_pin, "Unpin window")
         self.lbl_alert = ctk.CTkLabel(self.status_frame, text="SYSTEM NORMAL", font=FONT_HEADING, text_color=COLOR_MUTED)
         self.lbl_alert.pack(pady=SPACE_SM)
-        self.tabs = ctk.CTkTabview(self)
+        self.tabs = ctk.CTkTabview(self, command=lambda: self._ensure_tab(self.tabs.get()))
         self.tabs.pack(fill="both", expand=True, padx=SPACE_MD, pady=SPACE_SM)
         self.tab_dash = self.tabs.add("Dashboard")
         self.tab_rules = self.tabs.add("Rules")
         self.tab_settings = self.tabs.add("Settings")
         self._setup_dashboard_tab()
-        self._setup_rules_tab()
         self._setup_settings_tab()
         self._setup_tooltips()
 
+    def _show_tab(self, name):
+        self._ensure_tab(name)
+        self.tabs.set(name)
+
+    def _ensure_tab(self, name):
+        """Build a tab's contents the first time it is shown."""
+        if name in self._built_tabs: return
+        self._built_tabs.add(name)
+        if name == "Rules":
+            self._setup_rules_tab()
+            self._rebuild_list_display("whitelist")
+            self._rebuild_list_display("blacklist")
+        elif name == "Settings":
+            self._setup_rest_of_settings()
+
     def _setup_tooltips(self):
         Tooltip(self.btn_add_quick, "Add this game to your whitelist and start tracking it immediately.")
 
@@ -600,26 +653,39 @@ class HotSwap(ctk.CTk):
         self.lbl_suggestion.pack(pady=SPACE_XS)
         btn_box = ctk.CTkFrame(self.suggestion_frame, fg_color="transparent")
         btn_box.pack(pady=SPACE_MD)
-        self.btn_add_quick = ctk.CTkButton(btn_box, text=f"Add ({self.detection_hotkey.upper()})", width=90, fg_color=COLOR_SUCCESS, hover_color="#16A34A", command=self.quick_add_suggestion)
+        self.btn_add_quick = ctk.CTkButton(btn_box, text=f"Add ({self.engine.detection_hotkey.upper()})", width=90, fg_color=COLOR_SUCCESS, hover_color="#16A34A", command=self.engine.quick_add_suggestion)
         self.btn_add_quick.pack(side="left", padx=SPACE_XS)
-        self.btn_ignore_once = ctk.CTkButton(btn_box, text="Ignore Once", width=90, fg_color=COLOR_MUTED, hover_color="#4B5563", command=self.ignore_suggestion_once)
+        self.btn_ignore_once = ctk.CTkButton(btn_box, text="Ignore Once", width=90, fg_color=COLOR_MUTED, hover_color="#4B5563", command=self.engine.ignore_suggestion_once)
         self.btn_ignore_once.pack(side="left", padx=SPACE_XS)
-        self.btn_ignore_always = ctk.CTkButton(btn_box, text="Ignore Always", width=100, fg_color=COLOR_DANGER, hover_color=COLOR_DANGER_DARK, command=self.ignore_suggestion_always)
+        self.btn_ignore_always = ctk.CTkButton(btn_box, text="Ignore Always", width=100, fg_color=COLOR_DANGER, hover_color=COLOR_DANGER_DARK, command=self.engine.ignore_suggestion_always)
         self.btn_ignore_always.pack(side="left", padx=SPACE_XS)
         self.ctrl_frame = ctk.CTkFrame(self.tab_dash, fg_color=COLOR_SURFACE, corner_radius=8)
         self.ctrl_frame.pack(pady=SPACE_MD, padx=SPACE_MD, fill="x")
         self.lbl_ctrl_header = ctk.CTkLabel(self.ctrl_frame, text="Currently Tracking", font=FONT_CAPTION, text_color="#FFFFFF")
         self.lbl_ctrl_header.pack(pady=(SPACE_MD, SPACE_XS))
-        self.lbl_current_app = ctk.CTkLabel(self.ctrl_frame, text="Waiting...", font=FONT_HEADING, text_color=COLOR_PRIMARY)
+        text, tone = self.engine.app_status
+        self.lbl_current_app = ctk.CTkLabel(self.ctrl_frame, text=text, font=FONT_HEADING, text_color=TONE_COLORS[tone])
         self.lbl_current_app.pack(pady=SPACE_XS)
         self.track_row = ctk.CTkFrame(self.ctrl_frame, fg_color="transparent")
         self.track_row.pack(pady=SPACE_MD)
-        self.switch_track = ctk.CTkSwitch(self.track_row, text="", width=60, switch_width=52, switch_height=28, command=self.toggle_tracking, state="disabled")
+        self.switch_track = ctk.CTkSwitch(self.track_row, text="", width=60, switch_width=52, switch_height=28, command=self._on_switch_toggled, state="disabled")
         self.switch_track.pack(side="left")
         self.lbl_track_status = ctk.CTkLabel(self.track_row, text="Connect to OBS first", font=("Segoe UI", 18, "bold"), text_color=COLOR_MUTED)
         self.lbl_track_status.pack(side="left", padx=(SPACE_SM, 0))
-        self.lbl_swap_counter = ctk.CTkLabel(self.ctrl_frame, text="Total HotSwaps: 0", font=("Segoe UI", 14), text_color="#06B6D4")
-        self.lbl_swap_counter.pack(pady=(SPACE_XS, SPACE_MD))
+        self.lbl_swap_counter = ctk.CTkLabel(self.ctrl_frame, text=f"Total HotSwaps: {self.engine.total_swaps}", font=("Segoe UI", 14), text_color="#06B6D4")
+        self.lbl_swap_counter.pack(pady=(SPACE_XS, 0))
+        self.lbl_hook_time = ctk.CTkLabel(self.ctrl_frame, text="", font=FONT_SMALL, text_color=COLOR_MUTED)
+        self.lbl_hook_time.pack()
+        self.lbl_latency = ctk.CTkLabel(self.ctrl_frame, text="", font=FONT_SMALL, text_color=COLOR_MUTED, wraplength=460, justify="center")
+        self.lbl_latency.pack(pady=(0, SPACE_MD))
+        self.perf_frame = ctk.CTkFrame(self.tab_dash, fg_color=COLOR_SURFACE, corner_radius=8)
+        self.perf_frame.pack(pady=SPACE_SM, padx=SPACE_MD, fill="x")
+        self.lbl_perf = ctk.CTkLabel(self.perf_frame, text="Performance: Connect to OBS first", font=FONT_CAPTION, text_color=COLOR_MUTED)
+        self.lbl_perf.pack(pady=(SPACE_MD, SPACE_XS))
+        self.lbl_perf_drops = ctk.CTkLabel(self.perf_frame, text="", font=FONT_SMALL, text_color=COLOR_MUTED)
+        self.lbl_perf_drops.pack()
+        self.lbl_perf_tasks = ctk.CTkLabel(self.perf_frame, text="", font=FONT_SMALL, text_color=COLOR_MUTED)
+        self.lbl_perf_tasks.pack(pady=(0, SPACE_MD))
         self.storage_frame = ctk.CTkFrame(self.tab_dash, fg_color=COLOR_SURFACE, corner_radius=8)
         self.storage_frame.pack(pady=SPACE_SM, padx=SPACE_MD, fill="x")
         self.lbl_path = ctk.CTkLabel(self.storage_frame, text="Recording path: Connect to OBS first", font=FONT_CAPTION, text_color=COLOR_MUTED)
@@ -649,15 +715,30 @@ class HotSwap(ctk.CTk):
         btn_row.pack(pady=SPACE_SM)
         ctk.CTkButton(btn_row, text="Add Selected", width=120, font=FONT_BODY, command=lambda: self.add_from_combo(list_type, combo)).pack(side="left", padx=SPACE_SM)
         ctk.CTkButton(btn_row, text="Clear All", width=120, font=FONT_BODY, fg_color=COLOR_DANGER, hover_color=COLOR_DANGER_DARK, command=lambda: self.clear_list(list_type)).pack(side="left", padx=SPACE_SM)
-        scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
-        scroll.pack(pady=SPACE_SM, padx=SPACE_SM, fill="both", expand=True)
+        view = VirtualList(parent, make_row=lambda p: self._make_rule_row(p, list_type), count_text="Total: {} apps",
+                           empty_text="List empty", searchable=True, font=FONT_CAPTION, text_color=COLOR_MUTED)
+        view.pack(pady=SPACE_SM, padx=SPACE_SM, fill="both", expand=True)
         if list_type == "whitelist":
-            self.white_scroll = scroll
+            self.white_view = view
             self.white_combo = combo
         else:
-            self.black_scroll = scroll
+            self.black_view = view
             self.black_combo = combo
 
+    def _make_rule_row(self, parent, list_type):
+        """One pooled whitelist/blacklist row; VirtualList rebinds it as the list scrolls."""
+        row = ctk.CTkFrame(parent, fg_color=COLOR_SURFACE, corner_radius=6)
+        bound = [None]
+        lbl_btn = ctk.CTkButton(row, text="", font=FONT_BODY, fg_color="transparent", hover_color=COLOR_MUTED, anchor="w", command=lambda: log.debug("UI", "Selected: %s", bound[0]))
+        lbl_btn.pack(side="left", fill="x", expand=True)
+        remove_btn = ctk.CTkButton(row, text="X", width=32, fg_color=COLOR_DANGER, hover_color=COLOR_DANGER_DARK, command=lambda: self.engine.remove_from_list(list_type, bound[0]))
+        remove_btn.pack(side="right", padx=SPACE_XS)
+
+        def bind(app):
+            bound[0] = app
+            lbl_btn.configure(text=app)
+        return row, bind
+
     def _setup_settings_tab(self):
         self.scroll_settings = ctk.CTkScrollableFrame(self.tab_settings, fg_color="transparent")
         self.scroll_settings.pack(fill="both", expand=True)
@@ -672,15 +753,17 @@ class HotSwap(ctk.CTk):
         self.entry_pass = ctk.CTkEntry(self.conn_grp, placeholder_text="WebSocket Password", show="*", font=FONT_BODY, height=36)
         self.entry_pass.pack(pady=SPACE_SM, padx=SPACE_LG, fill="x")
         ctk.CTkLabel(self.conn_grp, text="Pass: OBS > Tools > WebSocket Settings", font=("Segoe UI", 12), text_color=COLOR_MUTED).pack(pady=(0, SPACE_SM))
-        self.btn_connect = ctk.CTkButton(self.conn_grp, text="Connect", font=FONT_BODY, height=36, command=lambda: threading.Thread(target=self.auto_connect_logic, daemon=True).start())
+        self.btn_connect = ctk.CTkButton(self.conn_grp, text="Connect", font=FONT_BODY, height=36, command=lambda: self.engine.connect(self.entry_pass.get()))
         self.btn_connect.pack(pady=SPACE_SM)
-        self.lbl_conn_status = ctk.CTkLabel(self.conn_grp, text="Disconnected, you MUST connect to OBS WebSocket for this to work.", font=FONT_SMALL, text_color=COLOR_DANGER, wraplength=400)
+        if self.engine.password: self.entry_pass.insert(0, self.engine.password)
+        text, tone = self.engine.connection_status
+        self.lbl_conn_status = ctk.CTkLabel(self.conn_grp, text=text, font=FONT_SMALL, text_color=TONE_COLORS[tone], wraplength=400)
         self.lbl_conn_status.pack(pady=(SPACE_XS, SPACE_MD))
-
-        self._setup_rest_of_settings()
+        # The remaining groups are built by _ensure_tab("Settings")
 
     def _setup_rest_of_settings(self):
         # (Copied logic from original _setup_settings_tab for remaining sections)
+        # Built on first view, from the state load_settings already applied
         self.obs_grp = ctk.CTkFrame(self.scroll_settings, fg_color=COLOR_SURFACE, corner_radius=8)
         self.obs_grp.pack(pady=SPACE_SM, padx=SPACE_SM, fill="x")
         self.lbl_obs_header = ctk.CTkLabel(self.obs_grp, text="Auto-Launch Setup", font=FONT_HEADING)
@@ -700,18 +783,16 @@ class HotSwap(ctk.CTk):
         vid_row.pack(pady=SPACE_SM, fill="x", padx=SPACE_LG)
         self.lbl_video_source = ctk.CTkLabel(vid_row, text="Video Source:", font=FONT_BODY, width=100, anchor="w")
         self.lbl_video_source.pack(side="left")
-        self.video_source_var = ctk.StringVar(value="Select Video Source...")
-        self.video_source_menu = ctk.CTkOptionMenu(vid_row, variable=self.video_source_var, values=["Scan first..."], font=FONT_BODY, command=self._on_source_changed)
+        self.video_source_menu = ctk.CTkOptionMenu(vid_row, variable=self.video_source_var, values=self.engine.source_choices[0], font=FONT_BODY, command=self._on_source_changed)
         self.video_source_menu.pack(side="left", fill="x", expand=True)
-        self.btn_vid_refresh = ctk.CTkButton(vid_row, text="Refresh", width=70, font=FONT_BODY, command=self.refresh_sources)
+        self.btn_vid_refresh = ctk.CTkButton(vid_row, text="Refresh", width=70, font=FONT_BODY, command=lambda: self.engine.tasks.submit(self.engine.refresh_sources))
         self.btn_vid_refresh.pack(side="right", padx=(SPACE_SM, 0))
 
         aud_row = ctk.CTkFrame(self.src_grp, fg_color="transparent")
         aud_row.pack(pady=SPACE_SM, fill="x", padx=SPACE_LG)
         self.lbl_audio_source = ctk.CTkLabel(aud_row, text="Audio Source:", font=FONT_BODY, width=100, anchor="w")
         self.lbl_audio_source.pack(side="left")
-        self.audio_source_var = ctk.StringVar(value="Select Audio Source...")
-        self.audio_source_menu = ctk.CTkOptionMenu(aud_row, variable=self.audio_source_var, values=["Connect first..."], font=FONT_BODY, command=self._on_source_changed)
+        self.audio_source_menu = ctk.CTkOptionMenu(aud_row, variable=self.audio_source_var, values=self.engine.source_choices[1], font=FONT_BODY, command=self._on_source_changed)
         self.audio_source_menu.pack(side="left", fill="x", expand=True, padx=(SPACE_SM, 0))
         ctk.CTkLabel(self.src_grp, text="HotSwap controls these sources automatically.\nAvoid changing the Window setting in OBS Properties.", font=("Segoe UI", 12), text_color=COLOR_WARNING, wraplength=400, justify="left").pack(pady=(SPACE_SM, SPACE_XS), padx=SPACE_LG, anchor="w")
         ctk.CTkLabel(self.src_grp, text="").pack(pady=SPACE_XS)
@@ -720,34 +801,27 @@ class HotSwap(ctk.CTk):
         self.auto_grp.pack(pady=SPACE_SM, padx=SPACE_SM, fill="x")
         self.lbl_auto_header = ctk.CTkLabel(self.auto_grp, text="Automation Preferences", font=FONT_HEADING)
         self.lbl_auto_header.pack(pady=SPACE_MD)
-        self.auto_rec_var = ctk.BooleanVar(value=False)
-        self.chk_auto_rec = ctk.CTkCheckBox(self.auto_grp, text="Auto-start recording\nwhen game detected", font=FONT_BODY, variable=self.auto_rec_var)
+        self.chk_auto_rec = ctk.CTkCheckBox(self.auto_grp, text="Auto-start recording\nwhen game detected", font=FONT_BODY, variable=self.auto_rec_var, command=lambda: self.engine.set_option("auto_record", self.auto_rec_var.get()))
         self.chk_auto_rec.pack(pady=SPACE_SM, padx=SPACE_LG, anchor="w")
-        self.auto_fit_var = ctk.BooleanVar(value=False)
-        self.chk_auto_fit = ctk.CTkCheckBox(self.auto_grp, text="Auto-fit source to canvas", font=FONT_BODY, variable=self.auto_fit_var)
+        self.chk_auto_fit = ctk.CTkCheckBox(self.auto_grp, text="Auto-fit source to canvas", font=FONT_BODY, variable=self.auto_fit_var, command=lambda: self.engine.set_option("auto_fit", self.auto_fit_var.get()))
         self.chk_auto_fit.pack(pady=SPACE_SM, padx=SPACE_LG, anchor="w")
-        self.game_detection_var = ctk.BooleanVar(value=True)
         self.chk_game_detect = ctk.CTkCheckBox(self.auto_grp, text="Auto-detect games\n(uncheck for Anti-Cheat Safe Mode)", font=FONT_BODY, variable=self.game_detection_var, command=self._toggle_game_detection)
         self.chk_game_detect.pack(pady=SPACE_SM, padx=SPACE_LG, anchor="w")
-        self.frame_drop_var = ctk.BooleanVar(value=True)
         self.chk_frame_drop = ctk.CTkCheckBox(self.auto_grp, text="Show frame drop alerts\n(press I to disable during game)", font=FONT_BODY, variable=self.frame_drop_var, command=self._toggle_frame_drop_alerts)
         self.chk_frame_drop.pack(pady=SPACE_SM, padx=SPACE_LG, anchor="w")
-        self.audio_feedback_var = ctk.BooleanVar(value=True)
         self.chk_audio_feedback = ctk.CTkCheckBox(self.auto_grp, text="Enable audio feedback", font=FONT_BODY, variable=self.audio_feedback_var, command=self._toggle_audio_feedback)
         self.chk_audio_feedback.pack(pady=SPACE_SM, padx=SPACE_LG, anchor="w")
-        self.popup_var = ctk.BooleanVar(value=True)
         self.chk_popup = ctk.CTkCheckBox(self.auto_grp, text="Show popup notifications", font=FONT_BODY, variable=self.popup_var, command=self._toggle_popup_notifications)
         self.chk_popup.pack(pady=SPACE_SM, padx=SPACE_LG, anchor="w")
 
         volume_row = ctk.CTkFrame(self.auto_grp, fg_color="transparent")
         volume_row.pack(pady=SPACE_XS, fill="x", padx=SPACE_LG)
         ctk.CTkLabel(volume_row, text="Volume:", font=FONT_BODY, width=70, anchor="w").pack(side="left")
-        self.audio_volume_var = ctk.DoubleVar(value=self.audio_volume)
         self.volume_slider = ctk.CTkSlider(volume_row, from_=0.0, to=1.0, variable=self.audio_volume_var, command=self._on_volume_change, width=180)
         self.volume_slider.pack(side="left", padx=SPACE_SM)
-        self.lbl_volume_pct = ctk.CTkLabel(volume_row, text=f"{int(self.audio_volume * 100)}%", font=FONT_BODY, width=45)
+        self.lbl_volume_pct = ctk.CTkLabel(volume_row, text=f"{int(self.engine.audio_volume * 100)}%", font=FONT_BODY, width=45)
         self.lbl_volume_pct.pack(side="left")
-        self.btn_volume_test = ctk.CTkButton(volume_row, text="Test", width=50, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=lambda: self._play_sound("detected"))
+        self.btn_volume_test = ctk.CTkButton(volume_row, text="Test", width=50, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=lambda: self.engine.play_sound("detected"))
         self.btn_volume_test.pack(side="right", padx=SPACE_XS)
 
         # Sounds
@@ -755,7 +829,8 @@ class HotSwap(ctk.CTk):
         sound_detected_row.pack(pady=SPACE_XS, fill="x", padx=SPACE_LG)
         self.lbl_sound_detected = ctk.CTkLabel(sound_detected_row, text="Detected Sound:", font=FONT_BODY, width=120, anchor="w")
         self.lbl_sound_detected.pack(side="left")
-        self.lbl_sound_detected_file = ctk.CTkLabel(sound_detected_row, text="Default", font=FONT_CAPTION, text_color=COLOR_MUTED, width=120)
+        path = self.engine.sound_detected_path
+        self.lbl_sound_detected_file = ctk.CTkLabel(sound_detected_row, text=os.path.basename(path) if path else "Default", font=FONT_CAPTION, text_color=COLOR_SUCCESS if path else COLOR_MUTED, width=120)
         self.lbl_sound_detected_file.pack(side="left", padx=SPACE_XS)
         self.btn_sound_detected_browse = ctk.CTkButton(sound_detected_row, text="Browse", width=70, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=lambda: self._browse_sound("detected"))
         self.btn_sound_detected_browse.pack(side="right", padx=SPACE_XS)
@@ -766,7 +841,8 @@ class HotSwap(ctk.CTk):
         sound_switched_row.pack(pady=SPACE_XS, fill="x", padx=SPACE_LG)
         self.lbl_sound_switched = ctk.CTkLabel(sound_switched_row, text="Switched Sound:", font=FONT_BODY, width=120, anchor="w")
         self.lbl_sound_switched.pack(side="left")
-        self.lbl_sound_switched_file = ctk.CTkLabel(sound_switched_row, text="Default", font=FONT_CAPTION, text_color=COLOR_MUTED, width=120)
+        path = self.engine.sound_switched_path
+        self.lbl_sound_switched_file = ctk.CTkLabel(sound_switched_row, text=os.path.basename(path) if path else "Default", font=FONT_CAPTION, text_color=COLOR_SUCCESS if path else COLOR_MUTED, width=120)
         self.lbl_sound_switched_file.pack(side="left", padx=SPACE_XS)
         self.btn_sound_switched_browse = ctk.CTkButton(sound_switched_row, text="Browse", width=70, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=lambda: self._browse_sound("switched"))
         self.btn_sound_switched_browse.pack(side="right", padx=SPACE_XS)
@@ -777,25 +853,25 @@ class HotSwap(ctk.CTk):
         hk_row.pack(pady=SPACE_SM, fill="x", padx=SPACE_LG)
         self.lbl_quickadd_hotkey = ctk.CTkLabel(hk_row, text="Quick-Add Hotkey:", font=FONT_BODY)
         self.lbl_quickadd_hotkey.pack(side="left")
-        self.btn_record_hotkey = ctk.CTkButton(hk_row, text=f"{self.detection_hotkey.upper()}", width=80, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=self.start_hotkey_recording)
+        self.btn_record_hotkey = ctk.CTkButton(hk_row, text=f"{self.engine.detection_hotkey.upper()}", width=80, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=self.start_hotkey_recording)
         self.btn_record_hotkey.pack(side="right")
 
         toggle_hk_row = ctk.CTkFrame(self.auto_grp, fg_color="transparent")
         toggle_hk_row.pack(pady=SPACE_SM, fill="x", padx=SPACE_LG)
         self.lbl_toggle_hotkey = ctk.CTkLabel(toggle_hk_row, text="Toggle Tracking Hotkey:", font=FONT_BODY)
         self.lbl_toggle_hotkey.pack(side="left")
-        self.btn_record_toggle_hotkey = ctk.CTkButton(toggle_hk_row, text=f"{self.toggle_tracking_hotkey.upper()}", width=80, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=self.start_toggle_hotkey_recording)
+        self.btn_record_toggle_hotkey = ctk.CTkButton(toggle_hk_row, text=f"{self.engine.toggle_tracking_hotkey.upper()}", width=80, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=self.start_toggle_hotkey_recording)
         self.btn_record_toggle_hotkey.pack(side="right")
         
         ignore_hk_row = ctk.CTkFrame(self.auto_grp, fg_color="transparent")
         ignore_hk_row.pack(pady=SPACE_SM, fill="x", padx=SPACE_LG)
         self.lbl_ignore_hotkey = ctk.CTkLabel(ignore_hk_row, text="Ignore Alerts Hotkey:", font=FONT_BODY)
         self.lbl_ignore_hotkey.pack(side="left")
-        self.btn_record_ignore_hotkey = ctk.CTkButton(ignore_hk_row, text=f"{self.ignore_alerts_hotkey.upper()}", width=80, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=self.start_ignore_hotkey_recording)
+        self.btn_record_ignore_hotkey = ctk.CTkButton(ignore_hk_row, text=f"{self.engine.ignore_alerts_hotkey.upper()}", width=80, font=FONT_BODY, fg_color=COLOR_MUTED, hover_color="#4B5563", command=self.start_ignore_hotkey_recording)
         self.btn_record_ignore_hotkey.pack(side="right")
 
-        self._create_slider_row(self.auto_grp, "Detection delay:", "lbl_time_val", "slider_time", 0.5, 5.0, 9, self.detection_threshold, self.update_timer_label, suffix="s")
-        self._create_slider_row(self.auto_grp, "Frame drop alert threshold:", "lbl_drop_val", "slider_drop", 5, 100, 19, self.frame_drop_threshold, self.update_drop_label, suffix="")
+        self._create_slider_row(self.auto_grp, "Detection delay:", "lbl_time_val", "slider_time", 0.5, 5.0, 9, self.engine.detection_threshold, self.update_timer_label, suffix="s")
+        self._create_slider_row(self.auto_grp, "Frame drop alert threshold:", "lbl_drop_val", "slider_drop", 5, 100, 19, self.engine.frame_drop_threshold, self.update_drop_label, suffix="")
         ctk.CTkLabel(self.auto_grp, text="").pack(pady=SPACE_XS)
 
         # --- NEW KEY GROUP UI ---
@@ -813,8 +889,9 @@ class HotSwap(ctk.CTk):
         self.btn_add_key.pack(pady=SPACE_SM)
 
         # The List Area (Similar to Rules Tab)
-        self.keys_scroll = ctk.CTkScrollableFrame(self.key_grp, height=160, fg_color="transparent")
-        self.keys_scroll.pack(pady=SPACE_SM, padx=SPACE_MD, fill="x")
+        self.keys_view = VirtualList(self.key_grp, make_row=self._make_key_row, empty_text="No keys added",
+                                     font=FONT_CAPTION, text_color=COLOR_MUTED, height=160)
+        self.keys_view.pack(pady=SPACE_SM, padx=SPACE_MD, fill="x")
         
         # Initial populate
         self.update_key_display()
@@ -837,58 +914,32 @@ class HotSwap(ctk.CTk):
         setattr(self, slider_name, slider)
 
     def start_hotkey_recording(self):
-        self.btn_record_hotkey.configure(text="Press key...", fg_color=COLOR_WARNING)
-        threading.Thread(target=self._wait_for_hotkey, daemon=True).start()
-    def _wait_for_hotkey(self):
-        try:
-            event = keyboard.read_event(suppress=False)
-            if event.event_type == keyboard.KEY_DOWN:
-                new_key = event.name
-                self._unregister_hotkeys()
-                self.detection_hotkey = new_key
-                self._register_hotkeys()
-                self.btn_record_hotkey.configure(text=new_key.upper(), fg_color=COLOR_MUTED)
-                self.btn_add_quick.configure(text=f"Add ({new_key.upper()})")
-                self.save_settings()
-        except Exception: pass
+        self._record_hotkey("hotkey", self.btn_record_hotkey)
     def start_toggle_hotkey_recording(self):
-        self.btn_record_toggle_hotkey.configure(text="Press key...", fg_color=COLOR_WARNING)
-        threading.Thread(target=self._wait_for_toggle_hotkey, daemon=True).start()
-    def _wait_for_toggle_hotkey(self):
-        try:
-            event = keyboard.read_event(suppress=False)
-            if event.event_type == keyboard.KEY_DOWN:
-                new_key = event.name
-                self._unregister_hotkeys()
-                self.toggle_tracking_hotkey = new_key
-                self._register_hotkeys()
-                self.btn_record_toggle_hotkey.configure(text=new_key.upper(), fg_color=COLOR_MUTED)
-                self.save_settings()
-        except Exception: pass
+        self._record_hotkey("toggle_hotkey", self.btn_record_toggle_hotkey)
     def start_ignore_hotkey_recording(self):
-        self.btn_record_ignore_hotkey.configure(text="Press key...", fg_color=COLOR_WARNING)
-        threading.Thread(target=self._wait_for_ignore_hotkey, daemon=True).start()
-    def _wait_for_ignore_hotkey(self):
+        self._record_hotkey("ignore_hotkey", self.btn_record_ignore_hotkey)
+    def _record_hotkey(self, name, button):
+        button.configure(text="Press key...", fg_color=COLOR_WARNING)
+        threading.Thread(target=self._wait_for_hotkey, args=(name, button), daemon=True).start()
+    def _wait_for_hotkey(self, name, button):
         try:
+            import keyboard
             event = keyboard.read_event(suppress=False)
             if event.event_type == keyboard.KEY_DOWN:
                 new_key = event.name
-                self._unregister_hotkeys()
-                self.ignore_alerts_hotkey = new_key
-                self._register_hotkeys()
-                self.btn_record_ignore_hotkey.configure(text=new_key.upper(), fg_color=COLOR_MUTED)
-                self.save_settings()
+                self.engine.set_hotkey(name, new_key)
+                self.after(0, lambda: button.configure(text=new_key.upper(), fg_color=COLOR_MUTED))
+                if name == "hotkey":
+                    self.after(0, lambda: self.btn_add_quick.configure(text=f"Add ({new_key.upper()})"))
         except Exception: pass
         
     def _toggle_game_detection(self):
         wants_enabled = self.game_detection_var.get()
-        if wants_enabled and not self.disclaimer_accepted:
+        if wants_enabled and not self.engine.disclaimer_accepted:
             self._show_anticheat_notice()
-            self.disclaimer_accepted = True
-        self.game_detection_enabled = wants_enabled
-        self.save_settings()
-        if self.game_detection_enabled:
-            threading.Thread(target=self.heuristic_loop, daemon=True).start()
+            self.engine.disclaimer_accepted = True
+        self.engine.set_option("game_detection_enabled", wants_enabled)
     def _show_anticheat_notice(self):
         notice = ctk.CTkToplevel(self)
         notice.title("Anti-Cheat Info")
@@ -909,65 +960,29 @@ class HotSwap(ctk.CTk):
         ctk.CTkButton(btn_frame, text="Enable Safe Mode", width=140, fg_color=COLOR_MUTED, hover_color="#4B5563", command=lambda: self._enable_safe_mode(notice)).pack(side="left", padx=10)
     def _enable_safe_mode(self, notice_window):
         self.game_detection_var.set(False)
-        self.game_detection_enabled = False
-        self.save_settings()
+        self.engine.set_option("game_detection_enabled", False)
         notice_window.destroy()
     def _toggle_frame_drop_alerts(self):
-        self.frame_drop_alerts_enabled = self.frame_drop_var.get()
-        self.save_settings()
+        self.engine.set_option("frame_drop_alerts_enabled", self.frame_drop_var.get())
     def _toggle_audio_feedback(self):
-        self.audio_feedback_enabled = self.audio_feedback_var.get()
-        self.save_settings()
-        if self.audio_feedback_enabled: self._play_sound("switched")
+        self.engine.set_option("audio_feedback_enabled", self.audio_feedback_var.get())
+        self.engine.play_sound("switched")
     def _toggle_popup_notifications(self):
-        self.popup_notifications_enabled = self.popup_var.get()
-        self.save_settings()
+        self.engine.set_option("popup_notifications_enabled", self.popup_var.get())
     def _on_volume_change(self, value):
-        self.audio_volume = float(value)
-        self.lbl_volume_pct.configure(text=f"{int(self.audio_volume * 100)}%")
-        self.save_settings()
+        self.engine.set_option("audio_volume", float(value))
+        self.lbl_volume_pct.configure(text=f"{int(self.engine.audio_volume * 100)}%")
     def _browse_sound(self, sound_type):
         filepath = filedialog.askopenfilename(title=f"Select {sound_type.capitalize()} Sound", filetypes=[("WAV files", "*.wav"), ("All files", "*.*")])
         if filepath:
-            if sound_type == "detected":
-                self.sound_detected_path = filepath
-                self.lbl_sound_detected_file.configure(text=os.path.basename(filepath), text_color=COLOR_SUCCESS)
-            else:
-                self.sound_switched_path = filepath
-                self.lbl_sound_switched_file.configure(text=os.path.basename(filepath), text_color=COLOR_SUCCESS)
-            self.save_settings()
-            self._play_sound(sound_type)
+            label = self.lbl_sound_detected_file if sound_type == "detected" else self.lbl_sound_switched_file
+            label.configure(text=os.path.basename(filepath), text_color=COLOR_SUCCESS)
+            self.engine.set_option(f"sound_{sound_type}_path", filepath)
+            self.engine.play_sound(sound_type)
     def _reset_sound(self, sound_type):
-        if sound_type == "detected":
-            self.sound_detected_path = ""
-            self.lbl_sound_detected_file.configure(text="Default", text_color=COLOR_MUTED)
-        else:
-            self.sound_switched_path = ""
-            self.lbl_sound_switched_file.configure(text="Default", text_color=COLOR_MUTED)
-        self.save_settings()
-    def _play_sound(self, sound_type):
-        if not self.audio_feedback_enabled: return
-        def _play():
-            try:
-                path = self.sound_detected_path if sound_type == "detected" else self.sound_switched_path
-                if not path:
-                    path = self.default_sound_detected if sound_type == "detected" else self.default_sound_switched
-                
-                if os.path.exists(path):
-                    with wave.open(path, 'rb') as wav:
-                        params = wav.getparams()
-                        frames = wav.readframes(params.nframes)
-                    volume = max(0.0, min(1.0, self.audio_volume))
-                    adjusted_frames = audioop.mul(frames, params.sampwidth, volume)
-                    buffer = io.BytesIO()
-                    with wave.open(buffer, 'wb') as out_wav:
-                        out_wav.setparams(params)
-                        out_wav.writeframes(adjusted_frames)
-                    winsound.PlaySound(buffer.getvalue(), winsound.SND_MEMORY)
-                else:
-                    winsound.MessageBeep(winsound.MB_OK if sound_type == "switched" else winsound.MB_ICONEXCLAMATION)
-            except Exception: pass
-        threading.Thread(target=_play, daemon=True).start()
+        label = self.lbl_sound_detected_file if sound_type == "detected" else self.lbl_sound_switched_file
+        label.configure(text="Default", text_color=COLOR_MUTED)
+        self.engine.set_option(f"sound_{sound_type}_path", "")
     
     def start_key_combo_recording(self):
         self.btn_add_key.configure(text="Press combo...", fg_color=COLOR_WARNING)
@@ -977,285 +992,224 @@ class HotSwap(ctk.CTk):
         try:
             # read_hotkey captures the full string like "shift+w" or "ctrl+alt+p"
             # It blocks until a combo is completed (keys released)
-            key_combo = keyboard.read_hotkey(suppress=False)
-            
-            # Sanity check to prevent empty or accidental captures
-            if key_combo and key_combo not in self.detection_keys:
-                self.detection_keys.append(key_combo)
-                self.save_settings()
+            import keyboard
+            self.engine.add_detection_key(keyboard.read_hotkey(suppress=False))
         except Exception as e:
-            print(f"Key recording failed: {e}")
+            log.warning("Keys", "Key recording failed: %s", e)
         finally:
-            # Reset button and refresh list on main thread
+            # Reset button on main thread; the engine reports the list change
             self.after(0, lambda: self.btn_add_key.configure(text="Record New Combo", fg_color=COLOR_PRIMARY))
-            self.after(0, self.update_key_display)
-
-    def remove_detection_key_item(self, key_combo):
-        if key_combo in self.detection_keys:
-            self.detection_keys.remove(key_combo)
-            self.save_settings()
-            self.update_key_display()
 
     def update_key_display(self):
-        # Clear existing list
-        for widget in self.keys_scroll.winfo_children():
-            widget.destroy()
-
-        if not self.detection_keys:
-            ctk.CTkLabel(self.keys_scroll, text="No keys added", font=FONT_CAPTION, text_color=COLOR_MUTED).pack(pady=SPACE_MD)
-            return
-
-        # Rebuild list rows
-        for key in self.detection_keys:
-            row = ctk.CTkFrame(self.keys_scroll, fg_color=COLOR_SURFACE, corner_radius=6)
-            row.pack(pady=SPACE_XS, padx=SPACE_SM, fill="x")
-
-            # Key Label (e.g. "shift+w")
-            lbl = ctk.CTkLabel(row, text=key.upper(), font=FONT_BODY, anchor="w")
-            lbl.pack(side="left", padx=SPACE_MD, fill="x", expand=True)
-
-            # X Button
-            btn_del = ctk.CTkButton(
-                row, 
-                text="X", 
-                width=32, 
-                fg_color=COLOR_DANGER, 
-                hover_color=COLOR_DANGER_DARK, 
-                command=lambda k=key: self.remove_detection_key_item(k)
-            )
-            btn_del.pack(side="right", padx=SPACE_XS, pady=SPACE_XS)
+        if "Settings" not in self._built_tabs: return  # Filled when the tab is built
+        self.keys_view.set_items(self.engine.detection_keys)
+
+    def _make_key_row(self, parent):
+        row = ctk.CTkFrame(parent, fg_color=COLOR_SURFACE, corner_radius=6)
+        bound = [None]
+        # Key Label (e.g. "shift+w")
+        lbl = ctk.CTkLabel(row, text="", font=FONT_BODY, anchor="w")
+        lbl.pack(side="left", padx=SPACE_MD, fill="x", expand=True)
+        btn_del = ctk.CTkButton(row, text="X", width=32, fg_color=COLOR_DANGER, hover_color=COLOR_DANGER_DARK, command=lambda: self.engine.remove_detection_key(bound[0]))
+        btn_del.pack(side="right", padx=SPACE_XS, pady=SPACE_XS)
+
+        def bind(key):
+            bound[0] = key
+            lbl.configure(text=key.upper())
+        return row, bind
 
     def update_timer_label(self, val):
         self.lbl_time_val.configure(text=f"{val:.1f}s")
-        self.detection_threshold = val
+        self.engine.set_option("detection_threshold", val)
     def update_drop_label(self, val):
         val = int(val)
         self.lbl_drop_val.configure(text=f"{val}")
-        self.frame_drop_threshold = val
+        self.engine.set_option("frame_drop_threshold", val)
         
-    def install_obs_script(self, silent=False):
-        # [Paste install_obs_script logic]
+    def install_obs_script(self):
         try:
-            if getattr(sys, 'frozen', False): exe_path = sys.executable
-            else: exe_path = os.path.abspath(__file__)
-            exe_path_escaped = exe_path.replace("\\", "\\\\")
-            lua_script = f'''obs = obslua
-local app_path = "{exe_path_escaped}"
-function script_description() return "Launches HotSwap automatically when OBS starts.\\n\\nPath: " .. app_path end
-function on_event(event) if event == obs.OBS_FRONTEND_EVENT_FINISHED_LOADING then obs.script_log(obs.LOG_INFO, "HotSwap: Launching...") os.execute('start "" "' .. app_path .. '"') end end
-function script_load(settings) obs.obs_frontend_add_event_callback(on_event) end
-'''
-            appdata = os.environ.get('APPDATA', '')
-            obs_base = os.path.join(appdata, 'obs-studio', 'basic', 'scripts')
-            if not os.path.exists(obs_base): os.makedirs(obs_base, exist_ok=True)
-            script_path = os.path.join(obs_base, 'HotSwap_Launcher.lua')
-            with open(script_path, 'w') as f: f.write(lua_script)
-            if not silent:
-                self.clipboard_clear()
-                self.clipboard_append(script_path)
-                self.update()
-                self.lbl_install_status.configure(text="Path copied! Just press Ctrl+V in OBS.", text_color=COLOR_SUCCESS)
-                self.after(5000, lambda: self.lbl_install_status.configure(text="Tip: The file path is in your clipboard."))
+            script_path = self.engine.install_obs_script()
+            self.clipboard_clear()
+            self.clipboard_append(script_path)
+            self.update()
+            self.lbl_install_status.configure(text="Path copied! Just press Ctrl+V in OBS.", text_color=COLOR_SUCCESS)
+            self.after(5000, lambda: self.lbl_install_status.configure(text="Tip: The file path is in your clipboard."))
         except Exception as e:
-            if not silent: self._show_install_error(f"Install failed: {str(e)[:50]}")
+            self._show_install_error(f"Install failed: {str(e)[:50]}")
     def _show_install_error(self, message):
         self.lbl_install_status.configure(text=f"{message}\nSee README for manual install instructions.", text_color=COLOR_DANGER)
 
     # =========================================================================
-    # SUGGESTION LOGIC (UPDATED)
+    # ENGINE VIEW (engine threads -> Tk thread)
     # =========================================================================
-    def show_suggestion(self, exe_name, monitor_handle=None):
-        if not self.suggestion_frame.winfo_ismapped():
-            self.lbl_suggestion.configure(text=exe_name)
-            self.suggestion_frame.pack(before=self.ctrl_frame, pady=SPACE_MD, padx=SPACE_MD, fill="x")
-            self.tabs.set("Dashboard")
-            self._play_sound("detected")
-            if self.popup_notifications_enabled:
-                self.overlay.show(
-                    title="Game Detected",
-                    message=exe_name,
-                    hotkey=self.detection_hotkey,
-                    duration=10000,
-                    overlay_type=OverlayPopup.TYPE_GAME_DETECTED,
-                    monitor_handle=monitor_handle  
-                )
-
-    def hide_suggestion(self):
-        self.suggestion_frame.pack_forget()
-        self.suggested_app = None
-        self.suggested_title = None
-        self.suggested_class = None
-        self.overlay.hide()
-
-    def ignore_suggestion_once(self):
-        if self.suggested_app:
-            self.temp_ignore_list.append(self.suggested_app)
-            self.hide_suggestion()
-
-    def ignore_suggestion_always(self):
-        if self.suggested_app:
-            self.blacklist.append(self.suggested_app)
-            self.update_display("blacklist")
-            self.save_settings()
-            self.hide_suggestion()
-
-    def quick_add_suggestion(self):
-        """UI PART: Sets the lock IMMEDIATELY to stop the loop from fighting."""
-        current_exe, current_title, current_cls, monitor = self.get_window_info()
-        if monitor:
-            self.current_monitor_handle = monitor
-        if not self.is_tracking:
-            return
-        if not self.obs_client:
-            self.lbl_current_app.configure(text="Connect to OBS first", text_color=COLOR_WARNING)
-            return
-        vid = self.video_source_var.get()
-        if not vid or "Select" in vid:
-            self.lbl_current_app.configure(text="Set Video Source in Settings", text_color=COLOR_WARNING)
-            return
-        self.overlay.clear_queue()
+    def on_connected(self):
+        STARTUP.mark("connected")
+        if self.startup_benchmark:
+            self.after(0, self._finish_startup_benchmark)
+            return False
 
-        app_to_add = self.suggested_app
+    def on_connection(self, text, tone):
+        self._ui(lambda: self.lbl_conn_status.configure(text=text, text_color=TONE_COLORS[tone]))
 
-        # If no suggestion is pending, grab the current active window
-        if not app_to_add:
-            exe, _, _, _ = self.get_window_info()
-            if exe and exe not in self.blacklist and exe != self.self_exe and exe != "HotSwap.exe":
-                app_to_add = exe
+    def on_tracking(self, tracking, connected):
+        self._ui(self._show_tracking, tracking, connected)
 
-        if not app_to_add: return
+    def _show_tracking(self, tracking, connected):
+        if tracking: self.switch_track.select()
+        else: self.switch_track.deselect()
+        self.switch_track.configure(state="normal" if connected else "disabled")
+        if tracking:
+            self.lbl_track_status.configure(text="Tracking is ON", text_color=COLOR_SUCCESS)
+        elif connected:
+            self.lbl_track_status.configure(text="Tracking is OFF", text_color=COLOR_DANGER)
+        else:
+            self.lbl_track_status.configure(text="Connect to OBS first", text_color=COLOR_MUTED)
 
-        # Don't add blacklisted apps
-        if app_to_add in self.blacklist:
-            self.hide_suggestion()
-            return
-            
-        # --- FIX: CHECK IF ALREADY TRACKING ---
-        # If we are already locked onto this exe, pressing F9 again should do nothing.
-        if app_to_add == self.last_injected_exe:
-            return
-        # --------------------------------------
+    def _on_switch_toggled(self):
+        self.engine.set_tracking(self.switch_track.get() == 1)
 
-        # Debounce rapid F9 spam (within 2 seconds)
-        if time.time() - getattr(self, 'last_f9_time', 0) < 2:
-            return
-        self.last_f9_time = time.time()
+    def on_app_status(self, text, tone):
+        self._ui(lambda: self.lbl_current_app.configure(text=text, text_color=TONE_COLORS[tone]))
 
-        # 1. Update Whitelist
-        if app_to_add not in self.whitelist:
-            self.whitelist.append(app_to_add)
-            self.update_display("whitelist")
-            self.save_settings()
+    def on_alert_status(self, text, tone, banner=False):
+        def show():
+            self.lbl_alert.configure(text=text, text_color=TONE_COLORS[tone])
+            self.status_frame.configure(fg_color=COLOR_DANGER_DARK if banner else "transparent")
+        self._ui(show)
 
-        saved_title = self.suggested_title
-        saved_class = self.suggested_class
-        
-        self.hide_suggestion()
-        
-        # --- EARLY LOCK ---
-        self.last_injected_exe = app_to_add 
-        self.locked_app = None
-        
-        # 2. Run OBS update in background thread
-        threading.Thread(target=self._quick_add_worker, args=(app_to_add, saved_title, saved_class), daemon=True).start()
+    def on_swaps(self, total):
+        self._ui(lambda: self.lbl_swap_counter.configure(text=f"Total HotSwaps: {total}"))
 
-    def _quick_add_worker(self, app_to_add, saved_title, saved_class):
-        """WORKER PART: Updates OBS."""
-        current_exe, current_title, current_cls, _ = self.get_window_info()
+    def on_hook_time(self, text):
+        self._ui(lambda: self.lbl_hook_time.configure(text=text))
+
+    def on_latency(self, game, overall):
+        self._ui(lambda: self.lbl_latency.configure(text="\n".join(line for line in (game, overall) if line)))
+
+    def on_health(self, health, tasks):
+        self._ui(self._show_health, health, tasks)
+
+    def _show_health(self, health, tasks):
+        if health is None:
+            self.lbl_perf.configure(text="Performance: Connect to OBS first", text_color=COLOR_MUTED)
+            self.lbl_perf_drops.configure(text="")
+            return
+        self.lbl_perf.configure(
+            text=f"{health.fps:.0f} FPS  |  Render p95 {health.render_p95:.1f} ms  |  CPU {health.cpu:.0f}%  |  RAM {health.memory:.0f} MB",
+            text_color=COLOR_WARNING if health.render_budget and health.render_p95 > health.render_budget else "#FFFFFF",
+        )
+        self.lbl_perf_drops.configure(text=f"Dropped last 5s: {health.dropped}  |  Last minute: {health.drop_rate * 100:.1f}%")
+        self.lbl_perf_tasks.configure(text=f"Background tasks: {tasks['queued']} queued, {tasks['running']} running  |  Wait p95 {tasks['wait_p95_ms']:.0f} ms")
+
+    def on_disk(self, folder, free_fraction, text, tone):
+        def show():
+            self.lbl_path.configure(text=f"Recording to: {folder}")
+            if free_fraction is not None:
+                self.storage_bar.set(free_fraction)
+                self.storage_bar.configure(progress_color=COLOR_DANGER if tone == TONE_DANGER else COLOR_WARNING if tone == TONE_WARNING else COLOR_SUCCESS)
+            self.lbl_storage.configure(text=text, text_color=TONE_COLORS[tone])
+        self._ui(show)
+
+    def on_sources(self, video_choices, audio_choices):
+        def show():
+            if "Settings" in self._built_tabs:
+                self.video_source_menu.configure(values=video_choices)
+                self.audio_source_menu.configure(values=audio_choices)
+            self.video_source_var.set(self.engine.video_source)
+            self.audio_source_var.set(self.engine.audio_source)
+        self._ui(show)
 
-        target_title = current_title if (current_exe == app_to_add) else saved_title
-        target_class = current_cls if (current_exe == app_to_add) else saved_class
+    def _on_source_changed(self, _=None):
+        self.engine.select_sources(self.video_source_var.get(), self.audio_source_var.get())
 
-        if not target_title or not target_class:
-            time.sleep(0.5)
-            current_exe, current_title, current_cls, _ = self.get_window_info()
-            if current_exe == app_to_add:
-                target_title = current_title
-                target_class = current_cls
+    def on_suggestion(self, exe):
+        self._ui(self._show_suggestion, exe)
 
-        if target_title and target_class:
-            print(f"Quick Add worker switching to: {app_to_add}")
+    def _show_suggestion(self, exe):
+        if exe is None:
+            self.suggestion_frame.pack_forget()
+            self.overlay.hide()
+            return
+        self.lbl_suggestion.configure(text=exe)
+        self.suggestion_frame.pack(before=self.ctrl_frame, pady=SPACE_MD, padx=SPACE_MD, fill="x")
+        self.tabs.set("Dashboard")
+
+    def on_alert(self, alert):
+        self._ui(lambda: self.overlay.show(
+            title=alert.title,
+            message=alert.message,
+            hotkey=alert.hotkey,
+            duration=alert.duration,
+            overlay_type=alert.kind,
+            monitor_handle=alert.monitor,
+            value=alert.value,
+            template=alert.template,
+        ))
+
+    def on_alerts_cleared(self, kind=None):
+        def clear():
+            if kind is None:
+                self.overlay.clear_queue()
+                return
+            self.overlay.queue.discard(kind)
+            if self.overlay.overlay_type == kind: self.overlay.hide()
+        self._ui(clear)
+
+    def visible_alert(self):
+        if self.overlay.is_frame_drop_alert(): return ALERT_FRAME_DROP
+        if self.overlay.is_game_detected_alert(): return ALERT_GAME_DETECTED
+        return None
+
+    def on_lists(self, list_type):
+        if list_type == "detection_keys": self._ui(self.update_key_display)
+        else: self._ui(self._rebuild_list_display, list_type)
+
+    def on_settings(self):
+        self._ui(self._sync_setting_vars)
+
+    def on_demo_mode(self, enabled):
+        def show():
+            if enabled:
+                self.title(f"{APP_NAME} v{APP_VERSION} [DEMO MODE]")
+                self._show_for_capture()
+            else:
+                self.title(f"{APP_NAME} v{APP_VERSION}")
+                self._hide_from_capture()
+        self._ui(show)
 
+    def settings_extras(self):
+        return self._window_settings
 
-            self.update_obs(app_to_add, target_title, target_class, is_new_switch=True)
+    def _apply_window_settings(self, data):
+        if "window_geometry" in data:
+            try: self.geometry(data["window_geometry"])
+            except Exception: pass
+        if data.get("is_pinned") is False:
+            self.attributes("-topmost", False)
+            self.btn_pin.configure(text_color=COLOR_MUTED, fg_color="transparent")
+            self.pin_tooltip.text = "Pin window on top"
+        self._remember_window_settings()
+        self.bind("<Configure>", self._on_configure, add="+")
 
-            self.lbl_current_app.configure(text=f"{app_to_add} (Tracking)", text_color=COLOR_PRIMARY)
+    def _on_configure(self, event):
+        if event.widget is self: self._remember_window_settings()
 
-            self.last_switch_time = time.time()
+    def _remember_window_settings(self):
+        # Cached on the Tk thread; the engine saves from its own threads
+        self._window_settings = {"window_geometry": self.geometry(), "is_pinned": bool(self.attributes("-topmost"))}
 
-            self._play_sound("switched")
-        else:
-            print(f"Quick Add worker: Could not get window info for {app_to_add}")
-            
+    # =========================================================================
+    # WINDOW
+    # =========================================================================
     def _notify_user(self):
         try:
+            import winsound
             winsound.MessageBeep(winsound.MB_ICONASTERISK)
             hwnd = ctypes.windll.user32.GetParent(self.winfo_id())
             if not hwnd: hwnd = self.winfo_id()
             flash_window(hwnd)
         except Exception: pass
 
-    # =========================================================================
-    # HEURISTIC LOOP (Game Detection)
-    # =========================================================================
-    def heuristic_loop(self):
-        """Background loop that detects game activity based on key presses."""
-        activity_timer = 0
-
-        while self.game_detection_enabled:
-            threshold = self.detection_threshold
-            is_active = False
-
-            for key in self.detection_keys:
-                try:
-                    if keyboard.is_pressed(key):
-                        is_active = True
-                        break
-                except Exception:
-                    pass
-
-            if is_active:
-                activity_timer += 0.1
-                if activity_timer > threshold:
-                    # Capture the monitor handle (change '_' to 'monitor')
-                    exe, title, cls, monitor = self.get_window_info()
-
-                    if not exe or exe == self.self_exe or exe == "HotSwap.exe":
-                        time.sleep(0.1)
-                        continue
-                    
-                    is_whitelisted = exe in self.whitelist
-                    
-                    # ... (keep existing locked/injected logic) ...
-                    was_locked = (exe == self.locked_app)
-                    was_injected = (exe == self.last_injected_exe)
-
-                    if (was_locked or was_injected) and not is_whitelisted:
-                        self.locked_app = None
-                        self.last_injected_exe = ""
-
-                    is_blacklisted = exe in self.blacklist
-                    is_temp_ignored = exe in self.temp_ignore_list
-
-                    if not is_whitelisted and not is_blacklisted and not is_temp_ignored:
-                        self.suggested_app = exe
-                        self.suggested_title = title
-                        self.suggested_class = cls
-                        
-                        current_text = self.lbl_suggestion.cget("text")
-                        is_visible = self.suggestion_frame.winfo_ismapped()
-                        
-                        if current_text != exe or not is_visible:
-                            # Pass the monitor here!
-                            self.show_suggestion(exe, monitor_handle=monitor)
-                    else:
-                        if self.suggestion_frame.winfo_ismapped():
-                            self.hide_suggestion()
-            else:
-                activity_timer = 0
-
-            time.sleep(0.1)
-
     def debug_frame_drop_test(self):
         self.overlay.show(
             title="Performance Warning",
@@ -1265,695 +1219,63 @@ function script_load(settings) obs.obs_frontend_add_event_callback(on_event) end
             overlay_type=OverlayPopup.TYPE_FRAME_DROP
         )
 
-    def auto_connect_logic(self):
-        max_retries = 3
-        password = self.entry_pass.get()
-        if not password:
-            self.lbl_conn_status.configure(text="Enter password first", text_color=COLOR_WARNING)
-            return
-
-        hosts_to_try = ['127.0.0.1', 'localhost', '::1'] 
-        target_port = 4455 
-        
-        for attempt in range(max_retries):
-            for host in hosts_to_try:
-                self.lbl_conn_status.configure(text=f"Try {host}:{target_port}...", text_color=COLOR_WARNING)
-                
-                sock_status = self._diagnose_socket(host, target_port)
-                
-                if sock_status == "OK":
-                    # Port is OPEN! Now try to log in.
-                    try:
-                        self.obs_client = obs.ReqClient(host=host, port=target_port, password=password)
-                        self.obs_events = obs.EventClient(host=host, port=target_port, password=password, callback=self.on_obs_event)
-                        self._on_connect_success()
-                        return
-                    except Exception as e:
-                        error_msg = str(e).lower()
-                        print(f"DEBUG: Connect failed on open port: {error_msg}") # Helpful for debugging
-                        
-                        # If we found the port but failed to connect, we STOP here. 
-                        # We don't continue looking for other hosts.
-                        if "authentication" in error_msg or "password" in error_msg or "4006" in error_msg:
-                            self.lbl_conn_status.configure(text="Error: Incorrect WebSocket Password", text_color=COLOR_DANGER)
-                        else:
-                            # If it's some other error on an open port, it's usually a handshake failure (often caused by password too)
-                            self.lbl_conn_status.configure(text=f"Handshake Failed. Check Password?", text_color=COLOR_DANGER)
-                        return 
-                
-                # If sock_status is FAIL (Timeout/Refused), we move to the next host
-                continue
-
-            time.sleep(1)
-
-        # --- FINAL ERROR MESSAGE ---
-        self.lbl_conn_status.configure(
-            text=f"Connection Failed: is OBS open? Is the port correct? could not reach port: {target_port}.", 
-            text_color=COLOR_DANGER
-        )
-    
-    def _diagnose_socket(self, host, port):
-        """
-        Returns 'OK' if we can connect.
-        Returns 'FAIL' for ANY failure (Refused, Timeout, Unsupported Protocol).
-        """
-        try:
-            # timeout=1.0 is enough to know if it's open locally
-            with socket.create_connection((host, port), timeout=1.0):
-                return "OK"
-        except (socket.timeout, ConnectionRefusedError, OSError):
-            return "FAIL"
-    
-    def on_obs_event(self, event):
-        try:
-            if event.name == "CurrentSceneCollectionChanged":
-                self.after(2000, self.refresh_sources)
-            elif event.name in ("SceneItemEnableStateChanged", "InputSettingsChanged", "CurrentProgramSceneChanged"):
-                self.last_injected_exe = ""
-                self.last_obs_target = ""
-        except Exception: pass
-        
-    def _on_connect_success(self):
-        self.lbl_conn_status.configure(text="Connected", text_color=COLOR_SUCCESS)
-        self.switch_track.configure(state="normal")
-        self.lbl_track_status.configure(text="Tracking is OFF", text_color=COLOR_DANGER)
-        self.refresh_sources()
-        for _ in range(3):
-            if self._get_obs_config(): break
-            time.sleep(1)
-        self.check_disk_space()
-        self.save_settings()
-        try:
-            stats = self.obs_client.get_stats()
-            self.last_render_skipped = stats.render_skipped_frames
-        except Exception: pass
-        if getattr(self, '_pending_auto_tracking', False):
-            self._pending_auto_tracking = False
-            self.switch_track.select()
-            self.is_tracking = True
-            self.lbl_track_status.configure(text="Tracking is ON", text_color=COLOR_SUCCESS)
-            self.lbl_current_app.configure(text="Scanning...", text_color=COLOR_PRIMARY)
-            threading.Thread(target=self.tracking_loop, daemon=True).start()
-
-    def _on_obs_disconnect(self):
-        """Handle OBS disconnecting (closed, crashed, etc.)."""
-        if self.obs_client is None:
-            return  # Already disconnected, don't re-trigger
-        self.obs_client = None
-        self.is_tracking = False
-        self.switch_track.deselect()
-        self.switch_track.configure(state="disabled")
-        self.lbl_track_status.configure(text="Connect to OBS first", text_color=COLOR_MUTED)
-        self.lbl_current_app.configure(text="OBS Disconnected", text_color=COLOR_DANGER)
-        self.lbl_conn_status.configure(text="Reconnecting...", text_color=COLOR_WARNING)
-        self.lbl_alert.configure(text="SYSTEM NORMAL", text_color=COLOR_MUTED)
-        self._reset_detection_state()
-        # Start auto-reconnect in background
-        threading.Thread(target=self._auto_reconnect_loop, daemon=True).start()
-
-    def _auto_reconnect_loop(self):
-        """Periodically try to reconnect to OBS after disconnect."""
-        password = self.entry_pass.get()
-        if not password:
-            self.lbl_conn_status.configure(text="Disconnected - no password set", text_color=COLOR_DANGER)
-            return
-        hosts_to_try = ['127.0.0.1', 'localhost']
-        while self.obs_client is None:
-            time.sleep(5)
-            for host in hosts_to_try:
-                try:
-                    self.obs_client = obs.ReqClient(host=host, port=4455, password=password)
-                    self.obs_events = obs.EventClient(host=host, port=4455, password=password, callback=self.on_obs_event)
-                    self.after(0, self._on_connect_success)
-                    return
-                except Exception:
-                    continue
-
-    def refresh_sources(self):
-        if not self.obs_client: return
-        try:
-            try:
-                collection_resp = self.obs_client.get_scene_collection_list()
-                new_collection = collection_resp.current_scene_collection_name
-                if self.current_scene_collection is not None and new_collection != self.current_scene_collection:
-                    self._save_collection_sources(self.current_scene_collection)
-                old_collection = self.current_scene_collection
-                self.current_scene_collection = new_collection
-            except Exception: pass
-
-            resp = self.obs_client.get_input_list()
-            video_inputs = []
-            audio_inputs = []
-            raw_list = resp.inputs if hasattr(resp, 'inputs') else resp
-            video_kinds = ("game_capture", "window_capture")
-            audio_kinds = ("wasapi_process_output_capture", "wasapi_input_capture", "wasapi_output_capture")
-            for item in raw_list:
-                name = (getattr(item, 'inputName', None) or getattr(item, 'input_name', None) or item.get('inputName') or item.get('input_name'))
-                kind = (getattr(item, 'inputKind', None) or getattr(item, 'input_kind', None) or item.get('inputKind') or item.get('input_kind') or "")
-                if not name: continue
-                if kind in video_kinds:
-                    video_inputs.append(name)
-                if kind in audio_kinds or kind in video_kinds:
-                    audio_inputs.append(name)
-
-            if video_inputs or audio_inputs:
-                self.video_source_menu.configure(values=video_inputs if video_inputs else ["No capture sources found"])
-                self.audio_source_menu.configure(values=audio_inputs if audio_inputs else ["No audio sources found"])
-                inputs = video_inputs + audio_inputs
-                if self.current_scene_collection and self.current_scene_collection in self.scene_collection_sources:
-                    saved = self.scene_collection_sources[self.current_scene_collection]
-                    saved_video = saved.get("video_source", "")
-                    saved_audio = saved.get("audio_source", "")
-                    if saved_video in video_inputs: self.video_source_var.set(saved_video)
-                    elif self.video_source_var.get() not in video_inputs: self.video_source_var.set("Select Video Source...")
-                    if saved_audio in audio_inputs: self.audio_source_var.set(saved_audio)
-                    elif self.audio_source_var.get() not in audio_inputs: self.audio_source_var.set("Select Audio Source...")
-                else:
-                    if self.video_source_var.get() not in video_inputs: self.video_source_var.set("Select Video Source...")
-                    if self.audio_source_var.get() not in audio_inputs: self.audio_source_var.set("Select Audio Source...")
-            else:
-                self.video_source_var.set("No capture sources found")
-                self.audio_source_var.set("No audio sources found")
-        except Exception: self.video_source_var.set("Error loading sources")
-
-    def _save_collection_sources(self, collection_name):
-        if not collection_name: return
-        video = self.video_source_var.get()
-        audio = self.audio_source_var.get()
-        if "Select" not in video or "Select" not in audio:
-            self.scene_collection_sources[collection_name] = {"video_source": video if "Select" not in video else "", "audio_source": audio if "Select" not in audio else ""}
-            self.save_settings()
-
-    def _on_source_changed(self, _=None):
-        if self.current_scene_collection: self._save_collection_sources(self.current_scene_collection)
-    
-    def check_disk_space(self):
-        try:
-            clean_path = os.path.normpath(self.recording_folder)
-            self.lbl_path.configure(text=f"Recording to: {clean_path}")
-            if not os.path.exists(clean_path):
-                self.lbl_storage.configure(text=f"Path not found: {clean_path}", text_color=COLOR_DANGER)
-                return
-            total, used, free = shutil.disk_usage(clean_path)
-            free_gb = free / (1024 ** 3)
-            percent_free = free / total
-            self.storage_bar.set(percent_free)
-            total_bitrate = self.current_bitrate + 320
-            if total_bitrate <= 0: total_bitrate = 6000
-            minutes_left = (free_gb * 1024 * 1024 * 8) / (total_bitrate * 60)
-            time_str = f"~{int(minutes_left // 60)}h {int(minutes_left % 60)}m recording time"
-            if free_gb < 10:
-                self.storage_bar.configure(progress_color=COLOR_DANGER)
-                self.lbl_storage.configure(text=f"Critical: {free_gb:.1f} GB ({time_str})", text_color=COLOR_DANGER)
-            elif free_gb < 50:
-                self.storage_bar.configure(progress_color=COLOR_WARNING)
-                self.lbl_storage.configure(text=f"Low: {free_gb:.1f} GB ({time_str})", text_color=COLOR_WARNING)
-            else:
-                self.storage_bar.configure(progress_color=COLOR_SUCCESS)
-                self.lbl_storage.configure(text=f"{free_gb:.1f} GB available ({time_str})", text_color=COLOR_MUTED)
-        except Exception as e: self.lbl_storage.configure(text=f"Error checking disk: {e}", text_color=COLOR_DANGER)
-
-    def _get_obs_config(self):
-        if not self.obs_client: return False
-        try:
-            resp_dir = self.obs_client.get_record_directory()
-            directory = getattr(resp_dir, 'record_directory', None) or getattr(resp_dir, 'recordDirectory', None)
-            if directory:
-                self.recording_folder = os.path.normpath(directory)
-                return True
-        except Exception: pass
-        return False
-
-    
-    def _is_blocked_by_display_capture(self, target_source):
-        """Check if a Display Capture is currently VISIBLE and ABOVE our target."""
-        if not self.obs_client: return False
-        
-        try:
-            scene = self.obs_client.get_current_program_scene().current_program_scene_name
-            items = self.obs_client.get_scene_item_list(scene).scene_items
-            
-
-            target_index = 999
-            for item in items:
-                if item['sourceName'] == target_source:
-                    target_index = item['sceneItemIndex']
-                    break
-            
-            for item in items:
-                # Is it above us?
-                if item['sceneItemIndex'] < target_index:
-                    # Is it visible?
-                    if item['sceneItemEnabled']:
-                        # Is it a Display Capture?
-                        kind = item.get('inputKind', '').lower()
-                        name = item['sourceName'].lower()
-                        
-                        # Check for standard Display Capture types or names
-                        if "monitor_capture" in kind or "display_capture" in kind or "display capture" in name:
-                            # print(f"[OBS] Blocked by Display Capture: {item['sourceName']}")
-                            return True
-            
-            return False
-            
-        except Exception:
-            # If we can't check, assume we are safe to proceed to avoid breaking functionality
-            return False
-    
-    def update_obs(self, exe_name, window_title, class_name, is_new_switch=False):
-        """Update OBS. Includes strict checks to ensure we don't switch when disabled."""
-        
-        if self.demo_mode:
-            print(f"[DEMO MODE] Pretending to switch to: {exe_name}")
-            return #
-        
-        # 1. SAFETY CHECK: 
-        # We allow 'is_new_switch' (F9 Manual Add) to bypass this, 
-        # but automatic background switches must pass this check.
-        if not self.switch_track.get() and not is_new_switch:
-            # print("Blocked update: Tracking is disabled.")
-            return
-
-        if not self.obs_client: return
-
-        vid = self.video_source_var.get()
-        aud = self.audio_source_var.get()
-        
-        # --- DISPLAY CAPTURE LOGIC ---
-        if vid and "Select" not in vid:
-            # Check if Display Capture is blocking us
-            is_blocked = self._is_blocked_by_display_capture(vid)
-            
-            if is_blocked:
-                if is_new_switch:
-                    print(f"[OBS] OVERRIDE: Display Capture is active, but New Game detected. Switching anyway.")
-                else:
-                    # If it's NOT a new switch (just maintenance), we back off.
-                    return
-
-        safe_title = (window_title or "Untitled").replace(":", "#3A")
-        target = f"{safe_title}:{class_name}:{exe_name}"
-        
-        try:
-            # --- 1. HANDLE VIDEO SOURCE ---
-            if vid and "Select" not in vid:
-                current_settings = self.obs_client.get_input_settings(vid).input_settings
-                current_window = current_settings.get("window", "")
-
-                if current_window != target:
-                    self.total_swaps += 1
-                    self.lbl_swap_counter.configure(text=f"Total HotSwaps: {self.total_swaps}")
-                    self.save_settings()
-                    print(f"[OBS] Switching '{vid}' to: {exe_name}")
-                    
-                    try:
-                        input_kind = self.obs_client.get_input_kind(vid).input_kind
-                    except Exception:
-                        input_kind = "window_capture"
-
-                    new_settings = {"window": target}
-                    if "window" in input_kind.lower():
-                        new_settings["priority"] = 2 
-
-                    self.obs_client.set_input_settings(name=vid, settings=new_settings, overlay=True)
-
-                    if self.auto_fit_var.get(): 
-                        self._auto_fit_source(vid)
-                        
-                    threading.Thread(target=self._validate_hook, args=(vid,), daemon=True).start()
-
-            # --- 2. HANDLE AUDIO SOURCE ---
-            if aud and "Select" not in aud:
-                self.obs_client.set_input_settings(name=aud, settings={"window": target, "priority": 2}, overlay=True)
-                # Toggle Audio
-                self.obs_client.set_input_settings(name=aud, settings={"enabled": False}, overlay=True)
-                time.sleep(0.05)
-                self.obs_client.set_input_settings(name=aud, settings={"enabled": True}, overlay=True)
-
-            # --- 3. AUTO-RECORD ---
-            if self.auto_rec_var.get():
-                if not self.obs_client.get_record_status().output_active:
-                    self.obs_client.start_record()
+    def scan_running_apps(self, combo_widget):
+        # Runs on a worker; apps stream in as their exe resolves and a recent scan is reused
+        apps = []
+        flush_pending = [False]
 
-        except Exception as e:
-            error_msg = str(e).lower()
-            print(f"OBS Update Error: {e}")
-            if "10054" in error_msg or "10053" in error_msg or "connection" in error_msg or "closed" in error_msg or "eof" in error_msg:
-                self.after(0, self._on_obs_disconnect)
-            elif "scene" not in error_msg:
-                self.lbl_current_app.configure(text=f"OBS Error: {str(e)[:30]}", text_color=COLOR_DANGER)
-
-    def _auto_fit_source(self, source_name):
-        # We don't measure yet. We wait until the delay is over to measure the REAL window.
-        threading.Thread(target=self._auto_fit_source_delayed, args=(source_name,), daemon=True).start()
-
-    def _auto_fit_source_delayed(self, source_name):
-        try:
-            # 1. Wait for Splash Screen to finish
-            time.sleep(3.5)
-            
-            if not self.obs_client: 
-                return
-            
-            # 2. Get the CURRENT active window info
-            hwnd = win32gui.GetForegroundWindow()
-            if not hwnd: return
-            
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            try:
-                current_exe = psutil.Process(pid).name()
-            except:
-                return
+        def flush():
+            flush_pending[0] = False
+            values = sorted(apps, key=str.lower)
+            if not values: return
+            combo_widget.configure(values=values)
+            if combo_widget.get() not in values: combo_widget.set(values[0])
 
-            # 3. CRITICAL CHECK: Are we still looking at the tracked game?
-            # If the user Alt-Tabbed to Chrome, current_exe will be "chrome.exe".
-            # We compare it to what HotSwap THINKS it injected ("Game.exe").
-            if current_exe != self.last_injected_exe:
-                # User is doing something else; don't annoy them with black bar warnings.
-                return
+        def on_app(app):
+            apps.append(app)
+            if not flush_pending[0]:
+                flush_pending[0] = True
+                self.after(0, flush)
 
-            # 4. Measure the window NOW
-            rect = win32gui.GetClientRect(hwnd)
-            window_width = rect[2] - rect[0]
-            window_height = rect[3] - rect[1]
-            
-            # Get monitor for popup positioning
-            monitor = win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONULL)
+        def on_done(result):
+            self.after(0, lambda: self._finish_app_scan(combo_widget, result))
 
-            # Ignore tiny launchers
-            if window_width < 800 or window_height < 600:
-                return
-
-            # 5. Check OBS
-            current_scene = self.obs_client.get_current_program_scene().current_program_scene_name
-            items = self.obs_client.get_scene_item_list(current_scene).scene_items
-            target_item = next((i for i in items if i['sourceName'] == source_name), None)
-            
-            if target_item:
-                item_id = target_item['sceneItemId']
-                res = self.obs_client.get_video_settings()
-                
-                new_transform = {
-                    "boundsAlignment": 0, 
-                    "boundsWidth": res.base_width, 
-                    "boundsHeight": res.base_height, 
-                    "boundsType": "OBS_BOUNDS_SCALE_INNER"
-                }
-                self.obs_client.set_scene_item_transform(current_scene, item_id, new_transform)
-
-                if window_width > 0 and window_height > 0:
-                    canvas_ar = res.base_width / res.base_height
-                    source_ar = window_width / window_height
-                    diff = abs(canvas_ar - source_ar)
-                    
-                    size_match = (window_width == res.base_width and window_height == res.base_height)
-                    
-                    if diff > 0.01 and not size_match:
-                        if diff > 0.1:
-                            issue_type = "Ultrawide" if source_ar > canvas_ar else "Boxy (4:3)"
-                        else:
-                            issue_type = f"{window_width}x{window_height} (black bars possible)"
-                        
-                        self.lbl_alert.configure(text=f"Resolution: {issue_type}", text_color=COLOR_WARNING)
-                        
-                        # --- FIX: CHECK PER-GAME HISTORY ---
-                        # Get the history for THIS specific game (default to empty set if new)
-                        game_history = self.session_alerts.get(self.last_injected_exe, set())
-                        
-                        if "aspect_ratio" not in game_history and self.popup_notifications_enabled:
-                            game_history.add("aspect_ratio") 
-                            self.session_alerts[self.last_injected_exe] = game_history # Save it back
-                            
-                            self.overlay.show(
-                                title="Aspect Ratio Warning", 
-                                message=f"Game is {issue_type}", 
-                                hotkey="", 
-                                duration=6000, 
-                                overlay_type=OverlayPopup.TYPE_ASPECT_RATIO,
-                                monitor_handle=monitor 
-                            )
-        except Exception: pass
+        combo_widget.set("Scanning...")
+        self.engine.app_scanner.scan(on_app, on_done)
 
-    def _validate_hook(self, source_name):
-        # Give Game Capture more time to hook — some games take longer
-        for attempt in range(3):
-            time.sleep(2.0)
-            try:
-                if not self.obs_client: return
-                active = self.obs_client.get_source_active(source_name).video_active
-                if active: return  # Capture is working
-            except Exception: return
-        # Only warn after 3 failed checks (6 seconds total)
-        self.lbl_current_app.configure(text="Capture may have failed - try Admin?", text_color=COLOR_WARNING)
-        if self.popup_notifications_enabled:
-            self.overlay.show(
-                title="Capture Warning", 
-                message="Game may need Administrator mode", 
-                hotkey="", 
-                duration=6000, 
-                overlay_type=OverlayPopup.TYPE_CAPTURE_FAILED,
-                monitor_handle=self.current_monitor_handle # <--- Pass Saved Handle
-            )
-
-    def tracking_loop(self):
-        """Main tracking loop with Strict Monitor Checking."""
-        check_counter = 0
-        while self.is_tracking:
-            self.check_overload()
-            if check_counter % 10 == 0: self.check_disk_space()
-            check_counter += 1
-
-            # Get the monitor handle here
-            exe, title, cls, monitor = self.get_window_info()
-
-            if exe:
-                if exe == self.self_exe or exe == "HotSwap.exe":
-                    time.sleep(1.5)
-                    continue
-
-                # --- SAVE MONITOR HANDLE ---
-                # If this is a valid app (whitelisted or blacklisted), we want to know its monitor
-                # so that even if it's ignored, we know where the user is looking.
-                if monitor:
-                    self.current_monitor_handle = monitor
-
-                # --- PERMISSION CHECKS ---
-                is_whitelisted = exe in self.whitelist
-                is_blacklisted = exe in self.blacklist
-                is_temp_ignored = exe in self.temp_ignore_list
-
-                # --- FIX: USE PER-GAME HISTORY ---
-                if (exe.lower() in [g.lower() for g in self.anticheat_games] and self.game_detection_enabled):
-                    # Get history for THIS exe
-                    game_history = self.session_alerts.get(exe, set())
-                    
-                    if "anticheat" not in game_history:
-                        game_history.add("anticheat")
-                        self.session_alerts[exe] = game_history # Save it back
-                        
-                        if self.popup_notifications_enabled:
-                            self.overlay.show(
-                                title="Anti-Cheat Detected", 
-                                message=f"{exe}\nConsider enabling Safe Mode", 
-                                hotkey="", 
-                                duration=8000, 
-                                overlay_type=OverlayPopup.TYPE_ASPECT_RATIO,
-                                monitor_handle=self.current_monitor_handle
-                            )
-
-
-                allowed = is_whitelisted
-                if not allowed and self.last_injected_exe: self.last_injected_exe = ""
-                
-                if "failed" not in self.lbl_current_app.cget("text").lower():
-                    status = "Tracking" if allowed else "Ignored"
-                    self.lbl_current_app.configure(text=f"{exe} ({status})", text_color=COLOR_PRIMARY if allowed else COLOR_MUTED)
-                
-                # Debounce check
-                if time.time() - getattr(self, 'last_switch_time', 0) < 3:
-                    time.sleep(1.5)
-                    continue
-                
-                # --- 3. SWITCHING LOGIC ---
-                if allowed:
-                    is_new_game = (exe != self.last_injected_exe)
-                    
-                    if is_new_game:
-                        self.update_obs(exe, title, cls, is_new_switch=True)
-                        self.last_injected_exe = exe
-                        self.last_switch_time = time.time()
-                    else:
-                        # MAINTENANCE: We pass False. This prevents switching sounds/notifications on re-detect.
-                        self.update_obs(exe, title, cls, is_new_switch=False)
-
-            time.sleep(1.5)
-
-    def _is_process_running(self, exe_name):
-        try:
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'] == exe_name: return True
-        except Exception: pass
-        return False
-        
-    def check_overload(self):
-        if not self.obs_client: return
-        if not getattr(self, 'frame_drop_alerts_enabled', True): return
-        try:
-            stats = self.obs_client.get_stats()
-            diff = stats.render_skipped_frames - self.last_render_skipped
-            self.last_render_skipped = stats.render_skipped_frames
-            now = time.time()
-            recently_switched = (now - getattr(self, 'last_switch_time', 0)) < 5
-            alert_cooldown = (now - getattr(self, 'last_alert_time', 0)) < 30
-            if diff > self.frame_drop_threshold:
-                self.lbl_alert.configure(text=f"Dropped {diff} frames!", text_color=COLOR_DANGER)
-                self.status_frame.configure(fg_color=COLOR_DANGER_DARK)
-                if not recently_switched and not alert_cooldown and self.popup_notifications_enabled:
-                    self.overlay.show(
-                        title="Performance Warning", 
-                        message=f"Dropped {diff} frames!", 
-                        hotkey="", 
-                        duration=8000, 
-                        overlay_type=OverlayPopup.TYPE_FRAME_DROP,
-                        monitor_handle=self.current_monitor_handle # <--- Pass Saved Handle
-                    )
-            elif diff > 0:
-                self.lbl_alert.configure(text=f"Minor stutter ({diff} frames)", text_color=COLOR_WARNING)
-                self.status_frame.configure(fg_color="transparent")
-            else:
-                self.lbl_alert.configure(text="SYSTEM NORMAL", text_color=COLOR_MUTED)
-                self.status_frame.configure(fg_color="transparent")
-        except Exception as e:
-            error_msg = str(e).lower()
-            if "10054" in error_msg or "10053" in error_msg or "connection" in error_msg or "closed" in error_msg or "eof" in error_msg:
-                self.after(0, self._on_obs_disconnect)
-
-    def get_window_info(self):
-        try:
-            hwnd = win32gui.GetForegroundWindow()
-            if hwnd == 0: return None, None, None, None
-            
-            # FIX: Get Monitor FIRST, because it doesn't require Admin rights.
-            # Even if we can't read the EXE name, we might still want the monitor handle later.
-            monitor = win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONULL)
-
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            exe_name = psutil.Process(pid).name()
-            window_title = win32gui.GetWindowText(hwnd)
-            class_name = win32gui.GetClassName(hwnd)
-            
-            return exe_name, window_title, class_name, monitor
-            
-        except (psutil.NoSuchProcess, psutil.AccessDenied): 
-            # If we can't read the EXE, we still return None for the name, 
-            # but we could technically return the monitor if we wanted to. 
-            # For now, failing safely is fine.
-            return None, None, None, None
-        except Exception: 
-            return None, None, None, None
-
-    def scan_running_apps(self, combo_widget):
-        apps = []
-        def enum_handler(hwnd, ctx):
-            if win32gui.IsWindowVisible(hwnd):
-                title = win32gui.GetWindowText(hwnd)
-                if title:
-                    try:
-                        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                        exe_name = psutil.Process(pid).name()
-                        if exe_name and exe_name != "HotSwap.exe" and title.strip():
-                            apps.append(f"{title} ({exe_name})")
-                    except (psutil.NoSuchProcess, psutil.AccessDenied): pass
-        try:
-            win32gui.EnumWindows(enum_handler, None)
-            apps.sort()
-            clean_apps = [a for a in apps if "HotSwap" not in a]
-            if clean_apps:
-                combo_widget.configure(values=clean_apps)
-                combo_widget.set(clean_apps[0])
-            else:
-                combo_widget.configure(values=["No apps found"])
-                combo_widget.set("No apps found")
-        except Exception as e:
+    def _finish_app_scan(self, combo_widget, apps):
+        if apps is None:
             combo_widget.set("Scan error")
-            print(f"Scan error: {e}")
+        elif apps:
+            combo_widget.configure(values=apps)
+            if combo_widget.get() not in apps: combo_widget.set(apps[0])
+        else:
+            combo_widget.configure(values=["No apps found"])
+            combo_widget.set("No apps found")
 
     def add_from_combo(self, list_type, combo_widget):
         selection = combo_widget.get()
         exe = selection.split("(")[-1].strip(")") if "(" in selection else selection.strip()
         if not exe.lower().endswith(".exe"): return
-        target = self.whitelist if list_type == "whitelist" else self.blacklist
-        if exe and exe not in target:
-            target.append(exe)
-            self.update_display(list_type)
-            self.save_settings()
-
-    def _reset_detection_state(self, exe_name=None):
-        if exe_name:
-            if self.last_injected_exe == exe_name: self.last_injected_exe = ""
-            if self.locked_app == exe_name: self.locked_app = None
-            if self.last_injected_exe == exe_name: 
-                self.last_obs_target = ""
-            if self.suggested_app == exe_name:
-                self.suggested_app = None
-                self.hide_suggestion()
-            if exe_name in self.temp_ignore_list: self.temp_ignore_list.remove(exe_name)
-        else:
-            self.last_injected_exe = ""
-            self.last_obs_target = ""
-            self.locked_app = None
-            self.suggested_app = None
-            self.temp_ignore_list.clear()
-            self.hide_suggestion()
-
-    def remove_item(self, list_type, item):
-        target = self.whitelist if list_type == "whitelist" else self.blacklist
-        if item in target:
-            target.remove(item)
-            self.update_display(list_type)
-            self.save_settings()
-            if list_type == "whitelist":
-                for item in list(target): self._reset_detection_state(item)
+        self.engine.add_to_list(list_type, exe)
 
     def clear_list(self, list_type):
-        target = self.whitelist if list_type == "whitelist" else self.blacklist
-        if not target: return
+        if not self.engine._list(list_type): return
         dialog = ConfirmDialog(self, title="Clear List?", message=f"Are you sure you want to delete all apps from the {list_type}? This cannot be undone.", danger_action=True)
         if not dialog.result: return
-        if list_type == "whitelist":
-            for item in list(target): self._reset_detection_state(item)
-        target.clear()
-        self.update_display(list_type)
-        self.save_settings()
+        self.engine.clear_list(list_type)
 
-    def update_display(self, list_type):
-        self.after_idle(lambda: self._rebuild_list_display(list_type))
     def _rebuild_list_display(self, list_type):
-        target = self.whitelist if list_type == "whitelist" else self.blacklist
-        scroll = self.white_scroll if list_type == "whitelist" else self.black_scroll
-        try:
-            for child in list(scroll.winfo_children()):
-                try: child.update_idletasks(); child.destroy()
-                except Exception: pass
-        except Exception: pass
-        count = len(target)
-        header_text = f"Total: {count} apps"
-        ctk.CTkLabel(scroll, text=header_text, font=FONT_CAPTION, text_color=COLOR_MUTED).pack(pady=(0, SPACE_SM))
-        for app in target:
-            row = ctk.CTkFrame(scroll, fg_color=COLOR_SURFACE, corner_radius=6)
-            row.pack(pady=SPACE_XS, padx=SPACE_SM, fill="x")
-            lbl_btn = ctk.CTkButton(row, text=app, font=FONT_BODY, fg_color="transparent", hover_color=COLOR_MUTED, anchor="w", command=lambda a=app: print(f"Selected: {a}"))
-            lbl_btn.pack(side="left", fill="x", expand=True)
-            remove_btn = ctk.CTkButton(row, text="X", width=32, fg_color=COLOR_DANGER, hover_color=COLOR_DANGER_DARK, command=lambda a=app, lt=list_type: self.remove_item(lt, a))
-            remove_btn.pack(side="right", padx=SPACE_XS)
-        if not target:
-            ctk.CTkLabel(scroll, text="List empty", font=FONT_CAPTION, text_color=COLOR_MUTED).pack(pady=SPACE_MD)
+        if "Rules" not in self._built_tabs: return  # Filled when the tab is built
+        target = self.engine.whitelist if list_type == "whitelist" else self.engine.blacklist
+        view = self.white_view if list_type == "whitelist" else self.black_view
+        view.set_items(target)  # Only rebinds rows whose item changed
 
     def detect_monitors(self):
         try:
             self.monitors = []
             display_names = []
-            for i, (handle, _, rect) in enumerate(win32api.EnumDisplayMonitors()):
+            for i, (handle, rect) in enumerate(self.engine.platform.monitors()):
                 width = rect[2] - rect[0]
                 height = rect[3] - rect[1]
                 name = f"Monitor {i + 1} ({width}x{height})"
@@ -1963,7 +1285,7 @@ function script_load(settings) obs.obs_frontend_add_event_callback(on_event) end
                 self.monitor_menu.configure(values=display_names)
                 if display_names and self.monitor_var.get() == "Select Monitor":
                     self.monitor_var.set(display_names[0])
-        except Exception as e: print(f"Error detecting monitors: {e}")
+        except Exception as e: log.warning("UI", "Error detecting monitors: %s", e)
 
     def _hide_from_capture(self):
         """Hide HotSwap from OBS/screen capture using Win32 display affinity."""
@@ -1973,7 +1295,7 @@ function script_load(settings) obs.obs_frontend_add_event_callback(on_event) end
                 hwnd = self.winfo_id()
             SetWindowDisplayAffinity(hwnd, WDA_EXCLUDEFROMCAPTURE)
         except Exception as e:
-            print(f"[Cloak] Could not hide from capture: {e}")
+            log.warning("Cloak", "Could not hide from capture: %s", e)
 
     def _show_for_capture(self):
         """Make HotSwap visible to OBS/screen capture (for demo mode)."""
@@ -1983,7 +1305,7 @@ function script_load(settings) obs.obs_frontend_add_event_callback(on_event) end
                 hwnd = self.winfo_id()
             SetWindowDisplayAffinity(hwnd, 0)
         except Exception as e:
-            print(f"[Cloak] Could not show for capture: {e}")
+            log.warning("Cloak", "Could not show for capture: %s", e)
 
     def toggle_pin(self):
         is_top = bool(self.attributes("-topmost"))
@@ -1995,173 +1317,38 @@ function script_load(settings) obs.obs_frontend_add_event_callback(on_event) end
         else:
             self.btn_pin.configure(text_color=COLOR_MUTED, fg_color="transparent")
             self.pin_tooltip.text = "Pin window on top"
-
-    def save_settings(self):
-        data = {
-            "version": APP_VERSION,
-            "password": self.entry_pass.get(),
-            "video_source": self.video_source_var.get(),
-            "audio_source": self.audio_source_var.get(),
-            "auto_record": self.auto_rec_var.get(),
-            "auto_fit": self.auto_fit_var.get(),
-            "auto_tracking": self.switch_track.get() == 1,
-            "hotkey": self.detection_hotkey,
-            "toggle_hotkey": self.toggle_tracking_hotkey,
-            "ignore_hotkey": self.ignore_alerts_hotkey,
-            "game_detection_enabled": self.game_detection_enabled,
-            "frame_drop_alerts_enabled": self.frame_drop_alerts_enabled,
-            "disclaimer_accepted": self.disclaimer_accepted,
-            "audio_feedback_enabled": self.audio_feedback_enabled,
-            "popup_notifications_enabled": self.popup_notifications_enabled,
-            "audio_volume": self.audio_volume,
-            "sound_detected_path": self.sound_detected_path,
-            "sound_switched_path": self.sound_switched_path,
-            "detection_keys": self.detection_keys,
-            "whitelist": self.whitelist,
-            "blacklist": self.blacklist,
-            "detection_threshold": self.detection_threshold,
-            "frame_drop_threshold": self.frame_drop_threshold,
-            "total_swaps": self.total_swaps,
-            "window_geometry": self.geometry(),
-            "is_pinned": bool(self.attributes("-topmost")),
-            "scene_collection_sources": self.scene_collection_sources
-        }
-        try:
-            with open(CONFIG_FILE, "w") as f: json.dump(data, f, indent=2)
-        except Exception: pass
-
-    def load_settings(self):
-        if not os.path.exists(CONFIG_FILE):
-            if getattr(sys, 'frozen', False): app_dir = os.path.dirname(sys.executable)
-            else: app_dir = os.path.dirname(os.path.abspath(__file__))
-            old_config = os.path.join(app_dir, "obs_tracker_config.json")
-            if os.path.exists(old_config):
-                try: os.rename(old_config, CONFIG_FILE)
-                except Exception: pass
-        if not os.path.exists(CONFIG_FILE): return
-        try:
-            with open(CONFIG_FILE, "r") as f: data = json.load(f)
-            if "password" in data: self.entry_pass.insert(0, data["password"])
-            if "video_source" in data: self.video_source_var.set(data["video_source"])
-            if "audio_source" in data: self.audio_source_var.set(data["audio_source"])
-            if "auto_record" in data: self.auto_rec_var.set(data["auto_record"])
-            if "auto_fit" in data: self.auto_fit_var.set(data["auto_fit"])
-            if "whitelist" in data: self.whitelist = data["whitelist"]
-            if "blacklist" in data: self.blacklist = data["blacklist"]
-            if "hotkey" in data:
-                self.detection_hotkey = data["hotkey"]
-                self.btn_record_hotkey.configure(text=self.detection_hotkey.upper())
-                self.btn_add_quick.configure(text=f"Add ({self.detection_hotkey.upper()})")
-            if "toggle_hotkey" in data:
-                self.toggle_tracking_hotkey = data["toggle_hotkey"]
-                self.btn_record_toggle_hotkey.configure(text=self.toggle_tracking_hotkey.upper())
-            if "ignore_hotkey" in data:
-                self.ignore_alerts_hotkey = data["ignore_hotkey"]
-                self.btn_record_ignore_hotkey.configure(text=self.ignore_alerts_hotkey.upper())
-            if "game_detection_enabled" in data:
-                self.game_detection_enabled = data["game_detection_enabled"]
-                self.game_detection_var.set(self.game_detection_enabled)
-            if "frame_drop_alerts_enabled" in data:
-                self.frame_drop_alerts_enabled = data["frame_drop_alerts_enabled"]
-                self.frame_drop_var.set(self.frame_drop_alerts_enabled)
-            if "disclaimer_accepted" in data: self.disclaimer_accepted = data["disclaimer_accepted"]
-            if "audio_feedback_enabled" in data:
-                self.audio_feedback_enabled = data["audio_feedback_enabled"]
-                self.audio_feedback_var.set(self.audio_feedback_enabled)
-            if "popup_notifications_enabled" in data:
-                self.popup_notifications_enabled = data["popup_notifications_enabled"]
-                self.popup_var.set(self.popup_notifications_enabled)
-            if "audio_volume" in data:
-                self.audio_volume = float(data["audio_volume"])
-                self.audio_volume_var.set(self.audio_volume)
-                self.lbl_volume_pct.configure(text=f"{int(self.audio_volume * 100)}%")
-            if "sound_detected_path" in data:
-                self.sound_detected_path = data["sound_detected_path"]
-                if self.sound_detected_path: self.lbl_sound_detected_file.configure(text=os.path.basename(self.sound_detected_path), text_color=COLOR_SUCCESS)
-            if "sound_switched_path" in data:
-                self.sound_switched_path = data["sound_switched_path"]
-                if self.sound_switched_path: self.lbl_sound_switched_file.configure(text=os.path.basename(self.sound_switched_path), text_color=COLOR_SUCCESS)
-            if "scene_collection_sources" in data: self.scene_collection_sources = data["scene_collection_sources"]
-            if "detection_keys" in data: self.detection_keys = data["detection_keys"]
-            self.update_key_display()
-            if "detection_threshold" in data:
-                self.slider_time.set(data["detection_threshold"])
-                self.detection_threshold = data["detection_threshold"]
-                self.lbl_time_val.configure(text=f"{self.detection_threshold:.1f}s")
-            if "frame_drop_threshold" in data:
-                self.frame_drop_threshold = data["frame_drop_threshold"]
-                self.slider_drop.set(self.frame_drop_threshold)
-                self.lbl_drop_val.configure(text=f"{self.frame_drop_threshold}")
-            if "total_swaps" in data:
-                self.total_swaps = data["total_swaps"]
-                self.lbl_swap_counter.configure(text=f"Total HotSwaps: {self.total_swaps}")
-            if "auto_tracking" in data and data["auto_tracking"]: self._pending_auto_tracking = True
-            if "window_geometry" in data:
-                try: self.geometry(data["window_geometry"])
-                except: pass
-            if "is_pinned" in data:
-                if not data["is_pinned"]:
-                    self.attributes("-topmost", False)
-                    self.btn_pin.configure(text_color=COLOR_MUTED, fg_color="transparent")
-                    self.pin_tooltip.text = "Pin window on top"
-            self.update_display("whitelist")
-            self.update_display("blacklist")
-        except json.JSONDecodeError:
-            try: os.remove(CONFIG_FILE)
-            except Exception: pass
-        except Exception: pass
+        self._remember_window_settings()
 
     def on_close(self):
-        self.save_settings()
+        self._remember_window_settings()
+        self.engine.shutdown()
         self.destroy()
 
-    def toggle_tracking(self):
-        if self.switch_track.get() == 1:
-            if not self.obs_client:
-                self.lbl_current_app.configure(text="Connect to OBS first", text_color=COLOR_WARNING)
-                self.switch_track.deselect()
-                return
-            vid = self.video_source_var.get()
-            if not vid or "Select" in vid:
-                self.lbl_current_app.configure(text="Set Video Source in Settings", text_color=COLOR_WARNING)
-                self.switch_track.deselect()
-                return
-            self._reset_detection_state()
-            self.is_tracking = True
-            self.lbl_track_status.configure(text="Tracking is ON", text_color=COLOR_SUCCESS)
-            self.lbl_current_app.configure(text="Scanning...", text_color=COLOR_PRIMARY)
-            threading.Thread(target=self.tracking_loop, daemon=True).start()
-        else:
-            self.is_tracking = False
-            self._reset_detection_state()
-            self.lbl_track_status.configure(text="Tracking is OFF", text_color=COLOR_DANGER)
-            self.lbl_current_app.configure(text="Paused", text_color=COLOR_MUTED)
-            self.lbl_alert.configure(text="SYSTEM NORMAL", text_color=COLOR_MUTED)
-
 if __name__ == "__main__":
     # --- FIX 1: SINGLE INSTANCE LOCK ---
-    mutex_name = "HotSwap_SingleInstance_Mutex"
-    mutex = win32event.CreateMutex(None, False, mutex_name)
-    last_error = win32api.GetLastError()
-
-    if last_error == winerror.ERROR_ALREADY_EXISTS:
+    mutex = acquire_single_instance()
+    if mutex is None:
         ctypes.windll.user32.MessageBoxW(0, "HotSwap is already running!", "HotSwap", 0x40 | 0x1)
         sys.exit(0)
 
-    log_file = os.path.join(app_data_dir, "hotswap_debug.log")
-    if getattr(sys, 'frozen', False):
-        sys.stdout = open(log_file, "w")
-        sys.stderr = sys.stdout
+    # Writes happen on the log's own thread; the file is appended to and rotated, not wiped per session
+    frozen = getattr(sys, 'frozen', False)
+    log.start(LOG_FILE, echo=None if frozen else sys.stdout)
+    log.install_crash_handler(CRASH_FILE)
+    if frozen:
+        sys.stdout = LogStream(log, "stdout", INFO)
+        sys.stderr = LogStream(log, "stderr", ERROR)
 
-    print(f"--- HotSwap v{APP_VERSION} Log Started ---")
+    log.info("App", "--- HotSwap v%s Log Started ---", APP_VERSION)
     
-    app = HotSwap()
+    app = HotSwap(startup_benchmark=BENCHMARK_FLAG in sys.argv)
     try:
         app.mainloop()
     except Exception as e:
-        print(f"FATAL ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        ctypes.windll.user32.MessageBoxW(0, f"Critical Error:\n{e}\n\nCheck logs in Settings.", "HotSwap Crashed", 16)
+        log.exception("App", "FATAL ERROR: %s", e)
+        log.dump_crash()
+        ctypes.windll.user32.MessageBoxW(0, f"Critical Error:\n{e}\n\nDetails are in {CRASH_FILE}", "HotSwap Crashed", 16)
+    finally:
+        log.stop()
 
 # you have reached the end of the code. there is nothing more to show traveler.
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""Capture hook validation for HotSwap: confirms a switched source actually shows video."""
+import threading
+import time
+from collections import deque
+
+DEFAULT_HOOK_TIMEOUT = 6.0   # Games we have never hooked before
+MIN_HOOK_TIMEOUT = 2.0
+MAX_HOOK_TIMEOUT = 20.0
+HOOK_TIMEOUT_FACTOR = 2.0    # Learned timeout = slowest recent hook x this
+HOOK_HISTORY = 10            # Hook times remembered per game
+PROBE_INTERVAL = 0.25
+
+# Game window geometry
+GEOMETRY_STABLE_SAMPLES = 4     # Same client size this many samples in a row = settled
+GEOMETRY_FAST_INTERVAL = 0.25   # While the size is unknown or changing
+GEOMETRY_SLOW_INTERVAL = 1.0    # Once settled, to notice later resolution changes
+MIN_FIT_SIZE = (800, 600)       # Smaller windows are launchers/splash screens
+
+
+class HookTimes:
+    """Recent time-to-hook per game, and the timeout learned from them."""
+
+    def __init__(self, history=HOOK_HISTORY):
+        self.history = history
+        self.times = {}  # exe -> deque of seconds
+
+    def record(self, exe, seconds):
+        self.times.setdefault(exe, deque(maxlen=self.history)).append(round(seconds, 3))
+
+    def timeout_for(self, exe):
+        times = self.times.get(exe)
+        if not times: return DEFAULT_HOOK_TIMEOUT
+        return min(MAX_HOOK_TIMEOUT, max(MIN_HOOK_TIMEOUT, max(times) * HOOK_TIMEOUT_FACTOR))
+
+    def average(self, exe):
+        times = self.times.get(exe)
+        return sum(times) / len(times) if times else None
+
+    def to_dict(self):
+        return {exe: list(times) for exe, times in self.times.items()}
+
+    def load(self, data):
+        for exe, times in (data or {}).items():
+            self.times[exe] = deque((float(t) for t in times), maxlen=self.history)
+
+
+class HookValidator:
+    """
+    Waits for a freshly switched source to go active.
+
+    Success is confirmed as soon as OBS reports the input active
+    (InputActiveStateChanged) or a probe sees it active; probes run every
+    PROBE_INTERVAL and immediately on InputShowStateChanged. Failure is
+    reported once the game's learned timeout passes. Starting a new
+    validation for the same source replaces the pending one, including its
+    scheduled probe.
+
+    Probes run on `scheduler` (a TaskRuntime). `probe(source)` returns True
+    when the source's video is active and `on_result(source, exe, ok,
+    elapsed)` is called from a worker thread.
+    """
+
+    def __init__(self, probe, on_result, scheduler, hook_times=None, clock=time.monotonic):
+        self.probe = probe
+        self.on_result = on_result
+        self.scheduler = scheduler
+        self.hook_times = hook_times or HookTimes()
+        self.clock = clock
+        self.pending = {}  # source -> [exe, started, deadline]
+        self._lock = threading.Lock()
+
+    def start(self, source, exe):
+        now = self.clock()
+        attempt = [exe, now, now + self.hook_times.timeout_for(exe)]
+        with self._lock:
+            self.pending[source] = attempt
+        self.scheduler.call_later(PROBE_INTERVAL, self._probe, source, attempt, key=("hook", source))
+
+    def cancel(self, source=None):
+        with self._lock:
+            sources = list(self.pending) if source is None else [source]
+            for s in sources: self.pending.pop(s, None)
+        for s in sources: self.scheduler.cancel(("hook", s))
+
+    def handle_event(self, event):
+        """Feed OBS events; InputActiveStateChanged/InputShowStateChanged drive validation."""
+        name = event.data.get("inputName")
+        if event.name == "InputActiveStateChanged":
+            if event.data.get("videoActive"): self._finish(name, True)
+        elif event.name == "InputShowStateChanged":
+            with self._lock:
+                attempt = self.pending.get(name)
+            if attempt is not None:  # Probe right away
+                self.scheduler.call_later(0, self._probe, name, attempt, key=("hook", name))
+
+    def _finish(self, source, ok, attempt=None):
+        with self._lock:
+            current = self.pending.get(source)
+            if current is None or (attempt is not None and current is not attempt): return
+            attempt = self.pending.pop(source)
+        self.scheduler.cancel(("hook", source))
+        exe, started = attempt[0], attempt[1]
+        elapsed = self.clock() - started
+        if ok: self.hook_times.record(exe, elapsed)
+        try: self.on_result(source, exe, ok, elapsed)
+        except Exception: pass
+
+    def _probe(self, source, attempt):
+        with self._lock:
+            if self.pending.get(source) is not attempt: return  # Superseded or finished
+        try:
+            active = self.probe(source)
+        except Exception:
+            self.cancel(source)  # Lost OBS; don't report a capture failure for it
+            return
+        now = self.clock()
+        if active: self._finish(source, True, attempt)
+        elif now >= attempt[2]: self._finish(source, False, attempt)
+        else:
+            self.scheduler.call_later(min(PROBE_INTERVAL, attempt[2] - now), self._probe, source, attempt, key=("hook", source))
+
+
+class RectStabilizer:
+    """
+    Turns a stream of client sizes into settled sizes.
+
+    A size is reported once it has been read `samples` times in a row, and
+    only if it differs from the last size reported. Missing, minimized and
+    tiny (launcher/splash) sizes break the run without being reported.
+    """
+
+    def __init__(self, samples=GEOMETRY_STABLE_SAMPLES, min_size=MIN_FIT_SIZE):
+        self.samples = samples
+        self.min_size = min_size
+        self.candidate = None
+        self.count = 0
+        self.settled = None
+
+    @property
+    def changing(self):
+        """True while a size different from the settled one is being read."""
+        return self.candidate is not None and self.candidate != self.settled
+
+    def feed(self, size):
+        """Feed one (width, height) or None. Returns the size when it settles, else None."""
+        if size is None or size[0] < self.min_size[0] or size[1] < self.min_size[1]:
+            self.candidate = None
+            self.count = 0
+            return None
+        size = tuple(size)
+        if size == self.candidate:
+            self.count += 1
+        else:
+            self.candidate = size
+            self.count = 1
+        if self.count >= self.samples and size != self.settled:
+            self.settled = size
+            return size
+        return None
+
+    def reset(self):
+        self.candidate = None
+        self.count = 0
+        self.settled = None
+
+    def retry(self, settled):
+        """The size just reported wasn't handled: go back to `settled` and report it again after another run."""
+        self.settled = settled
+        self.count = 0
+
+
+class GeometryWatcher:
+    """
+    Samples one game window's client size and calls on_settled(key, size)
+    whenever it settles on a new size: first when a splash screen gives way
+    to the game, then on every real resolution change. If on_settled
+    returns False the size is not taken as handled: the last handled size
+    is kept and the new one is reported again once it has been stable for
+    another run of samples.
+
+    `read_size()` returns (width, height) or None and is supplied per watch,
+    so the window lookup stays with the caller (and tests can script it).
+    step() takes one sample synchronously; `scheduler` (a TaskRuntime) just
+    calls it on a fast interval until settled, then on a slow one.
+    """
+
+    TIMER_KEY = "geometry"
+
+    def __init__(self, on_settled, scheduler, stable_samples=GEOMETRY_STABLE_SAMPLES, min_size=MIN_FIT_SIZE,
+                 fast_interval=GEOMETRY_FAST_INTERVAL, slow_interval=GEOMETRY_SLOW_INTERVAL):
+        self.on_settled = on_settled
+        self.scheduler = scheduler
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.stabilizer = RectStabilizer(stable_samples, min_size)
+        self.key = None
+        self.read_size = None
+        self._lock = threading.Lock()
+
+    def watch(self, key, read_size):
+        """Start watching a new window, replacing the current one."""
+        with self._lock:
+            self.key = key
+            self.read_size = read_size
+            self.stabilizer.reset()
+        self.scheduler.call_later(0, self._tick, key=self.TIMER_KEY)
+
+    def unwatch(self, key=None):
+        with self._lock:
+            if key is not None and key != self.key: return
+            self.key = None
+            self.read_size = None
+        self.scheduler.cancel(self.TIMER_KEY)
+
+    def poke(self):
+        """Sample now, e.g. after a move/resize notification."""
+        if self.key is not None:
+            self.scheduler.call_later(0, self._tick, key=self.TIMER_KEY)
+
+    def step(self):
+        """Take one sample. Returns the newly settled size, or None."""
+        with self._lock:
+            key, read_size = self.key, self.read_size
+        if read_size is None: return None
+        try:
+            size = read_size()
+        except Exception:
+            size = None
+        with self._lock:
+            if key != self.key: return None  # Replaced while sampling
+            handled_size = self.stabilizer.settled
+            settled = self.stabilizer.feed(size)
+        if settled is not None:
+            try: handled = self.on_settled(key, settled)
+            except Exception: handled = None
+            if handled is False:
+                with self._lock:
+                    if key == self.key: self.stabilizer.retry(handled_size)
+        return settled
+
+    def _tick(self):
+        if self.key is None: return
+        self.step()
+        stab = self.stabilizer
+        fast = stab.settled is None or stab.changing
+        if self.key is not None:
+            self.scheduler.call_later(self.fast_interval if fast else self.slow_interval, self._tick, key=self.TIMER_KEY)
@@ -0,0 +1,338 @@
+"""Time and thread primitives for HotSwap: the real ones, or virtual time for simulation."""
+import collections
+import heapq
+import threading
+import time
+
+from hotswap_log import log
+
+SETTLE_TIMEOUT = 10.0  # Real seconds the driver waits for simulated threads to go idle
+
+
+class SystemClock:
+    """Wall-clock time and real threads. Components take one of these as `timebase`."""
+
+    monotonic = staticmethod(time.monotonic)
+    sleep = staticmethod(time.sleep)
+    time = staticmethod(time.time)
+
+    def Event(self):
+        return threading.Event()
+
+    def Condition(self, lock=None):
+        return threading.Condition(lock)
+
+    def Lock(self):
+        return threading.Lock()
+
+    def spawn(self, target, *args):
+        """Start target(*args) on a daemon thread."""
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        return thread
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class _Waiter:
+    __slots__ = ("deadline", "fired", "timed_out", "parked", "counted", "cond")
+
+    def __init__(self):
+        self.cond = None
+        self.deadline = None
+        self.fired = False
+        self.timed_out = False
+        self.parked = False
+        self.counted = False
+
+
+class VirtualClock:
+    """
+    Simulated time for replaying sessions faster than real time.
+
+    Threads started with spawn() are participants. A participant waiting on
+    a primitive from this clock (Event, Condition, Lock, sleep) is parked; once
+    every participant is parked, the driver - the thread calling
+    run_until() - jumps time straight to the next deadline or scheduled
+    action instead of sleeping through it. Time therefore only moves while
+    nothing is running, so an hour-long session replays as fast as the code
+    under test executes and every timestamp it sees is reproducible. (The
+    order in which threads woken at the same instant run is still up to the
+    OS scheduler.)
+
+    Participants must not block on anything else for long: a thread stuck
+    on a real lock or socket holds virtual time still, and run_until()
+    raises after SETTLE_TIMEOUT real seconds. A timed wait always lasts at
+    least `resolution`, like a real one, so a loop that polls with a zero
+    or rounded-down timeout still lets time move.
+    """
+
+    def __init__(self, start=0.0, epoch=1_700_000_000.0, resolution=1e-6):
+        self.epoch = epoch  # time() = epoch + monotonic(), so wall-clock maths keeps working
+        self.resolution = resolution
+        self.advances = 0
+        self._now = float(start)
+        self._lock = threading.Lock()
+        self._cv = threading.Condition(self._lock)  # Driver waits here for the participants to park
+        self._running = 0
+        self._parked = set()
+        self._actions = []  # heap of (t, seq, fn, args)
+        self._seq = 0
+        self._local = threading.local()
+        self._driver = None
+
+    # --- Timebase interface ---
+    def monotonic(self):
+        return self._now
+
+    def time(self):
+        return self.epoch + self._now
+
+    def sleep(self, seconds):
+        with self._cv:
+            self._park(_Waiter(), max(0.0, seconds))
+
+    def Event(self):
+        return VirtualEvent(self)
+
+    def Condition(self, lock=None):
+        return VirtualCondition(self, lock)
+
+    def Lock(self):
+        return VirtualLock(self)
+
+    def spawn(self, target, *args):
+        """Start target(*args) as a participant thread."""
+        with self._cv:
+            self._running += 1  # Counted from now, so the driver can't advance before it runs
+        thread = threading.Thread(target=self._participate, args=(target, args), daemon=True)
+        thread.start()
+        return thread
+
+    # --- Driver ---
+    def at(self, t, fn, *args):
+        """Run fn(*args) on the driver thread once virtual time reaches t."""
+        with self._cv:
+            self._seq += 1
+            heapq.heappush(self._actions, (t, self._seq, fn, args))
+
+    def after(self, delay, fn, *args):
+        self.at(self._now + delay, fn, *args)
+
+    def settle(self):
+        """Block until every participant is parked or finished."""
+        with self._cv:
+            self._settle()
+
+    def run_until(self, t):
+        """Advance virtual time to t, running actions and waking waiters in time order."""
+        self._driver = threading.get_ident()
+        while True:
+            with self._cv:
+                self._settle()
+                deadline = min((w.deadline for w in self._parked if w.deadline is not None), default=None)
+                action_at = self._actions[0][0] if self._actions else None
+                due = min(x for x in (deadline, action_at, float("inf")) if x is not None)
+                if due > t:
+                    self._now = max(self._now, t)
+                    return
+                if due > self._now: self.advances += 1
+                self._now = max(self._now, due)
+                action = None
+                if action_at is not None and action_at <= due:
+                    # Actions run one at a time, with every participant parked, before timeouts at that instant
+                    _, _, fn, args = heapq.heappop(self._actions)
+                    action = (fn, args)
+                else:
+                    for waiter in [w for w in self._parked if w.deadline is not None and w.deadline <= self._now]:
+                        waiter.timed_out = True
+                        self._wake(waiter)
+            if action is not None:
+                self._run_action(*action)
+
+    def run_for(self, seconds):
+        self.run_until(self._now + seconds)
+
+    # --- Internals (called with _cv held) ---
+    def _participate(self, target, args):
+        self._local.participant = True
+        try:
+            target(*args)
+        except Exception as e:
+            log.error("Sim", "%s crashed: %r", getattr(target, '__name__', target), e)
+        finally:
+            with self._cv:
+                self._running -= 1
+                if not self._running: self._cv.notify_all()
+
+    def _run_action(self, fn, args):
+        try:
+            fn(*args)
+        except Exception as e:
+            log.error("Sim", "Action %s failed: %r", getattr(fn, '__name__', fn), e)
+
+    def _settle(self):
+        limit = time.monotonic() + SETTLE_TIMEOUT
+        while self._running > 0:
+            remaining = limit - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError(f"{self._running} simulated thread(s) still busy after {SETTLE_TIMEOUT:.0f}s "
+                                   "of real time (blocked outside the virtual clock?)")
+            self._cv.wait(remaining)
+
+    def _park(self, waiter, timeout):
+        if waiter.fired: return
+        if threading.get_ident() == self._driver:
+            raise RuntimeError("The simulation driver can't wait on virtual time")
+        waiter.deadline = None if timeout is None else self._now + max(timeout, self.resolution)
+        waiter.parked = True
+        waiter.counted = getattr(self._local, "participant", False)
+        waiter.cond = threading.Condition(self._lock)  # Woken on its own, not with every other parked thread
+        self._parked.add(waiter)
+        if waiter.counted:
+            self._running -= 1
+            if not self._running: self._cv.notify_all()
+        while not waiter.fired:
+            waiter.cond.wait()
+
+    def _wake(self, waiter):
+        if waiter.fired: return
+        waiter.fired = True
+        if waiter.parked:
+            waiter.parked = False
+            self._parked.discard(waiter)
+            if waiter.counted: self._running += 1
+            waiter.cond.notify()
+
+
+class VirtualEvent:
+    """threading.Event on a VirtualClock."""
+
+    def __init__(self, clock):
+        self._clock = clock
+        self._flag = False
+        self._waiters = []
+
+    def is_set(self):
+        return self._flag
+
+    def set(self):
+        clock = self._clock
+        with clock._cv:
+            self._flag = True
+            for waiter in self._waiters: clock._wake(waiter)
+            self._waiters = []
+
+    def clear(self):
+        with self._clock._cv:
+            self._flag = False
+
+    def wait(self, timeout=None):
+        clock = self._clock
+        with clock._cv:
+            if self._flag: return True
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+            clock._park(waiter, timeout)
+            if waiter in self._waiters: self._waiters.remove(waiter)
+            return self._flag
+
+
+class VirtualCondition:
+    """threading.Condition on a VirtualClock. The lock is a real lock; only waiting is virtual."""
+
+    def __init__(self, clock, lock=None):
+        self._clock = clock
+        self._lock = lock if lock is not None else threading.RLock()
+        self._waiters = collections.deque()
+        self.acquire = self._lock.acquire
+        self.release = self._lock.release
+
+    def __enter__(self):
+        return self._lock.__enter__()
+
+    def __exit__(self, *args):
+        return self._lock.__exit__(*args)
+
+    def _release_save(self):
+        release_save = getattr(self._lock, "_release_save", None)
+        if release_save is not None: return release_save()
+        self._lock.release()
+        return None
+
+    def _acquire_restore(self, saved):
+        acquire_restore = getattr(self._lock, "_acquire_restore", None)
+        if acquire_restore is not None: acquire_restore(saved)
+        else: self._lock.acquire()
+
+    def wait(self, timeout=None):
+        """Same contract as threading.Condition.wait: call with the lock held."""
+        clock = self._clock
+        waiter = _Waiter()
+        with clock._cv:
+            self._waiters.append(waiter)
+        saved = self._release_save()
+        try:
+            with clock._cv:
+                clock._park(waiter, timeout)
+                try: self._waiters.remove(waiter)
+                except ValueError: pass
+        finally:
+            self._acquire_restore(saved)
+        return not waiter.timed_out
+
+    def wait_for(self, predicate, timeout=None):
+        end = None if timeout is None else self._clock.monotonic() + timeout
+        result = predicate()
+        while not result:
+            remaining = None
+            if end is not None:
+                remaining = end - self._clock.monotonic()
+                if remaining <= 0: break
+            self.wait(remaining)
+            result = predicate()
+        return result
+
+    def notify(self, n=1):
+        clock = self._clock
+        with clock._cv:
+            while n > 0 and self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter.fired: continue  # Timed out, not gone yet
+                clock._wake(waiter)
+                n -= 1
+
+    def notify_all(self):
+        self.notify(len(self._waiters))
+
+
+class VirtualLock:
+    """threading.Lock on a VirtualClock: a thread waiting to acquire it is parked, so time can still move."""
+
+    def __init__(self, clock):
+        self._cond = VirtualCondition(clock, threading.Lock())
+        self._held = False
+
+    def acquire(self, blocking=True, timeout=-1):
+        with self._cond:
+            if self._held and not blocking: return False
+            if not self._cond.wait_for(lambda: not self._held, None if timeout < 0 else timeout): return False
+            self._held = True
+            return True
+
+    def release(self):
+        with self._cond:
+            if not self._held: raise RuntimeError("release unlocked lock")
+            self._held = False
+            self._cond.notify()
+
+    def locked(self):
+        return self._held
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
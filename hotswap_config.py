@@ -0,0 +1,118 @@
+"""Write-behind, atomic persistence for HotSwap's config.json."""
+import copy
+import json
+import os
+import threading
+import time
+
+from hotswap_log import log
+
+FLUSH_INTERVAL = 1.0  # At most one write per second
+
+
+class ConfigStore:
+    """
+    Holds the latest settings snapshot and writes it to disk behind the caller.
+
+    update() only compares the snapshot with what was last written and, when
+    it differs, schedules a flush on `scheduler` (a TaskRuntime) no sooner
+    than FLUSH_INTERVAL after the previous write, so bursts of changes (a
+    dragged slider, a run of switches) become one write. Writes go to a
+    temp file that is fsynced and renamed over the config, so a crash
+    mid-write leaves the previous file intact. flush() writes synchronously,
+    for shutdown.
+
+    Snapshots are deep-copied on the way in, so callers can keep editing the
+    lists and dicts they passed without changing what was recorded.
+    """
+
+    FLUSH_KEY = "config_flush"
+
+    def __init__(self, path, scheduler=None, flush_interval=FLUSH_INTERVAL, clock=time.monotonic):
+        self.path = path
+        self.scheduler = scheduler
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.writes = 0
+        self._pending = None   # Snapshot waiting to be written
+        self._written = None   # Last snapshot on disk
+        self._last_write = 0.0
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def dirty(self):
+        return self._pending is not None
+
+    def load(self):
+        """
+        Read the config. Returns {} if it is missing; an unreadable file is
+        moved aside to config.corrupt.json instead of being deleted.
+        """
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            corrupt = os.path.splitext(self.path)[0] + ".corrupt.json"
+            log.error("Config", "%s is unreadable (%s), keeping it as %s", self.path, e, corrupt)
+            try: os.replace(self.path, corrupt)
+            except Exception: pass
+            return {}
+        if not isinstance(data, dict): return {}
+        with self._lock:
+            self._written = copy.deepcopy(data)
+        return data
+
+    def update(self, data):
+        """Record a new snapshot; it is written within flush_interval if it changed anything."""
+        with self._lock:
+            if data == (self._pending if self._pending is not None else self._written):
+                return
+            self._pending = copy.deepcopy(data)
+            if self._scheduled: return
+            if self.scheduler is None:
+                schedule = False
+            else:
+                self._scheduled = True
+                schedule = True
+                delay = max(0.0, self._last_write + self.flush_interval - self.clock())
+        if schedule:
+            self.scheduler.call_later(delay, self._flush_scheduled, key=self.FLUSH_KEY)
+        else:
+            self.flush()
+
+    def _flush_scheduled(self):
+        with self._lock:
+            self._scheduled = False
+        self.flush()
+
+    def flush(self):
+        """Write the pending snapshot now, if any. Returns True if a write happened."""
+        with self._write_lock:
+            with self._lock:
+                data = self._pending
+                self._pending = None
+            if data is None: return False
+            try:
+                self._write(data)
+            except Exception as e:
+                log.error("Config", "Save failed: %s", e)
+                with self._lock:
+                    if self._pending is None: self._pending = data  # Retry with the next flush
+                return False
+            with self._lock:
+                self._written = data
+                self._last_write = self.clock()
+                self.writes += 1
+            return True
+
+    def _write(self, data):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
@@ -0,0 +1,1526 @@
+"""HotSwap's switching engine: OBS connection, tracking, game detection and settings, without a UI."""
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from hotswap_platform import (
+    IdentityCache, ProcessWatcher, AppScanner, Win32Platform, PROCESS_STARTED, PROCESS_EXITED, WINDOW_MOVED,
+    WINDOW_RENAMED,
+)
+from hotswap_input import KeyActivityDetector
+from hotswap_stats import StatsSampler, LEVEL_DROP, LEVEL_MINOR
+from hotswap_capture import HookValidator, GeometryWatcher
+from hotswap_trace import SwitchTracer, MARK_APPLIED, MARK_ACTIVE, MARK_FITTED
+from hotswap_log import log
+from hotswap_tasks import TaskRuntime, current_token
+from hotswap_sound import SoundEngine
+from hotswap_config import ConfigStore
+from hotswap_rules import RuleMatcher
+from hotswap_obs import (
+    ObsResponse, ObsStateMirror, EchoFilter, RequestBatch,
+    STATUS_OUTPUT_RUNNING, EVENT_SUB_HOTSWAP,
+)
+
+APP_NAME = "HotSwap"
+APP_VERSION = "1.1.0"
+HEADLESS_FLAG = "--headless"
+
+# Tracking timings (seconds)
+FOCUS_SAFETY_POLL = 10.0       # fallback re-check when focus events are available
+FOCUS_POLL_NO_EVENTS = 1.5     # poll rate when there is no foreground event source
+DISK_CHECK_INTERVAL = 15.0
+SWITCH_DEBOUNCE = 3.0
+PRETARGET_TIMEOUT = 30.0       # how long to wait for a launched game's first window
+FRAME_DROP_ALERT_COOLDOWN = 30.0  # while drops continue, re-alert at most this often
+
+OBS_PORT = 4455
+VIDEO_PLACEHOLDER = "Select Video Source..."
+AUDIO_PLACEHOLDER = "Select Audio Source..."
+
+# Status tones; each view maps them to its own colours
+TONE_NORMAL = "normal"
+TONE_PRIMARY = "primary"
+TONE_SUCCESS = "success"
+TONE_WARNING = "warning"
+TONE_DANGER = "danger"
+TONE_MUTED = "muted"
+
+# Alert kinds (the overlay keeps one window per kind)
+ALERT_GAME_DETECTED = "game_detected"
+ALERT_FRAME_DROP = "frame_drop"
+ALERT_CAPTURE_FAILED = "capture_failed"
+ALERT_ASPECT_RATIO = "aspect_mismatch"
+
+Alert = namedtuple("Alert", "kind title message hotkey duration monitor value template")
+
+
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and PyInstaller exe."""
+    if getattr(sys, 'frozen', False):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, relative_path)
+
+
+app_data_dir = os.path.join(os.environ.get('APPDATA') or os.path.expanduser("~"), "HotSwap")
+if not os.path.exists(app_data_dir):
+    try:
+        os.makedirs(app_data_dir)
+    except Exception:
+        pass
+CONFIG_FILE = os.path.join(app_data_dir, "config.json")
+LOG_FILE = os.path.join(app_data_dir, "hotswap_debug.log")
+CRASH_FILE = os.path.join(app_data_dir, "hotswap_crash.log")
+
+
+def acquire_single_instance(name="HotSwap_SingleInstance_Mutex"):
+    """Hold the single-instance mutex. Returns the handle, or None if HotSwap is already running."""
+    try:
+        import win32api
+        import win32event
+        import winerror
+    except ImportError:
+        return True  # No mutex outside Windows
+    mutex = win32event.CreateMutex(None, False, name)
+    if win32api.GetLastError() == winerror.ERROR_ALREADY_EXISTS:
+        return None
+    return mutex
+
+
+def source_ready(name):
+    return bool(name) and "Select" not in name
+
+
+class EngineView:
+    """
+    What the engine reports to a front end. Methods are called from the
+    engine's threads, so a view with its own event loop must hand them over
+    to it. Every method defaults to doing nothing; a view only overrides
+    what it shows.
+    """
+
+    def on_connection(self, text, tone): pass
+    def on_connected(self): pass                     # Return False to stop the engine from using the connection
+    def on_tracking(self, tracking, connected): pass
+    def on_app_status(self, text, tone): pass        # The "Currently Tracking" line
+    def on_alert_status(self, text, tone, banner=False): pass
+    def on_swaps(self, total): pass
+    def on_hook_time(self, text): pass
+    def on_latency(self, game, overall): pass        # SwitchTracer.describe() lines for the last game and all games
+    def on_health(self, health, tasks): pass         # health is None once OBS is gone
+    def on_disk(self, folder, free_fraction, text, tone): pass
+    def on_sources(self, video_choices, audio_choices): pass
+    def on_suggestion(self, exe): pass               # exe is None when the suggestion is withdrawn
+    def on_alert(self, alert): pass
+    def on_alerts_cleared(self, kind=None): pass     # kind None drops everything queued
+    def on_lists(self, list_type): pass
+    def on_settings(self): pass                      # The engine changed a setting itself
+    def on_demo_mode(self, enabled): pass
+
+    def visible_alert(self):
+        """Kind of the alert on screen right now, for the ignore-alerts hotkey."""
+        return None
+
+    def settings_extras(self):
+        """View state saved alongside the engine's settings (e.g. window geometry)."""
+        return {}
+
+
+class HotSwapEngine:
+    """
+    Everything HotSwap does apart from drawing: the OBS connection, focus
+    tracking and switching, game detection, hotkeys, alerts and config.json.
+
+    It runs on its own threads and TaskRuntime and never touches a widget;
+    whatever a user should see goes to the attached EngineView. The CTk
+    window is one such view, the console view used by `--headless` another.
+    Windows, processes, keys, sounds, threads and time all come from
+    `platform` (Win32Platform by default, hotswap_sim.SimPlatform in replays).
+    """
+
+    SETTING_KEYS = (
+        "version", "password", "video_source", "audio_source", "auto_record", "auto_fit", "auto_tracking",
+        "hotkey", "toggle_hotkey", "ignore_hotkey", "game_detection_enabled", "frame_drop_alerts_enabled",
+        "disclaimer_accepted", "audio_feedback_enabled", "popup_notifications_enabled", "audio_volume",
+        "sound_detected_path", "sound_switched_path", "detection_keys", "whitelist", "blacklist",
+        "detection_threshold", "frame_drop_threshold", "total_swaps", "hook_times", "scene_collection_sources",
+        "switch_latency",
+    )
+
+    def __init__(self, view=None, config_file=CONFIG_FILE, platform=None):
+        self.view = view or EngineView()
+        self.config_file = config_file
+        self.platform = platform or Win32Platform()
+        self.clock = self.platform.clock
+        self.obs_client = None
+        self.is_tracking = False
+        self.last_injected_exe = ""
+        self.pretargeted_exe = None  # Switched to at launch; hook validation waits for its first focus
+        self.current_monitor_handle = None
+        self.session_alerts = {}
+        self.tasks = TaskRuntime(clock=self.clock.monotonic, timebase=self.clock)
+        self.config_store = ConfigStore(config_file, scheduler=self.tasks, clock=self.clock.monotonic)
+        self.config_extras = {}  # Keys this engine doesn't own, kept on save
+        self.obs_state = ObsStateMirror()
+        self.obs_echoes = EchoFilter()
+        self.tracer = SwitchTracer(clock=self.clock.monotonic)
+        self.hook_validator = HookValidator(
+            probe=lambda source: self.obs_client.get_source_active(source).video_active,
+            on_result=self._on_hook_result,
+            scheduler=self.tasks,
+            clock=self.clock.monotonic,
+        )
+        self.suggested_app = None
+        self.suggested_title = None
+        self.suggested_class = None
+        self.suggestion_shown = None
+        self.recording_folder = os.path.normpath(os.path.join(os.path.expanduser("~"), "Videos"))
+        self.current_bitrate = 6000
+        self.temp_ignore_list = []
+        self.locked_app = None
+        self.self_exe = "HotSwap.exe" if getattr(sys, 'frozen', False) else "python.exe"
+        self.focus_changed = self.clock.Event()
+        self.foreground_source = self.platform.foreground_source()
+        # Window entries are only safe to cache when we get destroy/rename notifications
+        self.identity = IdentityCache(track_windows=self.foreground_source is not None,
+                                      query_window=self.platform.window_identity, clock=self.clock.monotonic,
+                                      open_process=self.platform.open_process)
+        self.fit_watcher = GeometryWatcher(on_settled=self._on_game_geometry, scheduler=self.tasks)
+        if self.foreground_source:
+            self.foreground_source.add_window_listener(self.identity.on_window_event)
+            self.foreground_source.add_window_listener(self._on_window_event)
+        self.process_watcher = ProcessWatcher(
+            self.identity, callback=self._on_process_event, list_pids=self.platform.list_pids,
+            open_process=self.platform.open_process, wait_procs=self.platform.wait_procs, timebase=self.clock,
+        )
+        self.process_watcher.watch = lambda exe: self.rules.decide(exe).whitelisted
+        self.app_scanner = AppScanner(self.identity, self.tasks, known=self.process_watcher.procs,
+                                      list_windows=self.platform.visible_windows, clock=self.clock.monotonic)
+        self._connection_lock = threading.Lock()
+        self._switch_lock = self.clock.Lock()  # One update_obs at a time: tracking loop, Quick Add and pre-targeting
+        self._detection_lock = self.clock.Lock()
+        self._detection_running = False  # A heuristic_loop is running (only one may)
+
+        self.demo_mode = False # Demo mode flag for testing
+
+        self.password = ""
+        self.obs_port = OBS_PORT
+        self.video_source = VIDEO_PLACEHOLDER
+        self.audio_source = AUDIO_PLACEHOLDER
+        self.source_choices = (["Scan first..."], ["Connect first..."])
+        self.auto_record = False
+        self.auto_fit = False
+        self.detection_keys = ['w', 'a', 's', 'd']
+        self.whitelist = []
+        self.blacklist = ["explorer.exe", "python.exe", "SearchHost.exe", "Taskmgr.exe", "ApplicationFrameHost.exe", "chrome.exe", "discord.exe"]
+        self.anticheat_games = ["valorant.exe", "vgc.exe", "faceitclient.exe", "faceit.exe", "easyanticheat.exe", "battleye.exe", "beclient.exe", "r5apex.exe", "fortnite.exe", "fortniteclient-win64-shipping.exe"]
+        self.rules = RuleMatcher()
+        self._compile_rules()
+        self.detection_hotkey = "f9"
+        self.toggle_tracking_hotkey = "f10"
+        self.ignore_alerts_hotkey = "i"
+        self.detection_threshold = 2.0
+        self.frame_drop_threshold = 30
+        self.stats = StatsSampler(
+            fetch=lambda: self.obs_client.get_stats(),
+            on_health=self._on_stats_health,
+            threshold=self.frame_drop_threshold,
+            clock=self.clock.time,
+        )
+        self.game_detection_enabled = True
+        self.total_swaps = 0
+        self.frame_drop_alerts_enabled = True
+        self.disclaimer_accepted = False
+        self.current_scene_collection = None
+        self.scene_collection_sources = {}
+        self.audio_feedback_enabled = True
+        self.popup_notifications_enabled = True
+        self.audio_volume = 0.5
+        self.sound_detected_path = ""
+        self.sound_switched_path = ""
+        self.default_sound_detected = resource_path("sounds/detected.wav")
+        self.default_sound_switched = resource_path("sounds/switched.wav")
+        self.sounds = SoundEngine(output=self.platform.sound_output(), clock=self.clock.monotonic)
+        # Combos are compiled by heuristic_loop
+        self.key_detector = KeyActivityDetector((), self.detection_threshold, resolver=self.platform.scan_codes,
+                                                clock=self.clock.time, timebase=self.clock)
+
+        self.connection_status = ("Disconnected, you MUST connect to OBS WebSocket for this to work.", TONE_DANGER)
+        self.app_status = ("Waiting...", TONE_PRIMARY)
+        self.last_switch_time = 0
+        self.last_alert_time = 0
+        self.focused_window = (None, None)  # (hwnd, exe) as of the last get_window_info()
+        self.last_f9_time = 0
+        self._pending_auto_tracking = False
+        self._hotkeys_registered = False
+
+    def attach(self, view):
+        self.view = view or EngineView()
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+    def start(self, install_script=True):
+        """Start the background work: sound preload, launcher script, game detection, hotkeys, focus events."""
+        # Decode the cues now so the first Game Detected sound plays without a file read
+        for path in (self.sound_detected_path or self.default_sound_detected, self.sound_switched_path or self.default_sound_switched):
+            self.tasks.submit(self.sounds.load, path, self.audio_volume)
+        if install_script: self.tasks.submit(self._install_obs_script_quietly)
+        if self.game_detection_enabled:
+            self._start_game_detection()
+        self.register_hotkeys()
+        if self.foreground_source:
+            self.foreground_source.start(self._on_foreground_changed)
+        self.process_watcher.start()
+
+    def shutdown(self):
+        self.save_settings()
+        self.config_store.flush()
+        self.is_tracking = False
+        self.game_detection_enabled = False
+        self.focus_changed.set()
+        self.key_detector.interrupt()
+        self.unregister_hotkeys()
+        try:
+            if self.foreground_source: self.foreground_source.stop()
+            self.process_watcher.stop()
+        except Exception: pass
+        client = self.obs_client
+        self.obs_client = None
+        if client:
+            try: client.disconnect()
+            except Exception: pass
+        self.tasks.shutdown()
+
+    # =========================================================================
+    # HOTKEYS
+    # =========================================================================
+    def register_hotkeys(self):
+        platform = self.platform
+        try:
+            platform.add_hotkey(self.detection_hotkey, self.quick_add_suggestion)
+        except Exception: pass
+        try:
+            platform.add_hotkey(self.toggle_tracking_hotkey, self.toggle_tracking)
+        except Exception: pass
+        try:
+            platform.add_hotkey(self.ignore_alerts_hotkey, self.ignore_alerts)
+        except Exception: pass
+        try:
+            platform.add_hotkey("shift+l+d", self.toggle_demo_mode) #demo mode toggle
+        except Exception: pass
+        self._hotkeys_registered = True
+
+    def unregister_hotkeys(self):
+        if not self._hotkeys_registered: return
+        platform = self.platform
+        try: platform.remove_hotkey(self.quick_add_suggestion)
+        except Exception: pass
+        try: platform.remove_hotkey(self.toggle_tracking)
+        except Exception: pass
+        try: platform.remove_hotkey(self.ignore_alerts)
+        except Exception: pass
+        self._hotkeys_registered = False
+
+    def set_hotkey(self, name, key):
+        """Rebind one of the hotkeys ('hotkey', 'toggle_hotkey' or 'ignore_hotkey')."""
+        self.unregister_hotkeys()
+        if name == "hotkey": self.detection_hotkey = key
+        elif name == "toggle_hotkey": self.toggle_tracking_hotkey = key
+        else: self.ignore_alerts_hotkey = key
+        self.register_hotkeys()
+        self.save_settings()
+
+    def toggle_demo_mode(self):
+        """Secret toggle for recording demo videos."""
+        self.demo_mode = not self.demo_mode
+        self.view.on_demo_mode(self.demo_mode)
+        try: self.platform.beep("asterisk" if self.demo_mode else "ok")
+        except Exception: pass
+        if self.demo_mode:
+            log.warning("Demo", "DEMO MODE ENABLED - OBS UPDATES DISABLED, VISIBLE TO CAPTURE")
+        else:
+            log.warning("Demo", "DEMO MODE DISABLED - LIVE")
+
+    def ignore_alerts(self):
+        """Ignore-alerts hotkey: silences frame drop alerts, or ignores the game on screen once."""
+        kind = self.view.visible_alert()
+        if kind == ALERT_FRAME_DROP:
+            self.frame_drop_alerts_enabled = False
+            self.view.on_alerts_cleared(ALERT_FRAME_DROP)
+            self.view.on_settings()
+            self.save_settings()
+        elif kind == ALERT_GAME_DETECTED:
+            self.ignore_suggestion_once()
+
+    # =========================================================================
+    # SETTINGS
+    # =========================================================================
+    def set_option(self, name, value):
+        """Change one setting from a front end and apply its side effects."""
+        setattr(self, name, value)
+        if name == "game_detection_enabled":
+            if value: self._start_game_detection()
+            else: self.key_detector.interrupt()
+        elif name == "detection_threshold":
+            self.key_detector.threshold = value
+        elif name == "frame_drop_threshold":
+            self.stats.threshold = value
+        self.save_settings()
+
+    def select_sources(self, video, audio):
+        self.video_source = video
+        self.audio_source = audio
+        if self.current_scene_collection: self._save_collection_sources(self.current_scene_collection)
+        self.save_settings()
+
+    def add_detection_key(self, key_combo):
+        if not key_combo or key_combo in self.detection_keys: return
+        self.detection_keys.append(key_combo)
+        self.key_detector.set_combos(self.detection_keys)
+        self.save_settings()
+        self.view.on_lists("detection_keys")
+
+    def remove_detection_key(self, key_combo):
+        if key_combo in self.detection_keys:
+            self.detection_keys.remove(key_combo)
+            self.key_detector.set_combos(self.detection_keys)
+            self.save_settings()
+            self.view.on_lists("detection_keys")
+
+    def save_settings(self):
+        data = dict(self.config_extras)
+        data.update({
+            "version": APP_VERSION,
+            "password": self.password,
+            "video_source": self.video_source,
+            "audio_source": self.audio_source,
+            "auto_record": self.auto_record,
+            "auto_fit": self.auto_fit,
+            "auto_tracking": self.is_tracking or self._pending_auto_tracking,
+            "hotkey": self.detection_hotkey,
+            "toggle_hotkey": self.toggle_tracking_hotkey,
+            "ignore_hotkey": self.ignore_alerts_hotkey,
+            "game_detection_enabled": self.game_detection_enabled,
+            "frame_drop_alerts_enabled": self.frame_drop_alerts_enabled,
+            "disclaimer_accepted": self.disclaimer_accepted,
+            "audio_feedback_enabled": self.audio_feedback_enabled,
+            "popup_notifications_enabled": self.popup_notifications_enabled,
+            "audio_volume": self.audio_volume,
+            "sound_detected_path": self.sound_detected_path,
+            "sound_switched_path": self.sound_switched_path,
+            "detection_keys": self.detection_keys,
+            "whitelist": self.whitelist,
+            "blacklist": self.blacklist,
+            "detection_threshold": self.detection_threshold,
+            "frame_drop_threshold": self.frame_drop_threshold,
+            "total_swaps": self.total_swaps,
+            "hook_times": self.hook_validator.hook_times.to_dict(),
+            "scene_collection_sources": self.scene_collection_sources,
+            "switch_latency": self.tracer.to_dict(),
+        })
+        try: data.update(self.view.settings_extras())
+        except Exception: pass
+        # Written behind us (coalesced, atomic); nothing here touches the disk
+        self.config_store.update(data)
+
+    def read_config(self):
+        if not os.path.exists(self.config_file):
+            if getattr(sys, 'frozen', False): app_dir = os.path.dirname(sys.executable)
+            else: app_dir = os.path.dirname(os.path.abspath(__file__))
+            old_config = os.path.join(app_dir, "obs_tracker_config.json")
+            if os.path.exists(old_config):
+                try: os.rename(old_config, self.config_file)
+                except Exception: pass
+        return self.config_store.load()
+
+    def load_settings(self, data=None):
+        if data is None: data = self.read_config()
+        if not data: return
+        self.config_extras = {k: v for k, v in data.items() if k not in self.SETTING_KEYS}
+        try:
+            self.password = data.get("password", self.password)
+            self.video_source = data.get("video_source", self.video_source)
+            self.audio_source = data.get("audio_source", self.audio_source)
+            self.auto_record = data.get("auto_record", self.auto_record)
+            self.auto_fit = data.get("auto_fit", self.auto_fit)
+            self.whitelist = data.get("whitelist", self.whitelist)
+            self.blacklist = data.get("blacklist", self.blacklist)
+            self.detection_hotkey = data.get("hotkey", self.detection_hotkey)
+            self.toggle_tracking_hotkey = data.get("toggle_hotkey", self.toggle_tracking_hotkey)
+            self.ignore_alerts_hotkey = data.get("ignore_hotkey", self.ignore_alerts_hotkey)
+            self.game_detection_enabled = data.get("game_detection_enabled", self.game_detection_enabled)
+            self.frame_drop_alerts_enabled = data.get("frame_drop_alerts_enabled", self.frame_drop_alerts_enabled)
+            self.disclaimer_accepted = data.get("disclaimer_accepted", self.disclaimer_accepted)
+            self.audio_feedback_enabled = data.get("audio_feedback_enabled", self.audio_feedback_enabled)
+            self.popup_notifications_enabled = data.get("popup_notifications_enabled", self.popup_notifications_enabled)
+            if "audio_volume" in data: self.audio_volume = float(data["audio_volume"])
+            self.sound_detected_path = data.get("sound_detected_path", self.sound_detected_path)
+            self.sound_switched_path = data.get("sound_switched_path", self.sound_switched_path)
+            self.scene_collection_sources = data.get("scene_collection_sources", self.scene_collection_sources)
+            self.detection_keys = data.get("detection_keys", self.detection_keys)
+            if "detection_threshold" in data:
+                self.detection_threshold = data["detection_threshold"]
+                self.key_detector.threshold = self.detection_threshold
+            if "frame_drop_threshold" in data:
+                self.frame_drop_threshold = data["frame_drop_threshold"]
+                self.stats.threshold = self.frame_drop_threshold
+            self.total_swaps = data.get("total_swaps", self.total_swaps)
+            if "hook_times" in data:
+                self.hook_validator.hook_times.load(data["hook_times"])
+            if "switch_latency" in data:
+                self.tracer.load(data["switch_latency"])
+            if data.get("auto_tracking"): self._pending_auto_tracking = True
+            self._lists_changed("whitelist")
+            self._lists_changed("blacklist")
+        except Exception: pass
+        self.view.on_settings()
+        self.view.on_swaps(self.total_swaps)
+        self.view.on_latency("", self.tracer.describe())
+
+    def install_obs_script(self):
+        """Write the OBS Lua script that launches HotSwap with OBS. Returns the script's path."""
+        if getattr(sys, 'frozen', False): exe_path = sys.executable
+        else: exe_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "HotSwap.py")
+        exe_path_escaped = exe_path.replace("\\", "\\\\")
+        lua_script = f'''obs = obslua
+local app_path = "{exe_path_escaped}"
+function script_description() return "Launches HotSwap automatically when OBS starts.\\n\\nPath: " .. app_path end
+function on_event(event) if event == obs.OBS_FRONTEND_EVENT_FINISHED_LOADING then obs.script_log(obs.LOG_INFO, "HotSwap: Launching...") os.execute('start "" "' .. app_path .. '"') end end
+function script_load(settings) obs.obs_frontend_add_event_callback(on_event) end
+'''
+        appdata = os.environ.get('APPDATA', '')
+        obs_base = os.path.join(appdata, 'obs-studio', 'basic', 'scripts')
+        if not os.path.exists(obs_base): os.makedirs(obs_base, exist_ok=True)
+        script_path = os.path.join(obs_base, 'HotSwap_Launcher.lua')
+        with open(script_path, 'w') as f: f.write(lua_script)
+        return script_path
+
+    def _install_obs_script_quietly(self):
+        try: self.install_obs_script()
+        except Exception: pass
+
+    # =========================================================================
+    # STATUS / ALERTS
+    # =========================================================================
+    def set_connection_status(self, text, tone):
+        self.connection_status = (text, tone)
+        self.view.on_connection(text, tone)
+
+    def set_app_status(self, text, tone):
+        self.app_status = (text, tone)
+        self.view.on_app_status(text, tone)
+
+    def _tracking_changed(self):
+        self.view.on_tracking(self.is_tracking, self.obs_client is not None)
+
+    def alert(self, kind, title, message, duration, hotkey="", monitor=None, value=None, template=None):
+        """Raise a popup alert, unless popups are turned off."""
+        if not self.popup_notifications_enabled: return
+        self.view.on_alert(Alert(kind, title, message, hotkey, duration, monitor, value, template))
+
+    def play_sound(self, sound_type):
+        if not self.audio_feedback_enabled: return
+        path = self.sound_detected_path if sound_type == "detected" else self.sound_switched_path
+        if not path:
+            path = self.default_sound_detected if sound_type == "detected" else self.default_sound_switched
+        # Decoding/scaling is cached and the engine mixes overlapping cues on its own player thread
+        self.tasks.submit(self.sounds.play, path, self.audio_volume, sound_type)
+
+    # =========================================================================
+    # SUGGESTION LOGIC
+    # =========================================================================
+    def show_suggestion(self, exe_name, monitor_handle=None):
+        if self.suggestion_shown: return
+        self.suggestion_shown = exe_name
+        self.view.on_suggestion(exe_name)
+        self.play_sound("detected")
+        self.alert(ALERT_GAME_DETECTED, "Game Detected", exe_name, 10000,
+                   hotkey=self.detection_hotkey, monitor=monitor_handle)
+
+    def hide_suggestion(self):
+        self.suggestion_shown = None
+        self.suggested_app = None
+        self.suggested_title = None
+        self.suggested_class = None
+        self.view.on_suggestion(None)
+
+    def ignore_suggestion_once(self):
+        if self.suggested_app:
+            self.temp_ignore_list.append(self.suggested_app)
+            self._compile_rules("temp_ignore")
+            self.hide_suggestion()
+
+    def ignore_suggestion_always(self):
+        if self.suggested_app:
+            self.blacklist.append(self.suggested_app)
+            self._lists_changed("blacklist")
+            self.save_settings()
+            self.hide_suggestion()
+
+    def quick_add_suggestion(self):
+        """Sets the lock IMMEDIATELY to stop the loop from fighting."""
+        current_exe, current_title, current_cls, monitor = self.get_window_info()
+        if monitor:
+            self.current_monitor_handle = monitor
+        if not self.is_tracking:
+            return
+        if not self.obs_client:
+            self.set_app_status("Connect to OBS first", TONE_WARNING)
+            return
+        if not source_ready(self.video_source):
+            self.set_app_status("Set Video Source in Settings", TONE_WARNING)
+            return
+        self.view.on_alerts_cleared()
+
+        app_to_add = self.suggested_app
+
+        # If no suggestion is pending, grab the current active window
+        if not app_to_add:
+            exe = current_exe
+            if exe and not self.rules.decide(exe).blacklisted and exe != self.self_exe and exe != "HotSwap.exe":
+                app_to_add = exe
+
+        if not app_to_add: return
+
+        # Don't add blacklisted apps
+        if self.rules.decide(app_to_add).blacklisted:
+            self.hide_suggestion()
+            return
+
+        # If we are already locked onto this exe, pressing F9 again should do nothing.
+        if app_to_add == self.last_injected_exe:
+            return
+
+        # Debounce rapid F9 spam (within 2 seconds)
+        if self.clock.time() - self.last_f9_time < 2:
+            return
+        self.last_f9_time = self.clock.time()
+
+        # 1. Update Whitelist
+        if not self.rules.decide(app_to_add).whitelisted:
+            self.whitelist.append(app_to_add)
+            self._lists_changed("whitelist")
+            self.save_settings()
+
+        saved_title = self.suggested_title
+        saved_class = self.suggested_class
+
+        self.hide_suggestion()
+
+        # --- EARLY LOCK ---
+        self.last_injected_exe = app_to_add
+        self.locked_app = None
+
+        # 2. Run OBS update in background thread
+        self.tasks.submit(self._quick_add_worker, app_to_add, saved_title, saved_class, key="quick_add")
+
+    def _quick_add_worker(self, app_to_add, saved_title, saved_class):
+        """WORKER PART: Updates OBS."""
+        current_exe, current_title, current_cls, _ = self.get_window_info()
+
+        target_title = current_title if (current_exe == app_to_add) else saved_title
+        target_class = current_cls if (current_exe == app_to_add) else saved_class
+
+        if not target_title or not target_class:
+            if not current_token(self.clock).sleep(0.5): return  # Superseded by a newer Quick Add
+            current_exe, current_title, current_cls, _ = self.get_window_info()
+            if current_exe == app_to_add:
+                target_title = current_title
+                target_class = current_cls
+
+        if target_title and target_class:
+            log.info("QuickAdd", "Switching to: %s", app_to_add)
+            self.update_obs(app_to_add, target_title, target_class, is_new_switch=True)
+            self.set_app_status(f"{app_to_add} (Tracking)", TONE_PRIMARY)
+            self.last_switch_time = self.clock.time()
+            self.play_sound("switched")
+        else:
+            log.warning("QuickAdd", "Could not get window info for %s", app_to_add)
+
+    # =========================================================================
+    # HEURISTIC LOOP (Game Detection)
+    # =========================================================================
+    def _start_game_detection(self):
+        """Spawn heuristic_loop unless one is still running; that one carries on while the option is on."""
+        with self._detection_lock:
+            if self._detection_running: return
+            self._detection_running = True
+        self.clock.spawn(self.heuristic_loop)
+
+    def _detection_wanted(self):
+        """heuristic_loop's loop test. Stopping is decided under the lock _start_game_detection takes."""
+        with self._detection_lock:
+            if not self.game_detection_enabled: self._detection_running = False
+            return self._detection_running
+
+    def heuristic_loop(self):
+        """Background loop that detects game activity from key press/release events. Start it with _start_game_detection()."""
+        try:
+            self.key_detector.set_combos(self.detection_keys)  # Scan codes come from the platform's keyboard
+            hook = self.platform.hook_keys(self._on_key_event)
+        except Exception as e:
+            log.error("Keys", "Keyboard hook failed: %s", e)
+            with self._detection_lock: self._detection_running = False
+            return
+
+        try:
+            # Toggled off and on before we notice: this loop just keeps going
+            while self._detection_wanted():
+                # Sleeps until the detection threshold is reached; no polling while idle
+                if self.key_detector.wait(timeout=5.0):
+                    try: self._on_activity_detected()
+                    except Exception as e: log.error("Keys", "Game detection failed: %s", e)
+        finally:
+            try: self.platform.unhook_keys(hook)
+            except Exception: pass
+
+    def _on_key_event(self, event):
+        self.key_detector.feed(event.event_type, event.scan_code, event.time)
+
+    def _on_activity_detected(self):
+        """Keys were held for detection_threshold seconds: suggest the focused app."""
+        exe, title, cls, monitor = self.get_window_info()
+
+        if not exe or exe == self.self_exe or exe == "HotSwap.exe":
+            return
+
+        decision = self.rules.decide(exe)
+        is_whitelisted = decision.whitelisted
+
+        was_locked = (exe == self.locked_app)
+        was_injected = (exe == self.last_injected_exe)
+
+        if (was_locked or was_injected) and not is_whitelisted:
+            self.locked_app = None
+            self.last_injected_exe = ""
+
+        if not is_whitelisted and not decision.blacklisted and not decision.temp_ignored:
+            self.suggested_app = exe
+            self.suggested_title = title
+            self.suggested_class = cls
+            if self.suggestion_shown != exe:
+                self.show_suggestion(exe, monitor_handle=monitor)
+        elif self.suggestion_shown:
+            self.hide_suggestion()
+
+    # =========================================================================
+    # OBS CONNECTION
+    # =========================================================================
+    def connect(self, password=None):
+        """Connect to OBS in the background with the given (or saved) password."""
+        if password is not None: self.password = password
+        self.clock.spawn(self.auto_connect_logic)
+
+    def auto_connect_logic(self):
+        max_retries = 3
+        password = self.password
+        if not password:
+            self.set_connection_status("Enter password first", TONE_WARNING)
+            return
+
+        hosts_to_try = ['127.0.0.1', 'localhost', '::1']
+        target_port = self.obs_port
+
+        for attempt in range(max_retries):
+            for host in hosts_to_try:
+                self.set_connection_status(f"Try {host}:{target_port}...", TONE_WARNING)
+
+                if self._diagnose_socket(host, target_port) == "OK":
+                    # Port is OPEN! Now try to log in.
+                    try:
+                        self._connect_obs(host, target_port, password)
+                        self._on_connect_success()
+                        return
+                    except Exception as e:
+                        error_msg = str(e).lower()
+                        log.warning("OBS", "Connect failed on open port: %s", error_msg)
+
+                        # If we found the port but failed to connect, we STOP here.
+                        if "authentication" in error_msg or "password" in error_msg or "4006" in error_msg:
+                            self.set_connection_status("Error: Incorrect WebSocket Password", TONE_DANGER)
+                        else:
+                            # Usually a handshake failure, which is often caused by the password too
+                            self.set_connection_status("Handshake Failed. Check Password?", TONE_DANGER)
+                        return
+
+            self.clock.sleep(1)
+
+        self.set_connection_status(
+            f"Connection Failed: is OBS open? Is the port correct? could not reach port: {target_port}.",
+            TONE_DANGER,
+        )
+
+    def _connect_obs(self, host, port, password):
+        """Open one multiplexed connection for requests and events, replacing any previous one."""
+        old_client = self.obs_client
+        self.obs_client = self.platform.open_obs(
+            host=host, port=port, password=password,
+            on_event=self.on_obs_event, on_disconnect=self._on_obs_connection_lost,
+            event_subscriptions=EVENT_SUB_HOTSWAP
+        )
+        self.obs_echoes.clear()
+        if old_client:
+            old_client.disconnect()
+
+    def _on_obs_connection_lost(self):
+        """Called from the OBS client when the socket drops."""
+        self.tasks.submit(self._on_obs_disconnect)
+
+    def _diagnose_socket(self, host, port):
+        """'OK' if the port accepts a connection, 'FAIL' for any failure."""
+        return "OK" if self.platform.probe_port(host, port) else "FAIL"
+
+    def on_obs_event(self, event):
+        try:
+            self.obs_state.handle_event(event)
+        except Exception as e:
+            log.warning("OBS", "State mirror failed on %s: %s", event.name, e)
+        self.hook_validator.handle_event(event)
+        # Our own SetInputSettings coming back: nothing changed that we don't know about
+        if self.obs_echoes.is_echo(event): return
+        try:
+            if event.name == "CurrentSceneCollectionChanged":
+                self.tasks.call_later(2.0, self.refresh_sources, key="refresh_sources")
+            elif event.name in ("SceneItemEnableStateChanged", "InputSettingsChanged", "CurrentProgramSceneChanged"):
+                self.last_injected_exe = ""
+        except Exception: pass
+
+    def _on_connect_success(self):
+        if self.view.on_connected() is False: return
+        self.set_connection_status("Connected", TONE_SUCCESS)
+        self._tracking_changed()
+        try: self.obs_state.seed(self.obs_client)
+        except Exception as e: log.warning("OBS", "Could not seed state mirror: %s", e)
+        self.refresh_sources()
+        for _ in range(3):
+            if self._get_obs_config(): break
+            self.clock.sleep(1)
+        self.check_disk_space()
+        self.save_settings()
+        self.stats.reset()
+        self.tasks.every(self.stats.interval, self.stats.poll, key="stats", initial_delay=0)
+        self.tasks.every(DISK_CHECK_INTERVAL, self.check_disk_space, key="disk")
+        if self._pending_auto_tracking:
+            self._pending_auto_tracking = False
+            self.set_tracking(True)
+
+    def _on_obs_disconnect(self):
+        """Handle OBS disconnecting (closed, crashed, etc.)."""
+        with self._connection_lock:
+            old_client = self.obs_client
+            if old_client is None:
+                return  # Already disconnected, don't re-trigger
+            self.obs_client = None
+        self.obs_state.reset()
+        self.tasks.cancel("stats")
+        self.tasks.cancel("disk")
+        self.hook_validator.cancel()
+        self.view.on_health(None, None)
+        try: old_client.disconnect()
+        except Exception: pass
+        self.is_tracking = False
+        self._tracking_changed()
+        self.set_app_status("OBS Disconnected", TONE_DANGER)
+        self.set_connection_status("Reconnecting...", TONE_WARNING)
+        self.view.on_alert_status("SYSTEM NORMAL", TONE_MUTED)
+        self._reset_detection_state()
+        # Start auto-reconnect in background
+        self.clock.spawn(self._auto_reconnect_loop)
+
+    def _auto_reconnect_loop(self):
+        """Periodically try to reconnect to OBS after disconnect."""
+        password = self.password
+        if not password:
+            self.set_connection_status("Disconnected - no password set", TONE_DANGER)
+            return
+        hosts_to_try = ['127.0.0.1', 'localhost']
+        while self.obs_client is None:
+            self.clock.sleep(5)
+            for host in hosts_to_try:
+                try:
+                    self._connect_obs(host, self.obs_port, password)
+                    self._on_connect_success()
+                    return
+                except Exception:
+                    continue
+
+    # =========================================================================
+    # OBS SOURCES / RECORDING
+    # =========================================================================
+    def refresh_sources(self):
+        if not self.obs_client: return
+        try:
+            try:
+                collection_resp = self.obs_client.get_scene_collection_list()
+                new_collection = collection_resp.current_scene_collection_name
+                if self.current_scene_collection is not None and new_collection != self.current_scene_collection:
+                    self._save_collection_sources(self.current_scene_collection)
+                self.current_scene_collection = new_collection
+            except Exception: pass
+
+            resp = self.obs_client.get_input_list()
+            video_inputs = []
+            audio_inputs = []
+            raw_list = resp.inputs if hasattr(resp, 'inputs') else resp
+            video_kinds = ("game_capture", "window_capture")
+            audio_kinds = ("wasapi_process_output_capture", "wasapi_input_capture", "wasapi_output_capture")
+            for item in raw_list:
+                name = (getattr(item, 'inputName', None) or getattr(item, 'input_name', None) or item.get('inputName') or item.get('input_name'))
+                kind = (getattr(item, 'inputKind', None) or getattr(item, 'input_kind', None) or item.get('inputKind') or item.get('input_kind') or "")
+                if not name: continue
+                if kind in video_kinds:
+                    video_inputs.append(name)
+                if kind in audio_kinds or kind in video_kinds:
+                    audio_inputs.append(name)
+
+            if video_inputs or audio_inputs:
+                self.source_choices = (video_inputs or ["No capture sources found"], audio_inputs or ["No audio sources found"])
+                saved = self.scene_collection_sources.get(self.current_scene_collection) if self.current_scene_collection else None
+                if saved is not None:
+                    saved_video = saved.get("video_source", "")
+                    saved_audio = saved.get("audio_source", "")
+                    if saved_video in video_inputs: self.video_source = saved_video
+                    elif self.video_source not in video_inputs: self.video_source = VIDEO_PLACEHOLDER
+                    if saved_audio in audio_inputs: self.audio_source = saved_audio
+                    elif self.audio_source not in audio_inputs: self.audio_source = AUDIO_PLACEHOLDER
+                else:
+                    if self.video_source not in video_inputs: self.video_source = VIDEO_PLACEHOLDER
+                    if self.audio_source not in audio_inputs: self.audio_source = AUDIO_PLACEHOLDER
+            else:
+                self.video_source = "No capture sources found"
+                self.audio_source = "No audio sources found"
+        except Exception: self.video_source = "Error loading sources"
+        self.view.on_sources(*self.source_choices)
+
+    def _save_collection_sources(self, collection_name):
+        if not collection_name: return
+        video, audio = self.video_source, self.audio_source
+        if source_ready(video) or source_ready(audio):
+            self.scene_collection_sources[collection_name] = {"video_source": video if source_ready(video) else "", "audio_source": audio if source_ready(audio) else ""}
+            self.save_settings()
+
+    def check_disk_space(self):
+        clean_path = os.path.normpath(self.recording_folder)
+        try:
+            if not os.path.exists(clean_path):
+                self.view.on_disk(clean_path, None, f"Path not found: {clean_path}", TONE_DANGER)
+                return
+            total, used, free = shutil.disk_usage(clean_path)
+            free_gb = free / (1024 ** 3)
+            total_bitrate = self.current_bitrate + 320
+            if total_bitrate <= 0: total_bitrate = 6000
+            minutes_left = (free_gb * 1024 * 1024 * 8) / (total_bitrate * 60)
+            time_str = f"~{int(minutes_left // 60)}h {int(minutes_left % 60)}m recording time"
+            if free_gb < 10:
+                self.view.on_disk(clean_path, free / total, f"Critical: {free_gb:.1f} GB ({time_str})", TONE_DANGER)
+            elif free_gb < 50:
+                self.view.on_disk(clean_path, free / total, f"Low: {free_gb:.1f} GB ({time_str})", TONE_WARNING)
+            else:
+                self.view.on_disk(clean_path, free / total, f"{free_gb:.1f} GB available ({time_str})", TONE_MUTED)
+        except Exception as e: self.view.on_disk(clean_path, None, f"Error checking disk: {e}", TONE_DANGER)
+
+    def _get_obs_config(self):
+        if not self.obs_client: return False
+        try:
+            resp_dir = self.obs_client.get_record_directory()
+            directory = getattr(resp_dir, 'record_directory', None) or getattr(resp_dir, 'recordDirectory', None)
+            if directory:
+                self.recording_folder = os.path.normpath(directory)
+                return True
+        except Exception: pass
+        return False
+
+    def _is_blocked_by_display_capture(self, target_source):
+        """Check if a Display Capture is currently VISIBLE and ABOVE our target."""
+        if not self.obs_client: return False
+
+        try:
+            items = self.obs_state.program_items()
+
+            target_index = 999
+            for item in items:
+                if item['sourceName'] == target_source:
+                    target_index = item['sceneItemIndex']
+                    break
+
+            for item in items:
+                # Above us and visible?
+                if item['sceneItemIndex'] < target_index and item['sceneItemEnabled']:
+                    kind = item.get('inputKind', '').lower()
+                    name = item['sourceName'].lower()
+                    # Standard Display Capture types or names
+                    if "monitor_capture" in kind or "display_capture" in kind or "display capture" in name:
+                        return True
+            return False
+
+        except Exception:
+            # If we can't check, assume we are safe to proceed to avoid breaking functionality
+            return False
+
+    # =========================================================================
+    # SWITCHING
+    # =========================================================================
+    def update_obs(self, exe_name, window_title, class_name, is_new_switch=False, traced=False):
+        """Update OBS. Includes strict checks to ensure we don't switch when disabled.
+        `traced`: the tracking loop opened a SwitchTracer trace for this switch."""
+        with self._switch_lock:
+            self._update_obs(exe_name, window_title, class_name, is_new_switch, traced)
+
+    def _update_obs(self, exe_name, window_title, class_name, is_new_switch, traced, validate=True):
+        """update_obs() for callers already holding _switch_lock. `validate`: start hook validation."""
+        if self.demo_mode:
+            log.info("Demo", "Pretending to switch to: %s", exe_name)
+            return
+
+        # We allow 'is_new_switch' (F9 Manual Add) to bypass this,
+        # but automatic background switches must pass this check.
+        if not self.is_tracking and not is_new_switch:
+            return
+
+        if not self.obs_client: return
+
+        vid = self.video_source
+        aud = self.audio_source
+
+        # --- DISPLAY CAPTURE LOGIC ---
+        if source_ready(vid) and self._is_blocked_by_display_capture(vid):
+            if is_new_switch:
+                log.info("OBS", "OVERRIDE: Display Capture is active, but New Game detected. Switching anyway.")
+            else:
+                # If it's NOT a new switch (just maintenance), we back off.
+                return
+
+        safe_title = (window_title or "Untitled").replace(":", "#3A")
+        target = f"{safe_title}:{class_name}:{exe_name}"
+        video_ready = source_ready(vid)
+        audio_ready = source_ready(aud)
+
+        try:
+            # --- 1. WHAT IS THE VIDEO SOURCE POINTING AT? ---
+            # Read from the state mirror; OBS events keep it current.
+            is_swap = False
+            if video_ready:
+                current_window = self.obs_state.input_settings(vid).get("window", "")
+                is_swap = current_window != target
+
+            # --- 2. BUILD THE SWITCH AS ONE ORDERED BATCH ---
+            batch = RequestBatch()
+            if is_swap:
+                new_settings = {"window": target}
+                if "window" in (self.obs_state.input_kind(vid) or "window_capture").lower():
+                    new_settings["priority"] = 2
+                batch.add("SetInputSettings", {"inputName": vid, "inputSettings": new_settings, "overlay": True}, tag="video")
+
+            if audio_ready and (is_swap or is_new_switch):
+                batch.add("SetInputSettings", {"inputName": aud, "inputSettings": {"window": target, "priority": 2}, "overlay": True}, tag="audio")
+                # Toggle Audio (OBS sleeps between the two writes, we don't)
+                batch.add("SetInputSettings", {"inputName": aud, "inputSettings": {"enabled": False}, "overlay": True}, tag="audio")
+                batch.sleep(50)
+                batch.add("SetInputSettings", {"inputName": aud, "inputSettings": {"enabled": True}, "overlay": True}, tag="audio")
+
+            # --- 3. AUTO-RECORD ---
+            # StartRecord on a running recording just answers OUTPUT_RUNNING, so no status query first
+            if self.auto_record and (is_swap or is_new_switch):
+                batch.add("StartRecord", tag="record")
+
+            self.obs_echoes.expect_batch(batch)
+            results = batch.execute(self.obs_client)
+
+            failures = [r for r in results if not r.ok and not (r.tag == "record" and r.code == STATUS_OUTPUT_RUNNING)]
+            for r in failures:
+                log.warning("OBS", "%s", r.describe())
+            video_failed = any(r.tag == "video" for r in failures)
+
+            if audio_ready and any(r.tag == "audio" for r in results) and not any(r.tag == "audio" for r in failures):
+                self.obs_state.apply_input_settings(aud, {"window": target, "priority": 2, "enabled": True})
+
+            if is_swap and not video_failed:
+                if traced: self.tracer.mark(exe_name, MARK_APPLIED)
+                else: self.tracer.discard(exe_name)  # Switched some other way: don't time its hook against an old trace
+                self.obs_state.apply_input_settings(vid, new_settings)
+                self.total_swaps += 1
+                self.view.on_swaps(self.total_swaps)
+                self.save_settings()
+                log.info("OBS", "Switched '%s' to: %s", vid, exe_name)
+
+                if self.auto_fit:
+                    self._auto_fit_source(vid, exe_name)
+
+                if validate: self.hook_validator.start(vid, exe_name)
+
+            if failures:
+                self.set_app_status(f"OBS Error: {failures[0].describe()[:30]}", TONE_DANGER)
+
+        except Exception as e:
+            error_msg = str(e).lower()
+            log.error("OBS", "Update error: %s", e)
+            if "10054" in error_msg or "10053" in error_msg or "connection" in error_msg or "closed" in error_msg or "eof" in error_msg:
+                self.tasks.submit(self._on_obs_disconnect)
+            elif "scene" not in error_msg:
+                self.set_app_status(f"OBS Error: {str(e)[:30]}", TONE_DANGER)
+
+    def _auto_fit_source(self, source_name, exe):
+        """Fit the source to the canvas once the game's window settles, and again on every resize."""
+        state = {"hwnd": None}
+
+        def read_size():
+            # Only sample while the game has focus (as of the tracking loop's last look), following its window
+            hwnd, focused_exe = self.focused_window
+            if focused_exe != exe: return None
+            state["hwnd"] = hwnd
+            return self.platform.client_size(hwnd)
+
+        self.fit_watcher.watch((source_name, exe, state), read_size)
+
+    def _on_game_geometry(self, key, size):
+        """GeometryWatcher thread: the game's client size settled on a new value."""
+        source_name, exe, state = key
+        try:
+            if not self.obs_client or not self.auto_fit:
+                return
+
+            # Are we still on the tracked game? Compare to what HotSwap THINKS it injected.
+            if exe != self.last_injected_exe:
+                # Not handled yet, so the watcher reports this size again later.
+                return False
+
+            window_width, window_height = size
+            log.info("Fit", "%s settled at %dx%d", exe, window_width, window_height)
+
+            # Get monitor for popup positioning
+            monitor = self.platform.monitor_from_window(state["hwnd"])
+
+            current_scene = self.obs_state.program_scene
+            items = self.obs_state.program_items()
+            target_item = next((i for i in items if i['sourceName'] == source_name), None)
+
+            if target_item:
+                item_id = target_item['sceneItemId']
+                res = ObsResponse(self.obs_state.video_settings)
+
+                new_transform = {
+                    "boundsAlignment": 0,
+                    "boundsWidth": res.base_width,
+                    "boundsHeight": res.base_height,
+                    "boundsType": "OBS_BOUNDS_SCALE_INNER"
+                }
+                self.obs_client.set_scene_item_transform(current_scene, item_id, new_transform)
+                if self.tracer.mark(exe, MARK_FITTED): self._show_latency(exe)
+
+                if window_width > 0 and window_height > 0:
+                    canvas_ar = res.base_width / res.base_height
+                    source_ar = window_width / window_height
+                    diff = abs(canvas_ar - source_ar)
+
+                    size_match = (window_width == res.base_width and window_height == res.base_height)
+
+                    if diff > 0.01 and not size_match:
+                        if diff > 0.1:
+                            issue_type = "Ultrawide" if source_ar > canvas_ar else "Boxy (4:3)"
+                        else:
+                            issue_type = f"{window_width}x{window_height} (black bars possible)"
+
+                        self.view.on_alert_status(f"Resolution: {issue_type}", TONE_WARNING)
+
+                        # Once per game per session
+                        game_history = self.session_alerts.setdefault(self.last_injected_exe, set())
+                        if "aspect_ratio" not in game_history and self.popup_notifications_enabled:
+                            game_history.add("aspect_ratio")
+                            self.alert(ALERT_ASPECT_RATIO, "Aspect Ratio Warning", f"Game is {issue_type}", 6000, monitor=monitor)
+        except Exception: pass
+
+    def _show_latency(self, exe):
+        self.view.on_latency(self.tracer.describe(exe), self.tracer.describe())
+
+    def _on_hook_result(self, source_name, exe, ok, elapsed):
+        """Hook validation finished."""
+        if ok:
+            avg = self.hook_validator.hook_times.average(exe)
+            self.view.on_hook_time(f"{exe} hooked in {elapsed:.1f}s (avg {avg:.1f}s)")
+            if self.tracer.mark(exe, MARK_ACTIVE): self._show_latency(exe)
+            log.info("OBS", "'%s' active after %.2fs (%s)", source_name, elapsed, exe)
+            self.save_settings()  # Keep the learned hook times
+            return
+        log.warning("OBS", "'%s' not active after %.1fs (%s)", source_name, elapsed, exe)
+        self.set_app_status("Capture may have failed - try Admin?", TONE_WARNING)
+        self.alert(ALERT_CAPTURE_FAILED, "Capture Warning", "Game may need Administrator mode", 6000,
+                   monitor=self.current_monitor_handle)
+
+    # =========================================================================
+    # TRACKING
+    # =========================================================================
+    def set_tracking(self, enabled):
+        """Turn automatic switching on or off. Returns whether tracking is now on."""
+        if enabled:
+            if self.is_tracking: return True
+            if not self.obs_client:
+                self.set_app_status("Connect to OBS first", TONE_WARNING)
+                self._tracking_changed()
+                return False
+            if not source_ready(self.video_source):
+                self.set_app_status("Set Video Source in Settings", TONE_WARNING)
+                self._tracking_changed()
+                return False
+            self._reset_detection_state()
+            self.is_tracking = True
+            self._tracking_changed()
+            self.set_app_status("Scanning...", TONE_PRIMARY)
+            self.clock.spawn(self.tracking_loop)
+        else:
+            self.is_tracking = False
+            self.focus_changed.set()  # Wake the tracking loop so it exits now
+            self._reset_detection_state()
+            self._tracking_changed()
+            self.set_app_status("Paused", TONE_MUTED)
+            self.view.on_alert_status("SYSTEM NORMAL", TONE_MUTED)
+        self.save_settings()
+        return self.is_tracking
+
+    def toggle_tracking(self):
+        return self.set_tracking(not self.is_tracking)
+
+    def _on_foreground_changed(self, hwnd):
+        """Called from the foreground event source whenever focus moves."""
+        self.tracer.focus_observed()
+        self.focus_changed.set()
+        # Keys held across an alt-tab count towards the NEW window from now on
+        self.key_detector.rearm()
+
+    def _on_window_event(self, hwnd, kind):
+        """Window listener, after the identity cache has dropped the window's entry."""
+        if kind == WINDOW_MOVED:
+            self.fit_watcher.poke()
+        elif kind == WINDOW_RENAMED and hwnd == self.focused_window[0]:
+            # Same window, new title: title-based rules re-check now rather than on the safety poll
+            self.focus_changed.set()
+
+    def tracking_loop(self):
+        """Main tracking loop. Wakes on focus changes; polling is only a safety net."""
+        next_focus_poll = 0
+        retry_at = None
+        focus_at = None
+        poll_interval = FOCUS_SAFETY_POLL if self.foreground_source else FOCUS_POLL_NO_EVENTS
+        self.focus_changed.set()  # Evaluate whatever is focused right now
+
+        while self.is_tracking:
+            now = self.clock.time()
+            if self.focus_changed.is_set() or now >= next_focus_poll or (retry_at and now >= retry_at):
+                self.focus_changed.clear()
+                # A focus change counts for this evaluation only, or for its retry while debounced
+                taken = self.tracer.take_focus()
+                if taken is not None: focus_at = taken
+                retry_at = self._evaluate_foreground(focus_at)
+                if retry_at is None: focus_at = None
+                next_focus_poll = self.clock.time() + poll_interval
+
+            wake_at = min(next_focus_poll, retry_at or next_focus_poll)
+            self.focus_changed.wait(max(0.0, wake_at - self.clock.time()))
+
+    def _evaluate_foreground(self, focus_at=None):
+        """Runs the switching logic for the focused window. Returns a retry time while debounced."""
+        evaluated = self.clock.monotonic()
+        exe, title, cls, monitor = self.get_window_info()
+
+        if not exe or exe == self.self_exe or exe == "HotSwap.exe":
+            return None
+
+        # Remember where the user is looking, even for ignored apps
+        if monitor:
+            self.current_monitor_handle = monitor
+
+        decision = self.rules.decide(exe)
+        allowed = decision.whitelisted
+
+        # Once per game per session
+        if decision.anticheat and self.game_detection_enabled:
+            game_history = self.session_alerts.setdefault(exe, set())
+            if "anticheat" not in game_history:
+                game_history.add("anticheat")
+                self.alert(ALERT_ASPECT_RATIO, "Anti-Cheat Detected", f"{exe}\nConsider enabling Safe Mode", 8000,
+                           monitor=self.current_monitor_handle)
+
+        # A pre-targeted game keeps the capture while its launcher still has focus
+        with self._switch_lock:
+            if not allowed and self.last_injected_exe != self.pretargeted_exe: self.last_injected_exe = ""
+
+        if "failed" not in self.app_status[0].lower():
+            status = "Tracking" if allowed else "Ignored"
+            self.set_app_status(f"{exe} ({status})", TONE_PRIMARY if allowed else TONE_MUTED)
+        if not allowed: return None
+
+        # Checked and sent under the lock so a pre-target can't land in between
+        with self._switch_lock:
+            # Debounce check: come back as soon as the window is open again instead of on the next poll
+            if self.clock.time() - self.last_switch_time < SWITCH_DEBOUNCE:
+                return self.last_switch_time + SWITCH_DEBOUNCE
+
+            first_focus = exe == self.pretargeted_exe
+            self.pretargeted_exe = None
+            if exe != self.last_injected_exe:
+                self.tracer.begin(exe, evaluated, focus_at)
+                self._update_obs(exe, title, cls, True, True)
+                self.last_injected_exe = exe
+                self.last_switch_time = self.clock.time()
+            else:
+                # MAINTENANCE: no switching sounds/notifications on re-detect
+                self._update_obs(exe, title, cls, False, False, validate=not first_focus)
+                if first_focus and self.obs_client and source_ready(self.video_source):
+                    self.hook_validator.start(self.video_source, exe)
+        return None
+
+    def get_window_info(self):
+        try:
+            hwnd = self.platform.foreground_window()
+            if hwnd == 0:
+                self.focused_window = (None, None)
+                return None, None, None, None
+
+            # Title/class/monitor and the exe come from the shared identity cache;
+            # it only hits Win32/psutil when the window or process is new to us.
+            exe_name, window_title, class_name, monitor = self.identity.window_info(hwnd)
+            self.focused_window = (hwnd, exe_name)
+            if not exe_name:
+                # Protected process (or it just exited) - fail safely
+                return None, None, None, None
+            return exe_name, window_title, class_name, monitor
+        except Exception:
+            return None, None, None, None
+
+    def _is_process_running(self, exe_name):
+        if self.process_watcher.primed:
+            return self.process_watcher.is_running(exe_name)
+        try:
+            for name in self.platform.process_names():
+                if name == exe_name: return True
+        except Exception: pass
+        return False
+
+    # =========================================================================
+    # PROCESS LIFECYCLE (launch pre-targeting / instant lock release)
+    # =========================================================================
+    def _on_process_event(self, kind, exe, pid):
+        """Called from the process watcher thread when a whitelisted exe starts or exits."""
+        if kind == PROCESS_STARTED:
+            if self.is_tracking:
+                self.tasks.submit(self._pretarget_launch, exe, pid, key=("pretarget", exe))
+        elif kind == PROCESS_EXITED and not self.process_watcher.is_running(exe):
+            if exe in (self.locked_app, self.last_injected_exe):
+                log.info("Lifecycle", "%s exited, releasing focus lock", exe)
+                self._reset_detection_state(exe)
+                self.focus_changed.set()
+
+    def _pretarget_launch(self, exe, pid, deadline=None):
+        """Point the capture at a just-launched game's window before it takes focus."""
+        if deadline is None: deadline = self.clock.time() + PRETARGET_TIMEOUT
+        if not self.is_tracking or pid not in self.process_watcher.pids(exe): return
+        hwnd, title, cls = self.platform.find_main_window(pid)
+        if not hwnd:
+            # No window yet: look again shortly instead of holding a worker
+            if self.clock.time() < deadline:
+                self.tasks.call_later(0.5, self._pretarget_launch, exe, pid, deadline, key=("pretarget", exe))
+            return
+        with self._switch_lock:
+            if exe == self.last_injected_exe: return
+
+            # Don't steal the source from another game that is still running
+            captured = self._current_capture_exe()
+            if captured and captured != exe and self._is_process_running(captured): return
+
+            log.info("Lifecycle", "Pre-targeting %s (%s)", exe, title)
+            # Recorded like a focus switch, so focusing the game later is maintenance, not a second batch.
+            # Its hook is validated once it has focus: a loading game isn't drawing yet.
+            self._update_obs(exe, title, cls, True, False, validate=False)
+            self.last_injected_exe = exe
+            self.pretargeted_exe = exe
+            self.last_switch_time = self.clock.time()
+
+    def _current_capture_exe(self):
+        """Exe the video source currently points at (OBS stores "title:class:exe")."""
+        vid = self.video_source
+        if not self.obs_client or not source_ready(vid): return None
+        try:
+            window = self.obs_state.input_settings(vid).get("window", "")
+        except Exception:
+            return None
+        return window.rsplit(":", 1)[-1] if window else None
+
+    def _on_stats_health(self, health):
+        """Called after every stats sample."""
+        if not self.obs_client: return
+        self.view.on_health(health, self.tasks.stats())
+
+        # The status banner only reflects performance while tracking
+        if not self.is_tracking or not self.frame_drop_alerts_enabled: return
+        if health.level == LEVEL_DROP:
+            burst = health.dropped > self.frame_drop_threshold
+            message = f"Dropped {health.dropped} frames!" if burst else f"Dropping {health.drop_rate * 100:.1f}% of frames"
+            self.view.on_alert_status(message, TONE_DANGER, banner=True)
+            now = self.clock.time()
+            recently_switched = (now - self.last_switch_time) < 5
+            # At most one popup per cooldown while drops go on (the overlay also merges repeats: "Dropped 45 → 310 frames!")
+            cooling_down = now - self.last_alert_time < FRAME_DROP_ALERT_COOLDOWN
+            if not recently_switched and not cooling_down:
+                self.last_alert_time = now
+                self.alert(ALERT_FRAME_DROP, "Performance Warning", message, 8000,
+                           monitor=self.current_monitor_handle,
+                           value=health.dropped if burst else None,
+                           template="Dropped {} frames!" if burst else None)
+        elif health.level == LEVEL_MINOR:
+            if health.dropped:
+                self.view.on_alert_status(f"Minor stutter ({health.dropped} frames)", TONE_WARNING)
+            else:
+                self.view.on_alert_status(f"Slow renders ({health.render_p95:.1f} ms)", TONE_WARNING)
+        else:
+            self.view.on_alert_status("SYSTEM NORMAL", TONE_MUTED)
+
+    # =========================================================================
+    # RULE LISTS
+    # =========================================================================
+    def _list(self, list_type):
+        return self.whitelist if list_type == "whitelist" else self.blacklist
+
+    def add_to_list(self, list_type, exe):
+        target = self._list(list_type)
+        if exe and exe not in target:
+            target.append(exe)
+            self._lists_changed(list_type)
+            self.save_settings()
+
+    def remove_from_list(self, list_type, item):
+        target = self._list(list_type)
+        if item in target:
+            target.remove(item)
+            self._lists_changed(list_type)
+            self.save_settings()
+            if list_type == "whitelist":
+                self._reset_detection_state(item)
+
+    def clear_list(self, list_type):
+        target = self._list(list_type)
+        if not target: return
+        if list_type == "whitelist":
+            for item in list(target): self._reset_detection_state(item)
+        target.clear()
+        self._lists_changed(list_type)
+        self.save_settings()
+
+    def _reset_detection_state(self, exe_name=None):
+        if exe_name:
+            if self.last_injected_exe == exe_name: self.last_injected_exe = ""
+            if self.pretargeted_exe == exe_name: self.pretargeted_exe = None
+            watched = self.fit_watcher.key
+            if watched and watched[1] == exe_name: self.fit_watcher.unwatch()
+            if self.locked_app == exe_name: self.locked_app = None
+            if self.suggested_app == exe_name:
+                self.hide_suggestion()
+            if exe_name in self.temp_ignore_list:
+                self.temp_ignore_list.remove(exe_name)
+                self._compile_rules("temp_ignore")
+        else:
+            self.last_injected_exe = ""
+            self.pretargeted_exe = None
+            self.fit_watcher.unwatch()
+            self.locked_app = None
+            self.temp_ignore_list.clear()
+            self._compile_rules("temp_ignore")
+            self.hide_suggestion()
+
+    def _compile_rules(self, *list_names):
+        """Recompile the rule matcher after a list changed (all lists when none given)."""
+        sources = {
+            "whitelist": self.whitelist,
+            "blacklist": self.blacklist,
+            "temp_ignore": self.temp_ignore_list,
+            "anticheat": self.anticheat_games,
+        }
+        for name in list_names or sources:
+            self.rules.set_list(name, sources[name])
+
+    def _lists_changed(self, list_type):
+        # Every whitelist/blacklist edit comes through here, so this is where the compiled rules are refreshed
+        self._compile_rules(list_type)
+        if list_type == "whitelist": self.process_watcher.refresh_watch()
+        self.view.on_lists(list_type)
+
+
+# =========================================================================
+# HEADLESS
+# =========================================================================
+class ConsoleView(EngineView):
+    """Headless front end: prints what the window would show."""
+
+    def __init__(self):
+        self.last_alert = None   # (kind, shown_at, duration)
+        self._last = {}
+
+    def _print(self, topic, text):
+        if self._last.get(topic) == text: return
+        self._last[topic] = text
+        print(f"[{topic}] {text}")
+
+    def on_connection(self, text, tone): self._print("OBS", text)
+    def on_tracking(self, tracking, connected): self._print("Tracking", "ON" if tracking else ("OFF" if connected else "waiting for OBS"))
+    def on_app_status(self, text, tone): self._print("App", text)
+    def on_alert_status(self, text, tone, banner=False): self._print("Status", text)
+    def on_hook_time(self, text): self._print("Hook", text)
+    def on_latency(self, game, overall):
+        if game: self._print("Latency", game)
+    def on_suggestion(self, exe):
+        if exe: self._print("Detected", f"{exe} (quick-add hotkey adds it)")
+    def on_demo_mode(self, enabled): self._print("Demo", "ON" if enabled else "OFF")
+
+    def on_alert(self, alert):
+        self.last_alert = (alert.kind, time.monotonic(), alert.duration / 1000)
+        print(f"[Alert] {alert.title}: {alert.message}".replace("\n", " "))
+
+    def on_alerts_cleared(self, kind=None):
+        if self.last_alert and kind in (None, self.last_alert[0]): self.last_alert = None
+
+    def visible_alert(self):
+        if not self.last_alert: return None
+        kind, shown_at, duration = self.last_alert
+        return kind if time.monotonic() - shown_at < duration else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run HotSwap's engine without the window.")
+    parser.add_argument(HEADLESS_FLAG, action="store_true", help="accepted so HotSwap.py can pass its arguments on")
+    parser.add_argument("--config", default=CONFIG_FILE, help="config.json to read and update (default: the window's)")
+    args = parser.parse_args(argv)
+
+    if acquire_single_instance() is None:
+        print("HotSwap is already running!")
+        return 1
+
+    log.start(LOG_FILE, echo=sys.stdout)
+    log.install_crash_handler(CRASH_FILE)
+    log.info("App", "--- HotSwap v%s (headless) ---", APP_VERSION)
+    engine = HotSwapEngine(config_file=args.config)
+    engine.attach(ConsoleView())
+    engine.load_settings(engine.read_config())
+    if not engine.password:
+        print(f"No OBS WebSocket password in {args.config}; set one up in the HotSwap window first.")
+        log.stop()
+        return 1
+
+    engine.start()
+    engine.connect()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        print("Stopping...")
+    finally:
+        engine.shutdown()
+        log.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
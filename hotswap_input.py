@@ -0,0 +1,143 @@
+"""Key activity detection for HotSwap's "Game Detected" suggestions."""
+import time
+
+from hotswap_clock import SYSTEM_CLOCK
+
+
+def keyboard_scan_codes(combo):
+    """Resolve a combo like "shift+w" into one set of scan codes per key."""
+    import keyboard
+    steps = keyboard.parse_hotkey(combo)
+    if len(steps) != 1:
+        raise ValueError(f"Key sequences are not supported for activity detection: {combo}")
+    return [set(codes) for codes in steps[0]]
+
+
+class KeyActivityDetector:
+    """
+    Tracks how long the detection combos have been held, from press/release events.
+
+    Combos are compiled once into scan-code sets, so each event is a set lookup
+    instead of re-parsing combo strings. Activity starts when any combo becomes
+    held and ends when none are; the detector fires once per activity period,
+    as soon as it has lasted `threshold` seconds.
+    """
+
+    def __init__(self, combos=(), threshold=2.0, resolver=keyboard_scan_codes, clock=time.time, timebase=SYSTEM_CLOCK):
+        self.threshold = threshold
+        self.resolver = resolver
+        self.clock = clock
+        self.pressed = set()
+        self.held_since = {}  # combo -> time it became held
+        self.active_since = None
+        self.fired = False
+        self._cond = timebase.Condition()
+        self._interrupted = False
+        self.set_combos(combos)
+
+    def set_combos(self, combos):
+        compiled = {}
+        by_code = {}
+        for combo in combos:
+            try:
+                parts = tuple(frozenset(p) for p in self.resolver(combo))
+            except Exception:
+                continue
+            if not parts or not all(parts): continue
+            compiled[combo] = parts
+            for part in parts:
+                for code in part:
+                    by_code.setdefault(code, []).append(combo)
+        with self._cond:
+            self._combos = compiled
+            self._by_code = by_code
+            self.held_since = {}
+            now = self.clock()
+            for combo, parts in compiled.items():
+                if self._is_held(parts): self.held_since[combo] = now
+            self._update_activity(now)
+
+    def feed(self, event_type, scan_code, t=None):
+        """Process one key event ("down"/"up"). Returns True if it completed a detection."""
+        combos = self._by_code.get(scan_code)
+        if combos is None:
+            return False
+        now = self.clock() if t is None else t
+        with self._cond:
+            if event_type == "down":
+                if scan_code in self.pressed: return self._check(now)  # Auto-repeat
+                self.pressed.add(scan_code)
+                for combo in combos:
+                    if combo not in self.held_since and self._is_held(self._combos[combo]):
+                        self.held_since[combo] = now
+            else:
+                self.pressed.discard(scan_code)
+                for combo in combos:
+                    if combo in self.held_since and not self._is_held(self._combos[combo]):
+                        del self.held_since[combo]
+            was_active = self.active_since is not None
+            self._update_activity(now)
+            if self.active_since is not None and not was_active:
+                self._cond.notify_all()
+            return self._check(now)
+
+    def check(self, now=None):
+        """Fire if activity has lasted long enough. Returns True once per activity period."""
+        with self._cond:
+            return self._check(self.clock() if now is None else now)
+
+    def due_at(self):
+        """Time the current activity will reach the threshold, or None."""
+        with self._cond:
+            if self.active_since is None or self.fired: return None
+            return self.active_since + self.threshold
+
+    def rearm(self, now=None):
+        """Restart the current activity period, e.g. after the foreground window changed."""
+        with self._cond:
+            if self.active_since is not None:
+                self.active_since = self.clock() if now is None else now
+            self.fired = False
+            self._cond.notify_all()
+
+    def interrupt(self):
+        """Wake a thread blocked in wait() without firing."""
+        with self._cond:
+            self._interrupted = True
+            self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until a detection fires (True), or timeout/interrupt (False)."""
+        end = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            self._interrupted = False
+            while True:
+                now = self.clock()
+                if self._check(now): return True
+                if self._interrupted: return False
+                remaining = None if end is None else end - now
+                if remaining is not None and remaining <= 0: return False
+                due = None if (self.active_since is None or self.fired) else self.active_since + self.threshold
+                if due is not None:
+                    remaining = due - now if remaining is None else min(remaining, due - now)
+                self._cond.wait(remaining)
+
+    def _is_held(self, parts):
+        pressed = self.pressed
+        return all(not pressed.isdisjoint(part) for part in parts)
+
+    def _update_activity(self, now):
+        if self.held_since:
+            if self.active_since is None:
+                self.active_since = now
+                self.fired = False
+        else:
+            self.active_since = None
+            self.fired = False
+
+    def _check(self, now):
+        if self.fired or self.active_since is None: return False
+        if now - self.active_since >= self.threshold:
+            self.fired = True
+            return True
+        return False
@@ -0,0 +1,91 @@
+"""Items and substring search behind HotSwap's virtualized lists. The widget itself is in hotswap_listview."""
+
+MIN_TRIGRAM_QUERY = 3   # Shorter queries scan the lowered names instead
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ListIndex:
+    """
+    The items behind a VirtualList plus a substring search over them.
+
+    sync() diffs a new item list against the current one and only indexes
+    or unindexes the entries that changed. Queries of MIN_TRIGRAM_QUERY or
+    more characters are answered from a trigram index; shorter ones scan
+    the pre-lowered names. `view` is the matching items in list order.
+    """
+
+    def __init__(self, items=()):
+        self.items = []
+        self.view = []
+        self.query = ""
+        self._lowered = {}    # item -> lowercase text
+        self._trigrams = {}   # trigram -> set of items
+        self._matches = None  # Items matching query, None when unfiltered
+        self.sync(items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def sync(self, items):
+        """Take a new item list. Returns (added, removed)."""
+        items = list(dict.fromkeys(items))  # Duplicates would share a row
+        current, new = set(self.items), set(items)
+        added = [i for i in items if i not in current]
+        removed = [i for i in self.items if i not in new]
+        for item in removed: self._unindex(item)
+        for item in added: self._index(item)
+        if self._matches is not None:
+            self._matches.difference_update(removed)
+            q = self.query
+            self._matches.update(i for i in added if q in self._lowered[i])
+        self.items = items
+        self._refresh_view()
+        return added, removed
+
+    def search(self, query):
+        """Set of items containing query (case-insensitive)."""
+        q = query.lower()
+        if len(q) < MIN_TRIGRAM_QUERY:
+            return {i for i, low in self._lowered.items() if q in low}
+        buckets = []
+        for gram in _trigrams(q):
+            bucket = self._trigrams.get(gram)
+            if not bucket: return set()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        candidates = set(buckets[0])
+        for bucket in buckets[1:]:
+            candidates &= bucket
+            if not candidates: break
+        return {i for i in candidates if q in self._lowered[i]}
+
+    def set_query(self, query):
+        """Filter the view. Returns True if the view changed."""
+        query = (query or "").strip().lower()
+        if query == self.query: return False
+        self.query = query
+        self._matches = self.search(query) if query else None
+        self._refresh_view()
+        return True
+
+    def _refresh_view(self):
+        matches = self._matches
+        self.view = self.items if matches is None else [i for i in self.items if i in matches]
+
+    def _index(self, item):
+        low = str(item).lower()
+        self._lowered[item] = low
+        for gram in _trigrams(low):
+            self._trigrams.setdefault(gram, set()).add(item)
+
+    def _unindex(self, item):
+        low = self._lowered.pop(item, None)
+        if low is None: return
+        for gram in _trigrams(low):
+            bucket = self._trigrams.get(gram)
+            if bucket is None: continue
+            bucket.discard(item)
+            if not bucket: del self._trigrams[gram]
@@ -0,0 +1,125 @@
+"""Virtualized list widgets for HotSwap's rule and detection-key lists."""
+import customtkinter as ctk
+
+from hotswap_listindex import ListIndex
+
+ROW_HEIGHT = 40         # Logical pixels per row, including spacing
+WHEEL_ROWS = 3          # Rows scrolled per mouse wheel notch
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    A scrollable list that only has widgets for the rows on screen.
+
+    `make_row(parent)` builds one row and returns (frame, bind), where
+    bind(item) points the row's widgets at an item. A small pool of rows is
+    rebound to whichever slice of the view is visible, so thousands of
+    entries draw as fast as a handful. set_items() applies only the diff and
+    rows still showing the same item aren't touched. With `searchable`, a
+    search box filters through the ListIndex instead of rebuilding rows.
+    """
+
+    def __init__(self, master, make_row, count_text=None, empty_text="List empty", searchable=False,
+                 font=None, text_color=None, row_height=ROW_HEIGHT, **kwargs):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+        if "height" in kwargs: self.pack_propagate(False)
+        self.make_row = make_row
+        self.count_text = count_text
+        self.row_height = row_height
+        self.index = ListIndex()
+        self.top = 0
+        self._rows = []    # [frame, bind, bound item or None, placed]
+
+        caption = {"font": font, "text_color": text_color} if font else {"text_color": text_color}
+        if searchable:
+            self.search_var = ctk.StringVar()
+            self.entry_search = ctk.CTkEntry(self, textvariable=self.search_var, placeholder_text="Search...", height=32)
+            self.entry_search.pack(fill="x", padx=8, pady=(0, 4))
+            self.search_var.trace_add("write", lambda *_: self.set_query(self.search_var.get()))
+        self.lbl_count = ctk.CTkLabel(self, text="", **caption)
+        if count_text: self.lbl_count.pack(pady=(0, 4))
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.lbl_empty = ctk.CTkLabel(self.body, text=empty_text, **caption)
+        self.body.bind("<Configure>", lambda _: self._render(), add="+")
+        self._bind_wheel(self.body)
+
+    # --- Data ---
+    def set_items(self, items):
+        """Show a new item list, applying only what changed."""
+        added, removed = self.index.sync(items)
+        self._render()
+        return added, removed
+
+    def set_query(self, query):
+        if self.index.set_query(query):
+            self.top = 0
+            self._render()
+
+    # --- Scrolling ---
+    def _visible_rows(self):
+        pitch = self._apply_widget_scaling(self.row_height)
+        return max(1, int(self.body.winfo_height() // pitch))
+
+    def scroll_to(self, top):
+        limit = max(0, len(self.index.view) - self._visible_rows())
+        top = max(0, min(int(top), limit))
+        if top != self.top:
+            self.top = top
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * len(self.index.view)))
+        elif action == "scroll":
+            step = self._visible_rows() if unit == "pages" else 1
+            self.scroll_to(self.top + int(amount) * step)
+
+    def _on_wheel(self, event):
+        self.scroll_to(self.top - int(event.delta / 120) * WHEEL_ROWS)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel, add="+")
+        for child in widget.winfo_children(): self._bind_wheel(child)
+
+    # --- Rows ---
+    def _row(self, slot):
+        while len(self._rows) <= slot:
+            frame, bind = self.make_row(self.body)
+            self._bind_wheel(frame)
+            self._rows.append([frame, bind, None, False])
+        return self._rows[slot]
+
+    def _render(self):
+        view = self.index.view
+        visible = self._visible_rows()
+        self.top = max(0, min(self.top, len(view) - visible))
+        shown = min(visible, len(view) - self.top)
+        for slot in range(max(shown, len(self._rows))):
+            row = self._rows[slot] if slot >= shown else self._row(slot)
+            if slot < shown:
+                item = view[self.top + slot]
+                if row[2] != item:
+                    row[1](item)
+                    row[2] = item
+                if not row[3]:
+                    row[0].place(x=0, y=slot * self.row_height, relwidth=1.0)
+                    row[3] = True
+            elif row[3]:
+                row[0].place_forget()
+                row[2] = None
+                row[3] = False
+
+        if view: self.lbl_empty.place_forget()
+        else: self.lbl_empty.place(relx=0.5, y=16, anchor="n")
+        if self.count_text:
+            total = len(self.index)
+            text = self.count_text.format(total) if not self.index.query else f"Showing {len(view)} of {total}"
+            self.lbl_count.configure(text=text)
+        if view:
+            self.scrollbar.set(self.top / len(view), (self.top + shown) / len(view))
+        else:
+            self.scrollbar.set(0.0, 1.0)
@@ -0,0 +1,232 @@
+"""Non-blocking logging for HotSwap: callers append to a ring buffer, a background thread writes it out."""
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
+LOG_CAPACITY = 4096        # Records waiting for the flusher; past this the oldest are dropped
+CRASH_RECORDS = 200        # Most recent records kept for a crash dump
+FLUSH_INTERVAL = 0.5       # Seconds between writes (errors are written straight away)
+MAX_LOG_BYTES = 2 * 1024 * 1024
+LOG_BACKUPS = 3            # hotswap_debug.log.1 .. .3
+
+
+class RingLog:
+    """
+    Logger whose callers never touch the disk.
+
+    A call below `level` returns after one comparison. Anything else is
+    stored as a raw (time, level, topic, message, args) tuple - formatting
+    is left to the flusher - on two deques: `pending`, which the background
+    flusher drains in batches every FLUSH_INTERVAL, and `recent`, the last
+    CRASH_RECORDS records for dump_crash(). If the flusher falls behind,
+    the oldest pending records are dropped rather than blocking the caller.
+    The log file is appended to and rotated at `max_bytes`, keeping
+    `backups` old files. `echo` (a stream) gets a copy of every batch.
+    Until start() is called records only collect in memory.
+    """
+
+    def __init__(self, level=INFO, capacity=LOG_CAPACITY, crash_records=CRASH_RECORDS, clock=time.time):
+        self.level = level
+        self.clock = clock
+        self.pending = deque(maxlen=capacity)
+        self.recent = deque(maxlen=crash_records)
+        self.path = None
+        self.crash_path = None
+        self.echo = None
+        self.max_bytes = MAX_LOG_BYTES
+        self.backups = LOG_BACKUPS
+        self.written = 0
+        self.dropped = 0
+        self._file = None
+        self._size = 0
+        self._wake = None
+        self._thread = None
+        self._write_lock = threading.Lock()
+
+    # --- Callers ---
+    def log(self, level, topic, message, *args):
+        if level < self.level: return
+        record = (self.clock(), level, topic, message, args)
+        if len(self.pending) == self.pending.maxlen: self.dropped += 1
+        self.pending.append(record)
+        self.recent.append(record)
+        if level >= ERROR and self._wake is not None: self._wake.set()
+
+    def debug(self, topic, message, *args):
+        if DEBUG >= self.level: self.log(DEBUG, topic, message, *args)
+
+    def info(self, topic, message, *args):
+        if INFO >= self.level: self.log(INFO, topic, message, *args)
+
+    def warning(self, topic, message, *args):
+        if WARNING >= self.level: self.log(WARNING, topic, message, *args)
+
+    def error(self, topic, message, *args):
+        self.log(ERROR, topic, message, *args)
+
+    def exception(self, topic, message, *args):
+        """error() plus the traceback of the exception being handled."""
+        self.log(ERROR, topic, "%s\n%s", message % args if args else message, traceback.format_exc().rstrip())
+
+    def enabled(self, level):
+        """For messages that are expensive to build: `if log.enabled(DEBUG): log.debug(...)`."""
+        return level >= self.level
+
+    # --- Lifecycle ---
+    def start(self, path=None, echo=None, max_bytes=MAX_LOG_BYTES, backups=LOG_BACKUPS, interval=FLUSH_INTERVAL):
+        """Start writing to `path` (appended to, not truncated) and/or `echo` from a background thread."""
+        self.path = path
+        self.echo = echo
+        self.max_bytes = max_bytes
+        self.backups = backups
+        if path:
+            self._file = open(path, "a", encoding="utf-8")
+            self._size = self._file.tell()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True, name="log-flusher")
+        self._thread.start()
+
+    def stop(self):
+        """Write out everything pending and close the file."""
+        thread = self._thread
+        if thread is None: return
+        self._thread = None
+        self._wake.set()
+        thread.join(2.0)
+        self.flush()
+        with self._write_lock:
+            if self._file:
+                try: self._file.close()
+                except Exception: pass
+                self._file = None
+
+    def flush(self):
+        """Write the pending records now, on the calling thread."""
+        with self._write_lock:
+            lines = []
+            while True:
+                try: record = self.pending.popleft()
+                except IndexError: break
+                lines.append(self.format(record))
+            if not lines: return
+            if self.dropped:
+                lines.insert(0, self.format((self.clock(), WARNING, "Log", "Buffer was full, dropped %d records", (self.dropped,))))
+                self.dropped = 0
+            self._write("\n".join(lines) + "\n")
+            self.written += len(lines)
+
+    def _run(self, interval):
+        while self._thread is not None:
+            self._wake.wait(interval)
+            self._wake.clear()
+            try: self.flush()
+            except Exception: pass
+
+    def _write(self, text):
+        if self.echo is not None:
+            try:
+                self.echo.write(text)
+                self.echo.flush()
+            except Exception: pass
+        if self._file is None: return
+        self._file.write(text)
+        self._file.flush()
+        self._size += len(text.encode("utf-8", "replace"))
+        if self._size >= self.max_bytes: self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        try:
+            if self.backups > 0:
+                for i in range(self.backups - 1, 0, -1):
+                    if os.path.exists(f"{self.path}.{i}"): os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+                os.replace(self.path, f"{self.path}.1")
+        except OSError: pass
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    @staticmethod
+    def format(record):
+        t, level, topic, message, args = record
+        if args:
+            try: message = message % args
+            except Exception: message = f"{message} {args!r}"
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t)) + f".{int(t % 1 * 1000):03d}"
+        return f"{stamp} {LEVEL_NAMES.get(level, level):<5} [{topic}] {message}"
+
+    # --- Crashes ---
+    def install_crash_handler(self, path):
+        """Dump the recent records to `path` on any uncaught exception, in the main thread or any other."""
+        self.crash_path = path
+        previous_hook, previous_thread_hook = sys.excepthook, threading.excepthook
+
+        def excepthook(exc_type, exc, tb):
+            self.dump_crash((exc_type, exc, tb))
+            previous_hook(exc_type, exc, tb)
+
+        def thread_excepthook(args):
+            self.dump_crash((args.exc_type, args.exc_value, args.exc_traceback), thread=args.thread)
+            previous_thread_hook(args)
+
+        sys.excepthook = excepthook
+        threading.excepthook = thread_excepthook
+
+    def dump_crash(self, exc_info=None, thread=None):
+        """Write the last CRASH_RECORDS records and the traceback to crash_path, and flush the main log."""
+        exc_info = exc_info or sys.exc_info()
+        try: self.flush()
+        except Exception: pass
+        if not self.crash_path: return
+        lines = [f"--- HotSwap crash at {time.strftime('%Y-%m-%d %H:%M:%S')}"
+                 + (f" in thread {thread.name}" if thread is not None else "") + " ---",
+                 f"--- Last {len(self.recent)} log records ---"]
+        lines.extend(self.format(record) for record in list(self.recent))
+        if exc_info[0] is not None:
+            lines.append("--- Traceback ---")
+            lines.append("".join(traceback.format_exception(*exc_info)).rstrip())
+        try:
+            with open(self.crash_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception: pass
+
+
+class LogStream:
+    """
+    File-like stand-in for sys.stdout/sys.stderr that turns each written
+    line into a record. Windowed builds have no console, so stray prints
+    and library tracebacks end up in the log instead of nowhere.
+    """
+
+    def __init__(self, log, topic, level=INFO):
+        self.log = log
+        self.topic = topic
+        self.level = level
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        with self._lock:
+            self._buffer += text
+            if "\n" not in self._buffer: return len(text)
+            *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            if line.strip(): self.log.log(self.level, self.topic, line.rstrip())
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+log = RingLog()
@@ -0,0 +1,706 @@
+"""OBS WebSocket v5 client and helpers for HotSwap."""
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import queue
+import re
+import threading
+import time
+
+# Opcodes
+OP_HELLO = 0
+OP_IDENTIFY = 1
+OP_IDENTIFIED = 2
+OP_EVENT = 5
+OP_REQUEST = 6
+OP_REQUEST_RESPONSE = 7
+OP_REQUEST_BATCH = 8
+OP_REQUEST_BATCH_RESPONSE = 9
+
+RPC_VERSION = 1
+
+# EventSubscription flags
+EVENT_SUB_GENERAL = 1 << 0
+EVENT_SUB_CONFIG = 1 << 1
+EVENT_SUB_SCENES = 1 << 2
+EVENT_SUB_INPUTS = 1 << 3
+EVENT_SUB_TRANSITIONS = 1 << 4
+EVENT_SUB_FILTERS = 1 << 5
+EVENT_SUB_OUTPUTS = 1 << 6
+EVENT_SUB_SCENE_ITEMS = 1 << 7
+EVENT_SUB_MEDIA_INPUTS = 1 << 8
+EVENT_SUB_VENDORS = 1 << 9
+EVENT_SUB_UI = 1 << 10
+EVENT_SUB_ALL = 0x7FF  # Every non high-volume category
+EVENT_SUB_INPUT_ACTIVE_STATE_CHANGED = 1 << 17  # High-volume, opt-in
+EVENT_SUB_INPUT_SHOW_STATE_CHANGED = 1 << 18    # High-volume, opt-in
+# What the state mirror, hook validation and HotSwap actually read
+EVENT_SUB_HOTSWAP = (EVENT_SUB_CONFIG | EVENT_SUB_SCENES | EVENT_SUB_INPUTS | EVENT_SUB_SCENE_ITEMS
+                     | EVENT_SUB_INPUT_ACTIVE_STATE_CHANGED | EVENT_SUB_INPUT_SHOW_STATE_CHANGED)
+
+ECHO_TTL = 5.0
+CLOSE_AUTHENTICATION_FAILED = 4009
+DEFAULT_TIMEOUT = 5.0
+
+# RequestBatchExecutionType
+EXECUTION_SERIAL_REALTIME = 0
+
+# RequestStatus codes we treat specially
+STATUS_SUCCESS = 100
+STATUS_OUTPUT_RUNNING = 500
+
+
+class ObsError(Exception):
+    """Base class for OBS client errors."""
+
+
+class ObsConnectionError(ObsError):
+    """The connection to OBS failed or was closed."""
+
+
+class ObsTimeoutError(ObsError):
+    """OBS did not answer in time."""
+
+
+class ObsRequestError(ObsError):
+    """A request returned a failure status."""
+
+    def __init__(self, request_type, code, comment=None):
+        self.request_type = request_type
+        self.code = code
+        message = f"Request {request_type} returned code {code}."
+        if comment: message += f" With message: {comment}"
+        super().__init__(message)
+
+
+def to_snake_case(name):
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+class ObsResponse:
+    """
+    Response data with snake_case attributes (currentProgramSceneName ->
+    current_program_scene_name), like obsws_python's dataclasses. Nested
+    values stay plain dicts/lists.
+    """
+
+    def __init__(self, data=None):
+        self.data = data or {}
+        for key, value in self.data.items():
+            setattr(self, to_snake_case(key), value)
+
+    def attrs(self):
+        return [to_snake_case(k) for k in self.data]
+
+    def __repr__(self):
+        return f"ObsResponse({self.data!r})"
+
+
+class ObsEvent(ObsResponse):
+    """An OBS event: .name is the eventType, the eventData keys become attributes."""
+
+    def __init__(self, name, data=None):
+        super().__init__(data)
+        self.name = name
+
+    def __repr__(self):
+        return f"ObsEvent({self.name!r}, {self.data!r})"
+
+
+class BatchResult:
+    """Decoded result of one request inside a RequestBatch."""
+
+    def __init__(self, request_type, ok, code, comment=None, data=None, tag=None):
+        self.request_type = request_type
+        self.ok = ok
+        self.code = code
+        self.comment = comment
+        self.data = data or {}
+        self.tag = tag
+
+    def describe(self):
+        text = f"{self.request_type} returned code {self.code}"
+        return f"{text}: {self.comment}" if self.comment else text
+
+    def __repr__(self):
+        return f"BatchResult({self.request_type!r}, ok={self.ok}, code={self.code})"
+
+
+class RequestBatch:
+    """
+    An ordered list of OBS requests sent as one RequestBatch (op 8).
+
+    Requests run serially on OBS's side, so a Sleep request between two
+    writes replaces a client-side time.sleep() without another round-trip.
+    Failures don't halt the batch unless halt_on_failure is set; every
+    request gets its own BatchResult.
+    """
+
+    def __init__(self, halt_on_failure=False, execution_type=EXECUTION_SERIAL_REALTIME):
+        self.halt_on_failure = halt_on_failure
+        self.execution_type = execution_type
+        self.requests = []
+        self.tags = []
+
+    def add(self, request_type, data=None, tag=None):
+        request = {"requestType": request_type}
+        if data: request["requestData"] = data
+        self.requests.append(request)
+        self.tags.append(tag)
+        return len(self.requests) - 1
+
+    def sleep(self, millis):
+        return self.add("Sleep", {"sleepMillis": int(millis)})
+
+    def __len__(self):
+        return len(self.requests)
+
+    def payload(self, batch_id):
+        requests = [dict(r, requestId=f"{batch_id}-{i}") for i, r in enumerate(self.requests)]
+        return {
+            "op": OP_REQUEST_BATCH,
+            "d": {
+                "requestId": batch_id,
+                "haltOnFailure": self.halt_on_failure,
+                "executionType": self.execution_type,
+                "requests": requests,
+            },
+        }
+
+    def decode(self, response):
+        """Turn a RequestBatchResponse "d" object into one BatchResult per request sent."""
+        by_id = {r.get("requestId"): r for r in response.get("results", [])}
+        batch_id = response.get("requestId")
+        results = []
+        for i, request in enumerate(self.requests):
+            r = by_id.get(f"{batch_id}-{i}")
+            if r is None:
+                # Not executed (haltOnFailure stopped the batch early)
+                results.append(BatchResult(request["requestType"], False, None, "not executed", tag=self.tags[i]))
+                continue
+            status = r.get("requestStatus", {})
+            results.append(BatchResult(
+                r.get("requestType", request["requestType"]),
+                bool(status.get("result")),
+                status.get("code"),
+                status.get("comment"),
+                r.get("responseData"),
+                tag=self.tags[i],
+            ))
+        return results
+
+    def execute(self, client):
+        """Send the batch over an ObsClient and return the BatchResults in request order."""
+        if not self.requests: return []
+        return client.send_batch(self)
+
+
+class EchoFilter:
+    """
+    Remembers the SetInputSettings writes HotSwap sends so the
+    InputSettingsChanged events they cause can be told apart from changes
+    made in OBS by the user.
+
+    Register a write with expect() before sending it; is_echo() consumes the
+    oldest matching expectation. An event matches when it is for the same
+    input and its settings contain every value we wrote. Expectations for
+    writes that never echo (failed requests) expire after `ttl` seconds.
+    """
+
+    def __init__(self, ttl=ECHO_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.pending = {}  # input name -> list of (deadline, settings)
+        self.suppressed = 0
+        self._lock = threading.Lock()
+
+    def expect(self, input_name, settings):
+        with self._lock:
+            self.pending.setdefault(input_name, []).append((self.clock() + self.ttl, dict(settings)))
+
+    def expect_batch(self, batch):
+        """Register every SetInputSettings in a RequestBatch."""
+        for request in batch.requests:
+            if request["requestType"] == "SetInputSettings":
+                data = request.get("requestData", {})
+                self.expect(data.get("inputName"), data.get("inputSettings", {}))
+
+    def is_echo(self, event):
+        if event.name != "InputSettingsChanged": return False
+        name = event.data.get("inputName")
+        actual = event.data.get("inputSettings") or {}
+        now = self.clock()
+        with self._lock:
+            writes = self.pending.get(name)
+            if not writes: return False
+            writes[:] = [w for w in writes if w[0] > now]
+            for i, (_, settings) in enumerate(writes):
+                if all(actual.get(k) == v for k, v in settings.items()):
+                    del writes[i]
+                    if not writes: del self.pending[name]
+                    self.suppressed += 1
+                    return True
+            if not writes: del self.pending[name]
+            return False
+
+    def clear(self):
+        with self._lock:
+            self.pending.clear()
+
+
+class ObsStateMirror:
+    """
+    Local copy of the OBS state HotSwap reads on hot paths: program scene,
+    scene items, input kinds/settings and video settings.
+
+    Seeded once per connection and then kept current from events, so
+    checks like "is a Display Capture covering our source?" read memory
+    instead of making websocket round-trips. Anything not seen yet (a scene
+    we never showed, an input's settings) is fetched on first use and then
+    maintained the same way.
+    """
+
+    RESEED_EVENTS = ("CurrentSceneCollectionChanged", "CurrentProfileChanged")
+
+    def __init__(self):
+        self.client = None
+        self.seeded = False
+        self.program_scene = None
+        self.video_settings = {}
+        self.input_kinds = {}     # input name -> inputKind
+        self.settings = {}        # input name -> inputSettings (no defaults, like GetInputSettings)
+        self.scenes = {}          # scene name -> list of scene item dicts
+        self._lock = threading.RLock()
+
+    def seed(self, client):
+        """Load the initial state in one batch. Safe to call again to resync."""
+        with self._lock:
+            self.client = client
+            self.seeded = False
+            self.scenes.clear()
+            self.settings.clear()
+            self.input_kinds.clear()
+        batch = RequestBatch()
+        batch.add("GetCurrentProgramScene")
+        batch.add("GetVideoSettings")
+        batch.add("GetInputList")
+        scene, video, inputs = batch.execute(client)
+        program_scene = scene.data.get("currentProgramSceneName") if scene.ok else None
+        items = list(client.get_scene_item_list(program_scene).scene_items) if program_scene else None
+        # Everything lands in one locked step, so a reader never sees seeded before the data
+        with self._lock:
+            if self.client is not client: return  # Reset or reseeded while we were asking
+            if scene.ok: self.program_scene = program_scene
+            if video.ok: self.video_settings = video.data
+            if inputs.ok:
+                for item in inputs.data.get("inputs", []):
+                    self.input_kinds[item.get("inputName")] = item.get("inputKind", "")
+            if items is not None: self.scenes[program_scene] = items
+            self.seeded = True
+
+    def reset(self):
+        with self._lock:
+            self.client = None
+            self.seeded = False
+            self.program_scene = None
+            self.video_settings = {}
+            self.scenes.clear()
+            self.settings.clear()
+            self.input_kinds.clear()
+
+    # --- Reads ---
+    def scene_items(self, scene_name):
+        """Scene items of a scene (copies), fetched the first time it's asked for."""
+        with self._lock:
+            items = self.scenes.get(scene_name)
+            if items is not None:
+                return [dict(i) for i in items]
+        items = self._fetch_scene_items(scene_name)
+        return [dict(i) for i in items] if items is not None else []
+
+    def program_items(self):
+        return self.scene_items(self.program_scene) if self.program_scene else []
+
+    def input_settings(self, input_name):
+        """Settings of an input (a copy), fetched the first time it's asked for."""
+        with self._lock:
+            settings = self.settings.get(input_name)
+            if settings is not None:
+                return dict(settings)
+        client = self.client
+        if client is None: return {}
+        response = client.get_input_settings(input_name)
+        with self._lock:
+            self.settings[input_name] = dict(response.input_settings)
+            self.input_kinds[input_name] = response.input_kind
+        return dict(response.input_settings)
+
+    def input_kind(self, input_name):
+        with self._lock:
+            return self.input_kinds.get(input_name, "")
+
+    # --- Writes we made ourselves ---
+    def apply_input_settings(self, input_name, settings, overlay=True):
+        """Record a SetInputSettings HotSwap just sent, before OBS echoes it back."""
+        with self._lock:
+            if overlay and input_name in self.settings:
+                self.settings[input_name].update(settings)
+            else:
+                self.settings[input_name] = dict(settings)
+
+    # --- Events ---
+    def handle_event(self, event):
+        """Apply one ObsEvent. Returns True if it touched the mirror."""
+        name, d = event.name, event.data
+        if name in self.RESEED_EVENTS:
+            if self.client: self.seed(self.client)
+            return True
+        with self._lock:
+            if name == "CurrentProgramSceneChanged":
+                self.program_scene = d.get("sceneName")
+                if self.program_scene in self.scenes: return True
+            elif name == "SceneItemCreated":
+                # The event lacks the item's kind/enabled state, so refetch scenes we track
+                if self.scenes.pop(d.get("sceneName"), None) is None: return True
+            elif name == "SceneItemRemoved":
+                items = self.scenes.get(d.get("sceneName"))
+                if items is not None:
+                    items[:] = [i for i in items if i.get("sceneItemId") != d.get("sceneItemId")]
+                return True
+            elif name == "SceneItemEnableStateChanged":
+                for item in self.scenes.get(d.get("sceneName"), ()):
+                    if item.get("sceneItemId") == d.get("sceneItemId"):
+                        item["sceneItemEnabled"] = d.get("sceneItemEnabled")
+                return True
+            elif name == "SceneItemListReindexed":
+                indexes = {i.get("sceneItemId"): i.get("sceneItemIndex") for i in d.get("sceneItems", [])}
+                for item in self.scenes.get(d.get("sceneName"), ()):
+                    if item.get("sceneItemId") in indexes:
+                        item["sceneItemIndex"] = indexes[item["sceneItemId"]]
+                return True
+            elif name == "SceneNameChanged":
+                if d.get("oldSceneName") in self.scenes:
+                    self.scenes[d.get("sceneName")] = self.scenes.pop(d.get("oldSceneName"))
+                if self.program_scene == d.get("oldSceneName"):
+                    self.program_scene = d.get("sceneName")
+                return True
+            elif name == "SceneRemoved":
+                self.scenes.pop(d.get("sceneName"), None)
+                return True
+            elif name == "InputCreated":
+                self.input_kinds[d.get("inputName")] = d.get("inputKind", "")
+                self.settings[d.get("inputName")] = dict(d.get("inputSettings") or {})
+                return True
+            elif name == "InputRemoved":
+                self.input_kinds.pop(d.get("inputName"), None)
+                self.settings.pop(d.get("inputName"), None)
+                return True
+            elif name == "InputNameChanged":
+                old, new = d.get("oldInputName"), d.get("inputName")
+                if old in self.input_kinds: self.input_kinds[new] = self.input_kinds.pop(old)
+                if old in self.settings: self.settings[new] = self.settings.pop(old)
+                for items in self.scenes.values():
+                    for item in items:
+                        if item.get("sourceName") == old: item["sourceName"] = new
+                return True
+            elif name == "InputSettingsChanged":
+                self.settings[d.get("inputName")] = dict(d.get("inputSettings") or {})
+                return True
+            else:
+                return False
+
+        # Scene content we don't have: fetch it outside the lock
+        self._fetch_scene_items(d.get("sceneName"))
+        return True
+
+    def _fetch_scene_items(self, scene_name):
+        client = self.client
+        if client is None or not scene_name: return None
+        items = list(client.get_scene_item_list(scene_name).scene_items)
+        with self._lock:
+            self.scenes[scene_name] = items
+        return items
+
+
+def _auth_string(password, salt, challenge):
+    secret = base64.b64encode(hashlib.sha256((password + salt).encode()).digest())
+    return base64.b64encode(hashlib.sha256(secret + challenge.encode()).digest()).decode()
+
+
+class AsyncObsClient:
+    """
+    asyncio OBS v5 client. One websocket carries requests, batches and events;
+    requests are pipelined and matched to their responses by requestId, so any
+    number of them can be in flight at once.
+    """
+
+    def __init__(self, host, port, password, event_subscriptions=EVENT_SUB_ALL,
+                 on_event=None, on_disconnect=None):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.event_subscriptions = event_subscriptions
+        self.on_event = on_event
+        self.on_disconnect = on_disconnect
+        self.connected = False
+        self.negotiated_rpc_version = None
+        self._ws = None
+        self._reader_task = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._closing = False
+
+    async def connect(self, timeout=DEFAULT_TIMEOUT):
+        import websockets
+        uri = f"ws://[{self.host}]:{self.port}" if ":" in self.host else f"ws://{self.host}:{self.port}"
+        try:
+            self._ws = await websockets.connect(uri, open_timeout=timeout, max_size=None, compression=None)
+            hello = json.loads(await asyncio.wait_for(self._ws.recv(), timeout))
+            if hello.get("op") != OP_HELLO:
+                raise ObsConnectionError("Unexpected handshake from OBS (expected Hello)")
+            identify = {"rpcVersion": RPC_VERSION, "eventSubscriptions": self.event_subscriptions}
+            auth = hello["d"].get("authentication")
+            if auth:
+                if not self.password:
+                    raise ObsConnectionError("Authentication enabled but no password provided")
+                identify["authentication"] = _auth_string(self.password, auth["salt"], auth["challenge"])
+            await self._ws.send(json.dumps({"op": OP_IDENTIFY, "d": identify}))
+            identified = json.loads(await asyncio.wait_for(self._ws.recv(), timeout))
+            if identified.get("op") != OP_IDENTIFIED:
+                raise ObsConnectionError("Failed to identify with OBS (expected Identified)")
+        except ObsError:
+            await self._abort()
+            raise
+        except asyncio.TimeoutError:
+            await self._abort()
+            raise ObsConnectionError("Connection timed out during handshake")
+        except Exception as e:
+            code = getattr(getattr(e, "rcvd", None), "code", None)
+            await self._abort()
+            if code == CLOSE_AUTHENTICATION_FAILED:
+                raise ObsConnectionError(f"Authentication failed ({code}): check the WebSocket password")
+            raise ObsConnectionError(f"Connection failed: {e}") from e
+
+        self.negotiated_rpc_version = identified["d"].get("negotiatedRpcVersion")
+        self.connected = True
+        self._reader_task = asyncio.ensure_future(self._reader())
+
+    async def request(self, request_type, data=None, timeout=DEFAULT_TIMEOUT):
+        """Send one request; returns the raw RequestResponse "d" object."""
+        request_id = f"r{next(self._ids)}"
+        payload = {"op": OP_REQUEST, "d": {"requestType": request_type, "requestId": request_id}}
+        if data: payload["d"]["requestData"] = data
+        return await self._send_and_wait(request_id, payload, timeout)
+
+    async def batch(self, batch, timeout=DEFAULT_TIMEOUT):
+        """Send a RequestBatch; returns its BatchResults."""
+        batch_id = f"b{next(self._ids)}"
+        response = await self._send_and_wait(batch_id, batch.payload(batch_id), timeout)
+        return batch.decode(response)
+
+    async def close(self):
+        self._closing = True
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader_task is not None:
+            try:
+                await self._reader_task
+            except Exception:
+                pass
+
+    async def _send_and_wait(self, request_id, payload, timeout):
+        if not self.connected:
+            raise ObsConnectionError("Not connected to OBS")
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._ws.send(json.dumps(payload))
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise ObsTimeoutError(f"Timed out waiting for {payload['d'].get('requestType', 'RequestBatch')}")
+        except ObsError:
+            raise
+        except Exception as e:
+            raise ObsConnectionError(f"OBS connection closed: {e}") from e
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _reader(self):
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                op = message.get("op")
+                d = message.get("d", {})
+                if op in (OP_REQUEST_RESPONSE, OP_REQUEST_BATCH_RESPONSE):
+                    future = self._pending.get(d.get("requestId"))
+                    if future is not None and not future.done():
+                        future.set_result(d)
+                elif op == OP_EVENT and self.on_event:
+                    try:
+                        self.on_event(ObsEvent(d.get("eventType"), d.get("eventData")))
+                    except Exception:
+                        pass
+        except Exception:
+            pass
+        finally:
+            self.connected = False
+            for future in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(ObsConnectionError("OBS connection closed"))
+            if not self._closing and self.on_disconnect:
+                try:
+                    self.on_disconnect()
+                except Exception:
+                    pass
+
+    async def _abort(self):
+        if self._ws is not None:
+            try:
+                await self._ws.close()
+            except Exception:
+                pass
+        self._ws = None
+
+
+class ObsClient:
+    """
+    Thread-safe blocking front end for AsyncObsClient.
+
+    The asyncio loop runs on its own thread; any thread may call in and
+    concurrent calls are pipelined over the one connection instead of
+    queueing behind each other. Events are delivered on a separate dispatch
+    thread, so handlers may make blocking calls back into the client. The
+    snake_case wrappers mirror the obsws_python.ReqClient methods HotSwap uses.
+    """
+
+    def __init__(self, host="localhost", port=4455, password="", on_event=None, on_disconnect=None,
+                 event_subscriptions=EVENT_SUB_ALL, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self.on_event = on_event
+        self.on_disconnect = on_disconnect
+        self._events = queue.Queue()
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+        self._client = AsyncObsClient(
+            host, port, password, event_subscriptions,
+            on_event=self._events.put, on_disconnect=self._handle_disconnect,
+        )
+        try:
+            self._run(self._client.connect(timeout), timeout * 2)
+        except Exception:
+            self._close_loop()
+            raise
+        self._event_thread = threading.Thread(target=self._dispatch_events, daemon=True)
+        self._event_thread.start()
+
+    @property
+    def connected(self):
+        return self._client.connected
+
+    def call(self, request_type, data=None, timeout=None):
+        """Blocking request. Returns an ObsResponse, raises ObsRequestError on failure."""
+        return self._unwrap(self._run(self._client.request(request_type, data, timeout or self.timeout), timeout))
+
+    def call_async(self, request_type, data=None, timeout=None):
+        """Non-blocking request. Returns a concurrent.futures.Future resolving to an ObsResponse."""
+        result = concurrent.futures.Future()
+        coro = self._client.request(request_type, data, timeout or self.timeout)
+        if not self._loop.is_running():
+            coro.close()
+            result.set_exception(ObsConnectionError("OBS connection closed"))
+            return result
+        raw = asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+        def _done(f):
+            try:
+                result.set_result(self._unwrap(f.result()))
+            except Exception as e:
+                result.set_exception(e)
+        raw.add_done_callback(_done)
+        return result
+
+    def send_batch(self, batch, timeout=None):
+        return self._run(self._client.batch(batch, timeout or self.timeout), timeout)
+
+    def disconnect(self):
+        try:
+            self._run(self._client.close(), self.timeout)
+        except Exception:
+            pass
+        self._events.put(None)
+        self._close_loop()
+
+    def _close_loop(self):
+        """Stop the loop thread and close the loop, so each reconnect doesn't leak its selector."""
+        loop = self._loop
+        if loop.is_closed(): return
+
+        async def cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for t in tasks: t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if loop.is_running():
+            try: asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(self.timeout)
+            except Exception: pass
+            loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join(self.timeout)
+        if not self._loop_thread.is_alive(): loop.close()
+
+    # --- ReqClient-compatible wrappers ---
+    def get_stats(self): return self.call("GetStats")
+    def get_version(self): return self.call("GetVersion")
+    def get_input_list(self, kind=None): return self.call("GetInputList", {"inputKind": kind} if kind else None)
+    def get_input_settings(self, name): return self.call("GetInputSettings", {"inputName": name})
+    def set_input_settings(self, name, settings, overlay):
+        return self.call("SetInputSettings", {"inputName": name, "inputSettings": settings, "overlay": overlay})
+    def get_scene_collection_list(self): return self.call("GetSceneCollectionList")
+    def get_record_directory(self): return self.call("GetRecordDirectory")
+    def get_record_status(self): return self.call("GetRecordStatus")
+    def start_record(self): return self.call("StartRecord")
+    def get_current_program_scene(self): return self.call("GetCurrentProgramScene")
+    def get_scene_item_list(self, name): return self.call("GetSceneItemList", {"sceneName": name})
+    def get_video_settings(self): return self.call("GetVideoSettings")
+    def set_scene_item_transform(self, scene_name, item_id, transform):
+        return self.call("SetSceneItemTransform", {"sceneName": scene_name, "sceneItemId": item_id, "sceneItemTransform": transform})
+    def get_source_active(self, name): return self.call("GetSourceActive", {"sourceName": name})
+
+    def _run(self, coro, timeout):
+        if threading.current_thread() is self._loop_thread:
+            raise RuntimeError("Blocking OBS call made from the client's own event loop")
+        if not self._loop.is_running():
+            coro.close()
+            raise ObsConnectionError("OBS connection closed")
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            # The coroutine enforces the real timeout; this is only a backstop
+            return future.result((timeout or self.timeout) + 1.0)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise ObsTimeoutError("Timed out waiting for OBS")
+
+    @staticmethod
+    def _unwrap(response):
+        status = response.get("requestStatus", {})
+        if not status.get("result"):
+            raise ObsRequestError(response.get("requestType"), status.get("code"), status.get("comment"))
+        return ObsResponse(response.get("responseData"))
+
+    def _handle_disconnect(self):
+        self._events.put(None)
+        if self.on_disconnect:
+            threading.Thread(target=self.on_disconnect, daemon=True).start()
+
+    def _dispatch_events(self):
+        while True:
+            event = self._events.get()
+            if event is None: return
+            if self.on_event:
+                try:
+                    self.on_event(event)
+                except Exception:
+                    pass
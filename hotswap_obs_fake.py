@@ -0,0 +1,595 @@
+"""
+Local stand-in for OBS WebSocket v5, for load and latency testing.
+
+FakeObs is an in-memory OBS: a scene collection (as big as you ask for),
+inputs and their settings, recording, GetStats and the events HotSwap
+listens to. FakeObsServer serves it over a real websocket - Hello/Identify
+with password authentication, requests, RequestBatch and events - and can
+add response latency and jitter or drop connections. The replay harness
+(hotswap_sim.py) answers from the same FakeObs in-process.
+
+    python hotswap_obs_fake.py --serve --port 4455 --password secret
+    python hotswap_obs_fake.py --switches 50 --latency-ms 5 --jitter-ms 10 --scenes 200 --items 50
+"""
+import argparse
+import asyncio
+import base64
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from hotswap_log import log
+from hotswap_obs import (
+    _auth_string, RPC_VERSION, CLOSE_AUTHENTICATION_FAILED, EXECUTION_SERIAL_REALTIME,
+    OP_HELLO, OP_IDENTIFY, OP_IDENTIFIED, OP_EVENT, OP_REQUEST, OP_REQUEST_RESPONSE,
+    OP_REQUEST_BATCH, OP_REQUEST_BATCH_RESPONSE,
+    EVENT_SUB_ALL, EVENT_SUB_GENERAL, EVENT_SUB_CONFIG, EVENT_SUB_SCENES, EVENT_SUB_INPUTS,
+    EVENT_SUB_OUTPUTS, EVENT_SUB_INPUT_ACTIVE_STATE_CHANGED,
+    STATUS_SUCCESS, STATUS_OUTPUT_RUNNING,
+)
+from hotswap_stats import percentile
+
+OBS_VERSION = "30.2.0"
+OBS_WEBSOCKET_VERSION = "5.5.0"
+
+# RequestStatus codes besides the ones the client knows
+STATUS_MISSING_REQUEST_TYPE = 203
+STATUS_UNKNOWN_REQUEST = 204
+STATUS_NOT_FOUND = 600
+
+# WebSocketCloseCode
+CLOSE_NOT_IDENTIFIED = 4007
+CLOSE_UNSUPPORTED_RPC_VERSION = 4010
+
+# Subscription category of each event FakeObs emits
+EVENT_INTENTS = {
+    "CurrentSceneCollectionChanged": EVENT_SUB_CONFIG,
+    "CurrentProgramSceneChanged": EVENT_SUB_SCENES,
+    "InputSettingsChanged": EVENT_SUB_INPUTS,
+    "InputActiveStateChanged": EVENT_SUB_INPUT_ACTIVE_STATE_CHANGED,
+    "RecordStateChanged": EVENT_SUB_OUTPUTS,
+}
+
+# Input kinds the filler sources of a big collection cycle through
+FILLER_KINDS = ("image_source", "text_gdiplus_v3", "browser_source", "ffmpeg_source", "color_source_v3")
+
+
+# =============================================================================
+# OBS MODEL
+# =============================================================================
+class FakeObs:
+    """
+    In-memory OBS answering the requests HotSwap makes.
+
+    The program scene holds a game capture, an application audio capture
+    and a webcam. `scenes` and `items` grow the collection: the program
+    scene plus scenes-1 more, each with `items` filler sources of their own.
+    A capture source goes active `hook_delay` seconds after it's pointed at
+    a new window; with `later(delay, fn, *args)` that is also announced
+    with InputActiveStateChanged. Events go to `emit(name, data)`. Not
+    thread-safe: the owner serialises calls.
+    """
+
+    VIDEO_SOURCE = "Game Capture"
+    AUDIO_SOURCE = "Game Audio"
+
+    def __init__(self, clock=time.monotonic, emit=None, later=None, hook_delay=1.5, record_directory=None,
+                 scene="Gaming", scenes=1, items=0):
+        self.clock = clock
+        self.emit = emit or (lambda name, data: None)
+        self.later = later
+        self.hook_delay = hook_delay
+        self.record_directory = record_directory or tempfile.gettempdir()
+        self.scene = scene
+        self.collection = "Untitled"
+        self.inputs = {
+            self.VIDEO_SOURCE: ["game_capture", {"capture_mode": "window"}],
+            self.AUDIO_SOURCE: ["wasapi_process_output_capture", {}],
+            "Webcam": ["dshow_input", {}],
+        }
+        self.scenes = {scene: [self._item(i, name) for i, name in enumerate(("Webcam", self.VIDEO_SOURCE, self.AUDIO_SOURCE))]}
+        for s in range(max(1, scenes)):
+            name = scene if s == 0 else f"Scene {s + 1}"
+            scene_items = self.scenes.setdefault(name, [])
+            for n in range(items):
+                source = f"{name} / Source {n + 1}"
+                self.inputs[source] = [FILLER_KINDS[n % len(FILLER_KINDS)], {}]
+                scene_items.append(self._item(len(scene_items), source))
+        self.active_at = {}     # input -> time its video goes active
+        self.recording = False
+        self.dropped_frames = 0
+        self.requests = Counter()
+        self.switches = []      # (time, window) per video SetInputSettings
+
+    def _item(self, index, source):
+        return {"sceneItemId": index + 1, "sceneItemIndex": index, "sourceName": source,
+                "inputKind": self.inputs[source][0], "sceneItemEnabled": True, "isGroup": None}
+
+    def drop_frames(self, count):
+        """Skip `count` output frames, as an overloaded encoder would."""
+        self.dropped_frames += count
+
+    def handle(self, request_type, data):
+        """(ok, status code, comment, responseData) for one request."""
+        self.requests[request_type] += 1
+        now = self.clock()
+        if request_type == "GetVersion":
+            return self._ok({"obsVersion": OBS_VERSION, "obsWebSocketVersion": OBS_WEBSOCKET_VERSION,
+                             "rpcVersion": RPC_VERSION})
+        if request_type == "GetStats":
+            frames = int(now * 60)
+            return self._ok({
+                "activeFps": 60.0, "averageFrameRenderTime": 2.5, "cpuUsage": 4.0, "memoryUsage": 512.0,
+                "renderTotalFrames": frames, "renderSkippedFrames": 0,
+                "outputTotalFrames": frames, "outputSkippedFrames": self.dropped_frames,
+            })
+        if request_type == "GetSceneCollectionList":
+            return self._ok({"currentSceneCollectionName": self.collection, "sceneCollections": [self.collection]})
+        if request_type == "GetRecordDirectory":
+            return self._ok({"recordDirectory": self.record_directory})
+        if request_type == "GetRecordStatus":
+            return self._ok({"outputActive": self.recording})
+        if request_type == "StartRecord":
+            if self.recording: return False, STATUS_OUTPUT_RUNNING, "Recording is already active.", None
+            self.recording = True
+            self.emit("RecordStateChanged", {"outputActive": True, "outputState": "OBS_WEBSOCKET_OUTPUT_STARTED"})
+            return self._ok()
+        if request_type == "GetCurrentProgramScene":
+            return self._ok({"currentProgramSceneName": self.scene, "sceneName": self.scene})
+        if request_type == "GetSceneList":
+            return self._ok({"currentProgramSceneName": self.scene, "currentPreviewSceneName": None, "scenes": [
+                {"sceneName": name, "sceneIndex": i} for i, name in enumerate(reversed(list(self.scenes)))
+            ]})
+        if request_type == "GetVideoSettings":
+            return self._ok({"baseWidth": 1920, "baseHeight": 1080, "outputWidth": 1920, "outputHeight": 1080,
+                             "fpsNumerator": 60, "fpsDenominator": 1})
+        if request_type in ("GetSceneItemList", "SetSceneItemTransform"):
+            items = self.scenes.get(data.get("sceneName"))
+            if items is None: return self._missing("scene", data.get("sceneName"))
+            if request_type == "GetSceneItemList":
+                return self._ok({"sceneItems": [dict(i) for i in items]})
+            if not any(i["sceneItemId"] == data.get("sceneItemId") for i in items):
+                return self._missing("scene item", data.get("sceneItemId"))
+            return self._ok()
+        if request_type == "GetInputList":
+            kind = data.get("inputKind")
+            return self._ok({"inputs": [
+                {"inputName": name, "inputKind": k, "unversionedInputKind": k}
+                for name, (k, _) in self.inputs.items() if kind is None or k == kind
+            ]})
+
+        name = data.get("inputName") or data.get("sourceName")
+        entry = self.inputs.get(name)
+        if request_type in ("GetInputSettings", "SetInputSettings", "GetSourceActive") and entry is None:
+            return self._missing("source", name)
+        if request_type == "GetInputSettings":
+            return self._ok({"inputSettings": dict(entry[1]), "inputKind": entry[0]})
+        if request_type == "SetInputSettings":
+            settings = data.get("inputSettings") or {}
+            before = entry[1].get("window")
+            if data.get("overlay", True): entry[1].update(settings)
+            else: entry[1] = dict(settings)
+            if name == self.VIDEO_SOURCE and "window" in settings:
+                self.switches.append((now, settings["window"]))
+                if settings["window"] != before: self._hook_later(name)
+            self.emit("InputSettingsChanged", {"inputName": name, "inputSettings": dict(entry[1])})
+            return self._ok()
+        if request_type == "GetSourceActive":
+            active = now >= self.active_at.get(name, 0.0)
+            return self._ok({"videoActive": active, "videoShowing": active})
+        return False, STATUS_UNKNOWN_REQUEST, f"Your request type is not valid: {request_type}", None
+
+    def _hook_later(self, name):
+        at = self.clock() + self.hook_delay
+        self.active_at[name] = at
+        if self.later: self.later(self.hook_delay, self._announce_active, name, at)
+
+    def _announce_active(self, name, at):
+        if self.active_at.get(name) == at:
+            self.emit("InputActiveStateChanged", {"inputName": name, "videoActive": True})
+
+    @staticmethod
+    def _ok(response=None):
+        return True, STATUS_SUCCESS, None, response
+
+    @staticmethod
+    def _missing(kind, name):
+        return False, STATUS_NOT_FOUND, f"No {kind} was found by the name of `{name}`.", None
+
+
+# =============================================================================
+# WEBSOCKET SERVER
+# =============================================================================
+class _Session:
+    """One identified client: its event subscriptions and an ordered outbox."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.subscriptions = EVENT_SUB_ALL
+        self.outbox = asyncio.Queue()
+
+    def send(self, op, d):
+        self.outbox.put_nowait(json.dumps({"op": op, "d": d}))
+
+
+class FakeObsServer:
+    """
+    FakeObs behind a real OBS WebSocket v5 endpoint.
+
+    Runs on its own asyncio loop thread, like ObsClient; FakeObs lives on
+    that thread, so script it through run(). Every request or batch is
+    answered after `latency` plus up to `jitter` seconds, so pipelined
+    responses can overtake each other as they may with OBS. A `drop_rate`
+    fraction of requests kills the connection instead of answering (no
+    close frame, like a crashed OBS). An empty password turns
+    authentication off. port=0 picks a free port; extra keyword arguments
+    go to FakeObs.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, password="", latency=0.0, jitter=0.0, drop_rate=0.0,
+                 seed=None, **obs_options):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.obs_options = obs_options
+        self.obs = None
+        self.sessions = set()
+        self.trips = Counter()  # request type (or "RequestBatch") -> round-trips answered
+        self.connections = 0
+        self.auth_failures = 0
+        self.drops = 0
+        self._loop = None
+        self._thread = None
+        self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def round_trips(self):
+        return sum(self.trips.values())
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self.obs = FakeObs(emit=self._broadcast, later=self._loop.call_later, **self.obs_options)
+        try:
+            self._server = self._on_loop(self._listen())
+        except Exception:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            raise
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"[FakeOBS] Listening on {self.host}:{self.port}")
+        return self
+
+    def stop(self):
+        if self._loop is None: return
+        try: self._on_loop(self._close())
+        except Exception: pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(2.0)
+        if not self._thread.is_alive(): self._loop.close()
+        self._loop = None
+
+    def run(self, fn, *args):
+        """Call fn(*args) on the server thread, where FakeObs lives, and return its result."""
+        async def call():
+            return fn(*args)
+        return self._on_loop(call())
+
+    def drop_connections(self):
+        """Kill every open connection, as if OBS crashed. Returns how many there were."""
+        def drop_all():
+            sessions = list(self.sessions)
+            for session in sessions: self._drop(session)
+            return len(sessions)
+        return self.run(drop_all)
+
+    # --- Loop thread ---
+    def _on_loop(self, coro, timeout=10.0):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _listen(self):
+        import websockets
+        return await websockets.serve(self._session, self.host, self.port, max_size=None, compression=None)
+
+    async def _close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in pending: task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _session(self, ws):
+        self.connections += 1
+        hello = {"obsWebSocketVersion": OBS_WEBSOCKET_VERSION, "rpcVersion": RPC_VERSION}
+        if self.password:
+            salt, challenge = (base64.b64encode(os.urandom(32)).decode() for _ in range(2))
+            hello["authentication"] = {"challenge": challenge, "salt": salt}
+        try:
+            await ws.send(json.dumps({"op": OP_HELLO, "d": hello}))
+            identify = json.loads(await ws.recv())
+        except Exception:
+            return
+        d = identify.get("d") or {}
+        if identify.get("op") != OP_IDENTIFY:
+            await ws.close(CLOSE_NOT_IDENTIFIED, "Identify first.")
+            return
+        if d.get("rpcVersion") != RPC_VERSION:
+            await ws.close(CLOSE_UNSUPPORTED_RPC_VERSION, f"Only rpcVersion {RPC_VERSION} is supported.")
+            return
+        if self.password and d.get("authentication") != _auth_string(self.password, salt, challenge):
+            self.auth_failures += 1
+            await ws.close(CLOSE_AUTHENTICATION_FAILED, "Authentication failed.")
+            return
+
+        session = _Session(ws)
+        session.subscriptions = d.get("eventSubscriptions", EVENT_SUB_ALL)
+        session.send(OP_IDENTIFIED, {"negotiatedRpcVersion": RPC_VERSION})
+        self.sessions.add(session)
+        writer = asyncio.ensure_future(self._write(session))
+        try:
+            async for raw in ws:
+                # Each message is answered on its own, so slow answers don't hold up the rest
+                asyncio.ensure_future(self._answer(session, json.loads(raw)))
+        except Exception:
+            pass
+        finally:
+            self.sessions.discard(session)
+            writer.cancel()
+
+    async def _write(self, session):
+        try:
+            while True:
+                await session.ws.send(await session.outbox.get())
+        except Exception:
+            pass
+
+    async def _answer(self, session, message):
+        op, d = message.get("op"), message.get("d") or {}
+        if op not in (OP_REQUEST, OP_REQUEST_BATCH): return
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0: await asyncio.sleep(delay)
+        if session not in self.sessions: return
+        if self.drop_rate and self.rng.random() < self.drop_rate:
+            self._drop(session)
+            return
+        if op == OP_REQUEST:
+            self.trips[d.get("requestType")] += 1
+            result = self._result(d.get("requestType"), d.get("requestData") or {})
+            result["requestId"] = d.get("requestId")
+            session.send(OP_REQUEST_RESPONSE, result)
+            return
+
+        self.trips["RequestBatch"] += 1
+        realtime = d.get("executionType", EXECUTION_SERIAL_REALTIME) == EXECUTION_SERIAL_REALTIME
+        results = []
+        for request in d.get("requests", []):
+            request_type, data = request.get("requestType"), request.get("requestData") or {}
+            if request_type == "Sleep":
+                await asyncio.sleep(data.get("sleepMillis", 0) / 1000 if realtime else data.get("sleepFrames", 0) / 60)
+                result = {"requestType": request_type, "requestStatus": {"result": True, "code": STATUS_SUCCESS}}
+            else:
+                result = self._result(request_type, data)
+            result["requestId"] = request.get("requestId")
+            results.append(result)
+            if not result["requestStatus"]["result"] and d.get("haltOnFailure"): break
+        if session in self.sessions:
+            session.send(OP_REQUEST_BATCH_RESPONSE, {"requestId": d.get("requestId"), "results": results})
+
+    def _result(self, request_type, data):
+        if not request_type:
+            return {"requestType": "", "requestStatus": {
+                "result": False, "code": STATUS_MISSING_REQUEST_TYPE, "comment": "Your request is missing a requestType"}}
+        ok, code, comment, response = self.obs.handle(request_type, data)
+        result = {"requestType": request_type, "requestStatus": {"result": ok, "code": code}}
+        if comment: result["requestStatus"]["comment"] = comment
+        if response is not None: result["responseData"] = response
+        return result
+
+    def _broadcast(self, name, data):
+        intent = EVENT_INTENTS.get(name, EVENT_SUB_GENERAL)
+        for session in self.sessions:
+            if session.subscriptions & intent:
+                session.send(OP_EVENT, {"eventType": name, "eventIntent": intent, "eventData": data})
+
+    def _drop(self, session):
+        self.drops += 1
+        self.sessions.discard(session)
+        session.ws.transport.abort()
+
+
+# =============================================================================
+# LOAD TEST
+# =============================================================================
+def load_test(server, switches=50, dwell=1.0, refreshes=20, polls=50, reconnects=1, timeout=30.0):
+    """
+    Drive HotSwap's OBS paths against a started FakeObsServer: connect and
+    state seeding, update_obs switches (with auto-fit and hook validation),
+    refresh_sources, stats polling and overload detection, and reconnecting
+    after the server drops every connection. Returns a report dict.
+    """
+    from hotswap_clock import SYSTEM_CLOCK
+    from hotswap_engine import HotSwapEngine
+    from hotswap_obs import ObsClient
+    from hotswap_sim import SimPlatform, RecordingView, SIM_GAMES
+    from hotswap_stats import LEVEL_DROP
+
+    workdir = tempfile.mkdtemp(prefix="hotswap-load-")
+    platform = SimPlatform(SYSTEM_CLOCK, focus_events=False, obs_factory=ObsClient)
+    engine = HotSwapEngine(view=RecordingView(SYSTEM_CLOCK), config_file=os.path.join(workdir, "config.json"),
+                           platform=platform)
+    engine.load_settings({
+        "password": server.password, "video_source": FakeObs.VIDEO_SOURCE, "audio_source": FakeObs.AUDIO_SOURCE,
+        "auto_fit": True, "disclaimer_accepted": True, "whitelist": [exe for exe, _, _ in SIM_GAMES],
+    })
+    engine.obs_port = server.port
+    windows = [(platform.launch(exe, title, cls, size=(2560, 1080) if i % 2 else (1920, 1080), focus=False), exe, title, cls)
+               for i, (exe, title, cls) in enumerate(SIM_GAMES)]
+    windows = [(platform.find_main_window(pid)[0], exe, title, cls) for pid, exe, title, cls in windows]
+
+    def ready():
+        client = engine.obs_client
+        return client is not None and client.connected and engine.obs_state.seeded
+
+    def wait_ready():
+        end = time.monotonic() + timeout
+        while not ready():
+            if time.monotonic() > end: raise TimeoutError("HotSwap did not (re)connect to the fake OBS")
+            time.sleep(0.01)
+
+    def trips_besides_stats():
+        return server.round_trips - server.trips["GetStats"]
+
+    report = {}
+    try:
+        started = time.perf_counter()
+        engine.auto_connect_logic()
+        wait_ready()
+        report["connect_ms"] = (time.perf_counter() - started) * 1000
+
+        # --- Switches ---
+        latencies = []
+        drops = server.drops
+        trips = trips_besides_stats()
+        for i in range(switches):
+            wait_ready()
+            hwnd, exe, title, cls = windows[i % len(windows)]
+            platform.focus(hwnd)
+            started = time.perf_counter()
+            engine.update_obs(exe, title, cls, is_new_switch=True)
+            latencies.append((time.perf_counter() - started) * 1000)
+            engine.last_injected_exe = exe
+            time.sleep(dwell)
+        time.sleep(0.5)  # Let the last auto-fit and hook validation finish
+        report["switches"] = switches
+        report["switch_ms"] = _summary(latencies)
+        report["round_trips_per_switch"] = (trips_besides_stats() - trips) / switches if switches else 0.0
+        report["switch_drops"] = server.drops - drops
+
+        # --- refresh_sources ---
+        latencies = []
+        for _ in range(refreshes):
+            wait_ready()
+            started = time.perf_counter()
+            engine.refresh_sources()
+            latencies.append((time.perf_counter() - started) * 1000)
+        report["refresh_ms"] = _summary(latencies)
+        report["sources_listed"] = len(engine.source_choices[0]) + len(engine.source_choices[1])
+
+        # --- Stats polling and overload detection ---
+        latencies = []
+        for i in range(polls):
+            wait_ready()
+            if i == polls - 1: server.run(server.obs.drop_frames, engine.frame_drop_threshold * 2)
+            started = time.perf_counter()
+            engine.stats.poll()
+            latencies.append((time.perf_counter() - started) * 1000)
+        report["stats_poll_ms"] = _summary(latencies)
+        report["overload_detected"] = engine.stats.health is not None and engine.stats.health.level == LEVEL_DROP
+
+        # --- Reconnect ---
+        latencies = []
+        for _ in range(reconnects):
+            wait_ready()
+            old_client = engine.obs_client
+            started = time.perf_counter()
+            server.drop_connections()
+            while engine.obs_client is old_client: time.sleep(0.01)
+            wait_ready()
+            latencies.append((time.perf_counter() - started) * 1000)
+        report["reconnect_ms"] = _summary(latencies)
+
+        report["round_trips"] = server.round_trips
+        report["requests"] = dict(server.obs.requests)
+        report["connections"] = server.connections
+        report["drops"] = server.drops
+        report["scenes"] = len(server.obs.scenes)
+        report["inputs"] = len(server.obs.inputs)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine.shutdown()
+            if engine.obs_client: engine.obs_client.disconnect()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def _summary(latencies):
+    return {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99), "max": max(latencies, default=0.0)}
+
+
+def print_report(report):
+    def line(label, s): return f"{label:<18}p50 {s['p50']:.1f} ms, p95 {s['p95']:.1f} ms, p99 {s['p99']:.1f} ms, max {s['max']:.1f} ms"
+    print(f"Collection:       {report['scenes']} scenes, {report['inputs']} inputs")
+    print(f"Connect + seed:   {report['connect_ms']:.1f} ms")
+    print(line("Switches:", report["switch_ms"]) + f" ({report['switches']}, {report['switch_drops']} interrupted by drops)")
+    print(f"Round-trips:      {report['round_trips_per_switch']:.2f} per switch besides stats polling")
+    print(line("refresh_sources:", report["refresh_ms"]) + f" ({report['sources_listed']} choices)")
+    print(line("Stats poll:", report["stats_poll_ms"]) + f"; overload {'detected' if report['overload_detected'] else 'MISSED'}")
+    print(line("Reconnect:", report["reconnect_ms"]))
+    print(f"OBS:              {report['round_trips']} round-trips over {report['connections']} connection(s), "
+          f"{report['drops']} dropped")
+    print(f"OBS requests:     {', '.join(f'{k} {v}' for k, v in sorted(report['requests'].items()))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake OBS WebSocket v5 server and HotSwap OBS load test.")
+    parser.add_argument("--serve", action="store_true", help="just serve until Ctrl+C (point HotSwap or obs tools at it)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port (default 4455 with --serve)")
+    parser.add_argument("--password", default="fake", help="empty turns authentication off")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra delay, up to this much")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of requests that kill the connection")
+    parser.add_argument("--scenes", type=int, default=1, help="scenes in the collection")
+    parser.add_argument("--items", type=int, default=0, help="filler sources per scene")
+    parser.add_argument("--hook-delay", type=float, default=0.3, help="seconds until a switched capture shows video")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--switches", type=int, default=50)
+    parser.add_argument("--dwell", type=float, default=1.0, help="seconds between switches (auto-fit needs ~1 s)")
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--reconnects", type=int, default=1, help="each waits out HotSwap's 5 s retry delay")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the engine's own output")
+    args = parser.parse_args(argv)
+
+    server = FakeObsServer(args.host, args.port or (4455 if args.serve else 0), args.password,
+                           latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, drop_rate=args.drop_rate,
+                           seed=args.seed, scenes=args.scenes, items=args.items, hook_delay=args.hook_delay)
+    with server:
+        if args.serve:
+            try:
+                while True: time.sleep(1)
+            except KeyboardInterrupt:
+                return 0
+        output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        if args.verbose: log.start(echo=sys.stdout)
+        try:
+            with output:
+                report = load_test(server, switches=args.switches, dwell=args.dwell, refreshes=args.refreshes,
+                                   polls=args.polls, reconnects=args.reconnects)
+        finally:
+            log.stop()
+    print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
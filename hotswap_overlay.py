@@ -0,0 +1,154 @@
+"""Overlay popup bookkeeping for HotSwap: the reusable window pool and the alert queue. The Tk side lives in HotSwap.py."""
+import time
+from collections import deque
+
+from hotswap_engine import ALERT_ASPECT_RATIO, ALERT_CAPTURE_FAILED, ALERT_FRAME_DROP, ALERT_GAME_DETECTED
+
+ALERT_DIGEST = "digest"
+
+PREBUILD_DELAY_MS = 50  # Between two pooled windows, so building them never blocks a frame for long
+SHOW_TIME_HISTORY = 20  # Time-to-visible samples kept per overlay type
+
+
+class OverlayPool:
+    """
+    One popup window per overlay type, built once and reused.
+
+    `build(overlay_type)` makes the window; `defer(ms, fn)` (Tk's after)
+    runs the next step of prebuild() on a later event-loop turn, so the
+    pool fills up one window at a time. Time-to-visible is kept per type.
+    """
+
+    def __init__(self, build, defer):
+        self.build = build
+        self.defer = defer
+        self.windows = {}     # overlay type -> window
+        self.show_times = {}  # overlay type -> recent time-to-visible (ms)
+
+    def get(self, overlay_type):
+        window = self.windows.get(overlay_type)
+        if window is None:
+            window = self.build(overlay_type)
+            self.windows[overlay_type] = window
+        return window
+
+    def prebuild(self, types):
+        """Build the windows for `types`, one per event-loop turn."""
+        pending = [t for t in types if t not in self.windows]
+        if not pending: return
+        self.get(pending[0])
+        if len(pending) > 1:
+            self.defer(PREBUILD_DELAY_MS, lambda: self.prebuild(pending[1:]))
+
+    def record_visible(self, overlay_type, ms):
+        self.show_times.setdefault(overlay_type, deque(maxlen=SHOW_TIME_HISTORY)).append(ms)
+
+    def show_stats(self):
+        """Time-to-visible per overlay type: {type: (last_ms, worst_ms)}."""
+        return {t: (times[-1], max(times)) for t, times in self.show_times.items() if times}
+
+
+def new_alert(title, message, overlay_type, hotkey="F9", duration=10000, monitor_handle=None,
+              value=None, template=None, requested_at=None, created=None):
+    return {
+        'title': title, 'message': message, 'hotkey': hotkey,
+        'duration': duration, 'overlay_type': overlay_type,
+        'monitor_handle': monitor_handle, 'value': value, 'first_value': value,
+        'template': template, 'count': 1, 'created': time.time() if created is None else created,
+        'requested_at': requested_at,
+    }
+
+
+def merge_alert(into, alert):
+    """Fold a repeat into an alert. `value`/`template` merge into one message, e.g. "Dropped 45 → 310 frames!"."""
+    into['count'] += 1
+    into['title'] = alert['title']
+    into['monitor_handle'] = alert['monitor_handle'] or into['monitor_handle']
+    into['value'] = alert['value']
+    template = alert['template']
+    if template and into['first_value'] is not None and alert['value'] is not None:
+        into['template'] = template
+        into['message'] = template.format(f"{into['first_value']} → {alert['value']}")
+    else:
+        into['message'] = alert['message']
+
+
+class AlertQueue:
+    """
+    Alerts waiting for the overlay, one per type with repeats merged in.
+
+    Each type has a minimum gap between two of its popups (RATE_LIMITS);
+    an alert becomes ready once its gap has passed. take() hands out the
+    ready alert with the best PRIORITY, or folds DIGEST_MIN or more ready
+    alerts into one digest. Game Detected needs an answer, so it is never
+    folded. Alerts left waiting longer than MAX_PENDING_AGE are dropped.
+    """
+
+    # Lower shows first; Game Detected needs an answer, so it jumps the queue
+    PRIORITY = {ALERT_GAME_DETECTED: 0, ALERT_CAPTURE_FAILED: 1, ALERT_FRAME_DROP: 2, ALERT_ASPECT_RATIO: 3}
+    # Minimum seconds between two popups of the same type; repeats in between are merged
+    RATE_LIMITS = {ALERT_CAPTURE_FAILED: 10.0, ALERT_FRAME_DROP: 30.0, ALERT_ASPECT_RATIO: 30.0}
+    DIGEST_MIN = 2           # Waiting alerts that collapse into one digest popup
+    MAX_PENDING_AGE = 120.0  # Older waiting alerts are dropped as stale
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.pending = {}     # overlay type -> waiting alert
+        self.last_shown = {}  # overlay type -> time its last popup appeared
+
+    def __bool__(self):
+        return bool(self.pending)
+
+    def add(self, alert):
+        """Queue an alert, or merge it into the waiting one of its type. Returns True if newly queued."""
+        overlay_type = alert['overlay_type']
+        queued = self.pending.get(overlay_type)
+        if queued is not None:
+            if queued['message'] != alert['message']: merge_alert(queued, alert)
+            return False
+        alert['not_before'] = self.last_shown.get(overlay_type, 0) + self.RATE_LIMITS.get(overlay_type, 0)
+        self.pending[overlay_type] = alert
+        return True
+
+    def discard(self, overlay_type):
+        self.pending.pop(overlay_type, None)
+
+    def clear(self):
+        self.pending.clear()
+
+    def take(self):
+        """(alert, None) for the next alert to show, else (None, seconds until one is ready or None)."""
+        now = self.clock()
+        for overlay_type, alert in list(self.pending.items()):
+            if now - alert['created'] > self.MAX_PENDING_AGE: del self.pending[overlay_type]
+        ready = [a for a in self.pending.values() if a['not_before'] <= now]
+        if not ready:
+            if not self.pending: return None, None
+            return None, min(a['not_before'] for a in self.pending.values()) - now
+
+        ready.sort(key=lambda a: (self.PRIORITY.get(a['overlay_type'], 9), a['created']))
+        first = ready[0]
+        # Actionable popups (Game Detected) are never folded into a digest
+        if first['overlay_type'] == ALERT_GAME_DETECTED or len(ready) < self.DIGEST_MIN:
+            del self.pending[first['overlay_type']]
+            return first, None
+
+        for alert in ready:
+            del self.pending[alert['overlay_type']]
+        lines = []
+        for alert in ready:
+            repeat = f" (x{alert['count']})" if alert['count'] > 1 else ""
+            lines.append(f"{alert['title']}: {alert['message']}{repeat}")
+        digest = {
+            'title': f"{len(ready)} alerts", 'message': "\n".join(lines), 'hotkey': "",
+            'duration': max(a['duration'] for a in ready), 'overlay_type': ALERT_DIGEST,
+            'monitor_handle': next((a['monitor_handle'] for a in ready if a['monitor_handle']), None),
+            'count': 1, 'requested_at': min(a['requested_at'] for a in ready), 'covers': [a['overlay_type'] for a in ready],
+        }
+        return digest, None
+
+    def shown(self, alert):
+        """Start the rate-limit gap for every type the popup covers."""
+        now = self.clock()
+        for covered in alert.get('covers', [alert['overlay_type']]):
+            self.last_shown[covered] = now
@@ -0,0 +1,726 @@
+"""Platform helpers for HotSwap: window notifications, window/process identity and the Win32 backend."""
+import ctypes
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import psutil
+
+from hotswap_clock import SYSTEM_CLOCK
+from hotswap_log import log
+
+# WinEvent constants
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MOVESIZEEND = 0x000B
+EVENT_SYSTEM_MINIMIZEEND = 0x0017
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_NAMECHANGE = 0x800C
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+WM_QUIT = 0x0012
+
+# Window notification kinds passed to window listeners
+WINDOW_DESTROYED = "destroyed"
+WINDOW_RENAMED = "renamed"
+WINDOW_MOVED = "moved"
+
+# Identity cache bounds
+WINDOW_CACHE_SIZE = 256
+PROCESS_CACHE_SIZE = 1024
+WINDOW_CACHE_TTL = 30.0  # Backstop for changes no WinEvent reports (e.g. fullscreen monitor moves)
+
+# Process lifecycle events
+PROCESS_STARTED = "started"
+PROCESS_EXITED = "exited"
+PROCESS_SCAN_INTERVAL = 2.0
+
+# Running-apps scan (Rules tab)
+APP_SCAN_TTL = 5.0  # Seconds a scan result is reused
+
+
+class ForegroundSource:
+    """Pushes foreground window changes (hwnd) to a callback."""
+
+    def __init__(self):
+        self.callback = None
+        self.window_listeners = []
+
+    def add_window_listener(self, listener):
+        """listener(hwnd, kind) is called for destroy/rename/move notifications."""
+        self.window_listeners.append(listener)
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        self.callback = None
+
+    def _emit(self, hwnd):
+        callback = self.callback
+        if callback is None: return
+        try:
+            callback(hwnd)
+        except Exception:
+            pass
+
+    def _emit_window(self, hwnd, kind):
+        for listener in list(self.window_listeners):
+            try:
+                listener(hwnd, kind)
+            except Exception:
+                pass
+
+
+class WinEventForegroundSource(ForegroundSource):
+    """WinEvent hooks (foreground, destroy, name change, move) on their own message-loop thread."""
+
+    HOOKED_EVENTS = (
+        EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_MOVESIZEEND, EVENT_SYSTEM_MINIMIZEEND,
+        EVENT_OBJECT_DESTROY, EVENT_OBJECT_NAMECHANGE,
+    )
+
+    def __init__(self):
+        super().__init__()
+        self._thread = None
+        self._thread_id = None
+        self._proc = None
+        self._ready = threading.Event()
+
+    def start(self, callback):
+        super().start(callback)
+        if self._thread and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(2.0)
+
+    def stop(self):
+        super().stop()
+        if self._thread_id:
+            try:
+                ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            except Exception:
+                pass
+        self._thread_id = None
+
+    def _run(self):
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+            wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+        ]
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+
+        # Keep a reference, otherwise ctypes frees the thunk while Windows still calls it
+        self._proc = WinEventProc(self._on_win_event)
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        # One hook per event: the ranges in between include LOCATIONCHANGE, which fires on every cursor move
+        hooks = []
+        for event in self.HOOKED_EVENTS:
+            hook = user32.SetWinEventHook(
+                event, event, 0, self._proc, 0, 0,
+                WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+            )
+            if hook: hooks.append(hook)
+        self._ready.set()
+        if not hooks:
+            self._thread_id = None
+            return
+
+        # Out-of-context hooks are delivered through this thread's message queue
+        msg = wintypes.MSG()
+        try:
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
+
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        if not hwnd: return
+        if event == EVENT_SYSTEM_FOREGROUND:
+            self._emit(hwnd)
+        elif id_object != OBJID_WINDOW or id_child != CHILDID_SELF:
+            return  # Child objects (carets, list items, ...) - not our business
+        elif event == EVENT_OBJECT_DESTROY:
+            self._emit_window(hwnd, WINDOW_DESTROYED)
+        elif event == EVENT_OBJECT_NAMECHANGE:
+            self._emit_window(hwnd, WINDOW_RENAMED)
+        else:
+            self._emit_window(hwnd, WINDOW_MOVED)
+
+
+class ScriptedForegroundSource(ForegroundSource):
+    """Replays focus changes from a timeline of (delay_seconds, hwnd) on `timebase`. Used for tests."""
+
+    def __init__(self, timeline=None, timebase=SYSTEM_CLOCK):
+        super().__init__()
+        self.timeline = list(timeline or [])
+        self.timebase = timebase
+        self._stopped = timebase.Event()
+        self._thread = None
+
+    def start(self, callback):
+        super().start(callback)
+        self._stopped.clear()
+        if self.timeline:
+            self._thread = self.timebase.spawn(self._play)
+
+    def stop(self):
+        super().stop()
+        self._stopped.set()
+
+    def push(self, hwnd):
+        """Deliver a focus change immediately."""
+        self._emit(hwnd)
+
+    def push_window(self, hwnd, kind):
+        """Deliver a destroy/rename/move notification immediately."""
+        self._emit_window(hwnd, kind)
+
+    def _play(self):
+        for delay, hwnd in self.timeline:
+            if self.callback is None: return
+            if delay > 0 and self._stopped.wait(delay): return
+            self._emit(hwnd)
+
+
+class LRUCache:
+    """Small thread-safe LRU map with hit/miss counters."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data), "hits": self.hits, "misses": self.misses,
+            "evictions": self.evictions, "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+def win32_window_identity(hwnd):
+    """(title, class, monitor, pid) for a window, straight from Win32."""
+    import win32api
+    import win32con
+    import win32gui
+    import win32process
+    # Monitor first: it doesn't need admin rights even when the process is protected
+    monitor = win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONULL)
+    _, pid = win32process.GetWindowThreadProcessId(hwnd)
+    return win32gui.GetWindowText(hwnd), win32gui.GetClassName(hwnd), monitor, pid
+
+
+def win32_client_size(hwnd):
+    """(width, height) of a window's client area, or None if it is gone."""
+    import win32gui
+    if not win32gui.IsWindow(hwnd): return None
+    left, top, right, bottom = win32gui.GetClientRect(hwnd)
+    return right - left, bottom - top
+
+
+class IdentityCache:
+    """
+    Shared window/process identity lookups.
+
+    Processes map pid -> (exe, create_time). Every lookup reads create_time
+    (opening the process already does) and only trusts the cached exe when it
+    matches, so a recycled PID never returns the previous owner's exe; what
+    the cache saves is the name() query. Windows map
+    hwnd -> (title, class, monitor, pid, create_time) and are dropped on
+    destroy/rename/move notifications. Window entries are only kept when such
+    notifications are available (track_windows=True); otherwise every window
+    lookup goes to the OS.
+    """
+
+    def __init__(self, track_windows=True, query_window=win32_window_identity, clock=time.monotonic,
+                 open_process=psutil.Process):
+        self.track_windows = track_windows
+        self.query_window = query_window
+        self.clock = clock
+        self.open_process = open_process
+        self.windows = LRUCache(WINDOW_CACHE_SIZE)
+        self.processes = LRUCache(PROCESS_CACHE_SIZE)  # pid -> (exe, create_time)
+
+    def process_identity(self, pid):
+        """(exe, create_time) for a pid, or (None, None) if it's gone or protected."""
+        try:
+            proc = self.open_process(pid)
+            created = proc.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            self.processes.pop(pid)
+            return None, None
+        entry = self.processes.get(pid)
+        if entry is not None and entry[1] == created:
+            return entry
+        try:
+            name = proc.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.processes.pop(pid)
+            return None, None
+        self.processes.put(pid, (name, created))
+        return name, created
+
+    def forget(self, pid):
+        """The pid exited: drop its entry instead of waiting for it to age out."""
+        self.processes.pop(pid)
+
+    def process_name(self, pid):
+        return self.process_identity(pid)[0]
+
+    def window_info(self, hwnd):
+        """(exe, title, class, monitor) for a window; exe is None if the process can't be read."""
+        if self.track_windows:
+            entry = self.windows.get(hwnd)
+            if entry is not None and self.clock() - entry[5] < WINDOW_CACHE_TTL:
+                title, cls, monitor, pid, create_time, _ = entry
+                # The window is alive (no destroy seen), so its owning process is too
+                process = self.processes.get(pid)
+                if process is not None and process[1] == create_time:
+                    return process[0], title, cls, monitor
+
+        title, cls, monitor, pid = self.query_window(hwnd)
+        exe, create_time = self.process_identity(pid)
+        if exe is not None and self.track_windows:
+            self.windows.put(hwnd, (title, cls, monitor, pid, create_time, self.clock()))
+        return exe, title, cls, monitor
+
+    def on_window_event(self, hwnd, kind):
+        """Window listener for ForegroundSource notifications."""
+        self.windows.pop(hwnd)
+
+    def stats(self):
+        return {"windows": self.windows.stats(), "processes": self.processes.stats()}
+
+
+def win32_find_main_window(pid):
+    """(hwnd, title, class) of the first visible, titled top-level window owned by pid."""
+    import win32gui
+    import win32process
+    found = []
+
+    def enum_handler(hwnd, ctx):
+        if found or not win32gui.IsWindowVisible(hwnd): return
+        title = win32gui.GetWindowText(hwnd)
+        if not title.strip(): return
+        _, owner = win32process.GetWindowThreadProcessId(hwnd)
+        if owner == pid:
+            found.append((hwnd, title, win32gui.GetClassName(hwnd)))
+
+    try:
+        win32gui.EnumWindows(enum_handler, None)
+    except Exception:
+        pass
+    return found[0] if found else (None, None, None)
+
+
+def win32_visible_windows():
+    """(hwnd, title, pid) of every visible, titled top-level window, in z-order."""
+    import win32gui
+    import win32process
+    windows = []
+
+    def enum_handler(hwnd, ctx):
+        if not win32gui.IsWindowVisible(hwnd): return
+        title = win32gui.GetWindowText(hwnd)
+        if not title.strip(): return
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        windows.append((hwnd, title, pid))
+
+    win32gui.EnumWindows(enum_handler, None)
+    return windows
+
+
+class ProcessWatcher:
+    """
+    Keeps a lowercase exe -> pids index current by diffing pid lists.
+
+    A scan only opens pids it hasn't seen before; pids that vanished are
+    dropped. Starts and exits of watched executables (see `watch`) are
+    reported to callback(kind, exe, pid). Watched processes are also waited
+    on directly, so their exit is reported as soon as it happens rather than
+    on the next scan - including when the pid is reused before then, since
+    wait_procs checks create_time. An unwatched pid reused between two scans
+    keeps its old index entry until it vanishes. Processes that exist when
+    the watcher starts are indexed but not reported as started.
+    """
+
+    def __init__(self, identity, callback=None, interval=PROCESS_SCAN_INTERVAL, list_pids=psutil.pids,
+                 open_process=psutil.Process, wait_procs=psutil.wait_procs, timebase=SYSTEM_CLOCK):
+        self.identity = identity
+        self.callback = callback
+        self.interval = interval
+        self.list_pids = list_pids
+        self.open_process = open_process
+        self.wait_procs = wait_procs
+        self.timebase = timebase
+        self.watch = lambda exe: False
+        self.by_name = {}   # exe.lower() -> set of pids
+        self.procs = {}     # pid -> exe (None if unreadable)
+        self.primed = False
+        self._waits = {}    # pid -> psutil.Process for watched processes
+        self._lock = threading.Lock()
+        self._stop = timebase.Event()
+        self._thread = None
+
+    def is_running(self, exe):
+        return bool(self.by_name.get(exe.lower()))
+
+    def pids(self, exe):
+        return set(self.by_name.get(exe.lower(), ()))
+
+    def start(self):
+        if self._thread and self._thread.is_alive(): return
+        self._stop.clear()
+        self._thread = self.timebase.spawn(self._run)
+
+    def stop(self):
+        self._stop.set()
+
+    def refresh_watch(self):
+        """Re-apply `watch` to known processes after the rules changed (no events emitted)."""
+        with self._lock:
+            for pid, exe in self.procs.items():
+                if exe and self.watch(exe):
+                    self._add_wait(pid)
+                else:
+                    self._waits.pop(pid, None)
+
+    def scan(self):
+        """Diff the pid list against the index. Returns the (kind, exe, pid) events emitted."""
+        try:
+            current = set(self.list_pids())
+        except Exception:
+            return []
+        events = []
+        with self._lock:
+            for pid in list(self.procs):
+                if pid in current: continue
+                event = self._remove(pid)
+                if event: events.append(event)
+            for pid in current:
+                if pid in self.procs: continue
+                exe = self.identity.process_name(pid)
+                self.procs[pid] = exe  # Unreadable pids are remembered too, so we don't re-query them
+                if not exe: continue
+                self.by_name.setdefault(exe.lower(), set()).add(pid)
+                if self.watch(exe):
+                    self._add_wait(pid)
+                    if self.primed: events.append((PROCESS_STARTED, exe, pid))
+            self.primed = True
+        self._dispatch(events)
+        return events
+
+    def _run(self):
+        self.scan()  # Prime the index with what is already running
+        while not self._stop.is_set():
+            if self.wait_exits() is None:
+                self._stop.wait(self.interval)
+            self.scan()
+
+    def wait_exits(self):
+        """
+        Wait up to `interval` for a watched process to exit and report it.
+        Returns the (kind, exe, pid) events emitted, or None if nothing is watched.
+        """
+        with self._lock:
+            waits = list(self._waits.values())
+        if not waits: return None
+        # Returns early as soon as any watched process exits
+        try:
+            gone, _ = self.wait_procs(waits, timeout=self.interval)
+        except Exception:
+            gone = []
+            self._stop.wait(self.interval)
+        events = []
+        with self._lock:
+            for proc in gone:
+                if self._waits.get(proc.pid) is not proc: continue  # Already removed by a scan
+                event = self._remove(proc.pid)
+                if event: events.append(event)
+        self._dispatch(events)
+        return events
+
+    def _add_wait(self, pid):
+        if pid in self._waits: return
+        try:
+            self._waits[pid] = self.open_process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+    def _remove(self, pid):
+        exe = self.procs.pop(pid, None)
+        self.identity.forget(pid)
+        watched = self._waits.pop(pid, None) is not None
+        if not exe: return None
+        pids = self.by_name.get(exe.lower())
+        if pids is not None:
+            pids.discard(pid)
+            if not pids: del self.by_name[exe.lower()]
+        return (PROCESS_EXITED, exe, pid) if watched else None
+
+    def _dispatch(self, events):
+        if not self.callback: return
+        for kind, exe, pid in events:
+            try:
+                self.callback(kind, exe, pid)
+            except Exception:
+                pass
+
+
+class AppScanner:
+    """
+    Lists running apps that have a visible window, as "title (exe)".
+
+    The scan runs on `scheduler` (a TaskRuntime). Exe names come from
+    `known` (e.g. ProcessWatcher.procs) and then the shared IdentityCache,
+    so only pids never seen before are queried. Each exe is listed once,
+    with its topmost window's title. Apps are streamed to on_app(app) as
+    they resolve and on_done(apps) gets the sorted list, or None if the
+    window list couldn't be read. A finished scan is reused for `ttl`
+    seconds, and callers arriving mid-scan join the running one.
+    """
+
+    def __init__(self, identity, scheduler, known=None, list_windows=win32_visible_windows,
+                 exclude="HotSwap", ttl=APP_SCAN_TTL, clock=time.monotonic):
+        self.identity = identity
+        self.scheduler = scheduler
+        self.known = known if known is not None else {}
+        self.list_windows = list_windows
+        self.exclude = exclude
+        self.ttl = ttl
+        self.clock = clock
+        self.snapshot = None
+        self.taken = 0.0
+        self._found = []       # Apps of the scan in progress
+        self._listeners = []   # (on_app, on_done) waiting on it
+        self._running = False
+        self._lock = threading.Lock()
+
+    def scan(self, on_app=None, on_done=None):
+        with self._lock:
+            cached = None
+            if not self._running and self.snapshot is not None and self.clock() - self.taken < self.ttl:
+                cached = self.snapshot
+            else:
+                self._listeners.append((on_app, on_done))
+                found = list(self._found)
+                start = not self._running
+                self._running = True
+        if cached is not None:
+            for app in cached: self._call(on_app, app)
+            self._call(on_done, cached)
+            return
+        for app in found: self._call(on_app, app)
+        if start and self.scheduler.submit(self._run) is None:
+            self._finish(None)
+
+    def invalidate(self):
+        with self._lock:
+            self.snapshot = None
+
+    def _resolve(self, pid):
+        return self.known.get(pid) or self.identity.process_name(pid)
+
+    def _run(self):
+        try:
+            windows = self.list_windows()
+        except Exception as e:
+            log.warning("Scan", "Scan error: %s", e)
+            self._finish(None)
+            return
+        seen = set()
+        for _, title, pid in windows:
+            exe = self._resolve(pid)
+            if not exe or exe.lower() in seen: continue
+            seen.add(exe.lower())
+            app = f"{title} ({exe})"
+            if self.exclude and self.exclude in app: continue
+            with self._lock:
+                self._found.append(app)
+                listeners = list(self._listeners)
+            for on_app, _ in listeners: self._call(on_app, app)
+        with self._lock:
+            apps = sorted(self._found, key=str.lower)
+        self._finish(apps)
+
+    def _finish(self, apps):
+        with self._lock:
+            if apps is not None:
+                self.snapshot = apps
+                self.taken = self.clock()
+            listeners = self._listeners
+            self._listeners = []
+            self._found = []
+            self._running = False
+        for _, on_done in listeners: self._call(on_done, apps)
+
+    @staticmethod
+    def _call(fn, *args):
+        if fn is None: return
+        try: fn(*args)
+        except Exception: pass
+
+
+def create_foreground_source():
+    """Best event source for this platform, or None when only polling is available."""
+    if sys.platform == "win32":
+        return WinEventForegroundSource()
+    return None
+
+
+class Win32Platform:
+    """
+    The real desktop behind HotSwapEngine: Win32 windows and monitors, psutil
+    processes, the keyboard module, winsound and the network to OBS.
+
+    Everything the engine asks of the OS goes through one of these, so a
+    simulated platform (hotswap_sim.SimPlatform) can stand in for it.
+    Win32 modules are imported on first use, which keeps this importable
+    anywhere.
+    """
+
+    clock = SYSTEM_CLOCK
+
+    # --- Windows and monitors ---
+    def foreground_window(self):
+        import win32gui
+        return win32gui.GetForegroundWindow()
+
+    def window_identity(self, hwnd):
+        return win32_window_identity(hwnd)
+
+    def window_pid(self, hwnd):
+        import win32process
+        return win32process.GetWindowThreadProcessId(hwnd)[1]
+
+    def client_size(self, hwnd):
+        return win32_client_size(hwnd)
+
+    def monitor_from_window(self, hwnd):
+        import win32api
+        import win32con
+        return win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONULL)
+
+    def monitors(self):
+        """(handle, (left, top, right, bottom)) per display."""
+        import win32api
+        return [(handle, rect) for handle, _, rect in win32api.EnumDisplayMonitors()]
+
+    def find_main_window(self, pid):
+        return win32_find_main_window(pid)
+
+    def visible_windows(self):
+        return win32_visible_windows()
+
+    def foreground_source(self):
+        return create_foreground_source()
+
+    # --- Network ---
+    def probe_port(self, host, port):
+        """True if something accepts TCP connections on host:port."""
+        try:
+            with socket.create_connection((host, port), timeout=1.0):
+                return True
+        except (socket.timeout, ConnectionRefusedError, OSError):
+            return False
+
+    def open_obs(self, **kwargs):
+        """Connected ObsClient; kwargs are ObsClient's."""
+        from hotswap_obs import ObsClient
+        return ObsClient(**kwargs)
+
+    # --- Processes ---
+    def list_pids(self):
+        return psutil.pids()
+
+    def open_process(self, pid):
+        return psutil.Process(pid)
+
+    def wait_procs(self, procs, timeout=None):
+        return psutil.wait_procs(procs, timeout=timeout)
+
+    def process_names(self):
+        """Exe name of every running process (None where unreadable)."""
+        for proc in psutil.process_iter(['name']):
+            yield proc.info['name']
+
+    # --- Keyboard ---
+    def hook_keys(self, callback):
+        """Deliver every key event to callback(event); returns a handle for unhook_keys()."""
+        import keyboard
+        return keyboard.hook(callback)
+
+    def unhook_keys(self, hook):
+        import keyboard
+        keyboard.unhook(hook)
+
+    def scan_codes(self, combo):
+        from hotswap_input import keyboard_scan_codes
+        return keyboard_scan_codes(combo)
+
+    def add_hotkey(self, combo, callback):
+        import keyboard
+        keyboard.add_hotkey(combo, callback)
+
+    def remove_hotkey(self, callback):
+        import keyboard
+        keyboard.remove_hotkey(callback)
+
+    # --- Sound ---
+    def sound_output(self):
+        from hotswap_sound import WinsoundOutput
+        return WinsoundOutput()
+
+    def beep(self, kind):
+        """System sound: "ok", "asterisk" or "exclamation"."""
+        import winsound
+        winsound.MessageBeep({"asterisk": winsound.MB_ICONASTERISK,
+                              "exclamation": winsound.MB_ICONEXCLAMATION}.get(kind, winsound.MB_OK))
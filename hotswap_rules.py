@@ -0,0 +1,99 @@
+"""Compiled whitelist/blacklist/anti-cheat matching for HotSwap."""
+import fnmatch
+import re
+from collections import namedtuple
+
+Decision = namedtuple("Decision", ["whitelisted", "blacklisted", "temp_ignored", "anticheat"])
+
+RULE_LISTS = ("whitelist", "blacklist", "temp_ignore", "anticheat")
+GLOB_CHARS = "*?["
+REGEX_PREFIX = "re:"
+MEMO_LIMIT = 4096
+# Regex features that mean something else once the pattern is one branch of an alternation
+GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")  # Group numbers shift, names can collide
+GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")           # Apply to (or are rejected in) the whole join
+
+
+class CompiledRules:
+    """
+    One rule list compiled for case-insensitive matching.
+
+    Plain names go into a set; "*"/"?"/"[" globs and "re:" regular
+    expressions are folded into one alternation, so a lookup is a set probe
+    plus at most one regex match no matter how long the list is.
+
+    Each regex is compiled on its own first; ones that don't compile are
+    listed in `invalid` and skipped. Regexes using group references or
+    global inline flags would change meaning inside the alternation, so
+    they are matched one by one instead, as is everything if the joined
+    expression still fails to compile.
+    """
+
+    def __init__(self, patterns=()):
+        self.exact = set()
+        self.invalid = []
+        self.separate = []  # Compiled regexes matched one by one
+        parts = []
+        for pattern in patterns:
+            pattern = (pattern or "").strip()
+            if not pattern: continue
+            if pattern.lower().startswith(REGEX_PREFIX):
+                expr = pattern[len(REGEX_PREFIX):]
+                try:
+                    compiled = re.compile(expr, re.IGNORECASE)
+                except re.error:
+                    self.invalid.append(pattern)
+                    continue
+                if GROUP_REFERENCE.search(expr) or GLOBAL_FLAGS.search(expr):
+                    self.separate.append(compiled)
+                else:
+                    parts.append((pattern, f"(?:{expr})\\Z"))
+            elif any(c in pattern for c in GLOB_CHARS):
+                parts.append((pattern, fnmatch.translate(pattern.lower())))
+            else:
+                self.exact.add(pattern.lower())
+        self.regex = None
+        if parts:
+            try:
+                self.regex = re.compile("|".join(part for _, part in parts), re.IGNORECASE)
+            except re.error:
+                for pattern, part in parts:
+                    try: self.separate.append(re.compile(part, re.IGNORECASE))
+                    except re.error: self.invalid.append(pattern)
+
+    def matches(self, exe_lower):
+        if exe_lower in self.exact: return True
+        if self.regex is not None and self.regex.match(exe_lower) is not None: return True
+        return any(r.fullmatch(exe_lower) for r in self.separate)
+
+
+class RuleMatcher:
+    """Decides whitelist/blacklist/temp-ignore/anti-cheat membership, memoized per exe."""
+
+    def __init__(self):
+        self._lists = {name: CompiledRules() for name in RULE_LISTS}
+        self._memo = {}
+
+    def set_list(self, name, patterns):
+        """Recompile one list; clears the decision memo."""
+        self._lists[name] = CompiledRules(patterns)
+        self._memo = {}
+
+    def decide(self, exe):
+        memo = self._memo
+        decision = memo.get(exe)
+        if decision is None:
+            exe_lower = exe.lower()
+            lists = self._lists
+            decision = Decision(
+                lists["whitelist"].matches(exe_lower),
+                lists["blacklist"].matches(exe_lower),
+                lists["temp_ignore"].matches(exe_lower),
+                lists["anticheat"].matches(exe_lower),
+            )
+            if len(memo) >= MEMO_LIMIT: memo.clear()
+            memo[exe] = decision
+        return decision
+
+    def invalid_patterns(self):
+        return [p for rules in self._lists.values() for p in rules.invalid]
@@ -0,0 +1,714 @@
+"""
+Deterministic replay harness for HotSwap.
+
+Runs the real HotSwapEngine - tracking_loop, heuristic_loop, Quick Add,
+focus lock, process lifecycle, hook validation, stats sampling - against a
+simulated desktop (windows, monitors, processes, keyboard, sounds) and an
+in-process OBS, all on virtual time. An hour-long session replays in
+seconds on any OS, and the report covers switch latency, OBS round-trips
+per switch and how often the engine touched the platform.
+
+    python hotswap_sim.py --hours 1 --seed 7
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, deque, namedtuple
+
+import psutil
+
+from hotswap_clock import VirtualClock
+from hotswap_log import log
+from hotswap_platform import ScriptedForegroundSource, WINDOW_DESTROYED, WINDOW_RENAMED, WINDOW_MOVED
+from hotswap_obs import ObsClient, ObsResponse, ObsEvent, ObsConnectionError, ObsRequestError, STATUS_SUCCESS
+from hotswap_obs_fake import FakeObs
+from hotswap_stats import percentile
+from hotswap_engine import HotSwapEngine, EngineView, SWITCH_DEBOUNCE
+
+SimKeyEvent = namedtuple("SimKeyEvent", "event_type scan_code name time")
+
+# (exe, title, class) of the simulated desktop
+SIM_GAMES = (
+    ("eldenring.exe", "ELDEN RING™", "ELDEN RING™"),
+    ("cs2.exe", "Counter-Strike 2", "SDL_app"),
+    ("witcher3.exe", "The Witcher 3", "W2ViewportClass"),
+    ("hades2.exe", "Hades II", "SDL_app"),
+    ("factorio.exe", "Factorio", "ALLEGRO"),
+    ("balatro.exe", "Balatro", "SDL_app"),
+)
+SIM_APPS = (
+    ("explorer.exe", "File Explorer", "CabinetWClass"),
+    ("chrome.exe", "YouTube - Google Chrome", "Chrome_WidgetWin_1"),
+    ("discord.exe", "#general - Discord", "Chrome_WidgetWin_1"),
+    ("notepad.exe", "notes.txt - Notepad", "Notepad"),
+)
+SIM_RESOLUTIONS = ((1920, 1080), (2560, 1080), (1600, 1200), (1280, 720))
+WINDOW_DELAY = 1.5  # Seconds from process start to its first window
+
+
+# =============================================================================
+# SIMULATED DESKTOP
+# =============================================================================
+class SimWindow:
+    def __init__(self, hwnd, pid, title, cls, monitor, size):
+        self.hwnd = hwnd
+        self.pid = pid
+        self.title = title
+        self.cls = cls
+        self.monitor = monitor
+        self.size = size
+
+
+class SimProcess:
+    """psutil.Process stand-in: raises psutil.NoSuchProcess once the process has exited."""
+
+    def __init__(self, table, pid, name, created):
+        self.table = table
+        self.pid = pid
+        self._name = name
+        self.created = created
+
+    def is_running(self):
+        proc = self.table.get(self.pid)
+        return proc is not None and proc.created == self.created
+
+    def create_time(self):
+        self._check()
+        return self.created
+
+    def name(self):
+        self._check()
+        return self._name
+
+    def _check(self):
+        if not self.is_running(): raise psutil.NoSuchProcess(self.pid)
+
+
+class SimSoundOutput:
+    """Records cues instead of playing them."""
+
+    def __init__(self, platform):
+        self.platform = platform
+
+    def play(self, wav_bytes):
+        self.platform.sounds.append((self.platform.clock.monotonic(), len(wav_bytes)))
+
+    def stop(self):
+        pass
+
+    def beep(self, kind):
+        self.platform.beep(kind)
+
+
+class SimPlatform:
+    """
+    Simulated desktop for HotSwapEngine, a drop-in for Win32Platform.
+
+    The engine reads it from its own threads; the scripting methods
+    (launch, focus, kill, key_down, ...) are called from the simulation
+    driver, usually as VirtualClock actions. Focus changes are pushed
+    through a ScriptedForegroundSource like WinEvents would be, unless
+    focus_events is False, in which case the engine falls back to polling.
+    OBS is "running" while obs_running is set: connections get a new SimObs
+    built with `obs_options`, or whatever obs_factory(host=, port=, ...)
+    returns (ObsClient, for a real or fake OBS server). `calls` counts
+    every platform query the engine makes.
+    """
+
+    def __init__(self, clock=None, monitors=((0, 0, 1920, 1080), (1920, 0, 4480, 1440)), focus_events=True,
+                 obs_options=None, obs_factory=None):
+        self.clock = clock or VirtualClock()
+        self.obs_running = True
+        self.obs_options = dict(obs_options or {})
+        self.obs_factory = obs_factory
+        self.obs_clients = []  # Every SimObs handed out, oldest first
+        self.monitor_rects = {i + 1: rect for i, rect in enumerate(monitors)}
+        self.windows = {}      # hwnd -> SimWindow
+        self.z_order = []      # hwnds, topmost first
+        self.processes = {}    # pid -> SimProcess (running ones only)
+        self.foreground = 0
+        self.source = ScriptedForegroundSource(timebase=self.clock) if focus_events else None
+        self.key_hooks = {}    # handle -> callback
+        self.hotkeys = []      # (frozenset of key names, callback)
+        self.pressed = set()
+        self.scan_code_map = {}
+        self.sounds = []       # (time, wav size)
+        self.beeps = []        # (time, kind)
+        self.focus_log = []    # (time, hwnd, exe)
+        self.on_focus = None   # on_focus(hwnd, exe) after each focus change, for the driver
+        self.calls = Counter()
+        self._pids = itertools.count(1000, 4)
+        self._hwnds = itertools.count(0x10010, 2)
+        self._hooks = itertools.count(1)
+        self._proc_changed = self.clock.Condition()
+
+    # --- Platform interface: windows and monitors ---
+    def foreground_window(self):
+        self.calls["foreground_window"] += 1
+        return self.foreground
+
+    def window_identity(self, hwnd):
+        self.calls["window_identity"] += 1
+        window = self.windows.get(hwnd)
+        if window is None: return "", "", None, 0
+        return window.title, window.cls, window.monitor, window.pid
+
+    def window_pid(self, hwnd):
+        self.calls["window_pid"] += 1
+        window = self.windows.get(hwnd)
+        return window.pid if window else 0
+
+    def client_size(self, hwnd):
+        self.calls["client_size"] += 1
+        window = self.windows.get(hwnd)
+        return window.size if window else None
+
+    def monitor_from_window(self, hwnd):
+        window = self.windows.get(hwnd)
+        return window.monitor if window else None
+
+    def monitors(self):
+        return list(self.monitor_rects.items())
+
+    def find_main_window(self, pid):
+        self.calls["find_main_window"] += 1
+        for hwnd in list(self.z_order):
+            window = self.windows.get(hwnd)
+            if window is not None and window.pid == pid and window.title.strip():
+                return hwnd, window.title, window.cls
+        return None, None, None
+
+    def visible_windows(self):
+        self.calls["visible_windows"] += 1
+        windows = [self.windows.get(hwnd) for hwnd in list(self.z_order)]
+        return [(w.hwnd, w.title, w.pid) for w in windows if w is not None]
+
+    def foreground_source(self):
+        return self.source
+
+    # --- Platform interface: network ---
+    def probe_port(self, host, port):
+        self.calls["probe_port"] += 1
+        return self.obs_running
+
+    def open_obs(self, host, port, password, on_event=None, on_disconnect=None, **kwargs):
+        self.calls["open_obs"] += 1
+        if not self.obs_running: raise ObsConnectionError("OBS is not running")
+        if self.obs_factory:
+            client = self.obs_factory(host=host, port=port, password=password, on_event=on_event,
+                                      on_disconnect=on_disconnect, **kwargs)
+        else:
+            client = SimObs(self.clock, on_event=on_event, on_disconnect=on_disconnect, **self.obs_options)
+        self.obs_clients.append(client)
+        return client
+
+    @property
+    def obs(self):
+        """The current OBS connection, if any."""
+        client = self.obs_clients[-1] if self.obs_clients else None
+        return client if client is not None and client.connected else None
+
+    def crash_obs(self, downtime):
+        """OBS closes without warning and starts again after `downtime` seconds."""
+        self.obs_running = False
+        if self.obs: self.obs.drop()
+        self.clock.after(downtime, setattr, self, "obs_running", True)
+
+    # --- Platform interface: processes ---
+    def list_pids(self):
+        self.calls["list_pids"] += 1
+        return list(self.processes)
+
+    def open_process(self, pid):
+        self.calls["open_process"] += 1
+        proc = self.processes.get(pid)
+        if proc is None: raise psutil.NoSuchProcess(pid)
+        return proc
+
+    def wait_procs(self, procs, timeout=None):
+        end = None if timeout is None else self.clock.monotonic() + timeout
+        with self._proc_changed:
+            while True:
+                gone = [p for p in procs if not p.is_running()]
+                remaining = None if end is None else end - self.clock.monotonic()
+                if gone or (remaining is not None and remaining <= 0):
+                    return gone, [p for p in procs if p.is_running()]
+                self._proc_changed.wait(remaining)
+
+    def process_names(self):
+        self.calls["process_names"] += 1
+        return [proc._name for proc in list(self.processes.values())]
+
+    # --- Platform interface: keyboard and sound ---
+    def hook_keys(self, callback):
+        handle = next(self._hooks)
+        self.key_hooks[handle] = callback
+        return handle
+
+    def unhook_keys(self, hook):
+        self.key_hooks.pop(hook, None)
+
+    def scan_codes(self, combo):
+        if "," in combo: raise ValueError(f"Key sequences are not supported for activity detection: {combo}")
+        return [{self._code(name)} for name in self._keys(combo)]
+
+    def add_hotkey(self, combo, callback):
+        self.hotkeys.append((frozenset(self._keys(combo)), callback))
+
+    def remove_hotkey(self, callback):
+        self.hotkeys = [(keys, cb) for keys, cb in self.hotkeys if cb != callback]
+
+    def sound_output(self):
+        return SimSoundOutput(self)
+
+    def beep(self, kind):
+        self.beeps.append((self.clock.monotonic(), kind))
+
+    # --- Scripting (driver thread) ---
+    def start_process(self, exe):
+        pid = next(self._pids)
+        self.processes[pid] = SimProcess(self.processes, pid, exe, self.clock.time())
+        return pid
+
+    def open_window(self, pid, title, cls, monitor=1, size=(1920, 1080), focus=True):
+        if pid not in self.processes: return None
+        hwnd = next(self._hwnds)
+        self.windows[hwnd] = SimWindow(hwnd, pid, title, cls, monitor, size)
+        self.z_order.insert(0, hwnd)
+        if focus: self.focus(hwnd)
+        return hwnd
+
+    def launch(self, exe, title, cls, monitor=1, size=(1920, 1080), window_delay=0.0, focus=True):
+        """Start a process; its window opens (and takes focus) after window_delay seconds."""
+        pid = self.start_process(exe)
+        if window_delay > 0:
+            self.clock.after(window_delay, self.open_window, pid, title, cls, monitor, size, focus)
+        else:
+            self.open_window(pid, title, cls, monitor, size, focus)
+        return pid
+
+    def focus(self, hwnd):
+        window = self.windows.get(hwnd)
+        if window is None: return
+        self.z_order.remove(hwnd)
+        self.z_order.insert(0, hwnd)
+        if hwnd == self.foreground: return
+        self.foreground = hwnd
+        proc = self.processes.get(window.pid)
+        exe = proc.name() if proc else None
+        self.focus_log.append((self.clock.monotonic(), hwnd, exe))
+        if self.on_focus: self.on_focus(hwnd, exe)
+        if self.source: self.source.push(hwnd)
+
+    def close_window(self, hwnd):
+        if self.windows.pop(hwnd, None) is None: return
+        self.z_order.remove(hwnd)
+        if self.source: self.source.push_window(hwnd, WINDOW_DESTROYED)
+        if hwnd == self.foreground:
+            self.foreground = 0
+            if self.z_order: self.focus(self.z_order[0])
+
+    def kill(self, pid):
+        for hwnd in [h for h, w in self.windows.items() if w.pid == pid]:
+            self.close_window(hwnd)
+        if self.processes.pop(pid, None) is None: return
+        with self._proc_changed:
+            self._proc_changed.notify_all()
+
+    def resize(self, hwnd, size):
+        window = self.windows.get(hwnd)
+        if window is None: return
+        window.size = size
+        if self.source: self.source.push_window(hwnd, WINDOW_MOVED)
+
+    def rename(self, hwnd, title):
+        window = self.windows.get(hwnd)
+        if window is None: return
+        window.title = title
+        if self.source: self.source.push_window(hwnd, WINDOW_RENAMED)
+
+    def key_down(self, name):
+        self.pressed.add(name)
+        self._deliver("down", name)
+        for keys, callback in list(self.hotkeys):
+            if name in keys and keys <= self.pressed:
+                try: callback()
+                except Exception as e: log.error("Sim", "Hotkey %s failed: %r", keys, e)
+
+    def key_up(self, name):
+        self.pressed.discard(name)
+        self._deliver("up", name)
+
+    def tap(self, combo):
+        keys = self._keys(combo)
+        for name in keys: self.key_down(name)
+        for name in reversed(keys): self.key_up(name)
+
+    def hold(self, combo, seconds):
+        """Press combo now and release it after `seconds`."""
+        for name in self._keys(combo): self.key_down(name)
+        self.clock.after(seconds, self._release, combo)
+
+    def exe_of(self, hwnd):
+        window = self.windows.get(hwnd)
+        proc = self.processes.get(window.pid) if window else None
+        return proc.name() if proc else None
+
+    def _release(self, combo):
+        for name in reversed(self._keys(combo)): self.key_up(name)
+
+    def _deliver(self, event_type, name):
+        event = SimKeyEvent(event_type, self._code(name), name, self.clock.time())
+        for callback in list(self.key_hooks.values()):
+            try: callback(event)
+            except Exception: pass
+
+    @staticmethod
+    def _keys(combo):
+        return [k.strip().lower() for k in combo.split("+") if k.strip()]
+
+    def _code(self, name):
+        return self.scan_code_map.setdefault(name, len(self.scan_code_map) + 1)
+
+
+# =============================================================================
+# SIMULATED OBS
+# =============================================================================
+class SimObs(ObsClient):
+    """
+    In-process OBS for replays: a FakeObs reached without a socket.
+
+    Every request or batch costs `latency` seconds of virtual time and
+    counts as one round-trip; capture sources go active `hook_delay`
+    seconds after a switch. Events are delivered on their own thread, as
+    ObsClient does. Extra keyword arguments go to FakeObs.
+    """
+
+    VIDEO_SOURCE = FakeObs.VIDEO_SOURCE
+    AUDIO_SOURCE = FakeObs.AUDIO_SOURCE
+
+    def __init__(self, clock, on_event=None, on_disconnect=None, latency=0.002, **obs_options):
+        self.clock = clock
+        self.on_event = on_event
+        self.on_disconnect = on_disconnect
+        self.timeout = 5.0
+        self.latency = latency
+        self.state = FakeObs(clock=clock.monotonic, emit=self._emit, later=clock.after, **obs_options)
+        self.trips = Counter()  # request type (or "RequestBatch") -> round-trips
+        self._connected = True
+        self._events = deque()
+        self._event_cond = clock.Condition()
+        clock.spawn(self._dispatch_events)
+
+    @property
+    def connected(self):
+        return self._connected
+
+    @property
+    def round_trips(self):
+        return sum(self.trips.values())
+
+    def call(self, request_type, data=None, timeout=None):
+        self._round_trip(request_type)
+        ok, code, comment, response = self.state.handle(request_type, data or {})
+        if not ok: raise ObsRequestError(request_type, code, comment)
+        return ObsResponse(response)
+
+    def call_async(self, request_type, data=None, timeout=None):
+        raise NotImplementedError("SimObs only answers blocking requests")
+
+    def send_batch(self, batch, timeout=None):
+        self._round_trip("RequestBatch")
+        batch_id = f"b{self.round_trips}"
+        d = batch.payload(batch_id)["d"]
+        results = []
+        for request in d["requests"]:
+            request_type, data = request["requestType"], request.get("requestData") or {}
+            if request_type == "Sleep":
+                self.clock.sleep(data.get("sleepMillis", 0) / 1000)
+                ok, code, comment, response = True, STATUS_SUCCESS, None, None
+            else:
+                ok, code, comment, response = self.state.handle(request_type, data)
+            results.append({
+                "requestId": request["requestId"], "requestType": request_type,
+                "requestStatus": {"result": ok, "code": code, "comment": comment}, "responseData": response,
+            })
+            if not ok and d["haltOnFailure"]: break
+        return batch.decode({"requestId": batch_id, "results": results})
+
+    def disconnect(self):
+        self._connected = False
+        with self._event_cond:
+            self._events.append(None)
+            self._event_cond.notify()
+
+    def drop(self):
+        """OBS went away: close the connection and report it like the real client does."""
+        if not self._connected: return
+        self.disconnect()
+        if self.on_disconnect: self.clock.spawn(self.on_disconnect)
+
+    def _round_trip(self, kind):
+        if not self._connected: raise ObsConnectionError("OBS connection closed")
+        self.trips[kind] += 1
+        if self.latency: self.clock.sleep(self.latency)
+
+    def _emit(self, name, data):
+        with self._event_cond:
+            self._events.append(ObsEvent(name, data))
+            self._event_cond.notify()
+
+    def _dispatch_events(self):
+        while True:
+            with self._event_cond:
+                while not self._events:
+                    self._event_cond.wait()
+                event = self._events.popleft()
+            if event is None: return
+            if self.on_event:
+                try: self.on_event(event)
+                except Exception: pass
+
+
+# =============================================================================
+# SESSION
+# =============================================================================
+class RecordingView(EngineView):
+    """Keeps what the engine shows, stamped with virtual time."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.suggestions = []   # (time, exe)
+        self.alerts = []        # (time, Alert)
+        self.tracking = False
+
+    def on_tracking(self, tracking, connected):
+        self.tracking = tracking
+
+    def on_suggestion(self, exe):
+        if exe: self.suggestions.append((self.clock.monotonic(), exe))
+
+    def on_alert(self, alert):
+        self.alerts.append((self.clock.monotonic(), alert))
+
+
+class Simulation:
+    """
+    One replayed session: SimPlatform + SimObs + a HotSwapEngine on a VirtualClock.
+
+    A seeded random user launches and quits games, alt-tabs between them and
+    desktop apps, plays (holding the detection keys), adds new games with
+    the Quick Add hotkey, changes resolution and occasionally loses OBS.
+    The same seed always produces the same session.
+    """
+
+    def __init__(self, seed=1, latency=0.002, hook_delay=1.5, focus_events=True, dwell=45.0,
+                 whitelisted=3, auto_fit=True, obs_drops=True):
+        self.rng = random.Random(seed)
+        self.dwell = dwell
+        self.obs_drops = obs_drops
+        self.clock = VirtualClock()
+        self.workdir = tempfile.mkdtemp(prefix="hotswap-sim-")
+        self.platform = SimPlatform(self.clock, focus_events=focus_events, obs_options={
+            "latency": latency, "hook_delay": hook_delay, "record_directory": self.workdir,
+        })
+        self.view = RecordingView(self.clock)
+        self.engine = HotSwapEngine(view=self.view, config_file=os.path.join(self.workdir, "config.json"),
+                                    platform=self.platform)
+        self.platform.on_focus = self._on_focus
+        self.expected = []  # (time, exe) focus changes the engine should act on
+        self.engine.load_settings({
+            "password": "sim", "video_source": SimObs.VIDEO_SOURCE, "audio_source": SimObs.AUDIO_SOURCE,
+            "auto_fit": auto_fit, "auto_tracking": True, "disclaimer_accepted": True,
+            "whitelist": [exe for exe, _, _ in SIM_GAMES[:whitelisted]],
+        })
+        self.actions = Counter()
+
+    def run(self, seconds):
+        platform = self.platform
+        for exe, title, cls in SIM_APPS:
+            platform.launch(exe, title, cls, focus=exe == "explorer.exe")
+        self.engine.start(install_script=False)
+        self.engine.connect()
+        self.clock.after(1.0, self._step)
+        self.clock.run_until(seconds)
+
+    def shutdown(self):
+        self.engine.shutdown()
+        self.clock.run_for(1.0)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    # --- The simulated user ---
+    def _step(self):
+        rng = self.rng
+        platform = self.platform
+        games = {platform.exe_of(h): h for h in platform.z_order if platform.exe_of(h) in {g[0] for g in SIM_GAMES}}
+        focused = platform.exe_of(platform.foreground)
+        roll = rng.random()
+        if platform.obs and not self.view.tracking:
+            # Tracking stops when OBS goes away; turn it back on like a user would
+            self._do("resume", platform.tap, self.engine.toggle_tracking_hotkey)
+        elif roll < 0.5 and platform.z_order:
+            # Alt-tab, mostly between games
+            pool = list(games.values()) * 3 + list(platform.z_order)
+            self._do("focus", platform.focus, rng.choice(pool))
+        elif roll < 0.62:
+            stopped = [g for g in SIM_GAMES if g[0] not in games and not any(
+                p.name() == g[0] for p in platform.processes.values())]
+            if stopped:
+                exe, title, cls = rng.choice(stopped)
+                self._do("launch", platform.launch, exe, title, cls, rng.choice(list(platform.monitor_rects)),
+                         rng.choice(SIM_RESOLUTIONS), WINDOW_DELAY)
+        elif roll < 0.69:
+            if games:
+                exe = rng.choice(sorted(games))
+                self._do("quit", platform.kill, platform.windows[games[exe]].pid)
+        elif roll < 0.86:
+            if focused in games:
+                # Play for a while; a game that isn't whitelisted gets suggested and Quick Added
+                held = self.engine.detection_threshold + rng.uniform(0.2, 3.0)
+                self._do("play", platform.hold, "w+a" if rng.random() < 0.5 else "w", held)
+                if not self.engine.rules.decide(focused).whitelisted and rng.random() < 0.8:
+                    self.clock.after(held + rng.uniform(0.3, 2.0), self._do, "quick_add", platform.tap,
+                                     self.engine.detection_hotkey)
+        elif roll < 0.94:
+            if focused in games:
+                self._do("resize", platform.resize, platform.foreground, rng.choice(SIM_RESOLUTIONS))
+        elif roll < 0.98:
+            if focused in games:
+                window = platform.windows[platform.foreground]
+                self._do("rename", platform.rename, window.hwnd, f"{window.title.split(' - ')[0]} - {rng.randint(1, 99)}")
+        elif self.obs_drops and platform.obs:
+            self._do("obs_crash", platform.crash_obs, rng.uniform(5.0, 20.0))
+        self.clock.after(max(0.2, rng.expovariate(1.0 / self.dwell)), self._step)
+
+    def _on_focus(self, hwnd, exe):
+        """Note focus changes to a tracked, whitelisted game that isn't captured already."""
+        if not exe or not self.view.tracking or not self.engine.rules.decide(exe).whitelisted: return
+        obs = self.platform.obs
+        window = obs.state.inputs[SimObs.VIDEO_SOURCE][1].get("window", "") if obs else ""
+        if window.rsplit(":", 1)[-1] != exe:
+            self.expected.append((self.clock.monotonic(), exe))
+
+    def _do(self, kind, fn, *args):
+        self.actions[kind] += 1
+        fn(*args)
+
+    # --- Results ---
+    def report(self):
+        platform, engine = self.platform, self.engine
+        clients = platform.obs_clients
+        switches = sorted(s for obs in clients for s in obs.state.switches)
+        requests, trips = Counter(), Counter()
+        for obs in clients:
+            requests.update(obs.state.requests)
+            trips.update(obs.trips)
+        round_trips = sum(trips.values())
+        # Stats polling runs whether or not anything switches
+        switch_trips = round_trips - trips["GetStats"]
+
+        # Focus -> SetInputSettings latency for each focus change the engine should have acted on;
+        # one that never got the capture while the game stayed focused long enough is a miss
+        latencies = []
+        missed = 0
+        focus_times = [t for t, _, _ in platform.focus_log] + [self.clock.monotonic()]
+        for focused_at, exe in self.expected:
+            until = next(t for t in focus_times if t > focused_at)
+            switched = next((t for t, w in switches if focused_at <= t < until and w.rsplit(":", 1)[-1] == exe), None)
+            if switched is not None: latencies.append((switched - focused_at) * 1000)
+            elif until - focused_at > SWITCH_DEBOUNCE + 1.0: missed += 1
+
+        identity = engine.identity.stats()
+        return {
+            "virtual_seconds": self.clock.monotonic(),
+            "clock_advances": self.clock.advances,
+            "actions": dict(self.actions),
+            "focus_changes": len(platform.focus_log),
+            "switches": len(switches),
+            "missed_switches": missed,
+            "switch_latency_ms": {
+                "p50": percentile(latencies, 50), "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99), "max": max(latencies, default=0.0),
+            },
+            "stage_latency_ms": engine.tracer.summary(),
+            "suggestions": len(self.view.suggestions),
+            "alerts": dict(Counter(a.kind for _, a in self.view.alerts)),
+            "sounds": len(platform.sounds),
+            "whitelist": list(engine.whitelist),
+            "obs_round_trips": round_trips,
+            "round_trips_per_switch": switch_trips / len(switches) if switches else 0.0,
+            "obs_requests": dict(requests),
+            "obs_connections": len(clients),
+            "platform_calls": dict(platform.calls),
+            "window_cache_hit_rate": identity["windows"]["hit_rate"],
+            "process_cache_hit_rate": identity["processes"]["hit_rate"],
+            "tasks": engine.tasks.stats(),
+        }
+
+
+def print_report(report, wall):
+    virtual = report["virtual_seconds"]
+    lat = report["switch_latency_ms"]
+    print(f"Replayed {virtual / 3600:.2f} h in {wall:.1f} s ({virtual / max(wall, 1e-9):.0f}x real time, "
+          f"{report['clock_advances']} clock advances)")
+    print(f"User actions:     {', '.join(f'{k} {v}' for k, v in sorted(report['actions'].items()))}")
+    print(f"Focus changes:    {report['focus_changes']}")
+    print(f"Switches:         {report['switches']} ({report['missed_switches']} missed)")
+    print(f"Switch latency:   p50 {lat['p50']:.1f} ms, p95 {lat['p95']:.1f} ms, p99 {lat['p99']:.1f} ms, max {lat['max']:.1f} ms")
+    for stage, (p50, p95, p99, count) in report["stage_latency_ms"].items():
+        if count: print(f"  {stage:<16}p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms ({count})")
+    print(f"Suggestions:      {report['suggestions']}; whitelist now {', '.join(report['whitelist'])}")
+    print(f"Alerts:           {report['alerts'] or 'none'}; {report['sounds']} sounds played")
+    print(f"OBS:              {report['obs_round_trips']} round-trips over {report['obs_connections']} connection(s), "
+          f"{report['round_trips_per_switch']:.1f} per switch besides stats polling")
+    print(f"OBS requests:     {', '.join(f'{k} {v}' for k, v in sorted(report['obs_requests'].items()))}")
+    print(f"Platform calls:   {', '.join(f'{k} {v}' for k, v in sorted(report['platform_calls'].items()))}")
+    print(f"Identity cache:   windows {report['window_cache_hit_rate']:.0%} hits, processes {report['process_cache_hit_rate']:.0%} hits")
+    tasks = report["tasks"]
+    print(f"Tasks:            {tasks['completed']} completed, {tasks['failed']} failed, {tasks['rejected']} rejected, "
+          f"wait p95 {tasks['wait_p95_ms']:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a simulated HotSwap session on virtual time.")
+    parser.add_argument("--hours", type=float, default=1.0, help="session length in virtual hours")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dwell", type=float, default=45.0, help="mean seconds between user actions")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="virtual OBS round-trip time")
+    parser.add_argument("--hook-delay", type=float, default=1.5, help="seconds until a switched capture shows video")
+    parser.add_argument("--whitelisted", type=int, default=3, help="games whitelisted at the start")
+    parser.add_argument("--no-focus-events", action="store_true", help="poll the foreground window like non-Windows builds")
+    parser.add_argument("--no-auto-fit", action="store_true")
+    parser.add_argument("--no-obs-drops", action="store_true", help="never restart OBS mid-session")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the engine's own output")
+    args = parser.parse_args(argv)
+
+    sim = Simulation(seed=args.seed, latency=args.latency_ms / 1000, hook_delay=args.hook_delay,
+                     focus_events=not args.no_focus_events, dwell=args.dwell, whitelisted=args.whitelisted,
+                     auto_fit=not args.no_auto_fit, obs_drops=not args.no_obs_drops)
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    if args.verbose:
+        log.clock = sim.clock.time  # Stamp records with virtual time
+        log.start(echo=sys.stdout)
+    started = time.perf_counter()
+    try:
+        with output:
+            sim.run(args.hours * 3600)
+            report = sim.report()
+    finally:
+        log.stop()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.shutdown()
+    print_report(report, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
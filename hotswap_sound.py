@@ -0,0 +1,229 @@
+"""Notification sounds for HotSwap: decoded once, cached per volume, mixed into one stream."""
+import io
+import os
+import sys
+import threading
+import time
+import wave
+from array import array
+
+from hotswap_platform import LRUCache
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the array fallback does the same math, just slower (once per cache miss)
+    np = None
+
+MIX_RATE = 44100
+MIX_CHANNELS = 2
+MIX_WIDTH = 2  # 16-bit
+SCALED_CACHE_SIZE = 16  # (path, mtime, volume) entries; dragging the volume slider creates a few
+
+
+class Cue:
+    """Volume-scaled PCM in the mix format (16-bit, MIX_RATE, MIX_CHANNELS), as an array('h')."""
+
+    __slots__ = ("samples",)
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    @property
+    def duration(self):
+        return len(self.samples) / (MIX_RATE * MIX_CHANNELS)
+
+
+def _to_array(values):
+    return values if isinstance(values, array) else array("h", values.astype("<i2").tobytes())
+
+
+def decode_wav(path):
+    """Read a PCM WAV and convert it to 16-bit MIX_RATE/MIX_CHANNELS samples (array('h'))."""
+    with wave.open(path, "rb") as wav:
+        channels, width, rate, nframes = wav.getnchannels(), wav.getsampwidth(), wav.getframerate(), wav.getnframes()
+        raw = wav.readframes(nframes)
+
+    # Any sample width -> signed 16-bit
+    if width == 2:
+        samples = array("h", raw)
+        if sys.byteorder == "big": samples.byteswap()
+    elif width == 1:
+        samples = array("h", ((b - 128) << 8 for b in raw))
+    elif width in (3, 4):
+        # Keep the top two bytes of each little-endian sample
+        samples = array("h", (int.from_bytes(raw[i + width - 2:i + width], "little", signed=True)
+                              for i in range(0, len(raw) - width + 1, width)))
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+
+    frames = len(samples) // channels
+
+    # Channels: mono is duplicated, extra channels beyond stereo are dropped
+    if channels != MIX_CHANNELS:
+        if np is not None:
+            data = np.frombuffer(samples.tobytes(), dtype=np.int16).reshape(frames, channels)
+            data = np.repeat(data, 2, axis=1) if channels == 1 else data[:, :MIX_CHANNELS]
+            samples = _to_array(data.reshape(-1))
+        else:
+            out = array("h")
+            for f in range(frames):
+                base = f * channels
+                out.append(samples[base])
+                out.append(samples[base + 1] if channels > 1 else samples[base])
+            samples = out
+
+    # Sample rate: linear interpolation
+    if rate != MIX_RATE and frames > 1:
+        out_frames = int(frames * MIX_RATE / rate)
+        if np is not None:
+            data = np.frombuffer(samples.tobytes(), dtype=np.int16).reshape(frames, MIX_CHANNELS).astype(np.float32)
+            positions = np.arange(out_frames) * (rate / MIX_RATE)
+            index = np.arange(frames)
+            data = np.stack([np.interp(positions, index, data[:, c]) for c in range(MIX_CHANNELS)], axis=1)
+            samples = _to_array(np.round(data).reshape(-1))
+        else:
+            out = array("h")
+            step = rate / MIX_RATE
+            for f in range(out_frames):
+                pos = f * step
+                i = int(pos)
+                j = min(i + 1, frames - 1)
+                frac = pos - i
+                for c in range(MIX_CHANNELS):
+                    a, b = samples[i * MIX_CHANNELS + c], samples[j * MIX_CHANNELS + c]
+                    out.append(int(round(a + (b - a) * frac)))
+            samples = out
+    return samples
+
+
+def scale(samples, volume):
+    """Multiply 16-bit samples by volume (0.0-1.0)."""
+    if volume >= 1.0: return array("h", samples)
+    if np is not None:
+        data = np.frombuffer(samples.tobytes(), dtype=np.int16).astype(np.float32) * volume
+        return _to_array(data)
+    return array("h", (int(s * volume) for s in samples))
+
+
+def mix(base, overlay):
+    """Sum two sample arrays (overlay starting at 0), clipped to 16-bit. Returns a new array."""
+    if not base: return array("h", overlay)
+    if not overlay: return array("h", base)
+    longer, shorter = (base, overlay) if len(base) >= len(overlay) else (overlay, base)
+    if np is not None:
+        out = np.frombuffer(longer.tobytes(), dtype=np.int16).astype(np.int32)
+        out[:len(shorter)] += np.frombuffer(shorter.tobytes(), dtype=np.int16)
+        return _to_array(np.clip(out, -32768, 32767))
+    out = array("h", longer)
+    for i, s in enumerate(shorter):
+        v = out[i] + s
+        out[i] = 32767 if v > 32767 else (-32768 if v < -32768 else v)
+    return out
+
+
+def to_wav_bytes(samples):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(MIX_CHANNELS)
+        wav.setsampwidth(MIX_WIDTH)
+        wav.setframerate(MIX_RATE)
+        data = array("h", samples)
+        if sys.byteorder == "big": data.byteswap()
+        wav.writeframes(data.tobytes())
+    return buffer.getvalue()
+
+
+class WinsoundOutput:
+    """Blocking in-memory playback through winsound; stop() cuts the current sound short."""
+
+    def play(self, wav_bytes):
+        import winsound
+        winsound.PlaySound(wav_bytes, winsound.SND_MEMORY | winsound.SND_NODEFAULT)
+
+    def stop(self):
+        import winsound
+        winsound.PlaySound(None, 0)
+
+    def beep(self, kind):
+        import winsound
+        winsound.MessageBeep(winsound.MB_OK if kind == "switched" else winsound.MB_ICONEXCLAMATION)
+
+
+class SoundEngine:
+    """
+    Plays notification cues through a single output stream.
+
+    WAVs are decoded once per (path, mtime); volume-scaled copies are cached
+    per (path, mtime, volume). One player thread owns the output: a cue that
+    arrives while another is playing interrupts it, and playback resumes
+    with the unplayed remainder mixed with the new cue, so overlapping
+    "detected"/"switched" sounds are heard together.
+    """
+
+    def __init__(self, output=None, clock=time.monotonic):
+        self.output = output or WinsoundOutput()
+        self.clock = clock
+        self._decoded = LRUCache(8)                  # (path, mtime) -> samples
+        self._scaled = LRUCache(SCALED_CACHE_SIZE)   # (path, mtime, volume) -> Cue
+        self._incoming = []
+        self._current = None      # Samples being played
+        self._started = 0.0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def load(self, path, volume):
+        """Cue for a WAV at a volume, from cache when the file hasn't changed."""
+        mtime = os.path.getmtime(path)
+        volume = round(max(0.0, min(1.0, volume)), 2)
+        key = (path, mtime, volume)
+        cue = self._scaled.get(key)
+        if cue is None:
+            samples = self._decoded.get((path, mtime))
+            if samples is None:
+                samples = decode_wav(path)
+                self._decoded.put((path, mtime), samples)
+            cue = Cue(scale(samples, volume))
+            self._scaled.put(key, cue)
+        return cue
+
+    def play(self, path, volume, kind="switched"):
+        """Queue a sound; falls back to the system beep if the file can't be used."""
+        try:
+            cue = self.load(path, volume)
+        except Exception:
+            try: self.output.beep(kind)
+            except Exception: pass
+            return
+        with self._cond:
+            self._incoming.append(cue)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            elif self._current is not None:
+                try: self.output.stop()  # Player resumes with the remainder mixed in
+                except Exception: pass
+            self._cond.notify()
+
+    def _remainder(self):
+        if self._current is None: return array("h")
+        played = int((self.clock() - self._started) * MIX_RATE) * MIX_CHANNELS
+        return self._current[played:] if played < len(self._current) else array("h")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._incoming and not self._cond.wait_for(lambda: self._incoming, timeout=30.0):
+                    self._thread = None
+                    return
+                samples = self._remainder()
+                for cue in self._incoming:
+                    samples = mix(samples, cue.samples)
+                self._incoming = []
+                self._current = samples
+                self._started = self.clock()
+            try:
+                self.output.play(to_wav_bytes(samples))
+            except Exception:
+                pass
+            with self._cond:
+                if not self._incoming: self._current = None
@@ -0,0 +1,93 @@
+"""Cold-start milestones for HotSwap and a benchmark that measures them over fresh processes."""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from hotswap_log import log
+
+REPORT_PREFIX = "STARTUP "
+BENCHMARK_FLAG = "--startup-benchmark"
+MILESTONES = ("imports", "first_frame", "connected")
+
+
+class StartupTimer:
+    """
+    Milliseconds from `started` (HotSwap.py's first line) to each named
+    milestone. Only the first mark of a name counts, so reconnects don't
+    overwrite time-to-connected.
+    """
+
+    def __init__(self, started=None, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock() if started is None else started
+        self.marks = {}
+
+    def mark(self, name):
+        if name in self.marks: return None
+        elapsed = (self.clock() - self.started) * 1000
+        self.marks[name] = round(elapsed, 1)
+        log.info("Startup", "%s: %.0f ms", name, elapsed)
+        return elapsed
+
+    def report(self):
+        """Print the marks as one machine-readable line for the benchmark."""
+        print(REPORT_PREFIX + json.dumps(self.marks), flush=True)
+
+
+def run_once(script, timeout):
+    """Start HotSwap in benchmark mode once. Returns its marks plus 'wall' (ms until it reported), or None."""
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, script, BENCHMARK_FLAG], stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True, cwd=os.path.dirname(script))
+    killer = threading.Timer(timeout, proc.kill)
+    killer.start()
+    result = None
+    try:
+        for line in proc.stdout:
+            if line.startswith(REPORT_PREFIX):
+                result = json.loads(line[len(REPORT_PREFIX):])
+                result["wall"] = round((time.perf_counter() - started) * 1000, 1)
+                break
+    finally:
+        killer.cancel()
+        try: proc.wait(timeout=5)
+        except subprocess.TimeoutExpired: proc.kill()
+    return result
+
+
+def summarize(runs):
+    """{milestone: (median, min, max)} over the runs that reached it."""
+    summary = {}
+    for name in MILESTONES + ("wall",):
+        values = [run[name] for run in runs if name in run]
+        if values: summary[name] = (statistics.median(values), min(values), max(values))
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure HotSwap's cold start over fresh processes.")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a run is abandoned")
+    parser.add_argument("--script", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "HotSwap.py"))
+    args = parser.parse_args(argv)
+
+    runs = []
+    for i in range(args.runs):
+        result = run_once(args.script, args.timeout)
+        print(f"run {i + 1}: {result if result is not None else 'no report (timed out or already running?)'}")
+        if result is not None: runs.append(result)
+    if not runs: return 1
+
+    print(f"\n{'milestone':<12} {'median':>9} {'min':>9} {'max':>9}   ({len(runs)}/{args.runs} runs)")
+    for name, (median, low, high) in summarize(runs).items():
+        print(f"{name:<12} {median:>7.0f}ms {low:>7.0f}ms {high:>7.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""OBS performance sampling and frame-drop detection for HotSwap."""
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+# GetStats fields we keep, in ring-buffer column order
+STAT_FIELDS = (
+    "render_skipped_frames", "render_total_frames",
+    "output_skipped_frames", "output_total_frames",
+    "active_fps", "average_frame_render_time",
+    "cpu_usage", "memory_usage",
+)
+
+SAMPLE_INTERVAL = 1.0
+HISTORY_SECONDS = 600       # Ring buffer capacity at SAMPLE_INTERVAL
+ALERT_WINDOW = 5.0          # Dropped frames are counted over this window...
+BASELINE_WINDOW = 60.0      # ...and compared to the rate over this one
+SUSTAINED_DROP_RATE = 0.02  # 2% of frames dropped over the baseline window is a problem on its own
+RENDER_PERCENTILE = 95
+
+LEVEL_NORMAL = "normal"
+LEVEL_MINOR = "minor"
+LEVEL_DROP = "drop"
+
+Health = namedtuple("Health", [
+    "level",           # LEVEL_NORMAL / LEVEL_MINOR / LEVEL_DROP
+    "dropped",         # Render + output frames dropped in ALERT_WINDOW
+    "drop_rate",       # Fraction of frames dropped over BASELINE_WINDOW
+    "render_p95",      # ms, over BASELINE_WINDOW
+    "render_budget",   # ms per frame at the current FPS
+    "fps", "cpu", "memory",
+])
+
+
+class StatsRing:
+    """
+    Fixed-size history of stat samples, one array('d') column per field.
+
+    Appends overwrite the oldest sample once full, so memory stays constant
+    however long OBS is connected.
+    """
+
+    def __init__(self, capacity, fields=STAT_FIELDS):
+        self.capacity = capacity
+        self.fields = fields
+        self.times = array("d", [0.0]) * capacity
+        self.columns = {f: array("d", [0.0]) * capacity for f in fields}
+        self.head = 0   # Next slot to write
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, t, sample):
+        i = self.head
+        self.times[i] = t
+        for field in self.fields:
+            self.columns[field][i] = float(sample.get(field) or 0.0)
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity: self.count += 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def _index(self, age):
+        """Ring slot of the sample `age` steps back (0 = newest)."""
+        return (self.head - 1 - age) % self.capacity
+
+    def latest(self, field):
+        return self.columns[field][self._index(0)] if self.count else None
+
+    def since(self, t):
+        """Slots of the samples taken at or after time t, oldest first."""
+        slots = []
+        for age in range(self.count):
+            i = self._index(age)
+            if self.times[i] < t: break
+            slots.append(i)
+        slots.reverse()
+        return slots
+
+    def values(self, field, since):
+        column = self.columns[field]
+        return [column[i] for i in self.since(since)]
+
+    def counter_delta(self, field, since):
+        """Increase of a cumulative counter since time t. Counter resets (OBS restart) count from zero."""
+        slots = self.since(since)
+        column = self.columns[field]
+        total = 0.0
+        for prev, cur in zip(slots, slots[1:]):
+            step = column[cur] - column[prev]
+            total += step if step >= 0 else column[cur]
+        return total
+
+
+def percentile(values, pct):
+    if not values: return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class StatsSampler:
+    """
+    Samples OBS GetStats and keeps the history in a StatsRing.
+
+    Every sample is turned into a Health summary from rolling windows: frames
+    dropped in the last ALERT_WINDOW against `threshold`, the drop rate over
+    BASELINE_WINDOW, and the 95th percentile render time against the frame
+    budget. poll() is meant to run as a periodic job every `interval`
+    seconds and calls `on_health` with each new summary.
+    """
+
+    def __init__(self, fetch, on_health=None, threshold=30, interval=SAMPLE_INTERVAL,
+                 history=HISTORY_SECONDS, clock=time.time):
+        self.fetch = fetch              # () -> GetStats response with snake_case attributes
+        self.on_health = on_health
+        self.threshold = threshold
+        self.interval = interval
+        self.clock = clock
+        self.ring = StatsRing(max(2, int(history / interval)))
+        self.health = None
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.ring.clear()
+            self.health = None
+
+    def sample(self, now=None):
+        """Take one sample. Returns the new Health."""
+        stats = self.fetch()
+        now = self.clock() if now is None else now
+        return self.record({f: getattr(stats, f, 0) for f in STAT_FIELDS}, now)
+
+    def record(self, sample, now):
+        with self._lock:
+            self.ring.append(now, sample)
+            self.health = self._assess(now)
+            return self.health
+
+    def _assess(self, now):
+        ring = self.ring
+        short = now - ALERT_WINDOW - self.interval / 2
+        long = now - BASELINE_WINDOW
+        dropped = int(ring.counter_delta("render_skipped_frames", short) + ring.counter_delta("output_skipped_frames", short))
+        skipped = ring.counter_delta("render_skipped_frames", long) + ring.counter_delta("output_skipped_frames", long)
+        total = ring.counter_delta("render_total_frames", long) + ring.counter_delta("output_total_frames", long)
+        drop_rate = skipped / total if total > 0 else 0.0
+        fps = ring.latest("active_fps") or 0.0
+        budget = 1000.0 / fps if fps > 0 else 0.0
+        render_p95 = percentile(ring.values("average_frame_render_time", long), RENDER_PERCENTILE)
+
+        if dropped > self.threshold or (drop_rate >= SUSTAINED_DROP_RATE and dropped > 0):
+            level = LEVEL_DROP
+        elif dropped > 0 or (budget and render_p95 > budget):
+            level = LEVEL_MINOR
+        else:
+            level = LEVEL_NORMAL
+        return Health(level, dropped, drop_rate, render_p95, budget, fps,
+                      ring.latest("cpu_usage") or 0.0, ring.latest("memory_usage") or 0.0)
+
+    def poll(self):
+        """Sample once and report. Errors are counted, not raised (a lost connection is handled elsewhere)."""
+        try:
+            health = self.sample()
+            self.errors = 0
+        except Exception:
+            self.errors += 1
+            return
+        if self.on_health:
+            try: self.on_health(health)
+            except Exception: pass
@@ -0,0 +1,326 @@
+"""Shared background task runtime for HotSwap: worker pool, timers, cancellation."""
+import collections
+import threading
+import time
+
+from hotswap_clock import SYSTEM_CLOCK
+from hotswap_log import log
+from hotswap_stats import percentile
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUE = 256
+TIMER_TICK = 0.05     # Timer resolution in seconds
+TIMER_SLOTS = 256     # One wheel turn = 12.8 s at TIMER_TICK
+LATENCY_HISTORY = 512
+
+
+class CancelToken:
+    """Cooperative cancellation flag handed to each task."""
+
+    def __init__(self, event=None):
+        self._event = event or threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def sleep(self, seconds):
+        """Sleep, waking early if cancelled. Returns False if cancelled."""
+        return not self._event.wait(seconds)
+
+
+_NEVER_CANCELLED = CancelToken()
+_local = threading.local()
+
+
+def current_token(timebase=SYSTEM_CLOCK):
+    """Cancellation token of the task running on this thread; outside tasks, a never-cancelled one that sleeps on `timebase`."""
+    token = getattr(_local, "token", None)
+    if token is not None: return token
+    return _NEVER_CANCELLED if timebase is SYSTEM_CLOCK else CancelToken(timebase.Event())
+
+
+class Task:
+    __slots__ = ("fn", "args", "kwargs", "key", "token", "submitted", "queued")
+
+    def __init__(self, fn, args, kwargs, key, submitted, token):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.token = token
+        self.submitted = submitted
+        self.queued = False  # Holding a queue slot: submitted, not started or cancelled yet
+
+    @property
+    def name(self):
+        return getattr(self.fn, "__name__", repr(self.fn))
+
+
+class Timer:
+    __slots__ = ("tick", "interval", "fn", "args", "kwargs", "key", "cancelled")
+
+    def __init__(self, tick, interval, fn, args, kwargs, key):
+        self.tick = tick
+        self.interval = interval
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.cancelled = False
+
+
+class TaskRuntime:
+    """
+    One bounded worker pool plus a hashed timer wheel for all of HotSwap's
+    short background jobs.
+
+    submit() queues work for up to `workers` threads; the queue is bounded
+    and full queues reject new work instead of blocking the caller. Work
+    submitted with a key supersedes the previous work with that key: a
+    queued task is dropped and a running one has its CancelToken cancelled
+    (tasks poll current_token()). call_later()/every() schedule work on the
+    wheel; a keyed timer replaces the previous timer with that key, and a
+    periodic job skips a run while its previous run is still queued or
+    running. stats() reports queue depth and wait/run latencies.
+
+    Threads, conditions and tokens come from `timebase` (hotswap_clock), so
+    the same runtime runs on virtual time in simulation.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_queue=DEFAULT_MAX_QUEUE,
+                 tick=TIMER_TICK, slots=TIMER_SLOTS, clock=time.monotonic, timebase=SYSTEM_CLOCK):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.clock = clock
+        self.timebase = timebase
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self._queue = collections.deque()
+        self._keyed = {}  # key -> latest Task, queued or running
+        self._queued = 0  # Queued tasks not cancelled yet
+        self._threads = []
+        self._idle = 0
+        self._running = 0
+        self._cond = timebase.Condition()
+        self._waits = collections.deque(maxlen=LATENCY_HISTORY)
+        self._runs = collections.deque(maxlen=LATENCY_HISTORY)
+        self._closed = False
+
+        self.tick = tick
+        self._slots = [[] for _ in range(slots)]
+        self._timers = {}  # key -> Timer
+        self._timer_count = 0
+        self._origin = clock()
+        self._current_tick = 0
+        self._timer_cond = timebase.Condition()
+        self._timer_thread = None
+
+    # --- Executor ---
+    def submit(self, fn, *args, key=None, **kwargs):
+        """Queue fn(*args, **kwargs). Returns the Task, or None if the queue is full."""
+        with self._cond:
+            if self._closed: return None
+            previous = self._keyed.get(key) if key is not None else None
+            # Superseding a task that hasn't started frees its slot; the previous task is only
+            # cancelled once this one is accepted, so a full queue doesn't lose both
+            if self._queued - (previous is not None and previous.queued) >= self.max_queue:
+                self.rejected += 1
+                log.warning("Tasks", "Queue full, dropped %s", getattr(fn, '__name__', fn))
+                return None
+            if previous is not None: self._cancel(previous)
+            task = Task(fn, args, kwargs, key, self.clock(), CancelToken(self.timebase.Event()))
+            if key is not None: self._keyed[key] = task
+            task.queued = True
+            self._queued += 1
+            self._queue.append(task)
+            if self._idle == 0 and len(self._threads) < self.workers:
+                self._threads.append(self.timebase.spawn(self._work))
+            else:
+                self._cond.notify()
+            return task
+
+    def cancel(self, key):
+        """Cancel the task and timer registered under key."""
+        with self._cond:
+            task = self._keyed.get(key)
+            if task is not None: self._cancel(task)
+        with self._timer_cond:
+            timer = self._timers.pop(key, None)
+            if timer is not None: self._drop_timer(timer)
+
+    def busy(self, key):
+        """True while work with this key is queued or running."""
+        with self._cond:
+            task = self._keyed.get(key)
+            return task is not None and not task.token.cancelled
+
+    def _cancel(self, task):
+        """Cancel a task (caller holds _cond), giving back its queue slot if it hasn't started."""
+        if task.queued:
+            task.queued = False
+            self._queued -= 1
+        task.token.cancel()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    if self._closed: return
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                task = self._queue.popleft()
+                if task.queued:
+                    task.queued = False
+                    self._queued -= 1
+                if task.token.cancelled:
+                    if self._keyed.get(task.key) is task: del self._keyed[task.key]
+                    continue
+                self._running += 1
+            started = self.clock()
+            self._waits.append(started - task.submitted)
+            _local.token = task.token
+            try:
+                task.fn(*task.args, **task.kwargs)
+            except Exception as e:
+                self.failed += 1
+                log.error("Tasks", "%s failed: %s", task.name, e)
+            finally:
+                _local.token = None
+                self._runs.append(self.clock() - started)
+                with self._cond:
+                    self._running -= 1
+                    self.completed += 1
+                    if task.key is not None and self._keyed.get(task.key) is task:
+                        del self._keyed[task.key]
+
+    # --- Timer wheel ---
+    def call_later(self, delay, fn, *args, key=None, **kwargs):
+        """Run fn on the pool after `delay` seconds."""
+        return self._schedule(delay, None, fn, args, kwargs, key)
+
+    def every(self, interval, fn, *args, key, initial_delay=None, **kwargs):
+        """Run fn on the pool every `interval` seconds until cancel(key)."""
+        delay = interval if initial_delay is None else initial_delay
+        return self._schedule(delay, interval, fn, args, kwargs, key)
+
+    def _tick_at(self, t):
+        """First tick at or after time t."""
+        return int((t - self._origin) / self.tick + 0.999999)
+
+    def _ticks(self, seconds):
+        return max(1, int(round(seconds / self.tick)))
+
+    def _schedule(self, delay, interval, fn, args, kwargs, key):
+        with self._timer_cond:
+            if self._closed: return None
+            tick = max(self._tick_at(self.clock() + max(0.0, delay)), self._current_tick + 1)
+            timer = Timer(tick, interval, fn, args, kwargs, key)
+            if key is not None:
+                previous = self._timers.pop(key, None)
+                if previous is not None: self._drop_timer(previous)
+                self._timers[key] = timer
+            self._add_timer(timer)
+            if self._timer_thread is None:
+                self._timer_thread = self.timebase.spawn(self._run_timers)
+            self._timer_cond.notify()
+            return timer
+
+    def _add_timer(self, timer):
+        self._slots[timer.tick % len(self._slots)].append(timer)
+        self._timer_count += 1
+
+    def _drop_timer(self, timer):
+        timer.cancelled = True
+        slot = self._slots[timer.tick % len(self._slots)]
+        try:
+            slot.remove(timer)
+            self._timer_count -= 1
+        except ValueError:
+            pass
+
+    def _next_tick(self):
+        """Earliest tick with a timer due, or None when the wheel is empty."""
+        if not self._timer_count: return None
+        n = len(self._slots)
+        for offset in range(1, n + 1):
+            tick = self._current_tick + offset
+            slot = self._slots[tick % n]
+            if slot and min(t.tick for t in slot) <= tick:
+                return tick
+        return min(t.tick for slot in self._slots for t in slot)
+
+    def _advance(self, now_tick):
+        """Collect the timers due up to now_tick."""
+        due = []
+        n = len(self._slots)
+        if now_tick - self._current_tick >= n:
+            ticks = range(n)  # Slept through a whole turn: sweep every slot once
+        else:
+            ticks = range(self._current_tick + 1, now_tick + 1)
+        for tick in ticks:
+            slot = self._slots[tick % n]
+            if not slot: continue
+            keep = [t for t in slot if t.tick > now_tick]
+            due.extend(t for t in slot if t.tick <= now_tick)
+            slot[:] = keep
+        self._current_tick = max(self._current_tick, now_tick)
+        self._timer_count -= len(due)
+        return due
+
+    def _run_timers(self):
+        while True:
+            with self._timer_cond:
+                if self._closed: return
+                due = self._advance(int((self.clock() - self._origin) / self.tick))
+                for timer in due:
+                    if timer.interval is not None and not timer.cancelled:
+                        timer.tick = max(timer.tick + self._ticks(timer.interval), self._current_tick + 1)
+                        self._add_timer(timer)
+                    elif timer.key is not None and self._timers.get(timer.key) is timer:
+                        del self._timers[timer.key]
+                if not due:
+                    next_tick = self._next_tick()
+                    timeout = None if next_tick is None else max(0.0, self._origin + next_tick * self.tick - self.clock())
+                    self._timer_cond.wait(timeout)
+                    continue
+            for timer in due:
+                if timer.cancelled: continue
+                if timer.interval is not None and timer.key is not None and self.busy(timer.key):
+                    continue  # Previous run still going; skip this one
+                self.submit(timer.fn, *timer.args, key=timer.key, **timer.kwargs)
+
+    # --- Introspection ---
+    def stats(self):
+        with self._cond:
+            depth = self._queued
+            running = self._running
+            threads = len(self._threads)
+        waits = [w * 1000 for w in list(self._waits)]
+        runs = [r * 1000 for r in list(self._runs)]
+        return {
+            "queued": depth,
+            "running": running,
+            "threads": threads,
+            "timers": self._timer_count,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "wait_p50_ms": percentile(waits, 50),
+            "wait_p95_ms": percentile(waits, 95),
+            "run_p95_ms": percentile(runs, 95),
+        }
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            for task in self._queue: self._cancel(task)
+            for task in self._keyed.values(): self._cancel(task)
+            self._cond.notify_all()
+        with self._timer_cond:
+            self._timer_cond.notify_all()
@@ -0,0 +1,202 @@
+"""Switch latency tracing for HotSwap: per-stage latency histograms, overall and per game."""
+import threading
+import time
+from array import array
+
+# Points a switch passes through, in order
+MARK_FOCUS = "focus"          # Focus change observed (foreground event, or the poll that saw it)
+MARK_EVALUATED = "evaluated"  # Tracking loop starts looking at the window
+MARK_DECIDED = "decided"      # Window/process lookup and rule decision done
+MARK_APPLIED = "applied"      # OBS answered the switch batch
+MARK_ACTIVE = "active"        # Capture source reports video
+MARK_FITTED = "fitted"        # Auto-fit transform applied
+
+# Stage -> (from mark, to mark). Auto-fit runs alongside hook validation, so it counts from MARK_APPLIED.
+STAGE_SPANS = {
+    "wait": (MARK_FOCUS, MARK_EVALUATED),     # Tracking loop wake-up, including the switch debounce
+    "lookup": (MARK_EVALUATED, MARK_DECIDED),
+    "obs": (MARK_DECIDED, MARK_APPLIED),
+    "hook": (MARK_APPLIED, MARK_ACTIVE),
+    "fit": (MARK_APPLIED, MARK_FITTED),
+    "total": (MARK_FOCUS, MARK_ACTIVE),
+}
+STAGES = tuple(STAGE_SPANS)
+
+SUB_BUCKET_BITS = 7           # 128 sub-buckets per power of two: under 1% relative error
+MAX_TRACKED_US = 120_000_000  # Slower than 2 minutes is clamped
+
+
+def _bucket(us):
+    """Bucket index of a value in microseconds (log-linear, HdrHistogram layout)."""
+    shift = max(0, us.bit_length() - SUB_BUCKET_BITS)
+    return (shift << (SUB_BUCKET_BITS - 1)) + (us >> shift)
+
+
+def _bucket_range(index):
+    """(lowest, highest) microsecond value a bucket holds."""
+    half = 1 << (SUB_BUCKET_BITS - 1)
+    shift = 0 if index < 2 * half else (index >> (SUB_BUCKET_BITS - 1)) - 1
+    lowest = (index - (shift << (SUB_BUCKET_BITS - 1))) << shift
+    return lowest, lowest + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are kept in whole microseconds in buckets that widen with the
+    value, so anything from 1 us to MAX_TRACKED_US keeps ~1% precision in
+    a fixed array of ~1,400 counts. record() is O(1); percentiles walk the
+    counts.
+    """
+
+    def __init__(self):
+        self.counts = array("I", [0]) * (_bucket(MAX_TRACKED_US) + 1)
+        self.count = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def record(self, ms):
+        us = min(MAX_TRACKED_US, max(0, int(ms * 1000)))
+        self.counts[_bucket(us)] += 1
+        self.count += 1
+        self.sum_us += us
+        if us > self.max_us: self.max_us = us
+
+    def percentile(self, pct):
+        """Latency (ms) at or below which `pct` percent of the values fall; 0.0 if empty."""
+        if not self.count: return 0.0
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_range(index)[1], self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def mean(self):
+        return self.sum_us / self.count / 1000.0 if self.count else 0.0
+
+    def max(self):
+        return self.max_us / 1000.0
+
+    def merge(self, other):
+        for index, n in enumerate(other.counts):
+            if n: self.counts[index] += n
+        self.count += other.count
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def to_dict(self):
+        return {"counts": {str(i): n for i, n in enumerate(self.counts) if n}, "sum_us": self.sum_us, "max_us": self.max_us}
+
+    def load(self, data):
+        for index, n in (data.get("counts") or {}).items():
+            index = int(index)
+            if 0 <= index < len(self.counts): self.counts[index] += int(n)
+        self.count = sum(self.counts)
+        self.sum_us = int(data.get("sum_us", 0))
+        self.max_us = int(data.get("max_us", 0))
+
+
+def _histograms():
+    return {stage: LatencyHistogram() for stage in STAGES}
+
+
+def _format_ms(values):
+    """'12/40/95 ms' or '1.2/2.5/3.1 s', one unit for the lot."""
+    if max(values) >= 1000: return "/".join(f"{v / 1000:.1f}" for v in values) + " s"
+    return "/".join(f"{v:.0f}" for v in values) + " ms"
+
+
+class SwitchTracer:
+    """
+    Times focus-driven switches stage by stage (see STAGE_SPANS) into a
+    LatencyHistogram per stage, for all games and for each game.
+
+    The tracking loop opens a trace with begin(); the OBS, hook validation
+    and auto-fit paths mark() it as they finish, from whatever thread they
+    run on. A stage is recorded as soon as both its marks exist, so a
+    switch whose hook fails or that is never auto-fitted still counts for
+    the stages it reached. Only the latest switch per game stays open.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.overall = _histograms()
+        self.games = {}      # exe -> {stage: LatencyHistogram}
+        self.traces = {}     # exe -> {mark: time} of its latest switch
+        self._focus_at = None
+        self._lock = threading.Lock()
+
+    def focus_observed(self):
+        with self._lock:
+            self._focus_at = self.clock()
+
+    def take_focus(self):
+        """When focus last moved, if it did since the previous call. The tracking loop calls this once per evaluation."""
+        with self._lock:
+            focus, self._focus_at = self._focus_at, None
+            return focus
+
+    def begin(self, exe, evaluated, focus=None):
+        """A switch to exe was decided on; `evaluated` is when the tracking loop started on it, `focus` the focus change it acts on."""
+        with self._lock:
+            if focus is None or focus > evaluated: focus = evaluated
+            self.traces[exe] = {MARK_FOCUS: focus, MARK_EVALUATED: evaluated}
+            self._record(exe, MARK_EVALUATED)
+        self.mark(exe, MARK_DECIDED)
+
+    def mark(self, exe, point):
+        """Mark the open switch to exe. Returns True if this was news (each mark counts once)."""
+        with self._lock:
+            trace = self.traces.get(exe)
+            if trace is None or point in trace: return False
+            trace[point] = self.clock()
+            self._record(exe, point)
+            return True
+
+    def discard(self, exe):
+        """Close exe's trace, e.g. when it was switched to some other way."""
+        with self._lock:
+            self.traces.pop(exe, None)
+
+    def _record(self, exe, point):
+        trace = self.traces[exe]
+        game = self.games.get(exe)
+        if game is None: game = self.games[exe] = _histograms()
+        for stage, (start, end) in STAGE_SPANS.items():
+            if end == point and start in trace:
+                ms = (trace[end] - trace[start]) * 1000
+                self.overall[stage].record(ms)
+                game[stage].record(ms)
+
+    # --- Reporting ---
+    def summary(self, exe=None):
+        """{stage: (p50, p95, p99, count)} in ms, for one game or all of them."""
+        with self._lock:
+            hists = self.overall if exe is None else self.games.get(exe) or _histograms()
+            return {stage: (h.percentile(50), h.percentile(95), h.percentile(99), h.count) for stage, h in hists.items()}
+
+    def describe(self, exe=None):
+        """Every stage's p50/p95/p99 on one line, for the Dashboard."""
+        stages = self.summary(exe)
+        shown = [f"{stage} {_format_ms(stages[stage][:3])}" for stage in STAGES if stages[stage][3]]
+        if not shown: return ""
+        switches = stages["lookup"][3]
+        return f"{exe or 'All games'} p50/p95/p99 ({switches} switches): " + ", ".join(shown)
+
+    # --- Persistence (per game; the overall histograms are rebuilt from them) ---
+    def to_dict(self):
+        with self._lock:
+            return {exe: {stage: h.to_dict() for stage, h in hists.items() if h.count} for exe, hists in self.games.items()}
+
+    def load(self, data):
+        with self._lock:
+            for exe, stages in (data or {}).items():
+                game = self.games[exe] = _histograms()
+                for stage, hist in stages.items():
+                    if stage in game: game[stage].load(hist)
+            self.overall = _histograms()
+            for game in self.games.values():
+                for stage, h in game.items(): self.overall[stage].merge(h)
@@ -0,0 +1,230 @@
+from hotswap_capture import (DEFAULT_HOOK_TIMEOUT, MAX_HOOK_TIMEOUT, MIN_HOOK_TIMEOUT, GeometryWatcher, HookTimes,
+                              HookValidator, RectStabilizer)
+from hotswap_obs import ObsEvent
+
+SPLASH = (640, 360)
+GAME = (1920, 1080)
+WINDOWED = (1280, 720)
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.calls = []
+
+    def call_later(self, delay, fn, *args, key=None):
+        self.calls.append((delay, key))
+
+    def cancel(self, key):
+        self.calls.append(("cancel", key))
+
+
+def settle_points(stream, samples=4):
+    stab = RectStabilizer(samples)
+    return [(i, size) for i, size in enumerate(map(stab.feed, stream)) if size is not None]
+
+
+def test_splash_screen_gives_way_to_the_game():
+    stream = [None, None] + [SPLASH] * 8 + [GAME] * 6
+    assert settle_points(stream) == [(13, GAME)]
+
+
+def test_resolution_change_is_reported_once_it_holds():
+    stream = [GAME] * 5 + [WINDOWED] * 3 + [GAME] * 2 + [WINDOWED] * 6
+    assert settle_points(stream) == [(3, GAME), (13, WINDOWED)]
+
+
+def test_missing_and_minimized_reads_break_the_run():
+    stream = [GAME] * 3 + [None] + [GAME] * 3 + [(0, 0)] + [GAME] * 4
+    assert settle_points(stream) == [(11, GAME)]
+
+
+def test_settled_size_is_not_reported_again_after_a_gap():
+    stream = [GAME] * 4 + [None] * 3 + [(160, 28)] + [GAME] * 8
+    assert settle_points(stream) == [(3, GAME)]
+
+
+def test_changing_while_a_new_size_is_read():
+    stab = RectStabilizer(2)
+    stab.feed(GAME), stab.feed(GAME)
+    assert not stab.changing
+    stab.feed(WINDOWED)
+    assert stab.changing
+
+
+class Window:
+    """A scripted read_size(): returns the next size per call, then keeps the last one."""
+
+    def __init__(self, *sizes):
+        self.sizes = list(sizes)
+
+    def __call__(self):
+        if len(self.sizes) > 1: return self.sizes.pop(0)
+        if isinstance(self.sizes[0], Exception): raise self.sizes[0]
+        return self.sizes[0]
+
+
+def watcher(answers=None):
+    seen = []
+
+    def on_settled(key, size):
+        seen.append((key, size))
+        return answers.pop(0) if answers else None
+    return GeometryWatcher(on_settled, FakeScheduler(), stable_samples=3), seen
+
+
+def test_watcher_reports_the_game_after_its_splash():
+    geometry, seen = watcher()
+    geometry.watch("game.exe", Window(SPLASH, SPLASH, SPLASH, GAME))
+    results = [geometry.step() for _ in range(8)]
+    assert seen == [("game.exe", GAME)]
+    assert results.count(GAME) == 1
+
+
+def test_watcher_reports_resolution_changes():
+    geometry, seen = watcher()
+    geometry.watch("game.exe", Window(*[GAME] * 4, None, *[WINDOWED] * 3))
+    for _ in range(10): geometry.step()
+    assert seen == [("game.exe", GAME), ("game.exe", WINDOWED)]
+
+
+def test_read_errors_count_as_missing():
+    geometry, seen = watcher()
+    geometry.watch("game.exe", Window(GAME, GAME, OSError("gone")))
+    for _ in range(5): geometry.step()
+    assert seen == []
+
+
+def test_rejected_size_is_retried_after_another_run():
+    geometry, seen = watcher(answers=[True, False, True])
+    geometry.watch("game.exe", Window(*[GAME] * 3, WINDOWED))
+    for _ in range(6): geometry.step()
+    assert seen == [("game.exe", GAME), ("game.exe", WINDOWED)]
+    assert geometry.stabilizer.settled == GAME  # The fit failed, so the old size is still the handled one
+    for _ in range(3): geometry.step()
+    assert seen[-1] == ("game.exe", WINDOWED)
+    assert len(seen) == 3
+    assert geometry.stabilizer.settled == WINDOWED
+    for _ in range(6): geometry.step()
+    assert len(seen) == 3
+
+
+def test_replacing_the_window_starts_over():
+    geometry, seen = watcher()
+    geometry.watch("old.exe", Window(GAME))
+    geometry.step(), geometry.step()
+    geometry.watch("new.exe", Window(GAME))
+    geometry.step(), geometry.step()
+    assert seen == []
+    geometry.step()
+    assert seen == [("new.exe", GAME)]
+    geometry.unwatch("old.exe")
+    assert geometry.key == "new.exe"
+    geometry.unwatch()
+    assert geometry.step() is None
+
+
+class ManualScheduler:
+    """Keyed timers run by advance(), on its own clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.timers = {}
+
+    def __call__(self):
+        return self.now
+
+    def call_later(self, delay, fn, *args, key=None):
+        self.timers[key] = (self.now + delay, fn, args)
+
+    def cancel(self, key):
+        self.timers.pop(key, None)
+
+    def advance(self, to):
+        while True:
+            due = [(at, key) for key, (at, _, _) in self.timers.items() if at <= to]
+            if not due: break
+            at, key = min(due)
+            self.now = at
+            _, fn, args = self.timers.pop(key)
+            fn(*args)
+        self.now = to
+
+
+def validator(active=lambda source, now: False, hook_times=None):
+    scheduler = ManualScheduler()
+    results = []
+    probes = []
+
+    def probe(source):
+        probes.append(scheduler.now)
+        return active(source, scheduler.now)
+    hooks = HookValidator(probe, lambda *r: results.append(r), scheduler, hook_times, clock=scheduler)
+    return hooks, scheduler, results, probes
+
+
+def test_learned_timeout_is_clamped():
+    times = HookTimes(history=3)
+    assert times.timeout_for("new.exe") == DEFAULT_HOOK_TIMEOUT
+    times.record("fast.exe", 0.2)
+    assert times.timeout_for("fast.exe") == MIN_HOOK_TIMEOUT
+    for t in (3.0, 4.0, 5.0, 30.0): times.record("slow.exe", t)
+    assert times.timeout_for("slow.exe") == MAX_HOOK_TIMEOUT
+    assert list(times.times["slow.exe"]) == [4.0, 5.0, 30.0]
+    restored = HookTimes()
+    restored.load(times.to_dict())
+    assert restored.average("slow.exe") == 13.0
+
+
+def test_active_event_confirms_before_the_next_probe():
+    hooks, scheduler, results, probes = validator()
+    hooks.start("Game", "game.exe")
+    scheduler.advance(0.1)
+    hooks.handle_event(ObsEvent("InputActiveStateChanged", {"inputName": "Game", "videoActive": True}))
+    assert results == [("Game", "game.exe", True, 0.1)]
+    assert probes == [] and scheduler.timers == {}
+    assert hooks.hook_times.average("game.exe") == 0.1
+
+
+def test_probe_confirms_once_the_source_goes_active():
+    hooks, scheduler, results, probes = validator(active=lambda source, now: now >= 1.0)
+    hooks.start("Game", "game.exe")
+    scheduler.advance(5.0)
+    assert results == [("Game", "game.exe", True, 1.0)]
+    assert len(probes) == 4
+
+
+def test_show_event_probes_at_once():
+    hooks, scheduler, results, probes = validator(active=lambda source, now: True)
+    hooks.start("Game", "game.exe")
+    scheduler.advance(0.1)
+    hooks.handle_event(ObsEvent("InputShowStateChanged", {"inputName": "Game", "videoShowing": True}))
+    scheduler.advance(0.1)
+    assert probes == [0.1]
+    assert results[0][2] is True
+
+
+def test_failure_is_reported_at_the_learned_timeout():
+    times = HookTimes()
+    times.record("game.exe", 1.5)
+    hooks, scheduler, results, probes = validator(hook_times=times)
+    hooks.start("Game", "game.exe")
+    scheduler.advance(10.0)
+    assert results == [("Game", "game.exe", False, 3.0)]
+    assert list(times.times["game.exe"]) == [1.5]  # Failures don't teach a timeout
+
+
+def test_restart_replaces_the_pending_validation():
+    hooks, scheduler, results, probes = validator(active=lambda source, now: now >= 3.0)
+    hooks.start("Game", "first.exe")
+    scheduler.advance(1.0)
+    hooks.start("Game", "second.exe")
+    scheduler.advance(10.0)
+    assert results == [("Game", "second.exe", True, 2.0)]
+
+
+def test_lost_connection_cancels_without_a_result():
+    def gone(source, now): raise ConnectionError("closed")
+    hooks, scheduler, results, probes = validator(active=gone)
+    hooks.start("Game", "game.exe")
+    scheduler.advance(10.0)
+    assert results == [] and hooks.pending == {}
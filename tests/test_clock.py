@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+import hotswap_clock
+from hotswap_clock import VirtualClock
+
+
+def test_sleeps_jump_straight_to_their_deadlines():
+    clock = VirtualClock()
+    woke = []
+    for delay in (3.0, 1.0, 2.0):
+        clock.spawn(lambda d=delay: (clock.sleep(d), woke.append((d, clock.monotonic()))))
+    started = time.perf_counter()
+    clock.run_until(10.0)
+    assert sorted(woke) == [(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)]
+    assert clock.monotonic() == 10.0
+    assert time.perf_counter() - started < 5.0
+
+
+def test_time_follows_monotonic():
+    clock = VirtualClock(start=5.0, epoch=1000.0)
+    assert clock.time() == 1005.0
+
+
+def test_actions_run_on_the_driver_in_time_order():
+    clock = VirtualClock()
+    order = []
+    clock.at(2.0, order.append, "b")
+    clock.after(1.0, order.append, "a")
+    clock.at(5.0, order.append, "late")
+    clock.run_until(3.0)
+    assert order == ["a", "b"]
+
+
+def test_event_wakes_waiter_and_times_out():
+    clock = VirtualClock()
+    event = clock.Event()
+    results = []
+    clock.spawn(lambda: results.append(("set", event.wait(10.0), clock.monotonic())))
+    clock.at(4.0, event.set)
+    clock.run_until(20.0)
+    assert results == [("set", True, 4.0)]
+
+    event.clear()
+    clock.spawn(lambda: results.append(("timeout", event.wait(2.0), clock.monotonic())))
+    clock.run_until(30.0)
+    assert results[-1] == ("timeout", False, 22.0)
+
+
+def test_zero_timeouts_still_let_time_move():
+    clock = VirtualClock(resolution=0.5)
+    event = clock.Event()
+    spins = []
+
+    def spin():
+        while clock.monotonic() < 2.0:
+            event.wait(0)
+            spins.append(clock.monotonic())
+    clock.spawn(spin)
+    clock.run_until(5.0)
+    assert len(spins) == 4
+
+
+def test_condition_notify_and_wait_for():
+    clock = VirtualClock()
+    cond = clock.Condition()
+    items = []
+    got = []
+
+    def consumer():
+        with cond:
+            got.append(cond.wait_for(lambda: items, timeout=10.0))
+            got.append(clock.monotonic())
+
+    def produce():
+        with cond:
+            items.append(1)
+            cond.notify()
+    clock.spawn(consumer)
+    clock.at(3.0, produce)
+    clock.run_until(20.0)
+    assert got == [[1], 3.0]
+
+
+def test_lock_parks_waiters_instead_of_stalling_time():
+    clock = VirtualClock()
+    lock = clock.Lock()
+    log = []
+
+    def worker(name, hold):
+        with lock:
+            log.append((name, "in", clock.monotonic()))
+            clock.sleep(hold)
+            log.append((name, "out", clock.monotonic()))
+    clock.spawn(worker, "a", 2.0)
+    clock.settle()
+    clock.spawn(worker, "b", 1.0)
+    clock.run_until(10.0)
+    assert log == [("a", "in", 0.0), ("a", "out", 2.0), ("b", "in", 2.0), ("b", "out", 3.0)]
+    assert not lock.locked()
+
+
+def test_lock_timeout_and_non_blocking_acquire():
+    clock = VirtualClock()
+    lock = clock.Lock()
+    results = []
+    assert lock.acquire()
+    assert not lock.acquire(blocking=False)
+    clock.spawn(lambda: results.append((lock.acquire(timeout=1.5), clock.monotonic())))
+    clock.run_until(5.0)
+    assert results == [(False, 1.5)]
+    lock.release()
+    with pytest.raises(RuntimeError):
+        lock.release()
+
+
+def test_crashing_participant_is_logged_and_does_not_hang(monkeypatch):
+    clock = VirtualClock()
+    errors = []
+    monkeypatch.setattr(hotswap_clock.log, "error", lambda *args: errors.append(args))
+    clock.spawn(lambda: 1 / 0)
+    clock.run_until(1.0)
+    assert errors and errors[0][0] == "Sim"
+
+
+def test_thread_blocked_outside_the_clock_is_reported(monkeypatch):
+    monkeypatch.setattr(hotswap_clock, "SETTLE_TIMEOUT", 0.2)
+    clock = VirtualClock()
+    real = threading.Event()
+    clock.spawn(real.wait)
+    with pytest.raises(RuntimeError, match="still busy"):
+        clock.run_until(1.0)
+    real.set()
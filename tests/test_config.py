@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+import hotswap_config
+from hotswap_clock import VirtualClock
+from hotswap_config import ConfigStore
+from hotswap_tasks import TaskRuntime
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "config.json")
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_missing_file_loads_empty(path):
+    assert ConfigStore(path).load() == {}
+
+
+def test_corrupt_file_is_kept_aside(path):
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert ConfigStore(path).load() == {}
+    assert not os.path.exists(path)
+    assert os.path.exists(path.replace(".json", ".corrupt.json"))
+
+
+def test_without_scheduler_update_writes_at_once(path):
+    store = ConfigStore(path)
+    store.update({"a": 1})
+    assert read(path) == {"a": 1}
+    store.update({"a": 1})
+    assert store.writes == 1
+
+
+def test_unchanged_snapshot_after_load_is_not_written(path):
+    with open(path, "w") as f:
+        json.dump({"a": 1}, f)
+    store = ConfigStore(path)
+    store.update(store.load())
+    assert store.writes == 0
+    assert not store.dirty
+
+
+def test_bursts_coalesce_into_one_write(path):
+    clock = VirtualClock(start=100.0)
+    runtime = TaskRuntime(clock=clock.monotonic, timebase=clock)
+    store = ConfigStore(path, scheduler=runtime, flush_interval=1.0, clock=clock.monotonic)
+    try:
+        for i in range(50):
+            store.update({"volume": i})
+        assert store.dirty
+        clock.run_for(0.5)
+        assert store.writes == 1
+        for i in range(50, 100):
+            store.update({"volume": i})
+        clock.run_for(0.5)
+        assert store.writes == 1  # Still inside flush_interval of the last write
+        clock.run_for(1.0)
+        assert store.writes == 2
+        assert read(path) == {"volume": 99}
+    finally:
+        runtime.shutdown()
+
+
+def test_failed_write_keeps_the_old_file_and_retries(path, monkeypatch):
+    store = ConfigStore(path)
+    store.update({"a": 1})
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(hotswap_config.json, "dump", crash)
+    store.update({"a": 2})
+    assert read(path) == {"a": 1}
+    assert store.dirty
+
+    monkeypatch.undo()
+    assert store.flush()
+    assert read(path) == {"a": 2}
+
+
+def test_lists_edited_in_place_are_saved(path):
+    with open(path, "w") as f:
+        json.dump({"whitelist": ["a.exe"]}, f)
+    store = ConfigStore(path)
+    settings = store.load()
+    whitelist = settings["whitelist"]
+    whitelist.append("b.exe")
+    store.update({"whitelist": whitelist})
+    assert read(path) == {"whitelist": ["a.exe", "b.exe"]}
+    whitelist.remove("a.exe")
+    store.update({"whitelist": whitelist})
+    assert read(path) == {"whitelist": ["b.exe"]}
+    assert store.writes == 2
@@ -0,0 +1,69 @@
+import contextlib
+import io
+
+import pytest
+
+from hotswap_sim import Simulation, SimObs, WINDOW_DELAY
+
+
+@pytest.fixture
+def sim(monkeypatch):
+    sim = Simulation(seed=1, obs_drops=False)
+    monkeypatch.setattr(sim, "_step", lambda: None)  # No random user: the test drives the desktop
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.run(5.0)
+    yield sim
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.shutdown()
+
+
+def captured(sim):
+    return sim.platform.obs.state.inputs[SimObs.VIDEO_SOURCE][1].get("window", "")
+
+
+def test_launch_is_pretargeted_once_and_validated_on_focus(sim):
+    platform, engine = sim.platform, sim.engine
+    launcher = platform.foreground
+    pid = platform.launch("eldenring.exe", "ELDEN RING™", "ELDEN RING™", window_delay=WINDOW_DELAY, focus=False)
+    sim.clock.run_for(15.0)  # Past a safety poll while the launcher still has focus
+    assert platform.foreground == launcher
+    assert captured(sim).endswith(":eldenring.exe")
+    assert engine.last_injected_exe == "eldenring.exe"
+    assert not engine.hook_validator.pending  # A loading game isn't validated yet
+
+    writes = platform.obs.state.requests["SetInputSettings"]
+    hwnd = next(h for h, w in platform.windows.items() if w.pid == pid)
+    platform.focus(hwnd)
+    sim.clock.settle()
+    assert engine.hook_validator.pending
+    sim.clock.run_for(10.0)
+    assert platform.obs.state.requests["SetInputSettings"] == writes  # No second switch batch
+    assert not engine.hook_validator.pending
+    assert "failed" not in engine.app_status[0].lower()
+
+
+def test_renaming_the_focused_window_rechecks_at_once(sim):
+    platform = sim.platform
+    platform.launch("eldenring.exe", "ELDEN RING™", "ELDEN RING™")
+    sim.clock.run_for(5.0)
+    assert captured(sim).startswith("ELDEN RING™:")
+    platform.rename(platform.foreground, "ELDEN RING™ - Limgrave")
+    sim.clock.run_for(1.0)  # Well inside the safety poll
+    assert captured(sim).startswith("ELDEN RING™ - Limgrave:")
+
+
+def test_toggling_game_detection_keeps_one_loop(sim):
+    engine, platform, clock = sim.engine, sim.platform, sim.clock
+
+    def toggle(*values):
+        for value in values: engine.set_option("game_detection_enabled", value)
+    assert len(platform.key_hooks) == 1
+    clock.spawn(toggle, False, True)  # Back on before the loop has noticed
+    clock.run_for(10.0)
+    assert len(platform.key_hooks) == 1
+    clock.spawn(toggle, False)
+    clock.run_for(10.0)
+    assert platform.key_hooks == {}
+    clock.spawn(toggle, True)
+    clock.run_for(1.0)
+    assert len(platform.key_hooks) == 1
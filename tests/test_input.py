@@ -0,0 +1,122 @@
+import threading
+import time
+
+from hotswap_input import KeyActivityDetector
+
+# Scan codes: both shifts resolve to one key, like keyboard.parse_hotkey does
+CODES = {"w": 17, "a": 30, "s": 31, "d": 32, "shift": (42, 54)}
+
+
+def resolve(combo):
+    parts = []
+    for key in combo.split("+"):
+        codes = CODES[key]
+        parts.append(set(codes) if isinstance(codes, tuple) else {codes})
+    return parts
+
+
+def detector(combos=("w", "a", "shift+d"), threshold=2.0, clock=None):
+    return KeyActivityDetector(combos, threshold, resolver=resolve, clock=clock or (lambda: 0.0))
+
+
+def play(det, stream):
+    """Feed (t, "down"/"up", key) events; returns the times a detection fired."""
+    fired = []
+    for t, kind, key in stream:
+        code = key if isinstance(key, int) else CODES[key]
+        if det.feed(kind, code, t): fired.append(t)
+    return fired
+
+
+def test_held_key_fires_once_at_the_threshold():
+    det = detector()
+    stream = [(0.0, "down", "w")] + [(0.5 * i, "down", "w") for i in range(1, 9)]  # Auto-repeat
+    assert play(det, stream) == [2.0]
+    assert not det.check(10.0)
+
+
+def test_short_taps_never_fire():
+    det = detector()
+    stream = []
+    for i in range(10):
+        stream += [(i * 1.0, "down", "w"), (i * 1.0 + 0.5, "up", "w")]
+    assert play(det, stream) == []
+    assert det.active_since is None
+
+
+def test_activity_spans_overlapping_keys():
+    det = detector()
+    stream = [(0.0, "down", "w"), (1.0, "down", "a"), (1.5, "up", "w"), (2.5, "down", "a")]
+    assert play(det, stream) == [2.5]
+
+
+def test_a_gap_with_nothing_held_restarts_the_window():
+    det = detector()
+    stream = [(0.0, "down", "w"), (1.5, "up", "w"), (1.6, "down", "a"), (3.0, "down", "a"), (3.6, "down", "a")]
+    assert play(det, stream) == [3.6]
+
+
+def test_combo_needs_every_part_and_accepts_either_shift():
+    det = detector()
+    assert play(det, [(0.0, "down", "d"), (3.0, "down", "d")]) == []
+    assert play(det, [(3.0, "down", 54), (5.0, "down", "d")]) == [5.0]
+    assert play(det, [(5.5, "up", 54), (5.6, "down", 42)]) == []  # Released, then the other shift
+    assert det.check(7.6)
+
+
+def test_unrelated_keys_are_ignored():
+    det = detector()
+    assert play(det, [(0.0, "down", 99), (5.0, "down", 99)]) == []
+    assert det.pressed == set()
+
+
+def test_check_fires_without_further_events():
+    det = detector()
+    play(det, [(0.0, "down", "w")])
+    assert det.due_at() == 2.0
+    assert not det.check(1.9)
+    assert det.check(2.0)
+    assert det.due_at() is None
+
+
+def test_rearm_restarts_the_current_activity():
+    det = detector()
+    assert play(det, [(0.0, "down", "w"), (2.0, "down", "w")]) == [2.0]
+    det.rearm(3.0)
+    assert not det.check(4.5)
+    assert det.check(5.0)
+
+
+def test_set_combos_keeps_keys_that_are_still_held():
+    det = detector(combos=("w", "a"), clock=lambda: 1.0)
+    play(det, [(0.0, "down", "w"), (0.5, "down", "a")])
+    det.set_combos(("a", "bogus"))
+    assert set(det._combos) == {"a"}
+    assert det.active_since == 0.0  # Still held, so the activity period carries on
+    assert det.held_since == {"a": 1.0}
+    assert det.check(2.0)
+    det.set_combos(("s",))
+    assert det.active_since is None
+
+
+def test_wait_returns_when_activity_reaches_the_threshold():
+    det = KeyActivityDetector(("w",), 0.05, resolver=resolve, clock=time.monotonic)
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(det.wait(5.0)))
+    waiter.start()
+    det.feed("down", CODES["w"])
+    waiter.join(5.0)
+    assert result == [True]
+
+
+def test_interrupt_wakes_a_waiter_without_firing():
+    det = KeyActivityDetector(("w",), 60.0, resolver=resolve, clock=time.monotonic)
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(det.wait()))
+    waiter.start()
+    det.feed("down", CODES["w"])
+    while waiter.is_alive():  # Until the waiter is blocked, an interrupt can land before wait() starts
+        det.interrupt()
+        waiter.join(0.05)
+    assert result == [False]
+    assert not det.fired
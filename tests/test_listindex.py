@@ -0,0 +1,43 @@
+from hotswap_listindex import ListIndex
+
+GAMES = ["Cyberpunk2077.exe", "cs2.exe", "eldenring.exe", "EldenRingLauncher.exe", "obs64.exe"]
+
+
+def test_search_is_case_insensitive_substring():
+    index = ListIndex(GAMES)
+    assert index.search("ELDEN") == {"eldenring.exe", "EldenRingLauncher.exe"}
+    assert index.search("ringl") == {"EldenRingLauncher.exe"}
+    assert index.search("zzz") == set()
+
+
+def test_short_queries_scan_instead_of_using_trigrams():
+    index = ListIndex(GAMES)
+    assert index.search("cs") == {"cs2.exe"}
+    assert index.search("") == set(GAMES)
+
+
+def test_trigram_candidates_are_checked_for_the_whole_query():
+    index = ListIndex(["abcxbcd", "abcd"])
+    # "abcxbcd" has every trigram of "abcd" but not "abcd" itself
+    assert index.search("abcd") == {"abcd"}
+
+
+def test_view_keeps_list_order_while_filtered():
+    index = ListIndex(GAMES)
+    assert index.set_query("  Elden ")
+    assert index.view == ["eldenring.exe", "EldenRingLauncher.exe"]
+    assert not index.set_query("elden")  # Same query after normalising
+    assert index.set_query("")
+    assert index.view == GAMES
+
+
+def test_sync_only_reindexes_changes_and_updates_the_filter():
+    index = ListIndex(GAMES)
+    index.set_query("exe")
+    added, removed = index.sync(["obs64.exe", "hades.exe", "cs2.exe", "hades.exe", "notes.txt"])
+    assert added == ["hades.exe", "notes.txt"]
+    assert removed == ["Cyberpunk2077.exe", "eldenring.exe", "EldenRingLauncher.exe"]
+    assert index.items == ["obs64.exe", "hades.exe", "cs2.exe", "notes.txt"]
+    assert index.view == ["obs64.exe", "hades.exe", "cs2.exe"]
+    assert "eldenring.exe" not in index._lowered
+    assert "eld" not in index._trigrams  # Emptied buckets are dropped
@@ -0,0 +1,100 @@
+import io
+import re
+import time
+
+from hotswap_log import DEBUG, ERROR, INFO, WARNING, LogStream, RingLog
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.25
+
+    def __call__(self):
+        return self.now
+
+
+def lines(text):
+    return [line.split(" ", 2)[2] for line in text.splitlines()]  # Without the timestamp
+
+
+def test_records_below_the_level_are_not_kept():
+    log = RingLog(level=INFO, clock=Clock())
+    log.debug("Engine", "expensive %s", "detail")
+    log.info("Engine", "switched to %s", "game.exe")
+    assert len(log.pending) == 1
+    assert log.pending[0][3:] == ("switched to %s", ("game.exe",))  # Formatted by the flusher, not the caller
+    assert not log.enabled(DEBUG) and log.enabled(WARNING)
+
+
+def test_flush_formats_records_in_order():
+    log = RingLog(clock=Clock())
+    echo = io.StringIO()
+    log.echo = echo
+    log.info("OBS", "connected to %s:%d", "127.0.0.1", 4455)
+    log.warning("Scan", "bad args %d", "x")
+    log.flush()
+    assert lines(echo.getvalue()) == ["INFO  [OBS] connected to 127.0.0.1:4455", "WARN  [Scan] bad args %d ('x',)"]
+    assert re.match(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\.250 INFO ", echo.getvalue())
+    assert log.written == 2 and not log.pending
+
+
+def test_a_full_buffer_drops_the_oldest_and_says_so():
+    log = RingLog(capacity=3, crash_records=5, clock=Clock())
+    log.echo = io.StringIO()
+    for i in range(5): log.info("Loop", "tick %d", i)
+    log.flush()
+    assert lines(log.echo.getvalue()) == ["WARN  [Log] Buffer was full, dropped 2 records",
+                                          "INFO  [Loop] tick 2", "INFO  [Loop] tick 3", "INFO  [Loop] tick 4"]
+    assert len(log.recent) == 5
+
+
+def test_file_rotates_and_keeps_the_backups(tmp_path):
+    path = str(tmp_path / "debug.log")
+    log = RingLog(clock=Clock())
+    log.start(path, max_bytes=200, backups=2, interval=60.0)
+    try:
+        for batch in range(4):
+            for i in range(5): log.info("Engine", "batch %d line %d", batch, i)
+            log.flush()
+    finally:
+        log.stop()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["debug.log", "debug.log.1", "debug.log.2"]
+    assert "batch 3" in (tmp_path / "debug.log.1").read_text()
+    assert "batch 2" in (tmp_path / "debug.log.2").read_text()
+
+
+def test_errors_wake_the_flusher(tmp_path):
+    path = tmp_path / "debug.log"
+    log = RingLog(clock=Clock())
+    log.start(str(path), interval=60.0)
+    try:
+        log.error("OBS", "connection lost")
+        for _ in range(200):
+            if log.written: break
+            time.sleep(0.01)
+        assert "[OBS] connection lost" in path.read_text()
+    finally:
+        log.stop()
+
+
+def test_crash_dump_has_the_recent_records_and_traceback(tmp_path):
+    log = RingLog(crash_records=2, clock=Clock())
+    log.crash_path = str(tmp_path / "crash.log")
+    for i in range(3): log.info("Loop", "tick %d", i)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.dump_crash()
+    text = (tmp_path / "crash.log").read_text()
+    assert "tick 0" not in text and "tick 1" in text and "tick 2" in text
+    assert "ValueError: boom" in text
+
+
+def test_stream_turns_written_lines_into_records():
+    log = RingLog(clock=Clock())
+    stream = LogStream(log, "stderr", ERROR)
+    stream.write("Traceback (most recent call last):\n  File")
+    stream.write(' "x.py"\n\n')
+    assert [(r[1], r[2], r[3]) for r in log.pending] == [
+        (ERROR, "stderr", "Traceback (most recent call last):"), (ERROR, "stderr", '  File "x.py"')]
+    assert not stream.isatty()
@@ -0,0 +1,71 @@
+import base64
+import hashlib
+
+import pytest
+
+from hotswap_obs import (OP_REQUEST_BATCH, ObsClient, ObsRequestError, ObsResponse, RequestBatch,
+                         _auth_string, to_snake_case)
+
+
+def test_batch_payload_numbers_each_request():
+    batch = RequestBatch(halt_on_failure=True)
+    batch.add("SetInputSettings", {"inputName": "Game", "inputSettings": {"window": "a"}}, tag="video")
+    batch.sleep(50.7)
+    batch.add("GetStats")
+    payload = batch.payload("b1")
+    assert payload["op"] == OP_REQUEST_BATCH
+    assert payload["d"]["haltOnFailure"] is True
+    requests = payload["d"]["requests"]
+    assert [r["requestId"] for r in requests] == ["b1-0", "b1-1", "b1-2"]
+    assert requests[1]["requestData"] == {"sleepMillis": 50}
+    assert "requestData" not in requests[2]
+    assert "requestId" not in batch.requests[0]  # Payloads don't touch the batch itself
+
+
+def test_batch_decode_keeps_request_order_and_tags():
+    batch = RequestBatch(halt_on_failure=True)
+    batch.add("SetInputSettings", {"inputName": "Game"}, tag="video")
+    batch.add("SetInputSettings", {"inputName": "Audio"}, tag="audio")
+    batch.add("GetStats")
+    results = batch.decode({"requestId": "b7", "results": [
+        {"requestId": "b7-1", "requestType": "SetInputSettings",
+         "requestStatus": {"result": False, "code": 600, "comment": "No source"}},
+        {"requestId": "b7-0", "requestType": "SetInputSettings",
+         "requestStatus": {"result": True, "code": 100}, "responseData": {"x": 1}},
+    ]})
+    assert [(r.tag, r.ok, r.code) for r in results] == [("video", True, 100), ("audio", False, 600), (None, False, None)]
+    assert results[0].data == {"x": 1}
+    assert results[1].describe() == "SetInputSettings returned code 600: No source"
+    assert results[2].comment == "not executed"
+
+
+def test_empty_batch_is_not_sent():
+    class Client:
+        def send_batch(self, batch): raise AssertionError("sent")
+    assert RequestBatch().execute(Client()) == []
+
+
+def test_response_fields_become_snake_case_attributes():
+    assert to_snake_case("currentProgramSceneName") == "current_program_scene_name"
+    response = ObsResponse({"inputSettings": {"window": "a"}, "videoActive": True})
+    assert response.input_settings == {"window": "a"}
+    assert response.video_active is True
+    assert response.attrs() == ["input_settings", "video_active"]
+    assert ObsResponse(None).data == {}
+
+
+def test_auth_string_follows_the_v5_handshake():
+    secret = base64.b64encode(hashlib.sha256(b"hunter2" + b"salt").digest())
+    expected = base64.b64encode(hashlib.sha256(secret + b"challenge").digest()).decode()
+    assert _auth_string("hunter2", "salt", "challenge") == expected
+
+
+def test_failed_status_raises_request_error():
+    ok = ObsClient._unwrap({"requestType": "GetStats", "requestStatus": {"result": True, "code": 100},
+                            "responseData": {"activeFps": 60.0}})
+    assert ok.active_fps == 60.0
+    with pytest.raises(ObsRequestError) as error:
+        ObsClient._unwrap({"requestType": "StartRecord",
+                           "requestStatus": {"result": False, "code": 500, "comment": "Already recording"}})
+    assert error.value.code == 500
+    assert str(error.value) == "Request StartRecord returned code 500. With message: Already recording"
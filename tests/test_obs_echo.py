@@ -0,0 +1,62 @@
+from hotswap_obs import EchoFilter, ObsEvent, RequestBatch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def changed(name, settings):
+    return ObsEvent("InputSettingsChanged", {"inputName": name, "inputSettings": settings})
+
+
+def test_own_write_is_an_echo_once():
+    echoes = EchoFilter(clock=FakeClock())
+    echoes.expect("Game", {"window": "game.exe"})
+    event = changed("Game", {"window": "game.exe", "capture_cursor": True})
+    assert echoes.is_echo(event)
+    assert not echoes.is_echo(event)  # The expectation was consumed
+    assert echoes.suppressed == 1
+    assert echoes.pending == {}
+
+
+def test_user_changes_are_not_echoes():
+    echoes = EchoFilter(clock=FakeClock())
+    echoes.expect("Game", {"window": "game.exe"})
+    assert not echoes.is_echo(changed("Game", {"window": "other.exe"}))
+    assert not echoes.is_echo(changed("Mic", {"window": "game.exe"}))
+    assert not echoes.is_echo(ObsEvent("InputCreated", {"inputName": "Game"}))
+    assert echoes.is_echo(changed("Game", {"window": "game.exe"}))
+
+
+def test_repeated_writes_match_in_order():
+    echoes = EchoFilter(clock=FakeClock())
+    echoes.expect("Game", {"window": "a.exe"})
+    echoes.expect("Game", {"window": "b.exe"})
+    assert echoes.is_echo(changed("Game", {"window": "b.exe"}))
+    assert echoes.is_echo(changed("Game", {"window": "a.exe"}))
+    assert not echoes.is_echo(changed("Game", {"window": "a.exe"}))
+
+
+def test_unanswered_writes_expire():
+    clock = FakeClock()
+    echoes = EchoFilter(ttl=5.0, clock=clock)
+    echoes.expect("Game", {"window": "game.exe"})
+    clock.now = 6.0
+    assert not echoes.is_echo(changed("Game", {"window": "game.exe"}))
+    assert echoes.pending == {}
+
+
+def test_expect_batch_registers_only_setinputsettings():
+    echoes = EchoFilter(clock=FakeClock())
+    batch = RequestBatch()
+    batch.add("SetInputSettings", {"inputName": "Game", "inputSettings": {"window": "game.exe"}})
+    batch.sleep(100)
+    batch.add("SetSceneItemEnabled", {"sceneName": "Main", "sceneItemId": 1, "sceneItemEnabled": True})
+    echoes.expect_batch(batch)
+    assert list(echoes.pending) == ["Game"]
+    echoes.clear()
+    assert not echoes.is_echo(changed("Game", {"window": "game.exe"}))
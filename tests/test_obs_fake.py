@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from hotswap_obs import (EVENT_SUB_GENERAL, EVENT_SUB_INPUTS, ObsClient, ObsConnectionError, ObsRequestError,
+                         ObsTimeoutError, RequestBatch)
+from hotswap_obs_fake import FakeObs, FakeObsServer, load_test
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**options):
+        server = FakeObsServer(**options).start()
+        servers.append(server)
+        return server
+    yield start
+    for server in servers: server.stop()
+
+
+def connect(server, password="", **options):
+    return ObsClient("127.0.0.1", server.port, password, **options)
+
+
+def test_password_is_checked_on_identify(serve):
+    server = serve(password="secret")
+    client = connect(server, "secret")
+    assert client.get_version().rpc_version == 1
+    client.disconnect()
+    with pytest.raises(ObsConnectionError, match="Authentication failed"):
+        connect(server, "wrong")
+    with pytest.raises(ObsConnectionError, match="no password"):
+        connect(server)
+    assert server.auth_failures == 1
+
+
+def test_requests_are_pipelined_and_matched_by_id(serve):
+    server = serve(latency=0.3, jitter=0.2, seed=3)
+    client = connect(server)
+    try:
+        started = time.perf_counter()
+        names = [FakeObs.VIDEO_SOURCE, FakeObs.AUDIO_SOURCE, "Webcam"] * 4
+        futures = [client.call_async("GetInputSettings", {"inputName": name}) for name in names]
+        wait(futures, timeout=10)
+        elapsed = time.perf_counter() - started
+        kinds = [f.result().input_kind for f in futures]
+        assert kinds == ["game_capture", "wasapi_process_output_capture", "dshow_input"] * 4
+        assert elapsed < 1.5  # 12 serial round-trips would take at least 3.6 s
+    finally:
+        client.disconnect()
+
+
+def test_batch_runs_in_one_round_trip_and_halts_on_failure(serve):
+    server = serve()
+    client = connect(server)
+    try:
+        batch = RequestBatch(halt_on_failure=True)
+        batch.add("SetInputSettings", {"inputName": FakeObs.VIDEO_SOURCE, "inputSettings": {"window": "a"}}, tag="video")
+        batch.add("SetInputSettings", {"inputName": "Missing", "inputSettings": {}}, tag="missing")
+        batch.add("GetStats")
+        results = batch.execute(client)
+        assert [(r.tag, r.ok) for r in results] == [("video", True), ("missing", False), (None, False)]
+        assert results[1].code == 600 and results[2].comment == "not executed"
+        assert server.trips == {"RequestBatch": 1}
+        with pytest.raises(ObsRequestError):
+            client.get_input_settings("Missing")
+    finally:
+        client.disconnect()
+
+
+def test_events_follow_the_subscription(serve):
+    server = serve()
+    events = []
+    got = threading.Event()
+
+    def on_event(event):
+        events.append(event)
+        got.set()
+    client = connect(server, on_event=on_event, event_subscriptions=EVENT_SUB_INPUTS)
+    general = connect(server, event_subscriptions=EVENT_SUB_GENERAL)
+    try:
+        client.set_input_settings(FakeObs.VIDEO_SOURCE, {"window": "game.exe"}, True)
+        assert got.wait(5.0)
+        assert events[0].name == "InputSettingsChanged"
+        assert events[0].input_settings["window"] == "game.exe"
+    finally:
+        client.disconnect()
+        general.disconnect()
+
+
+def test_dropped_connection_fails_calls_and_reports_the_disconnect(serve):
+    server = serve(latency=0.5)
+    lost = threading.Event()
+    client = connect(server, on_disconnect=lost.set)
+    try:
+        in_flight = client.call_async("GetStats")
+        time.sleep(0.1)
+        assert server.drop_connections() == 1
+        assert lost.wait(5.0)
+        assert not client.connected
+        with pytest.raises(ObsConnectionError):
+            in_flight.result(5.0)
+        with pytest.raises(ObsConnectionError):
+            client.get_stats()
+    finally:
+        client.disconnect()
+
+
+def test_slow_answers_time_out(serve):
+    server = serve(latency=1.0)
+    client = connect(server)
+    try:
+        with pytest.raises(ObsTimeoutError):
+            client.call("GetStats", timeout=0.2)
+        assert client.connected  # A late answer doesn't break the connection
+    finally:
+        client.disconnect()
+
+
+def test_load_test_drives_the_engine_against_the_fake(serve):
+    server = serve(password="fake", hook_delay=0.05)  # The engine won't connect without a password
+    report = load_test(server, switches=2, dwell=0.2, refreshes=1, polls=2, reconnects=0)
+    assert report["switches"] == 2 and len(server.obs.switches) == 2
+    assert report["round_trips_per_switch"] >= 1
+    assert report["sources_listed"] > 0
+    assert report["overload_detected"]
@@ -0,0 +1,166 @@
+import pytest
+
+from hotswap_obs import ObsEvent, ObsResponse, ObsStateMirror, BatchResult
+
+
+class FakeObs:
+    """Answers the few requests the mirror makes and counts them."""
+
+    def __init__(self):
+        self.scenes = {
+            "Main": [{"sceneItemId": 1, "sourceName": "Game", "sceneItemEnabled": True, "sceneItemIndex": 0}],
+            "BRB": [{"sceneItemId": 7, "sourceName": "Card", "sceneItemEnabled": True, "sceneItemIndex": 0}],
+        }
+        self.inputs = {"Game": ("game_capture", {"window": "game.exe"})}
+        self.calls = []
+
+    def send_batch(self, batch):
+        self.calls.append("batch")
+        return [
+            BatchResult("GetCurrentProgramScene", True, 100, data={"currentProgramSceneName": "Main"}),
+            BatchResult("GetVideoSettings", True, 100, data={"baseWidth": 1920, "baseHeight": 1080}),
+            BatchResult("GetInputList", True, 100, data={"inputs": [
+                {"inputName": name, "inputKind": kind} for name, (kind, _) in self.inputs.items()]}),
+        ]
+
+    def get_scene_item_list(self, name):
+        self.calls.append(("items", name))
+        return ObsResponse({"sceneItems": [dict(i) for i in self.scenes[name]]})
+
+    def get_input_settings(self, name):
+        self.calls.append(("settings", name))
+        kind, settings = self.inputs[name]
+        return ObsResponse({"inputKind": kind, "inputSettings": dict(settings)})
+
+
+@pytest.fixture
+def obs():
+    return FakeObs()
+
+
+@pytest.fixture
+def mirror(obs):
+    mirror = ObsStateMirror()
+    mirror.seed(obs)
+    return mirror
+
+
+def event(name, **data):
+    return ObsEvent(name, data)
+
+
+def test_seed_loads_program_scene_in_one_batch(obs, mirror):
+    assert mirror.seeded
+    assert mirror.program_scene == "Main"
+    assert mirror.video_settings["baseWidth"] == 1920
+    assert mirror.input_kind("Game") == "game_capture"
+    assert obs.calls == ["batch", ("items", "Main")]
+    assert mirror.program_items()[0]["sourceName"] == "Game"
+    assert len(obs.calls) == 2  # Served from memory
+
+
+def test_seed_publishes_seeded_with_the_data(obs):
+    mirror = ObsStateMirror()
+    seen = []
+    fetch = obs.get_scene_item_list
+
+    def watch(name):
+        seen.append((mirror.seeded, mirror.program_scene))
+        return fetch(name)
+    obs.get_scene_item_list = watch
+    mirror.seed(obs)
+    assert seen == [(False, None)]
+    assert mirror.seeded and mirror.program_scene == "Main"
+
+
+def test_reset_during_seed_is_not_undone(obs):
+    mirror = ObsStateMirror()
+    fetch = obs.get_scene_item_list
+
+    def reset_midway(name):
+        mirror.reset()
+        return fetch(name)
+    obs.get_scene_item_list = reset_midway
+    mirror.seed(obs)
+    assert not mirror.seeded
+    assert mirror.program_scene is None
+
+
+def test_reads_are_fetched_once_and_returned_as_copies(obs, mirror):
+    assert mirror.input_settings("Game") == {"window": "game.exe"}
+    mirror.input_settings("Game")["window"] = "changed"
+    mirror.program_items()[0]["sourceName"] = "changed"
+    assert mirror.input_settings("Game") == {"window": "game.exe"}
+    assert mirror.program_items()[0]["sourceName"] == "Game"
+    assert obs.calls.count(("settings", "Game")) == 1
+
+
+def test_own_writes_overlay_known_settings(mirror):
+    mirror.input_settings("Game")
+    mirror.apply_input_settings("Game", {"capture_cursor": False})
+    assert mirror.input_settings("Game") == {"window": "game.exe", "capture_cursor": False}
+    mirror.apply_input_settings("Game", {"window": "other.exe"}, overlay=False)
+    assert mirror.input_settings("Game") == {"window": "other.exe"}
+
+
+def test_program_scene_change_fetches_unknown_scene(obs, mirror):
+    assert mirror.handle_event(event("CurrentProgramSceneChanged", sceneName="BRB"))
+    assert ("items", "BRB") in obs.calls
+    calls = len(obs.calls)
+    mirror.handle_event(event("CurrentProgramSceneChanged", sceneName="Main"))
+    assert len(obs.calls) == calls
+    assert mirror.program_scene == "Main"
+
+
+def test_scene_item_events_update_in_place(obs, mirror):
+    mirror.handle_event(event("SceneItemEnableStateChanged", sceneName="Main", sceneItemId=1,
+                              sceneItemEnabled=False))
+    assert mirror.program_items()[0]["sceneItemEnabled"] is False
+    mirror.handle_event(event("SceneItemListReindexed", sceneName="Main",
+                              sceneItems=[{"sceneItemId": 1, "sceneItemIndex": 3}]))
+    assert mirror.program_items()[0]["sceneItemIndex"] == 3
+    mirror.handle_event(event("SceneItemRemoved", sceneName="Main", sceneItemId=1))
+    assert mirror.program_items() == []
+    assert obs.calls.count(("items", "Main")) == 1
+
+
+def test_created_items_refetch_tracked_scenes_only(obs, mirror):
+    mirror.handle_event(event("SceneItemCreated", sceneName="Main", sceneItemId=2))
+    assert obs.calls.count(("items", "Main")) == 2
+    mirror.handle_event(event("SceneItemCreated", sceneName="Elsewhere", sceneItemId=5))
+    assert ("items", "Elsewhere") not in obs.calls
+
+
+def test_renames_follow_scenes_and_inputs(mirror):
+    mirror.input_settings("Game")
+    mirror.handle_event(event("SceneNameChanged", oldSceneName="Main", sceneName="Live"))
+    assert mirror.program_scene == "Live"
+    mirror.handle_event(event("InputNameChanged", oldInputName="Game", inputName="Capture"))
+    assert mirror.input_kind("Capture") == "game_capture"
+    assert mirror.input_settings("Capture") == {"window": "game.exe"}
+    assert mirror.program_items()[0]["sourceName"] == "Capture"
+
+
+def test_input_lifecycle_events(obs, mirror):
+    mirror.handle_event(event("InputCreated", inputName="Mic", inputKind="wasapi_input_capture",
+                              inputSettings={"device_id": "default"}))
+    assert mirror.input_kind("Mic") == "wasapi_input_capture"
+    mirror.handle_event(event("InputSettingsChanged", inputName="Mic", inputSettings={"device_id": "usb"}))
+    assert mirror.input_settings("Mic") == {"device_id": "usb"}
+    mirror.handle_event(event("InputRemoved", inputName="Mic"))
+    assert mirror.input_kind("Mic") == ""
+    assert ("settings", "Mic") not in obs.calls
+
+
+def test_collection_change_reseeds_and_unknown_events_are_ignored(obs, mirror):
+    assert not mirror.handle_event(event("StreamStateChanged", outputActive=True))
+    assert mirror.handle_event(event("CurrentSceneCollectionChanged", sceneCollectionName="Other"))
+    assert obs.calls.count("batch") == 2
+
+
+def test_reset_forgets_everything(mirror):
+    mirror.reset()
+    assert not mirror.seeded
+    assert mirror.program_scene is None
+    assert mirror.program_items() == []
+    assert mirror.input_settings("Game") == {}
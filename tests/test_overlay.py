@@ -0,0 +1,143 @@
+from hotswap_engine import ALERT_ASPECT_RATIO, ALERT_CAPTURE_FAILED, ALERT_FRAME_DROP, ALERT_GAME_DETECTED
+from hotswap_overlay import (ALERT_DIGEST, PREBUILD_DELAY_MS, SHOW_TIME_HISTORY, AlertQueue, OverlayPool,
+                             merge_alert, new_alert)
+
+
+class Deferred:
+    """Stands in for Tk's after(): steps run when the test says so."""
+
+    def __init__(self):
+        self.steps = []
+
+    def __call__(self, ms, fn):
+        self.steps.append((ms, fn))
+
+    def run_next(self):
+        self.steps.pop(0)[1]()
+
+
+def pool():
+    built = []
+
+    def build(overlay_type):
+        built.append(overlay_type)
+        return object()
+    deferred = Deferred()
+    return OverlayPool(build, deferred), built, deferred
+
+
+def test_windows_are_built_once_and_reused():
+    windows, built, _ = pool()
+    first = windows.get("frame_drop")
+    assert windows.get("frame_drop") is first
+    assert built == ["frame_drop"]
+
+
+def test_prebuild_builds_one_window_per_turn():
+    windows, built, deferred = pool()
+    windows.prebuild(("a", "b", "c"))
+    assert built == ["a"]
+    assert [ms for ms, _ in deferred.steps] == [PREBUILD_DELAY_MS]
+    deferred.run_next()
+    deferred.run_next()
+    assert built == ["a", "b", "c"]
+    assert deferred.steps == []
+
+
+def test_prebuild_skips_windows_already_in_use():
+    windows, built, deferred = pool()
+    windows.get("b")
+    windows.prebuild(("a", "b"))
+    assert built == ["b", "a"]
+    assert deferred.steps == []
+    windows.prebuild(("a", "b"))
+    assert built == ["b", "a"]
+
+
+def test_show_stats_keep_the_last_and_worst_recent_times():
+    windows, _, _ = pool()
+    for ms in [90.0] + [5.0] * SHOW_TIME_HISTORY + [7.5]:
+        windows.record_visible("digest", ms)
+    assert windows.show_stats() == {"digest": (7.5, 7.5)}  # 90 ms aged out
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def alert(clock, overlay_type, message="", title="Alert", value=None, template=None, monitor=None):
+    return new_alert(title, message, overlay_type, monitor_handle=monitor, value=value, template=template,
+                     requested_at=clock.now, created=clock.now)
+
+
+def test_repeats_merge_values_into_one_message():
+    clock = Clock()
+    first = alert(clock, ALERT_FRAME_DROP, "Dropped 45 frames!", value=45, template="Dropped {} frames!")
+    merge_alert(first, alert(clock, ALERT_FRAME_DROP, "Dropped 310 frames!", value=310,
+                             template="Dropped {} frames!", monitor=7))
+    assert first['message'] == "Dropped 45 → 310 frames!"
+    assert first['count'] == 2 and first['monitor_handle'] == 7
+
+
+def test_waiting_alert_takes_repeats_of_its_type():
+    clock = Clock()
+    queue = AlertQueue(clock)
+    assert queue.add(alert(clock, ALERT_CAPTURE_FAILED, "game.exe"))
+    assert not queue.add(alert(clock, ALERT_CAPTURE_FAILED, "game.exe"))  # Same message: dropped
+    assert not queue.add(alert(clock, ALERT_CAPTURE_FAILED, "other.exe"))
+    shown, wait = queue.take()
+    assert (shown['message'], shown['count'], wait) == ("other.exe", 2, None)
+    assert not queue
+
+
+def test_rate_limit_holds_a_type_back_after_it_was_shown():
+    clock = Clock()
+    queue = AlertQueue(clock)
+    queue.add(alert(clock, ALERT_FRAME_DROP, "Dropped 45 frames!"))
+    queue.shown(queue.take()[0])
+    clock.now += 5.0
+    queue.add(alert(clock, ALERT_FRAME_DROP, "Dropped 80 frames!"))
+    assert queue.take() == (None, AlertQueue.RATE_LIMITS[ALERT_FRAME_DROP] - 5.0)
+    clock.now += 25.0
+    assert queue.take()[0]['message'] == "Dropped 80 frames!"
+
+
+def test_priority_picks_game_detected_and_never_digests_it():
+    clock = Clock()
+    queue = AlertQueue(clock)
+    queue.add(alert(clock, ALERT_ASPECT_RATIO, "Game is pillarboxed"))
+    clock.now += 1.0
+    queue.add(alert(clock, ALERT_GAME_DETECTED, "game.exe"))
+    first, _ = queue.take()
+    assert first['overlay_type'] == ALERT_GAME_DETECTED
+    assert queue.take()[0]['overlay_type'] == ALERT_ASPECT_RATIO
+
+
+def test_several_ready_alerts_become_one_digest():
+    clock = Clock()
+    queue = AlertQueue(clock)
+    queue.add(alert(clock, ALERT_ASPECT_RATIO, "Game is pillarboxed", title="Aspect Ratio Warning"))
+    queue.add(alert(clock, ALERT_FRAME_DROP, "Dropped 45 frames!", title="Frame Drops", monitor=3))
+    queue.add(alert(clock, ALERT_FRAME_DROP, "Dropped 60 frames!", title="Frame Drops"))
+    digest, _ = queue.take()
+    assert digest['overlay_type'] == ALERT_DIGEST
+    assert digest['message'].split("\n") == ["Frame Drops: Dropped 60 frames! (x2)",
+                                             "Aspect Ratio Warning: Game is pillarboxed"]
+    assert digest['monitor_handle'] == 3
+    queue.shown(digest)
+    assert set(queue.last_shown) == {ALERT_FRAME_DROP, ALERT_ASPECT_RATIO}  # Both types are now rate-limited
+    assert not queue
+
+
+def test_stale_alerts_are_dropped():
+    clock = Clock()
+    queue = AlertQueue(clock)
+    queue.last_shown[ALERT_FRAME_DROP] = clock.now
+    queue.add(alert(clock, ALERT_FRAME_DROP, "Dropped 45 frames!"))
+    clock.now += AlertQueue.MAX_PENDING_AGE + 1
+    assert queue.take() == (None, None)
+    assert not queue
@@ -0,0 +1,355 @@
+import psutil
+import pytest
+
+import hotswap_platform
+from hotswap_clock import VirtualClock
+from hotswap_platform import (
+    AppScanner, IdentityCache, ProcessWatcher, ScriptedForegroundSource, PROCESS_STARTED, PROCESS_EXITED,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSystem:
+    """pid -> (exe, create_time) table standing in for psutil.Process."""
+
+    def __init__(self):
+        self.procs = {}
+        self.opened = 0
+        self.denied = set()
+
+    def run(self, pid, exe, created):
+        self.procs[pid] = (exe, created)
+
+    def kill(self, pid):
+        self.procs.pop(pid, None)
+
+    def open(self, pid):
+        self.opened += 1
+        if pid in self.denied: raise psutil.AccessDenied(pid)
+        if pid not in self.procs: raise psutil.NoSuchProcess(pid)
+        return FakeProcess(self, pid)
+
+
+class FakeProcess:
+    def __init__(self, system, pid):
+        self.system = system
+        self.pid = pid
+        self.created = system.procs[pid][1]
+
+    def is_running(self):
+        return self.system.procs.get(self.pid, (None, None))[1] == self.created
+
+    def create_time(self):
+        if self.pid not in self.system.procs: raise psutil.NoSuchProcess(self.pid)
+        return self.system.procs[self.pid][1]
+
+    def name(self):
+        if self.pid not in self.system.procs: raise psutil.NoSuchProcess(self.pid)
+        return self.system.procs[self.pid][0]
+
+
+def test_push_delivers_at_once():
+    seen = []
+    source = ScriptedForegroundSource()
+    source.start(seen.append)
+    source.push(7)
+    assert seen == [7]
+
+
+def test_scripted_timeline_plays_on_the_timebase():
+    clock = VirtualClock()
+    seen = []
+    source = ScriptedForegroundSource([(5.0, 1), (0, 2), (10.0, 3)], timebase=clock)
+    source.start(lambda hwnd: seen.append((hwnd, clock.monotonic())))
+    clock.run_until(20.0)
+    assert seen == [(1, 5.0), (2, 5.0), (3, 15.0)]
+
+
+def test_stopped_timeline_plays_no_further():
+    clock = VirtualClock()
+    seen = []
+    source = ScriptedForegroundSource([(5.0, 1), (10.0, 2)], timebase=clock)
+    source.start(seen.append)
+    clock.run_until(6.0)
+    source.stop()
+    clock.run_until(30.0)
+    assert seen == [1]
+
+
+@pytest.fixture
+def system():
+    return FakeSystem()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def identity(system, clock):
+    return IdentityCache(query_window=None, clock=clock, open_process=system.open)
+
+
+def test_names_are_cached_per_process(system, identity, monkeypatch):
+    system.run(10, "game.exe", 1.0)
+    names = []
+    monkeypatch.setattr(FakeProcess, "name", lambda self: names.append(self.pid) or system.procs[self.pid][0])
+    assert identity.process_identity(10) == ("game.exe", 1.0)
+    for _ in range(5):
+        assert identity.process_name(10) == "game.exe"
+    assert names == [10]
+
+
+def test_reused_pid_is_never_given_the_old_exe(system, identity):
+    system.run(10, "game.exe", 1.0)
+    identity.process_name(10)
+    system.run(10, "notepad.exe", 2.0)  # Straight away, nothing reported the exit
+    assert identity.process_identity(10) == ("notepad.exe", 2.0)
+    system.kill(10)
+    assert identity.process_identity(10) == (None, None)
+    assert len(identity.processes) == 0
+
+
+def test_gone_and_protected_processes(system, identity):
+    assert identity.process_identity(99) == (None, None)
+    system.run(4, "System", 0.0)
+    system.denied.add(4)
+    assert identity.process_name(4) is None
+    assert identity.stats()["processes"]["size"] == 0
+
+
+def test_window_info_is_cached_until_the_window_changes(system, clock):
+    queries = []
+
+    def query(hwnd):
+        queries.append(hwnd)
+        return "Game", "GameWindow", 1, 10
+    system.run(10, "game.exe", 1.0)
+    identity = IdentityCache(query_window=query, clock=clock, open_process=system.open)
+    assert identity.window_info(500) == ("game.exe", "Game", "GameWindow", 1)
+    identity.window_info(500)
+    assert queries == [500]
+    identity.on_window_event(500, hotswap_platform.WINDOW_RENAMED)
+    identity.window_info(500)
+    assert queries == [500, 500]
+
+    untracked = IdentityCache(track_windows=False, query_window=query, clock=clock, open_process=system.open)
+    untracked.window_info(500)
+    untracked.window_info(500)
+    assert queries.count(500) == 4
+
+
+@pytest.fixture
+def watcher(system, identity):
+    def wait_procs(procs, timeout):
+        gone = [p for p in procs if not p.is_running()]
+        return gone, [p for p in procs if p not in gone]
+    watcher = ProcessWatcher(identity, list_pids=lambda: list(system.procs), open_process=system.open,
+                             wait_procs=wait_procs)
+    watcher.watch = lambda exe: exe == "game.exe"
+    return watcher
+
+
+def test_running_processes_are_indexed_but_not_reported(system, watcher):
+    system.run(10, "game.exe", 1.0)
+    system.run(11, "Notepad.exe", 1.0)
+    assert watcher.scan() == []
+    assert watcher.is_running("GAME.EXE")
+    assert watcher.pids("notepad.exe") == {11}
+
+
+def test_starts_and_exits_of_watched_processes(system, watcher):
+    events = []
+    watcher.callback = lambda *event: events.append(event)
+    watcher.scan()
+    system.run(10, "game.exe", 1.0)
+    system.run(11, "notepad.exe", 1.0)
+    assert watcher.scan() == [(PROCESS_STARTED, "game.exe", 10)]
+    system.kill(10)
+    system.kill(11)
+    assert watcher.scan() == [(PROCESS_EXITED, "game.exe", 10)]
+    assert not watcher.is_running("game.exe")
+    assert events == [(PROCESS_STARTED, "game.exe", 10), (PROCESS_EXITED, "game.exe", 10)]
+
+
+def test_rule_changes_apply_to_running_processes(system, watcher):
+    system.run(10, "game.exe", 1.0)
+    system.run(11, "other.exe", 1.0)
+    watcher.scan()
+    watcher.watch = lambda exe: exe == "other.exe"
+    watcher.refresh_watch()
+    system.kill(10)
+    system.kill(11)
+    assert watcher.scan() == [(PROCESS_EXITED, "other.exe", 11)]
+
+
+def test_scans_only_open_new_pids(system, watcher):
+    for pid in range(10, 20):
+        system.run(pid, "notepad.exe", 1.0)
+    watcher.scan()
+    opened = system.opened
+    watcher.scan()
+    assert system.opened == opened
+    system.run(20, "game.exe", 1.0)
+    watcher.scan()
+    assert system.opened == opened + 2  # Its identity, then the handle waited on
+
+
+def test_watched_pid_reused_before_the_next_scan(system, watcher):
+    system.run(10, "game.exe", 1.0)
+    watcher.scan()
+    system.run(10, "other.exe", 2.0)
+    assert watcher.wait_exits() == [(PROCESS_EXITED, "game.exe", 10)]
+    assert watcher.scan() == []
+    assert watcher.pids("other.exe") == {10}
+    assert watcher.wait_exits() is None  # Nothing watched any more
+
+
+def test_unwatched_pid_reuse_shows_once_the_pid_vanishes(system, watcher):
+    system.run(10, "other.exe", 1.0)
+    watcher.scan()
+    system.run(10, "game.exe", 2.0)
+    assert watcher.scan() == []
+    system.kill(10)
+    watcher.scan()
+    system.run(10, "game.exe", 2.0)
+    assert watcher.scan() == [(PROCESS_STARTED, "game.exe", 10)]
+
+
+def test_exit_seen_by_a_scan_first_is_reported_once(system, watcher):
+    system.run(10, "game.exe", 1.0)
+    watcher.scan()
+    system.kill(10)
+    assert watcher.scan() == [(PROCESS_EXITED, "game.exe", 10)]
+    assert watcher.wait_exits() is None
+
+
+def test_unreadable_processes_are_not_queried_again(system, watcher):
+    system.run(4, "System", 0.0)
+    system.denied.add(4)
+    watcher.scan()
+    opened = system.opened
+    watcher.scan()
+    assert system.opened == opened
+    assert watcher.procs[4] is None
+
+
+class HeldScheduler:
+    """Holds submitted work until the test runs it; None when `full`, like a full TaskRuntime."""
+
+    def __init__(self):
+        self.work = []
+        self.full = False
+
+    def submit(self, fn, *args):
+        if self.full: return None
+        self.work.append((fn, args))
+        return object()
+
+    def run(self):
+        while self.work:
+            fn, args = self.work.pop(0)
+            fn(*args)
+
+
+class Listener:
+    def __init__(self):
+        self.apps = []
+        self.done = []
+
+    def on_app(self, app):
+        self.apps.append(app)
+
+    def on_done(self, apps):
+        self.done.append(apps)
+
+
+@pytest.fixture
+def desktop(system):
+    system.run(10, "game.exe", 1.0)
+    system.run(11, "Discord.exe", 1.0)
+    system.run(12, "discord.exe", 1.0)
+    system.run(13, "HotSwap.exe", 1.0)
+    return [(1, "Elden Ring", 10), (2, "Friends - Discord", 11), (3, "Voice - Discord", 12),
+            (4, "HotSwap", 13), (5, "Elden Ring Settings", 10), (6, "Gone", 99)]
+
+
+@pytest.fixture
+def scanner(identity, desktop, clock):
+    return AppScanner(identity, HeldScheduler(), list_windows=lambda: list(desktop), clock=clock)
+
+
+def test_apps_stream_in_window_order_and_finish_sorted(scanner):
+    listener = Listener()
+    scanner.scan(listener.on_app, listener.on_done)
+    assert listener.apps == []  # Nothing runs on the caller's thread
+    scanner.scheduler.run()
+    assert listener.apps == ["Elden Ring (game.exe)", "Friends - Discord (Discord.exe)"]
+    assert listener.done == [["Elden Ring (game.exe)", "Friends - Discord (Discord.exe)"]]
+
+
+def test_known_pids_skip_the_identity_lookup(system, scanner):
+    scanner.known = {10: "game.exe", 11: "Discord.exe", 12: "discord.exe", 13: "HotSwap.exe", 99: None}
+    scanner.scan()
+    scanner.scheduler.run()
+    assert system.opened == 1  # Only pid 99, which the watcher couldn't read either
+    assert len(scanner.snapshot) == 2
+
+
+def test_callers_mid_scan_join_the_running_scan(identity, desktop, clock):
+    late = Listener()
+    scanner = None
+
+    def list_windows():
+        # The first app is found before the second caller arrives
+        for hwnd, title, pid in desktop:
+            if pid == 11: scanner.scan(late.on_app, late.on_done)
+            yield hwnd, title, pid
+    scanner = AppScanner(identity, HeldScheduler(), list_windows=list_windows, clock=clock)
+    first = Listener()
+    scanner.scan(first.on_app, first.on_done)
+    scanner.scheduler.run()
+    assert late.apps == first.apps == ["Elden Ring (game.exe)", "Friends - Discord (Discord.exe)"]
+    assert late.done == first.done
+    assert scanner.scheduler.work == []  # One scan served both
+
+
+def test_finished_scan_is_reused_until_it_expires(scanner, clock):
+    scanner.scan()
+    scanner.scheduler.run()
+    cached = Listener()
+    scanner.scan(cached.on_app, cached.on_done)
+    assert cached.done == [scanner.snapshot] and scanner.scheduler.work == []
+    clock.now += scanner.ttl
+    scanner.scan()
+    assert len(scanner.scheduler.work) == 1
+    scanner.scheduler.run()
+    scanner.invalidate()
+    scanner.scan()
+    assert len(scanner.scheduler.work) == 1
+
+
+def test_failed_or_rejected_scans_report_none(scanner, clock):
+    def broken(): raise OSError("no desktop")
+    scanner.scan()
+    scanner.scheduler.run()
+    snapshot = scanner.snapshot
+    clock.now += scanner.ttl
+    scanner.list_windows = broken
+    failed = Listener()
+    scanner.scan(on_done=failed.on_done)
+    scanner.scheduler.run()
+    assert failed.done == [None]
+    scanner.scheduler.full = True
+    rejected = Listener()
+    scanner.scan(on_done=rejected.on_done)
+    assert rejected.done == [None]
+    assert scanner.snapshot is snapshot  # The last good list is kept
@@ -0,0 +1,80 @@
+from hotswap_rules import CompiledRules, RuleMatcher, MEMO_LIMIT
+
+
+def test_exact_names_ignore_case():
+    rules = CompiledRules(["EldenRing.exe", "  ", ""])
+    assert rules.matches("eldenring.exe")
+    assert not rules.matches("eldenring.exe.bak")
+    assert rules.regex is None
+
+
+def test_globs_and_regexes_share_one_alternation():
+    rules = CompiledRules(["*-Win64-Shipping.exe", r"re:cod(hq)?\.exe"])
+    assert rules.matches("stray-win64-shipping.exe")
+    assert rules.matches("codhq.exe")
+    assert rules.matches("cod.exe")
+    assert not rules.matches("codhq.exe.old")  # Regexes are anchored at both ends
+    assert not rules.matches("shipping.exe")
+
+
+def test_invalid_regex_is_reported_not_raised():
+    rules = CompiledRules(["re:(unclosed", "ok.exe"])
+    assert rules.invalid == ["re:(unclosed"]
+    assert rules.matches("ok.exe")
+
+
+def test_decide_covers_every_list():
+    matcher = RuleMatcher()
+    matcher.set_list("whitelist", ["game.exe"])
+    matcher.set_list("blacklist", ["chrome.exe"])
+    matcher.set_list("temp_ignore", ["game.exe"])
+    matcher.set_list("anticheat", ["re:game\\.exe"])
+    assert matcher.decide("Game.exe") == (True, False, True, True)
+    assert matcher.decide("chrome.exe") == (False, True, False, False)
+
+
+def test_set_list_clears_memo():
+    matcher = RuleMatcher()
+    assert not matcher.decide("game.exe").whitelisted
+    matcher.set_list("whitelist", ["game.exe"])
+    assert matcher.decide("game.exe").whitelisted
+
+
+def test_memo_is_bounded():
+    matcher = RuleMatcher()
+    for i in range(MEMO_LIMIT + 10):
+        matcher.decide(f"app{i}.exe")
+    assert len(matcher._memo) <= MEMO_LIMIT
+
+
+def test_invalid_patterns_across_lists():
+    matcher = RuleMatcher()
+    matcher.set_list("whitelist", ["re:["])
+    matcher.set_list("blacklist", ["re:(x"])
+    assert sorted(matcher.invalid_patterns()) == ["re:(x", "re:["]
+
+
+def test_global_inline_flags_are_matched_on_their_own():
+    rules = CompiledRules(["re:(?i)foo.*", "bar-*.exe", r"re:baz\d+\.exe"])
+    assert rules.invalid == []
+    assert rules.matches("foo.exe")
+    assert rules.matches("bar-1.exe")
+    assert rules.matches("baz12.exe")
+    assert not rules.matches("xfoo.exe")
+
+
+def test_backreferences_keep_their_own_groups():
+    rules = CompiledRules([r"re:(a)b\1\.exe", r"re:(x)(y)\2\.exe"])
+    assert rules.matches("aba.exe")
+    assert rules.matches("xyy.exe")
+    assert not rules.matches("xya.exe")
+
+
+def test_join_failure_falls_back_to_matching_one_by_one():
+    rules = CompiledRules([r"re:(?P<n>game)\.exe", r"re:(?P<n>play)\.exe"])  # Duplicate group names once joined
+    assert rules.regex is None
+    assert rules.matches("game.exe")
+    assert rules.matches("play.exe")
+    matcher = RuleMatcher()
+    matcher.set_list("whitelist", ["re:(?i)foo", "other.exe"])
+    assert matcher.decide("FOO").whitelisted
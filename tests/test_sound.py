@@ -0,0 +1,99 @@
+import io
+import threading
+import wave
+from array import array
+
+from hotswap_sound import MIX_CHANNELS, MIX_RATE, SoundEngine, decode_wav, mix, scale
+
+
+def write_wav(path, samples, rate=MIX_RATE, channels=MIX_CHANNELS, width=2):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(rate)
+        wav.writeframes(bytes(samples) if width == 1 else array("h", samples).tobytes())
+    return str(path)
+
+
+def read_wav(data):
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        return array("h", wav.readframes(wav.getnframes()))
+
+
+def test_decode_converts_to_the_mix_format(tmp_path):
+    path = write_wav(tmp_path / "mono8.wav", [128, 192, 64], rate=MIX_RATE // 2, channels=1, width=1)
+    samples = decode_wav(path)
+    assert len(samples) == 6 * MIX_CHANNELS  # Twice the frames, both channels
+    assert list(samples[:4]) == [0, 0, 8192, 8192]  # Interpolated halfway, mono duplicated
+
+
+def test_scale_and_mix_clip_to_16_bit():
+    assert list(scale(array("h", [1000, -1000]), 0.5)) == [500, -500]
+    loud = array("h", [30000, -30000, 100])
+    assert list(mix(loud, array("h", [10000, -10000]))) == [32767, -32768, 100]
+    assert list(mix(array("h"), loud)) == list(loud)
+
+
+class Output:
+    """Plays by blocking until stop() or finish(); records what it was given."""
+
+    def __init__(self):
+        self.played = []
+        self.beeps = []
+        self._done = threading.Event()
+        self._cond = threading.Condition()
+
+    def play(self, wav_bytes):
+        with self._cond:
+            self.played.append(read_wav(wav_bytes))
+            self._cond.notify_all()
+        self._done.wait(5.0)
+        self._done.clear()
+
+    def stop(self):
+        self._done.set()
+
+    finish = stop
+
+    def beep(self, kind):
+        self.beeps.append(kind)
+
+    def wait_for(self, count):
+        with self._cond:
+            assert self._cond.wait_for(lambda: len(self.played) >= count, 5.0)
+
+
+def test_overlapping_cue_is_mixed_into_the_remainder(tmp_path):
+    frames = MIX_RATE  # One second each
+    first = write_wav(tmp_path / "first.wav", [1000] * frames * MIX_CHANNELS)
+    second = write_wav(tmp_path / "second.wav", [300] * frames * MIX_CHANNELS)
+    now = [0.0]
+    output = Output()
+    engine = SoundEngine(output, clock=lambda: now[0])
+    engine.play(first, 1.0)
+    output.wait_for(1)
+    now[0] = 0.25
+    engine.play(second, 0.5)
+    output.wait_for(2)
+    output.finish()
+    remainder = frames * 3 // 4 * MIX_CHANNELS
+    resumed = output.played[1]
+    assert len(resumed) == frames * MIX_CHANNELS
+    assert resumed[0] == 1150 and resumed[remainder - 1] == 1150
+    assert resumed[remainder] == 150
+
+
+def test_cues_are_cached_per_volume(tmp_path):
+    path = write_wav(tmp_path / "cue.wav", [2000] * 8)
+    engine = SoundEngine(Output())
+    cue = engine.load(path, 0.5)
+    assert engine.load(path, 0.504) is cue
+    assert engine.load(path, 0.6) is not cue
+    assert list(cue.samples[:2]) == [1000, 1000]
+
+
+def test_unusable_file_falls_back_to_the_beep(tmp_path):
+    output = Output()
+    SoundEngine(output).play(str(tmp_path / "missing.wav"), 1.0, kind="detected")
+    assert output.beeps == ["detected"]
+    assert output.played == []
@@ -0,0 +1,69 @@
+import json
+import textwrap
+
+from hotswap_startup import BENCHMARK_FLAG, REPORT_PREFIX, StartupTimer, run_once, summarize
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_only_the_first_mark_of_a_name_counts():
+    clock = FakeClock()
+    timer = StartupTimer(started=9.5, clock=clock)
+    assert timer.mark("imports") == 500.0
+    clock.now = 12.0
+    assert timer.mark("connected") == 2500.0
+    clock.now = 20.0
+    assert timer.mark("connected") is None  # A reconnect
+    assert timer.marks == {"imports": 500.0, "connected": 2500.0}
+
+
+def test_report_is_one_machine_readable_line(capsys):
+    timer = StartupTimer(clock=FakeClock())
+    timer.marks = {"imports": 412.3, "first_frame": 903.0}
+    timer.report()
+    line = capsys.readouterr().out
+    assert line.startswith(REPORT_PREFIX) and line.count("\n") == 1
+    assert json.loads(line[len(REPORT_PREFIX):]) == timer.marks
+
+
+def test_summary_covers_the_runs_that_reached_each_milestone():
+    runs = [
+        {"imports": 400, "first_frame": 900, "wall": 1000},
+        {"imports": 300, "first_frame": 700, "connected": 1500, "wall": 1600},
+        {"imports": 500, "first_frame": 800, "wall": 1100},
+    ]
+    summary = summarize(runs)
+    assert summary["imports"] == (400, 300, 500)
+    assert summary["connected"] == (1500, 1500, 1500)
+    assert list(summary) == ["imports", "first_frame", "connected", "wall"]
+
+
+def write_script(tmp_path, body):
+    script = tmp_path / "app.py"
+    script.write_text(textwrap.dedent(body))
+    return str(script)
+
+
+def test_run_once_reads_the_report_of_a_fresh_process(tmp_path):
+    script = write_script(tmp_path, f"""
+        import sys
+        assert sys.argv[1:] == [{BENCHMARK_FLAG!r}]
+        print("starting up")
+        print({REPORT_PREFIX!r} + '{{"imports": 12.5}}', flush=True)
+    """)
+    result = run_once(script, timeout=30.0)
+    assert result["imports"] == 12.5
+    assert result["wall"] > 0
+
+
+def test_run_once_gives_up_on_a_process_that_never_reports(tmp_path):
+    quiet = write_script(tmp_path, "print('already running')\n")
+    assert run_once(quiet, timeout=30.0) is None
+    hung = write_script(tmp_path, "import time\ntime.sleep(60)\n")
+    assert run_once(hung, timeout=0.5) is None
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+from hotswap_stats import (
+    StatsRing, StatsSampler, percentile, LEVEL_DROP, LEVEL_MINOR, LEVEL_NORMAL,
+)
+
+
+def sample(skipped=0, total=0, fps=60.0, render=2.0):
+    return {"render_skipped_frames": skipped, "render_total_frames": total, "output_skipped_frames": 0,
+            "output_total_frames": total, "active_fps": fps, "average_frame_render_time": render}
+
+
+def test_ring_overwrites_oldest_once_full():
+    ring = StatsRing(3, fields=("x",))
+    for t in range(5):
+        ring.append(float(t), {"x": t})
+    assert len(ring) == 3
+    assert ring.latest("x") == 4
+    assert ring.values("x", since=0) == [2, 3, 4]
+    assert ring.values("x", since=3) == [3, 4]
+
+
+def test_counter_delta_survives_counter_reset():
+    ring = StatsRing(10, fields=("c",))
+    for t, c in enumerate([100, 110, 5, 15]):  # OBS restarted between 110 and 5
+        ring.append(float(t), {"c": c})
+    assert ring.counter_delta("c", since=0) == 10 + 5 + 10
+
+
+def test_percentile_interpolates():
+    assert percentile([], 95) == 0.0
+    assert percentile([1, 2, 3, 4], 50) == pytest.approx(2.5)
+    assert percentile([5], 99) == 5
+
+
+def test_health_levels():
+    sampler = StatsSampler(fetch=None, threshold=30)
+    assert sampler.record(sample(0, 0), 0.0).level == LEVEL_NORMAL
+    assert sampler.record(sample(0, 6000), 1.0).level == LEVEL_NORMAL
+    assert sampler.record(sample(5, 12000), 2.0).level == LEVEL_MINOR
+    health = sampler.record(sample(100, 18000), 3.0)
+    assert health.level == LEVEL_DROP
+    assert health.dropped == 100
+
+
+def test_slow_renders_are_minor():
+    sampler = StatsSampler(fetch=None)
+    for t in range(5):
+        health = sampler.record(sample(0, 60 * t, fps=60.0, render=25.0), float(t))
+    assert health.level == LEVEL_MINOR
+    assert health.render_budget == pytest.approx(1000 / 60)
+
+
+def test_poll_counts_errors_and_reports_health():
+    seen = []
+    stats = SimpleNamespace(render_skipped_frames=0, render_total_frames=0, output_skipped_frames=0,
+                            output_total_frames=0, active_fps=60.0, average_frame_render_time=1.0,
+                            cpu_usage=3.0, memory_usage=100.0)
+    calls = iter([stats, RuntimeError("gone")])
+
+    def fetch():
+        result = next(calls)
+        if isinstance(result, Exception): raise result
+        return result
+
+    sampler = StatsSampler(fetch, on_health=seen.append, clock=lambda: 0.0)
+    sampler.poll()
+    sampler.poll()
+    assert [h.level for h in seen] == [LEVEL_NORMAL]
+    assert sampler.errors == 1
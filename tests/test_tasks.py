@@ -0,0 +1,150 @@
+import threading
+
+import pytest
+
+from hotswap_clock import VirtualClock
+from hotswap_tasks import TaskRuntime, current_token
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock()
+
+
+@pytest.fixture
+def runtime(clock):
+    runtime = TaskRuntime(workers=2, max_queue=4, clock=clock.monotonic, timebase=clock)
+    yield runtime
+    runtime.shutdown()
+    clock.run_for(1.0)
+
+
+def test_submit_runs_on_the_pool(clock, runtime):
+    ran = []
+    runtime.submit(lambda: ran.append(threading.current_thread().name))
+    clock.run_for(0.1)
+    assert len(ran) == 1
+    assert runtime.stats()["completed"] == 1
+
+
+def test_keyed_submit_cancels_the_running_task(clock, runtime):
+    results = []
+
+    def job(name):
+        results.append((name, current_token().sleep(5.0)))
+
+    runtime.submit(job, "first", key="k")
+    clock.run_for(1.0)
+    runtime.submit(job, "second", key="k")
+    clock.run_for(10.0)
+    assert results == [("first", False), ("second", True)]
+    assert clock.monotonic() == pytest.approx(11.0)
+
+
+def test_full_queue_rejects_instead_of_blocking(clock, runtime):
+    for _ in range(2):
+        runtime.submit(lambda: current_token().sleep(10.0))  # Keep both workers busy
+    clock.settle()
+    accepted = [runtime.submit(lambda: None) for _ in range(6)]
+    assert accepted.count(None) == 2
+    assert runtime.rejected == 2
+    assert runtime.stats()["queued"] == 4
+
+
+def test_rejected_keyed_submit_keeps_the_previous_task(clock, runtime):
+    results = []
+
+    def job(name):
+        results.append((name, current_token().sleep(5.0)))
+
+    runtime.submit(job, "running", key="k")
+    runtime.submit(lambda: current_token().sleep(10.0))
+    clock.settle()
+    for _ in range(4):
+        runtime.submit(lambda: None)
+    assert runtime.submit(job, "rejected", key="k") is None
+    clock.run_for(20.0)
+    assert results == [("running", True)]
+
+
+def test_superseding_a_queued_task_takes_its_slot(clock, runtime):
+    results = []
+    for _ in range(2):
+        runtime.submit(lambda: current_token().sleep(10.0))
+    clock.settle()
+    for _ in range(3):
+        runtime.submit(lambda: None)
+    runtime.submit(lambda: results.append("old"), key="k")
+    assert runtime.submit(lambda: results.append("newer"), key="k") is not None
+    assert runtime.stats()["queued"] == 4
+    clock.run_for(20.0)
+    assert results == ["newer"]
+    assert runtime.stats()["queued"] == 0
+
+
+def test_cancelled_queued_tasks_free_their_slots(clock, runtime):
+    for _ in range(2):
+        runtime.submit(lambda: current_token().sleep(10.0))
+    clock.settle()
+    for i in range(4):
+        runtime.submit(lambda: None, key=i)
+    for i in range(4):
+        runtime.cancel(i)
+    assert runtime.stats()["queued"] == 0
+    assert all(runtime.submit(lambda: None) for _ in range(4))
+
+
+def test_failures_are_counted(clock, runtime):
+    runtime.submit(lambda: 1 / 0)
+    clock.run_for(0.1)
+    assert runtime.failed == 1
+
+
+def test_call_later_fires_on_time_and_keys_replace(clock, runtime):
+    fired = []
+    runtime.call_later(2.0, lambda: fired.append(("old", clock.monotonic())), key="t")
+    runtime.call_later(3.0, lambda: fired.append(("new", clock.monotonic())), key="t")
+    clock.run_for(2.5)
+    assert fired == []
+    clock.run_for(1.0)
+    assert [name for name, _ in fired] == ["new"]
+    assert fired[0][1] == pytest.approx(3.0, abs=runtime.tick)
+
+
+def test_timers_beyond_one_wheel_turn(clock, runtime):
+    fired = []
+    turn = runtime.tick * len(runtime._slots)
+    runtime.call_later(turn * 2 + 1.0, lambda: fired.append(clock.monotonic()))
+    clock.run_for(turn * 2)
+    assert fired == []
+    clock.run_for(2.0)
+    assert fired == [pytest.approx(turn * 2 + 1.0, abs=runtime.tick)]
+
+
+def test_every_repeats_until_cancelled(clock, runtime):
+    runs = []
+    runtime.every(1.0, lambda: runs.append(clock.monotonic()), key="poll")
+    clock.run_for(5.5)
+    runtime.cancel("poll")
+    clock.run_for(5.0)
+    assert len(runs) == 5
+
+
+def test_every_skips_a_run_while_the_previous_one_is_busy(clock, runtime):
+    runs = []
+
+    def slow():
+        runs.append(clock.monotonic())
+        current_token().sleep(2.5)
+
+    runtime.every(1.0, slow, key="slow")
+    clock.run_for(6.5)
+    runtime.cancel("slow")
+    assert len(runs) < 6
+
+
+def test_current_token_outside_tasks_sleeps_on_the_timebase(clock):
+    results = []
+    clock.spawn(lambda: results.append(current_token(clock).sleep(30.0)))
+    clock.run_for(31.0)  # Would hit SETTLE_TIMEOUT if the sleep were real
+    assert results == [True]
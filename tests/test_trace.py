@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from hotswap_trace import (
+    LatencyHistogram, SwitchTracer, MARK_APPLIED, MARK_ACTIVE, MARK_FITTED, MAX_TRACKED_US,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_histogram_percentiles_within_one_percent():
+    rng = random.Random(3)
+    values = sorted(rng.uniform(1, 5000) for _ in range(10000))
+    hist = LatencyHistogram()
+    for v in values:
+        hist.record(v)
+    for pct in (50, 95, 99):
+        exact = values[int(len(values) * pct / 100) - 1]
+        assert hist.percentile(pct) == pytest.approx(exact, rel=0.01)
+    assert hist.max() == pytest.approx(values[-1], abs=0.001)
+    assert hist.mean() == pytest.approx(sum(values) / len(values), rel=0.001)
+
+
+def test_histogram_empty_and_clamped():
+    hist = LatencyHistogram()
+    assert hist.percentile(99) == 0.0
+    hist.record(10 * 60 * 1000)  # 10 minutes
+    assert hist.max() == MAX_TRACKED_US / 1000
+
+
+def test_histogram_merge_and_round_trip():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for v in (1, 2, 3):
+        a.record(v)
+    b.record(100)
+    a.merge(b)
+    copy = LatencyHistogram()
+    copy.load(a.to_dict())
+    assert copy.count == 4
+    assert copy.max() == 100
+    assert copy.percentile(50) == pytest.approx(2, rel=0.01)
+
+
+def test_stages_are_recorded_as_marks_arrive():
+    clock = FakeClock()
+    tracer = SwitchTracer(clock=clock)
+    clock.now = 1.0
+    tracer.focus_observed()
+    clock.now = 1.1
+    focus = tracer.take_focus()
+    tracer.begin("game.exe", 1.1, focus)
+    clock.now = 1.2
+    assert tracer.mark("game.exe", MARK_APPLIED)
+    assert not tracer.mark("game.exe", MARK_APPLIED)  # Each mark counts once
+    clock.now = 2.0
+    tracer.mark("game.exe", MARK_FITTED)
+    clock.now = 2.7
+    tracer.mark("game.exe", MARK_ACTIVE)
+
+    summary = tracer.summary("game.exe")
+    assert summary["wait"][0] == pytest.approx(100, rel=0.01)
+    assert summary["obs"][0] == pytest.approx(100, rel=0.01)
+    assert summary["fit"][0] == pytest.approx(800, rel=0.01)
+    assert summary["hook"][0] == pytest.approx(1500, rel=0.01)
+    assert summary["total"][0] == pytest.approx(1700, rel=0.01)
+    assert tracer.summary()["total"][3] == 1
+
+
+def test_focus_is_only_used_by_the_next_evaluation():
+    clock = FakeClock()
+    tracer = SwitchTracer(clock=clock)
+    clock.now = 10.0
+    tracer.focus_observed()     # Focus moved to something that wasn't switched to
+    assert tracer.take_focus() == 10.0
+
+    clock.now = 130.0           # Much later a poll or key starts a switch without a focus change
+    tracer.begin("game.exe", 130.0, tracer.take_focus())
+    clock.now = 130.05
+    tracer.mark("game.exe", MARK_APPLIED)
+    clock.now = 131.0
+    tracer.mark("game.exe", MARK_ACTIVE)
+    summary = tracer.summary()
+    assert summary["wait"][2] == 0.0
+    assert summary["total"][2] == pytest.approx(1000, rel=0.01)
+
+
+def test_focus_after_evaluation_is_ignored():
+    tracer = SwitchTracer(clock=FakeClock())
+    tracer.begin("game.exe", 5.0, focus=6.0)
+    assert tracer.traces["game.exe"]["focus"] == 5.0
+
+
+def test_marks_without_an_open_trace_are_dropped():
+    tracer = SwitchTracer(clock=FakeClock())
+    assert not tracer.mark("game.exe", MARK_ACTIVE)
+    tracer.begin("game.exe", 0.0)
+    tracer.discard("game.exe")
+    assert not tracer.mark("game.exe", MARK_APPLIED)
+
+
+def test_load_replaces_rather_than_adds():
+    clock = FakeClock()
+    tracer = SwitchTracer(clock=clock)
+    tracer.begin("game.exe", 0.0)
+    clock.now = 0.05
+    tracer.mark("game.exe", MARK_APPLIED)
+    saved = tracer.to_dict()
+    restored = SwitchTracer()
+    restored.load(saved)
+    restored.load(saved)
+    assert restored.summary("game.exe")["obs"][3] == 1
+    assert restored.summary()["obs"][3] == 1
+    assert "game.exe" in restored.describe("game.exe")
+
+
+def test_simulated_session_has_no_stale_focus_waits():
+    """Seed 7 has focus changes that start no switch, followed by poll/key driven switches."""
+    import contextlib
+    import io
+    from hotswap_engine import SWITCH_DEBOUNCE
+    from hotswap_sim import Simulation
+
+    sim = Simulation(seed=7)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.run(3600)
+        stages = sim.report()["stage_latency_ms"]
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.shutdown()
+    assert stages["wait"][3] > 0
+    assert stages["wait"][2] <= SWITCH_DEBOUNCE * 1000